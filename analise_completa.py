@@ -7,8 +7,8 @@ import numpy as np
 import os
 # Novas importações para OCR
 from PIL import Image
-import pytesseract
-from pdf2image import convert_from_path
+from src.ocr.servico import obter_servico
+from src.ocr.pdf import ocr_pdf_paginas
 import tempfile
 
 # Configuração da página
@@ -47,7 +47,7 @@ def extract_text_from_image(file, lang='por'):
     """Extrai texto de imagem usando OCR"""
     try:
         img = Image.open(file)
-        text = pytesseract.image_to_string(img, lang=lang)
+        text = obter_servico().texto(img, lang=lang)
         return text
     except Exception as e:
         return f"Erro ao processar imagem: {str(e)}"
@@ -59,15 +59,14 @@ def extract_text_from_pdf(file, lang='por'):
             tmp_file.write(file.read())
             tmp_file_path = tmp_file.name
         
-        with tempfile.TemporaryDirectory() as path:
-            images = convert_from_path(tmp_file_path, output_folder=path)
-            texto = ""
-            progress_bar = st.progress(0)
-            for i, img in enumerate(images):
-                texto += f"\n--- Página {i+1} ---\n"
-                texto += pytesseract.image_to_string(img, lang=lang) + "\n"
-                progress_bar.progress((i + 1) / len(images))
-            progress_bar.empty()
+        # Rasteriza e faz OCR página a página, em paralelo no pool de OCR
+        texto = ""
+        progress_bar = st.progress(0)
+        for pagina, total, texto_pagina in ocr_pdf_paginas(tmp_file_path, lang=lang):
+            texto += f"\n--- Página {pagina} ---\n"
+            texto += texto_pagina + "\n"
+            progress_bar.progress(pagina / total, text=f"Página {pagina}/{total}")
+        progress_bar.empty()
         
         os.unlink(tmp_file_path)
         return texto
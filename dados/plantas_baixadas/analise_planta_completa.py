@@ -1,10 +1,42 @@
+import sys
+from pathlib import Path
+
 import cv2
 import numpy as np
 from PIL import Image
-import pytesseract
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.ocr.preprocessamento import Receita
+from src.ocr.servico import obter_servico
+from src.ocr.tiles import abrir_raster, detectar_paredes_tiles, e_grande, ocr_tiles, texto_de_palavras
 
 IMAGEM = "planta_principal.png"
 
+# --- PRANCHAS MUITO GRANDES: TILES SOBRE RASTER MAPEADO EM MEMÓRIA --- #
+if Path(IMAGEM).exists() and e_grande(IMAGEM):
+    print("🧩 Imagem grande: OCR e detecção de paredes em tiles")
+    raster = abrir_raster(IMAGEM)
+    receita = Receita.de_lista("adaptativo_media", [("adaptativo", {"metodo": "media", "bloco": 25, "c": 15})])
+    texto = texto_de_palavras(ocr_tiles(raster, receita=receita, lang="por", config=""))
+    print("\nTexto OCR da planta (tiles binarizados):")
+    print('='*40)
+    print(texto)
+    with open("ocr_resultado.txt", "w", encoding="utf-8") as f:
+        f.write(texto)
+
+    lines = detectar_paredes_tiles(raster)
+    print(f"Linhas (possíveis paredes): {len(lines)}")
+
+    # Overlay desenhado numa prévia reduzida (a prancha inteira não cabe em memória)
+    fator = max(1, max(raster.shape) // 4000)
+    img_draw = cv2.cvtColor(np.ascontiguousarray(raster[::fator, ::fator]), cv2.COLOR_GRAY2BGR)
+    for x1, y1, x2, y2 in lines // fator:
+        cv2.line(img_draw, (int(x1), int(y1)), (int(x2), int(y2)), (0, 0, 255), 2)
+    saida = "planta_destacada.png"
+    cv2.imwrite(saida, img_draw)
+    print(f"✅ Prévia destacada (1:{fator}) salva como {saida}")
+    sys.exit(0)
+
 # --- PRÉ-PROCESSAMENTO PARA OCR --- #
 # Carregar e converter para tons de cinza
 img_cv = cv2.imread(IMAGEM)
@@ -21,7 +53,7 @@ cv2.imwrite("para_ocr.png", bin_img)  # só para visualizar/debug se quiser
 
 # OCR com imagem binarizada
 img_pil = Image.fromarray(bin_img)
-texto = pytesseract.image_to_string(img_pil, lang="por")
+texto = obter_servico().texto(img_pil, lang="por")
 print("\nTexto OCR da planta (imagem binarizada):")
 print('='*40)
 print(texto)
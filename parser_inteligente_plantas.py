@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from enum import Enum
 
+from src.classificador_tipos import ClassificadorTipos
+
 class TipoPlanta(Enum):
     """Tipos de plantas no sistema"""
     ARQUITETONICA = "arquitetonica"
@@ -81,12 +83,24 @@ AMBIENTES_VALIDOS = {
 }
 #!/usr/bin/env python3
 # parser_inteligente_plantas.py
+import argparse
+import glob
+import os
 import re
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional
 from enum import Enum
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional (saída .parquet)
+    pa = pq = None
+
 class TipoPlanta(Enum):
     """Tipos de plantas no sistema"""
     ARQUITETONICA = "arquitetonica"
@@ -237,22 +251,6 @@ class ParserInteligentePlantas:
         resumo += "\n💡 *Para mais detalhes, use modo_detalhado=True*"
         return resumo
 
-# Script principal
-if __name__ == "__main__":
-    parser = ParserInteligentePlantas()
-    with open("dados/pipeline_output/construcode_ocr.txt", "r", encoding="utf-8") as f:
-        texto_ocr = f.read()
-    planta = parser.processar_planta(texto_ocr, modo_detalhado=False)
-    print(parser.exibir_resumo_usuario(planta))
-    resultado = {
-        "tipo": planta.tipo.value,
-        "proposito": planta.proposito_principal,
-        "informacoes_relevantes": planta.informacoes_relevantes,
-        "checklist": parser.gerar_checklist_resumido(planta)
-    }
-    with open("dados/saidas_parser/planta_resumo.json", "w", encoding="utf-8") as f:
-        json.dump(resultado, f, ensure_ascii=False, indent=2)
-    print("\n✅ Resumo salvo em: dados/saidas_parser/planta_resumo.json")
 class ParserInteligentePlantas:
     """Parser baseado nas 5 regras do framework"""
     
@@ -289,17 +287,26 @@ class ParserInteligentePlantas:
             "medida_cm": re.compile(r'(\d{2,4})\s*cm', re.IGNORECASE),
             "pavimento": re.compile(r'(TÉRREO|PAVIMENTO|ANDAR|COBERTURA)\s*(\d*)', re.IGNORECASE)
         }
+
+        # Palavras-chave do config_tipos_plantas.json + as de cada propósito, numa única passada;
+        # só os tipos com propósito (layout/detalhamento não têm e quebrariam processar_planta)
+        self.classificador = ClassificadorTipos.de_config(
+            extras={tipo.value: config["palavras_chave"] for tipo, config in self.propositos.items()},
+            tipos=[tipo.value for tipo in self.propositos],
+        )
     
+    def pontuar_tipos(self, texto: str) -> List[Dict]:
+        """Todos os tipos encontrados no texto, com as contagens de palavras-chave"""
+        return [
+            {"tipo": p.tipo, "palavras_distintas": p.distintas, "ocorrencias": p.ocorrencias,
+             "cobertura": p.cobertura}
+            for p in self.classificador.classificar(texto)
+        ]
+
     def identificar_tipo_planta(self, texto: str) -> Optional[TipoPlanta]:
         """2. Foco no Usuário - Identifica o tipo baseado no conteúdo"""
-        texto_upper = texto.upper()
-        
-        for tipo, config in self.propositos.items():
-            matches = sum(1 for palavra in config["palavras_chave"] if palavra in texto_upper)
-            if matches >= 2:  # Pelo menos 2 palavras-chave
-                return tipo
-        
-        return TipoPlanta.ARQUITETONICA  # Default
+        melhor = self.classificador.melhor(texto, minimo=2)  # Pelo menos 2 palavras-chave
+        return TipoPlanta(melhor) if melhor else TipoPlanta.ARQUITETONICA  # Default
 
     def extrair_informacoes_relevantes(self, texto: str, tipo: TipoPlanta) -> Dict:
         """3. Exibição Direta - Extrai apenas o essencial"""
@@ -411,30 +418,265 @@ class ParserInteligentePlantas:
         
         return resumo
 
-# Script principal
-if __name__ == "__main__":
-    # Inicializa parser
-    parser = ParserInteligentePlantas()
-    
-    # Carrega OCR
-    with open("dados/pipeline_output/construcode_ocr.txt", "r", encoding="utf-8") as f:
-        texto_ocr = f.read()
-    
-    # Processa planta (modo resumido por padrão)
-    planta = parser.processar_planta(texto_ocr, modo_detalhado=False)
-    
-    # Exibe resumo para usuário
-    print(parser.exibir_resumo_usuario(planta))
-    
-    # Salva resultado estruturado
+    def processar_lote(self, entradas, saida=None, workers: Optional[int] = None,
+                       tamanho_bloco: Optional[int] = None, modo_detalhado: bool = False,
+                       ao_concluir=None) -> "ResumoLote":
+        """Processa vários textos de OCR em paralelo (diretório, glob ou lista de arquivos)
+
+        Cada resultado é gravado em ``saida`` (.jsonl ou .parquet) assim que o
+        bloco que o contém termina; ``ao_concluir(registro)`` é chamado na mesma
+        hora. Com ``workers=0`` tudo roda neste processo, com este parser.
+        """
+        caminhos = expandir_entradas(entradas)
+        workers = (os.cpu_count() or 1) if workers is None else max(0, workers)
+        resumo = ResumoLote(arquivos=len(caminhos), workers=workers)
+        escritor = EscritorResultados(saida) if saida else None
+        inicio = time.perf_counter()
+        try:
+            for registro in iterar_lote(caminhos, workers, tamanho_bloco, modo_detalhado, parser=self):
+                resumo.contabilizar(registro)
+                if escritor is not None:
+                    escritor.escrever(registro)
+                if ao_concluir is not None:
+                    ao_concluir(registro)
+        finally:
+            if escritor is not None:
+                escritor.fechar()
+            resumo.segundos = time.perf_counter() - inicio
+        return resumo
+
+
+# Processamento em lote ----------------------------------------------------
+
+SAIDA_LOTE_PADRAO = "dados/saidas_parser/plantas_lote.jsonl"
+
+ESQUEMA_PARQUET = pa.schema([
+    ("arquivo", pa.string()),
+    ("tipo", pa.string()),
+    ("proposito", pa.string()),
+    ("checklist", pa.list_(pa.string())),
+    ("informacoes_relevantes", pa.string()),  # JSON
+    ("detalhes_completos", pa.string()),      # JSON, só no modo detalhado
+    ("bytes", pa.int64()),
+    ("segundos", pa.float64()),
+    ("erro", pa.string()),
+]) if pa is not None else None
+
+# Parser do worker, criado uma única vez pelo initializer do pool
+_PARSER_WORKER: Optional[ParserInteligentePlantas] = None
+
+
+def expandir_entradas(entradas, padrao: str = "*.txt") -> List[Path]:
+    """Arquivos de uma ou mais entradas: arquivo, diretório (``padrao``) ou glob"""
+    if isinstance(entradas, (str, Path)):
+        entradas = [entradas]
+    caminhos, vistos = [], set()
+    for entrada in entradas:
+        entrada = str(entrada)
+        if os.path.isdir(entrada):
+            encontrados = sorted(Path(entrada).glob(padrao))
+        elif glob.has_magic(entrada):
+            encontrados = sorted(Path(c) for c in glob.glob(entrada, recursive=True))
+        else:
+            encontrados = [Path(entrada)]
+        for caminho in encontrados:
+            if caminho not in vistos and not caminho.is_dir():
+                vistos.add(caminho)
+                caminhos.append(caminho)
+    return caminhos
+
+
+def planta_para_dict(parser: ParserInteligentePlantas, planta: InfoPlanta) -> Dict:
+    """Resultado serializável de uma planta (o mesmo formato de planta_resumo.json)"""
     resultado = {
         "tipo": planta.tipo.value,
         "proposito": planta.proposito_principal,
         "informacoes_relevantes": planta.informacoes_relevantes,
         "checklist": parser.gerar_checklist_resumido(planta)
     }
-    
-    with open("dados/saidas_parser/planta_resumo.json", "w", encoding="utf-8") as f:
-        json.dump(resultado, f, ensure_ascii=False, indent=2)
-    
-    print("\n✅ Resumo salvo em: dados/saidas_parser/planta_resumo.json")
\ No newline at end of file
+    if planta.detalhes_completos:
+        resultado["detalhes_completos"] = planta.detalhes_completos
+    return resultado
+
+
+def processar_arquivo(parser: ParserInteligentePlantas, caminho, modo_detalhado: bool = False) -> Dict:
+    """Lê e processa um texto de OCR; erros viram um registro com o campo ``erro``"""
+    inicio = time.perf_counter()
+    registro = {"arquivo": str(caminho)}
+    try:
+        with open(caminho, "rb") as f:
+            bruto = f.read()
+        registro["bytes"] = len(bruto)
+        planta = parser.processar_planta(bruto.decode("utf-8"), modo_detalhado=modo_detalhado)
+        registro.update(planta_para_dict(parser, planta))
+    except Exception as e:
+        registro["erro"] = f"{type(e).__name__}: {e}"
+    registro["segundos"] = round(time.perf_counter() - inicio, 6)
+    return registro
+
+
+def _iniciar_worker():
+    global _PARSER_WORKER
+    _PARSER_WORKER = ParserInteligentePlantas()
+
+
+def _processar_bloco(caminhos: List[Path], modo_detalhado: bool) -> List[Dict]:
+    return [processar_arquivo(_PARSER_WORKER, c, modo_detalhado) for c in caminhos]
+
+
+def iterar_lote(caminhos: List[Path], workers: int, tamanho_bloco: Optional[int] = None,
+                modo_detalhado: bool = False,
+                parser: Optional[ParserInteligentePlantas] = None) -> Iterator[Dict]:
+    """Registros na ordem em que os blocos terminam
+
+    Os arquivos seguem para os workers em blocos de ``tamanho_bloco`` caminhos
+    (cada worker lê os seus), com no máximo dois blocos por worker em voo.
+    """
+    if workers == 0 or len(caminhos) <= 1:
+        parser = parser or ParserInteligentePlantas()
+        for caminho in caminhos:
+            yield processar_arquivo(parser, caminho, modo_detalhado)
+        return
+
+    if not tamanho_bloco:
+        tamanho_bloco = max(1, min(64, len(caminhos) // (workers * 4)))
+    blocos = (caminhos[i:i + tamanho_bloco] for i in range(0, len(caminhos), tamanho_bloco))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker) as pool:
+        pendentes = set()
+        for bloco in blocos:
+            pendentes.add(pool.submit(_processar_bloco, bloco, modo_detalhado))
+            if len(pendentes) >= 2 * workers:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    yield from futuro.result()
+        while pendentes:
+            prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                yield from futuro.result()
+
+
+class EscritorResultados:
+    """Grava registros em JSONL (uma linha por planta) ou Parquet (em grupos de linhas)"""
+
+    def __init__(self, caminho, linhas_por_grupo: int = 1000):
+        self.caminho = Path(caminho)
+        self.formato = "parquet" if self.caminho.suffix == ".parquet" else "jsonl"
+        self.linhas_por_grupo = linhas_por_grupo
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._pendentes: List[Dict] = []
+        if self.formato == "parquet":
+            if pq is None:
+                raise RuntimeError("pyarrow não está instalado; use uma saída .jsonl")
+            self._arquivo = pq.ParquetWriter(str(self.caminho), ESQUEMA_PARQUET)
+        else:
+            self._arquivo = open(self.caminho, "w", encoding="utf-8")
+
+    def escrever(self, registro: Dict):
+        if self.formato == "jsonl":
+            self._arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self._arquivo.flush()
+            return
+        detalhes = registro.get("detalhes_completos")
+        self._pendentes.append({
+            "arquivo": registro["arquivo"],
+            "tipo": registro.get("tipo"),
+            "proposito": registro.get("proposito"),
+            "checklist": registro.get("checklist"),
+            "informacoes_relevantes": json.dumps(registro.get("informacoes_relevantes", {}), ensure_ascii=False),
+            "detalhes_completos": json.dumps(detalhes, ensure_ascii=False) if detalhes else None,
+            "bytes": registro.get("bytes"),
+            "segundos": registro.get("segundos"),
+            "erro": registro.get("erro"),
+        })
+        if len(self._pendentes) >= self.linhas_por_grupo:
+            self._descarregar()
+
+    def _descarregar(self):
+        if self._pendentes:
+            self._arquivo.write_table(pa.Table.from_pylist(self._pendentes, schema=ESQUEMA_PARQUET))
+            self._pendentes = []
+
+    def fechar(self):
+        if self.formato == "parquet":
+            self._descarregar()
+        self._arquivo.close()
+
+
+@dataclass
+class ResumoLote:
+    """Vazão de um processamento em lote"""
+    arquivos: int = 0
+    workers: int = 0
+    processados: int = 0
+    erros: int = 0
+    bytes: int = 0
+    segundos: float = 0.0
+    por_tipo: Dict[str, int] = field(default_factory=dict)
+
+    def contabilizar(self, registro: Dict):
+        self.processados += 1
+        self.bytes += registro.get("bytes", 0)
+        if "erro" in registro:
+            self.erros += 1
+        else:
+            self.por_tipo[registro["tipo"]] = self.por_tipo.get(registro["tipo"], 0) + 1
+
+    @property
+    def arquivos_por_s(self) -> float:
+        return self.processados / self.segundos if self.segundos else 0.0
+
+    @property
+    def mb_por_s(self) -> float:
+        return self.bytes / 1024 / 1024 / self.segundos if self.segundos else 0.0
+
+    def texto(self) -> str:
+        tipos = ", ".join(f"{tipo}: {n}" for tipo, n in sorted(self.por_tipo.items())) or "-"
+        return (
+            f"📊 {self.processados}/{self.arquivos} arquivos em {self.segundos:.2f} s "
+            f"({self.workers} workers) — {self.arquivos_por_s:.1f} arquivos/s, {self.mb_por_s:.2f} MB/s\n"
+            f"   Tipos: {tipos}\n"
+            f"   Erros: {self.erros}"
+        )
+
+
+def main():
+    parser_cli = argparse.ArgumentParser(
+        description="Identifica o tipo e o essencial de plantas a partir de textos de OCR",
+        epilog="Com um único arquivo e sem --saida, exibe o resumo e grava "
+               "dados/saidas_parser/planta_resumo.json")
+    parser_cli.add_argument("entradas", nargs="*", default=["dados/pipeline_output/construcode_ocr.txt"],
+                            help="Arquivos, diretórios (*.txt) ou globs entre aspas")
+    parser_cli.add_argument("--saida", help=f"Resultados em .jsonl ou .parquet (lote; padrão: {SAIDA_LOTE_PADRAO})")
+    parser_cli.add_argument("--workers", type=int, help="Processos (padrão: núcleos; 0 = sem pool)")
+    parser_cli.add_argument("--bloco", type=int, help="Arquivos por tarefa enviada a um worker")
+    parser_cli.add_argument("--detalhado", action="store_true", help="Inclui medidas, pavimentos e texto original")
+    args = parser_cli.parse_args()
+
+    parser = ParserInteligentePlantas()
+    caminhos = expandir_entradas(args.entradas)
+    if len(caminhos) == 1 and not args.saida:
+        with open(caminhos[0], "r", encoding="utf-8") as f:
+            texto_ocr = f.read()
+        planta = parser.processar_planta(texto_ocr, modo_detalhado=args.detalhado)
+        print(parser.exibir_resumo_usuario(planta))
+        os.makedirs("dados/saidas_parser", exist_ok=True)
+        with open("dados/saidas_parser/planta_resumo.json", "w", encoding="utf-8") as f:
+            json.dump(planta_para_dict(parser, planta), f, ensure_ascii=False, indent=2)
+        print("\n✅ Resumo salvo em: dados/saidas_parser/planta_resumo.json")
+        return
+
+    saida = args.saida or SAIDA_LOTE_PADRAO
+
+    def _progresso(registro):
+        if "erro" in registro:
+            print(f"❌ {registro['arquivo']}: {registro['erro']}")
+
+    resumo = parser.processar_lote(caminhos, saida, workers=args.workers, tamanho_bloco=args.bloco,
+                                   modo_detalhado=args.detalhado, ao_concluir=_progresso)
+    print(resumo.texto())
+    print(f"✅ Resultados em: {saida}")
+
+
+# Script principal
+if __name__ == "__main__":
+    main()
@@ -13,14 +13,9 @@ echo "==============================================="
 echo "🔍 Processando imagem: $IMAGEM"
 echo
 
-# 1. Analisar a planta
-python scripts/analisador_plantas_wsf.py "$IMAGEM"
-
-# 2. Corrigir para o formato compatível
-python scripts/corrige_formato_json.py
-
-# 3. Calcular áreas
-python scripts/calcula_area_total.py
+# 1-3. Analisar a planta, corrigir o formato e calcular áreas (um único processo;
+#      o JSON de cada etapa fica em plantas_teste/)
+python scripts/pipeline_completo.py "$IMAGEM" --checkpoint plantas_teste
 
 # 4. Exibir arquivos e resumo
 echo
@@ -1,42 +1,55 @@
 #!/usr/bin/env python3
-import pytesseract
-from PIL import Image
-import cv2
-import numpy as np
 import os
 
+from src.ocr.cache import hash_arquivo, montar_chave, obter_cache
+from src.ocr.preprocessamento import RECEITAS
+from src.ocr.servico import obter_servico
+from src.ocr.tiles import abrir_raster, e_grande, ocr_tiles, texto_de_palavras
+
+# Cinza -> threshold 150 -> mediana 3; a descrição entra na chave do cache de OCR
+RECEITA = RECEITAS["planta_principal"]
+RECEITA_PREPROCESSAMENTO = RECEITA.descricao()
+
 def preprocessar_imagem(caminho_imagem):
-    """Pré-processa imagem para melhorar OCR"""
-    # Ler imagem
-    img = cv2.imread(caminho_imagem)
-    
-    # Converter para escala de cinza
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    
-    # Aplicar threshold para binarizar
-    _, thresh = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)
-    
-    # Remover ruído
-    denoised = cv2.medianBlur(thresh, 3)
-    
-    # Salvar imagem processada
-    processed_path = caminho_imagem.replace('.png', '_processed.png')
-    cv2.imwrite(processed_path, denoised)
-    
-    return processed_path
+    """Pré-processa imagem para melhorar OCR (em memória, sem gravar _processed.png)"""
+    img, tempos = RECEITA.aplicar_arquivo(caminho_imagem)
+    print("⏱️  Pré-processamento: " + ", ".join(f"{n} {t * 1000:.0f}ms" for n, t in tempos))
+    return img
 
 def extrair_texto_planta(caminho_imagem):
     """Extrai texto da planta usando OCR"""
     print(f"🔍 Processando: {caminho_imagem}")
     
-    # Pré-processar imagem
-    img_processada = preprocessar_imagem(caminho_imagem)
-    
     # Configurar Tesseract para português
     custom_config = r'--oem 3 --psm 11 -l por'
     
-    # Extrair texto
-    texto = pytesseract.image_to_string(Image.open(img_processada), config=custom_config)
+    # Consultar o cache antes de pré-processar (mesmo arquivo + receita + config)
+    cache = obter_cache()
+    chave = None
+    texto = None
+    if cache is not None:
+        chave = montar_chave(hash_arquivo(caminho_imagem), RECEITA_PREPROCESSAMENTO, custom_config)
+        texto = cache.obter(chave)
+        if texto is not None:
+            print("♻️  Resultado de OCR reaproveitado do cache")
+    
+    if texto is None and e_grande(caminho_imagem):
+        # Prancha muito grande: pré-processamento e OCR em tiles, memória limitada
+        print("🧩 Imagem grande: processando em tiles")
+        palavras = ocr_tiles(abrir_raster(caminho_imagem), receita=RECEITA, config=custom_config,
+                             cache=False)
+        texto = texto_de_palavras(palavras)
+        if chave is not None:
+            cache.guardar(chave, texto, origem=caminho_imagem)
+    elif texto is None:
+        # Pré-processar imagem
+        img_processada = preprocessar_imagem(caminho_imagem)
+        
+        # Extrair texto
+        # o resultado já vai para o cache sob a chave do arquivo; não guardar de novo pela imagem
+        texto = obter_servico().texto(img_processada, config=custom_config, cache=False)
+        if chave is not None:
+            cache.guardar(chave, texto, origem=caminho_imagem)
     
     # Salvar resultado
     output_path = 'dados/pipeline_output/planta_principal_ocr.txt'
@@ -11,65 +11,72 @@ Este script analisa imagens de plantas baixas e extrai automaticamente:
 """
 
 import cv2
-import numpy as np
-import pytesseract
 import json
+import pyarrow.parquet as pq
 import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.colunar.ambientes import registros_de_json, tabela_ambientes
+from src.ocr.preprocessamento import RECEITAS
+from src.ocr.regioes import CONFIG_REGIOES, filtrar_caixas, ocr_regioes
+from src.ocr.servico import obter_servico
+from src.ocr.tiles import abrir_raster, agrupar_linhas, e_grande, ocr_tiles
+
+def gravar_parquet(resultado, arquivo_parquet):
+    """Ambientes do resultado do analisador em Parquet, para consultas agregadas entre plantas"""
+    Path(arquivo_parquet).parent.mkdir(parents=True, exist_ok=True)
+    planta_id = Path(resultado.get("arquivo_origem", arquivo_parquet)).stem
+    pq.write_table(tabela_ambientes(registros_de_json(resultado, planta_id)), arquivo_parquet)
+    return str(arquivo_parquet)
+
 class AnalisadorPlantasWSF:
-    def __init__(self):
+    def __init__(self, modo_ocr_regioes="mosaico"):
         self.ambientes_detectados = []
         self.debug_mode = True
+        self.modo_ocr_regioes = modo_ocr_regioes  # "mosaico" ou "imagem"
         
     def preprocessar_imagem(self, imagem):
         """Preprocessa a imagem para melhor detecção de texto"""
-        # Converter para escala de cinza
-        cinza = cv2.cvtColor(imagem, cv2.COLOR_BGR2GRAY)
-        
-        # Aplicar threshold adaptativo
-        thresh = cv2.adaptiveThreshold(
-            cinza, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 11, 2
-        )
-        
-        # Remover ruído
-        kernel = np.ones((1,1), np.uint8)
-        processada = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-        
+        # Escala de cinza + threshold adaptativo (receita compartilhada)
+        processada, tempos = RECEITAS["analisador"].aplicar(imagem)
+        if self.debug_mode:
+            print("⏱️  Pré-processamento: " + ", ".join(f"{n} {t * 1000:.0f}ms" for n, t in tempos))
         return processada
     
     def extrair_texto_regioes(self, imagem):
-        """Extrai texto de regiões específicas da imagem"""
+        """Extrai texto de regiões específicas da imagem (uma única chamada ao Tesseract)"""
         altura, largura = imagem.shape[:2]
         regioes_texto = []
-        
+
         # Detectar contornos para encontrar áreas de texto
         contornos, _ = cv2.findContours(
             imagem, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
         )
-        
-        for contorno in contornos:
-            x, y, w, h = cv2.boundingRect(contorno)
-            
-            # Filtrar contornos muito pequenos ou muito grandes
-            if w > 30 and h > 10 and w < largura * 0.5 and h < altura * 0.5:
-                roi = imagem[y:y+h, x:x+w]
-                
-                # Configuração otimizada do Tesseract
-                config = '--psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,x '
-                texto = pytesseract.image_to_string(roi, config=config, lang='por')
-                
-                if texto.strip():
-                    regioes_texto.append({
-                        'texto': texto.strip(),
-                        'posicao': (x, y, w, h)
-                    })
-        
+
+        # Filtrar contornos muito pequenos ou muito grandes
+        caixas = filtrar_caixas(contornos, largura, altura)
+
+        # OCR de todas as regiões de uma vez (mosaico das ROIs)
+        textos = ocr_regioes(imagem, caixas, lang='por', modo=self.modo_ocr_regioes)
+
+        for caixa, texto in zip(caixas, textos):
+            if texto.strip():
+                regioes_texto.append({
+                    'texto': texto.strip(),
+                    'posicao': caixa
+                })
+
         return regioes_texto
     
+    def extrair_texto_tiles(self, caminho_imagem):
+        """Extrai regiões de texto de pranchas grandes, tile a tile, no formato de regioes_texto"""
+        raster = abrir_raster(caminho_imagem)
+        palavras = ocr_tiles(raster, receita=RECEITAS["analisador"], lang='por', config=CONFIG_REGIOES)
+        return agrupar_linhas(palavras)
+    
     def extrair_medidas(self, texto):
         """Extrai medidas no formato LxC ou L x C"""
         # Padrões para detectar medidas
@@ -128,7 +135,8 @@ class AnalisadorPlantasWSF:
                     ambientes.append({
                         'ambiente': ambiente_encontrado.title(),
                         'largura': largura,
-                        'comprimento': comprimento
+                        'comprimento': comprimento,
+                        'bbox': list(regiao['posicao'])
                     })
         
         return ambientes
@@ -137,17 +145,24 @@ class AnalisadorPlantasWSF:
         """Analisa a planta e extrai todas as informações"""
         print(f"\n🔍 Analisando: {caminho_imagem}")
         
-        # Carregar imagem
-        imagem = cv2.imread(caminho_imagem)
-        if imagem is None:
-            print(f"❌ Erro ao carregar imagem: {caminho_imagem}")
-            return []
-        
-        # Preprocessar
-        imagem_processada = self.preprocessar_imagem(imagem)
-        
-        # Extrair texto
-        regioes_texto = self.extrair_texto_regioes(imagem_processada)
+        # Pranchas muito grandes (A0/A1): tiles sobre raster mapeado em memória
+        if e_grande(caminho_imagem):
+            print("🧩 Imagem grande: processando em tiles")
+            regioes_texto = self.extrair_texto_tiles(caminho_imagem)
+            imagem_processada = None
+        else:
+            # Carregar imagem
+            imagem = cv2.imread(caminho_imagem)
+            if imagem is None:
+                print(f"❌ Erro ao carregar imagem: {caminho_imagem}")
+                return []
+            
+            # Preprocessar
+            imagem_processada = self.preprocessar_imagem(imagem)
+            del imagem
+            
+            # Extrair texto
+            regioes_texto = self.extrair_texto_regioes(imagem_processada)
         print(f"📝 Regiões de texto encontradas: {len(regioes_texto)}")
         
         # Identificar ambientes
@@ -156,7 +171,11 @@ class AnalisadorPlantasWSF:
         # Se não encontrou ambientes, tentar OCR direto na imagem completa
         if not ambientes:
             print("🔄 Tentando análise alternativa...")
-            texto_completo = pytesseract.image_to_string(imagem_processada, lang='por')
+            if imagem_processada is None:
+                # Em tiles o OCR já cobriu a prancha inteira
+                texto_completo = "\n".join(r['texto'] for r in regioes_texto)
+            else:
+                texto_completo = obter_servico().texto(imagem_processada, lang='por')
             linhas = texto_completo.split('\n')
             
             for linha in linhas:
@@ -183,14 +202,22 @@ class AnalisadorPlantasWSF:
         
         return ambientes
     
-    def gerar_json_resultado(self, ambientes, arquivo_origem, arquivo_saida):
-        """Gera o JSON de resultado no formato especificado"""
-        resultado = {
+    def montar_resultado(self, ambientes, arquivo_origem):
+        """Resultado da análise no formato do JSON do analisador"""
+        return {
             "projeto": "Análise Automática de Planta Baixa",
             "data_analise": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "arquivo_origem": str(arquivo_origem),
             "medidas": ambientes
         }
+    
+    def analisar(self, caminho_imagem):
+        """Analisa a planta e devolve o resultado em memória (etapa do pipeline em processo)"""
+        return self.montar_resultado(self.analisar_planta(caminho_imagem), caminho_imagem)
+    
+    def gerar_json_resultado(self, ambientes, arquivo_origem, arquivo_saida):
+        """Gera o JSON de resultado no formato especificado"""
+        resultado = self.montar_resultado(ambientes, arquivo_origem)
         
         # Criar diretório se não existir
         Path(arquivo_saida).parent.mkdir(parents=True, exist_ok=True)
@@ -199,7 +226,11 @@ class AnalisadorPlantasWSF:
         with open(arquivo_saida, 'w', encoding='utf-8') as f:
             json.dump(resultado, f, ensure_ascii=False, indent=2)
         
+        # Mesmos ambientes em Parquet, para consultas agregadas entre plantas
+        arquivo_parquet = gravar_parquet(resultado, Path(arquivo_saida).with_suffix('.parquet'))
+        
         print(f"\n✅ JSON gerado: {arquivo_saida}")
+        print(f"🧱 Parquet gerado: {arquivo_parquet}")
         print(f"📊 Total de ambientes detectados: {len(ambientes)}")
         
         # Mostrar resumo
@@ -55,6 +55,10 @@ for i, img in enumerate(imagens, start=1):
         print(f"  ⚠️ Ignorado (src não http): {src}")
         continue
     nome_arquivo = os.path.basename(src).split("?")[0]
+    # Tiles Leaflet .../{z}/{x}/{y}.png: mantém as coordenadas no nome (src/ocr/leaflet.py)
+    partes = src.split("?")[0].split("/")
+    if len(partes) >= 3 and all(p.split(".")[0].isdigit() for p in partes[-3:]):
+        nome_arquivo = "_".join(partes[-3:])
     nome_arquivo = f"tile_{i:03d}_" + nome_arquivo
     destino = os.path.join(PASTA_DESTINO, nome_arquivo)
     try:
@@ -5,10 +5,14 @@ Salva relatórios simples de sucesso/falha.
 """
 
 import requests
+import sys
 from pathlib import Path
 from datetime import datetime
 import re
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.download.baixador import baixar_lote, carregar_config, nome_planta
+
 def baixar_planta_construcode(url, destino):
     destino = Path(destino)
     destino.mkdir(parents=True, exist_ok=True)
@@ -44,17 +48,26 @@ def baixar_planta_construcode(url, destino):
         resultado["erro"] = str(e)
     return resultado
 
-def processar_lote(links, destino):
-    relatorio = []
-    for url in links:
-        print(f"\nBaixando: {url}")
-        resultado = baixar_planta_construcode(url, destino)
-        if resultado["status"] == "OK":
-            print(f"✔️ Sucesso: {resultado['arquivo']}")
+def processar_lote(links, destino, config=None, manifesto=None):
+    """
+    Baixa os links em paralelo (pool de conexões, limites por host, novas
+    tentativas com backoff e retomada via Range; ver src/download/baixador.py).
+    """
+    destino = Path(destino)
+    config = config or carregar_config()
+    manifesto = manifesto or destino / "manifesto.jsonl"
+
+    def mostrar(r):
+        if r.status == "OK":
+            print(f"✔️ Sucesso: {r.arquivo}")
         else:
-            print(f"❌ Falha: {resultado['erro']}")
-        relatorio.append(resultado)
-    return relatorio
+            print(f"❌ Falha: {r.url} -> {r.erro}")
+
+    print(f"\nBaixando {len(links)} plantas ({config.workers} workers, {config.por_host} por host)")
+    resultados = baixar_lote(links, destino, config, manifesto=manifesto, nome_arquivo=nome_planta,
+                             validar=lambda cabeca: b"%PDF" in cabeca, ao_concluir=mostrar)
+    # um resultado por link, na ordem de ``links`` (links repetidos aparecem repetidos)
+    return [{"url": r.url, "status": r.status, "arquivo": r.arquivo, "erro": r.erro} for r in resultados]
 
 if __name__ == "__main__":
     # Lista de links das plantas
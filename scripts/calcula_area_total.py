@@ -1,43 +1,80 @@
+"""
+Soma as áreas válidas de resultado_analisador.json (geometria.medidas)
+
+O cálculo é vetorizado em src/colunar/areas.py: medidas que não são números
+são descartadas (e contadas), e só entram ambientes com largura >=
+LARGURA_MINIMA e comprimento >= COMPRIMENTO_MINIMO.
+
+Medidas com vírgula decimal ("3,5") agora são lidas como números; o laço
+antigo (``float("3,5")``) as descartava, então a área total de JSON com
+esse formato pode ser maior que a calculada pelas versões anteriores.
+
+Uso:
+    python scripts/calcula_area_total.py
+    python scripts/calcula_area_total.py entrada.json saida.json --largura-minima 1.5
+"""
+import argparse
 import json
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.colunar.areas import (COMPRIMENTO_MINIMO, LARGURA_MINIMA, area_total,  # noqa: E402,F401
+                               calcular_areas, dataframe_de_json)
 
 CAMINHO_JSON = "plantas_teste/resultado_analisador.json"  # defina aqui o caminho do seu JSON de entrada
 CAMINHO_SAIDA = "plantas_teste/resultado_analisador_com_area.json"
 
-# Critérios para filtrar dimensões válidas (ajuste conforme sua planta)
-LARGURA_MINIMA = 2  # em metros (valores menores podem ser ruído, como 2x4 pode ser parede ou porta)
-COMPRIMENTO_MINIMO = 2
-
-def calcula_area_total(medidas):
-    area_total = 0.0
-    for medida in medidas:
-        try:
-            largura = float(medida["largura"])
-            comprimento = float(medida["comprimento"])
-            if largura >= LARGURA_MINIMA and comprimento >= COMPRIMENTO_MINIMO:
-                area = largura * comprimento
-                area_total += area
-        except Exception as e:
-            print(f"Erro em medida: {medida}. Detalhes: {e}")
-    return area_total
-# Leitura do arquivo JSON
-if not os.path.exists(CAMINHO_JSON):
-    raise FileNotFoundError(f"O arquivo de entrada '{CAMINHO_JSON}' não foi encontrado.")
-with open(CAMINHO_JSON, "r", encoding="utf-8") as f:
-    dados = json.load(f)
-
-# Verifica se as chaves esperadas existem
-if "geometria" not in dados or "medidas" not in dados["geometria"]:
-    raise KeyError("O JSON de entrada deve conter as chaves 'geometria' e 'geometria'['medidas']")
-
-# Cálculo da soma das áreas
-area_total = calcula_area_total(dados["geometria"]["medidas"])
-print(f"Área total calculada: {area_total:.2f} m²")
-
-# Atualiza o JSON e salva
-dados["geometria"]["area_total"] = area_total
-
-with open(CAMINHO_SAIDA, "w", encoding="utf-8") as f:
-    json.dump(dados, f, indent=2, ensure_ascii=False)
-
-print(f"Arquivo atualizado salvo em: {CAMINHO_SAIDA}")
\ No newline at end of file
+
+def calcula_area_total(medidas, largura_minima=LARGURA_MINIMA, comprimento_minimo=COMPRIMENTO_MINIMO):
+    return area_total(medidas, largura_minima, comprimento_minimo)
+
+
+def adicionar_area_total(dados, largura_minima=LARGURA_MINIMA, comprimento_minimo=COMPRIMENTO_MINIMO):
+    """Cópia de ``dados`` com geometria.area_total (etapa do pipeline em processo)"""
+    if "geometria" not in dados or "medidas" not in dados["geometria"]:
+        raise KeyError("O JSON de entrada deve conter as chaves 'geometria' e 'geometria'['medidas']")
+    total = calcula_area_total(dados["geometria"]["medidas"], largura_minima, comprimento_minimo)
+    return {**dados, "geometria": {**dados["geometria"], "area_total": total}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calcula a área total das medidas válidas")
+    parser.add_argument("entrada", nargs="?", default=CAMINHO_JSON)
+    parser.add_argument("saida", nargs="?", default=CAMINHO_SAIDA)
+    parser.add_argument("--largura-minima", type=float, default=LARGURA_MINIMA)
+    parser.add_argument("--comprimento-minimo", type=float, default=COMPRIMENTO_MINIMO)
+    args = parser.parse_args()
+
+    # Leitura do arquivo JSON
+    if not os.path.exists(args.entrada):
+        raise FileNotFoundError(f"O arquivo de entrada '{args.entrada}' não foi encontrado.")
+    with open(args.entrada, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+
+    # Verifica se as chaves esperadas existem
+    if "geometria" not in dados or "medidas" not in dados["geometria"]:
+        raise KeyError("O JSON de entrada deve conter as chaves 'geometria' e 'geometria'['medidas']")
+
+    # Cálculo da soma das áreas
+    df = calcular_areas(dataframe_de_json(dados["geometria"]["medidas"]),
+                        args.largura_minima, args.comprimento_minimo)
+    invalidas = int(df["area"].isna().sum())
+    if invalidas:
+        print(f"Medidas ignoradas (largura/comprimento não numéricos): {invalidas}")
+    total = float(df["area_valida"].sum())
+    print(f"Área total calculada: {total:.2f} m²")
+
+    # Atualiza o JSON e salva
+    dados["geometria"]["area_total"] = total
+
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(dados, f, indent=2, ensure_ascii=False)
+
+    print(f"Arquivo atualizado salvo em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,80 +1,53 @@
 #!/usr/bin/env python3
 """
-Automatiza a navegação e captura das N páginas da planta do ConstruCode
+Monta as N páginas da planta do ConstruCode a partir dos tiles Leaflet salvos
+
+Cada página fica numa subpasta de PASTA_TILES (ex.: pagina_01/{z}/{x}/{y}.png).
+As pranchas são montadas no maior zoom, gravadas como .npy mapeado em
+memória e enviadas direto ao OCR em tiles, sem navegador.
 """
 
 import os
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from PIL import Image
-from datetime import datetime
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.ocr.leaflet import listar_tiles, montar_prancha
+from src.ocr.tiles import ocr_tiles, texto_de_palavras
 
-PLANTA_URL = "https://www.construcode.com.br/Track/Planta/?m=68uTY2frNHg%3d&o=cc&area=37589&tp=114#"
+PASTA_TILES = "dados/tiles_salvos_html"
 OUTPUT_DIR = "data/raw_plantas"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
-NUM_PAGINAS = 42  # Ajuste conforme o número real no menu
-
-def capture_all_pages():
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--window-size=1920,1080')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    driver = webdriver.Chrome(options=options)
-
-    try:
-        print(f"🌐 Acessando: {PLANTA_URL}")
-        driver.get(PLANTA_URL)
-        time.sleep(8)  # Ajuste para garantir carregamento inicial
-
-        for pagina in range(NUM_PAGINAS):
-            print(f"📄 Capturando página {pagina + 1}/{NUM_PAGINAS}")
-
-            # Aguarda o carregamento do Leaflet/mapa/tela
-            time.sleep(2.0)
-            nome_base = datetime.now().strftime(f"planta_%Y%m%d_%H%M%S_p{pagina+1:02d}")
-            
-            # Screenshot geral
-            screenshot_path = os.path.join(OUTPUT_DIR, f"{nome_base}_full.png")
-            driver.save_screenshot(screenshot_path)
-
-            # Recorta área do mapa
-            try:
-                container = driver.find_element(By.CSS_SELECTOR, ".leaflet-pane.leaflet-map-pane.leaflet-pan-anim")
-                location = container.location
-                size = container.size
-
-                with Image.open(screenshot_path) as img:
-                    left = int(location['x'])
-                    top = int(location['y'])
-                    right = int(location['x'] + size['width'])
-                    bottom = int(location['y'] + size['height'])
-                    cropped = img.crop((left, top, right, bottom))
-                    cropped_path = os.path.join(OUTPUT_DIR, f"{nome_base}_crop.png")
-                    cropped.save(cropped_path)
-                    print(f"✅ Página {pagina + 1}: imagem salva em {cropped_path}")
-            except Exception as e:
-                print(f"⚠️ Erro ao recortar screenshot da página {pagina + 1}: {e}")
-
-            # Avança para a próxima página, exceto na última iteração
-            if pagina < NUM_PAGINAS - 1:
-                try:
-                    btn_next = driver.find_element(By.ID, "nextpageplanta")
-                    driver.execute_script("arguments[0].click();", btn_next)
-                except Exception as e:
-                    print(f"❌ Não foi possível acessar o botão de próxima página na página {pagina+1}: {e}")
-                    break
-                # Aqui pode ser útil aguardar até que o DOM indique nova página carregada
-
-        print("🎉 Todas as páginas capturadas!")
-
-    except Exception as e:
-        print(f"❌ Erro geral: {e}")
 
-    finally:
-        driver.quit()
+def capture_all_pages(executar_ocr=True):
+    if not Path(PASTA_TILES).is_dir():
+        print(f"❌ Pasta de tiles não encontrada: {PASTA_TILES}")
+        return
+    # Subpastas numéricas são níveis de zoom, não páginas
+    paginas = sorted(p for p in Path(PASTA_TILES).iterdir()
+                     if p.is_dir() and not p.name.isdigit() and listar_tiles(p))
+    if not paginas:
+        # Uma única página com os tiles direto na pasta
+        paginas = [Path(PASTA_TILES)]
+
+    for numero, pasta in enumerate(paginas, start=1):
+        print(f"📄 Montando página {numero}/{len(paginas)}: {pasta}")
+        destino = os.path.join(OUTPUT_DIR, f"planta_p{numero:02d}.npy")
+        try:
+            prancha = montar_prancha(pasta, saida=destino)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"⚠️ Página {numero} ignorada: {e}")
+            continue
+        print(f"✅ Página {numero}: {prancha.shape[1]}x{prancha.shape[0]} em {destino}")
+
+        if executar_ocr:
+            texto = texto_de_palavras(ocr_tiles(prancha))
+            saida_txt = os.path.join(OUTPUT_DIR, f"planta_p{numero:02d}.txt")
+            with open(saida_txt, "w", encoding="utf-8") as f:
+                f.write(texto)
+            print(f"📝 OCR salvo em {saida_txt}")
+
+    print("🎉 Todas as páginas montadas!")
 
 if __name__ == "__main__":
-    capture_all_pages()
\ No newline at end of file
+    capture_all_pages()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Daemon de ingestão: observa dados/entrada/ e processa cada arquivo novo
+
+Substitui batch_pipeline.sh/processar_lote.sh. As etapas rodam neste
+processo, com um pool limitado de workers (src/pipeline/ingestao.py):
+
+    .png/.jpg/.tif   análise da planta (analisador → formato → área, ver pipeline_completo.py)
+    .txt             split do memorial, índice de seções e memorial unificado
+    .pdf             texto (pdftotext ou OCR página a página) e o mesmo do .txt
+
+As saídas de cada arquivo ficam em dados/saidas_ingestao/<nome>_<ext>/. O
+estado dos jobs fica em dados/ingestao.sqlite (um reinício retoma a fila) e
+cada transição é emitida como uma linha JSON, na saída padrão e em
+dados/logs/ingestao.jsonl.
+
+Uso:
+    python scripts/daemon_ingestao.py
+    python scripts/daemon_ingestao.py --workers 4 --entrada ~/Downloads
+    python scripts/daemon_ingestao.py --uma-vez          # processa o que houver e sai
+    python scripts/daemon_ingestao.py --status
+    python scripts/daemon_ingestao.py --refazer-falhas --uma-vez
+"""
+
+import argparse
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.merge_saidas_split import merge_files  # noqa: E402
+from src.memorial.divisor import dividir_memorial  # noqa: E402
+from src.memorial.indice import SUFIXO_SIDECAR, salvar_indice  # noqa: E402
+from src.pipeline.ingestao import DaemonIngestao, FilaJobs  # noqa: E402
+
+RAIZ = Path(__file__).resolve().parent.parent
+ENTRADA_PADRAO = RAIZ / "dados" / "entrada"
+SAIDA_PADRAO = RAIZ / "dados" / "saidas_ingestao"
+LOG_PADRAO = RAIZ / "dados" / "logs" / "ingestao.jsonl"
+
+EXTENSOES_IMAGEM = (".png", ".jpg", ".jpeg", ".tif", ".tiff")
+
+
+def extrair_texto_pdf(caminho_pdf: Path, destino: Path) -> Path:
+    """Texto do PDF com pdftotext (como o run_pipeline.sh); sem ele, OCR página a página"""
+    if shutil.which("pdftotext"):
+        subprocess.run(["pdftotext", str(caminho_pdf), str(destino)], check=True)
+        return destino
+    from src.ocr.pdf import ocr_pdf_paginas
+    with open(destino, "w", encoding="utf-8") as f:
+        for pagina, _total, texto in ocr_pdf_paginas(str(caminho_pdf)):
+            f.write(("\f" if pagina > 1 else "") + texto)
+    return destino
+
+
+class Processadores:
+    """Etapas do pipeline por tipo de arquivo; o analisador é carregado uma vez por daemon"""
+
+    def __init__(self, saida=SAIDA_PADRAO):
+        self.saida = Path(saida)
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    def mapa(self) -> Dict[str, Callable[[Path], Dict]]:
+        processadores = {".txt": self.memorial, ".pdf": self.pdf}
+        processadores.update({ext: self.planta for ext in EXTENSOES_IMAGEM})
+        return processadores
+
+    def _destino(self, caminho: Path) -> Path:
+        destino = self.saida / f"{caminho.stem}_{caminho.suffix[1:].lower()}"
+        destino.mkdir(parents=True, exist_ok=True)
+        return destino
+
+    def planta(self, caminho: Path) -> Dict:
+        from scripts.pipeline_completo import assinatura_imagem, montar_pipeline
+        with self._lock:
+            if self._pipeline is None:
+                self._pipeline = montar_pipeline()
+        destino = self._destino(caminho)
+        resultado = self._pipeline.executar({"imagem": str(caminho), "saida": destino}, dir_checkpoint=destino,
+                                            assinatura=assinatura_imagem(caminho))
+        geometria = resultado.valores["area"]["geometria"]
+        return {
+            "saida": str(destino),
+            "ambientes": len(geometria["medidas"]),
+            "area_total": round(geometria["area_total"], 2),
+            "etapas": {nome: round(segundos, 3) for nome, segundos in resultado.tempos.items()},
+        }
+
+    def _memorial(self, texto: Path, destino: Path) -> Dict:
+        secoes = list(dividir_memorial(texto, destino / "secoes"))
+        salvar_indice(secoes, texto, destino / (texto.name + SUFIXO_SIDECAR))
+        merge_files(str(destino / "secoes"), str(destino / "memorial_unificado.txt"))
+        return {"saida": str(destino), "secoes": len(secoes)}
+
+    def memorial(self, caminho: Path) -> Dict:
+        return self._memorial(caminho, self._destino(caminho))
+
+    def pdf(self, caminho: Path) -> Dict:
+        destino = self._destino(caminho)
+        texto = extrair_texto_pdf(caminho, destino / f"{caminho.stem}.txt")
+        return self._memorial(texto, destino)
+
+
+def _interromper(*_):
+    raise KeyboardInterrupt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Observa uma pasta e processa plantas e memoriais novos")
+    parser.add_argument("--entrada", default=str(ENTRADA_PADRAO), help="Pasta observada")
+    parser.add_argument("--saida", default=str(SAIDA_PADRAO), help="Pasta das saídas por arquivo")
+    parser.add_argument("--db", help="SQLite dos jobs (padrão: dados/ingestao.sqlite)")
+    parser.add_argument("--log", default=str(LOG_PADRAO), help="Eventos em JSON Lines ('' para desativar)")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--estabilidade", type=float, default=1.0,
+                        help="Segundos sem modificação antes de processar um arquivo")
+    parser.add_argument("--uma-vez", action="store_true", help="Processa o que está na pasta e sai")
+    parser.add_argument("--refazer-falhas", action="store_true", help="Devolve os jobs que falharam à fila")
+    parser.add_argument("--status", action="store_true", help="Mostra a fila e sai")
+    args = parser.parse_args()
+
+    fila = FilaJobs(args.db)
+    if args.status:
+        for estado, n in fila.contagem().items():
+            print(f"{estado:>8}: {n}")
+        for job in fila.jobs("failed"):
+            print(f"❌ {job['caminho']}: {job['erro']}")
+        return
+
+    log = None
+    if args.log:
+        Path(args.log).parent.mkdir(parents=True, exist_ok=True)
+        log = open(args.log, "a", encoding="utf-8")
+
+    def _evento(evento):
+        linha = evento.json()
+        print(linha, flush=True)
+        if log is not None:
+            log.write(linha + "\n")
+            log.flush()
+
+    fila.assinar(_evento)
+    if args.refazer_falhas:
+        fila.refazer_falhas()
+
+    daemon = DaemonIngestao(args.entrada, Processadores(args.saida).mapa(), fila,
+                            workers=args.workers, estabilidade=args.estabilidade)
+    signal.signal(signal.SIGTERM, _interromper)
+    daemon.iniciar()
+    try:
+        if args.uma_vez:
+            while not daemon.aguardar_ocioso(timeout=60):
+                pass
+        else:
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.parar()
+        contagem = fila.contagem()
+        print(f"📊 done: {contagem['done']}, failed: {contagem['failed']}, "
+              f"queued: {contagem['queued']}, running: {contagem['running']}", file=sys.stderr)
+        fila.fechar()
+        if log is not None:
+            log.close()
+
+
+if __name__ == "__main__":
+    main()
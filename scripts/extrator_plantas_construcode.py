@@ -2,6 +2,11 @@
 """
 extrator_plantas_construcode.py
 Extrai todos os links de plantas do HTML do ConstruCode
+
+Uso:
+    python scripts/extrator_plantas_construcode.py arquivo.html
+    python scripts/extrator_plantas_construcode.py arquivo.html --sync --destino plantas_baixadas
+    python scripts/extrator_plantas_construcode.py --benchmark 10000
 """
 
 import re
@@ -9,7 +14,29 @@ import json
 from bs4 import BeautifulSoup
 from urllib.parse import unquote
 from datetime import datetime
+from pathlib import Path
 import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.classificador_tipos import ClassificadorTipos
+from src.download.baixador import carregar_config, criar_sessao
+from src.download.cards import gerar_pagina_sintetica, iterar_cards
+from src.download.catalogo import CatalogoPlantas, sincronizar
+
+TIPOS_PLANTA = {
+    'ARQUITETÔNICA': ['ARQUITET', 'PLANTA BAIXA', 'FACHADA', 'CORTE', 'COBERTURA'],
+    'ESTRUTURAL': ['ESTRUTUR', 'ESTC', 'ARMAÇÃO', 'PILAR', 'VIGA', 'LAJE', 'FUNDAÇÃO'],
+    'ELÉTRICA': ['ELÉTRIC', 'ELET', 'FIAÇÃO', 'QUADRO', 'ILUMINAÇÃO'],
+    'HIDRÁULICA': ['HIDRÁULIC', 'HIDR', 'ÁGUA', 'ESGOTO', 'PLUVIAL'],
+    'INCÊNDIO': ['INCÊNDIO', 'SPRINKLER', 'ALARME', 'HIDRANTE'],
+    'AR_CONDICIONADO': ['AR CONDICIONADO', 'CLIMATIZAÇÃO', 'HVAC'],
+    'GÁS': ['GÁS', 'GLP', 'TUBULAÇÃO DE GÁS'],
+    'DETALHAMENTO': ['DETALHE', 'DETALHAMENTO', 'AMPLIAÇÃO']
+}
+
+# Todas as palavras-chave compiladas uma vez; o tipo com mais palavras encontradas vence
+CLASSIFICADOR = ClassificadorTipos(TIPOS_PLANTA)
 
 class ExtratorPlantasConstruCode:
     def __init__(self, arquivo_html):
@@ -17,9 +44,31 @@ class ExtratorPlantasConstruCode:
         self.base_url = "https://www.construcode.com.br"
         self.plantas = []
         
-    def extrair_plantas(self):
-        """Extrai todas as plantas do HTML"""
+    def iterar_plantas(self):
+        """Gera as plantas à medida que os cards são lidos (lxml, memória constante)"""
+        for idx, campos in iterar_cards(self.arquivo_html):
+            yield {
+                'id': idx,
+                'planta_id': campos['planta_id'],
+                'area_id': campos['area_id'],
+                'titulo': campos['titulo'],
+                'detalhes': campos['detalhes'],
+                'revisao': campos['revisao'],
+                'tipo': self.classificar_tipo(campos['titulo'], campos['detalhes']),
+                'url_completa': f"{self.base_url}{campos['url_relativa']}",
+                'url_relativa': campos['url_relativa'],
+                'nome_arquivo': self.gerar_nome_arquivo(campos['titulo'], campos['revisao'], idx)
+            }
+
+    def extrair_plantas(self, streaming=True):
+        """Extrai todas as plantas do HTML (streaming=False usa o BeautifulSoup original)"""
         print(f"🔍 Analisando arquivo: {self.arquivo_html}")
+
+        if streaming:
+            for planta_info in self.iterar_plantas():
+                self.plantas.append(planta_info)
+                print(f"✅ [{planta_info['id']:03d}] {planta_info['tipo']}: {planta_info['titulo'][:60]}...")
+            return
         
         with open(self.arquivo_html, 'r', encoding='utf-8') as f:
             soup = BeautifulSoup(f.read(), 'html.parser')
@@ -77,24 +126,7 @@ class ExtratorPlantasConstruCode:
     
     def classificar_tipo(self, titulo, detalhes):
         """Classifica o tipo de planta baseado no título e detalhes"""
-        texto = f"{titulo} {detalhes}".upper()
-        
-        tipos = {
-            'ARQUITETÔNICA': ['ARQUITET', 'PLANTA BAIXA', 'FACHADA', 'CORTE', 'COBERTURA'],
-            'ESTRUTURAL': ['ESTRUTUR', 'ESTC', 'ARMAÇÃO', 'PILAR', 'VIGA', 'LAJE', 'FUNDAÇÃO'],
-            'ELÉTRICA': ['ELÉTRIC', 'ELET', 'FIAÇÃO', 'QUADRO', 'ILUMINAÇÃO'],
-            'HIDRÁULICA': ['HIDRÁULIC', 'HIDR', 'ÁGUA', 'ESGOTO', 'PLUVIAL'],
-            'INCÊNDIO': ['INCÊNDIO', 'SPRINKLER', 'ALARME', 'HIDRANTE'],
-            'AR_CONDICIONADO': ['AR CONDICIONADO', 'CLIMATIZAÇÃO', 'HVAC'],
-            'GÁS': ['GÁS', 'GLP', 'TUBULAÇÃO DE GÁS'],
-            'DETALHAMENTO': ['DETALHE', 'DETALHAMENTO', 'AMPLIAÇÃO']
-        }
-        
-        for tipo, palavras in tipos.items():
-            if any(palavra in texto for palavra in palavras):
-                return tipo
-        
-        return 'OUTROS'
+        return CLASSIFICADOR.melhor(f"{titulo} {detalhes}") or 'OUTROS'
     
     def gerar_nome_arquivo(self, titulo, revisao, idx):
         """Gera nome padronizado para o arquivo"""
@@ -180,14 +212,82 @@ sleep $DELAY
         for tipo, count in sorted(tipos_count.items()):
             print(f"  - {tipo}: {count} plantas")
 
+    def sincronizar(self, destino="plantas_baixadas", catalogo=None, cookie=None, verificar=False):
+        """Baixa só as plantas novas ou revisadas desde a última sincronização"""
+        catalogo = catalogo or CatalogoPlantas()
+        config = carregar_config()
+        sessao = criar_sessao(config)
+        if cookie:
+            sessao.headers["Cookie"] = cookie
+        resumo = sincronizar(self.plantas, destino, catalogo, config, verificar=verificar, sessao=sessao,
+                             manifesto=os.path.join(destino, "manifesto_sync.jsonl"))
+        sessao.close()
+
+        print("\n🔄 SINCRONIZAÇÃO INCREMENTAL:")
+        print(f"  - Novas: {resumo['novas']}")
+        print(f"  - Revisadas: {resumo['revisadas']}")
+        print(f"  - Inalteradas (puladas): {resumo['inalteradas']}")
+        print(f"  - Baixadas: {resumo['baixadas']} ({resumo['bytes'] / 1024 / 1024:.1f} MB)")
+        print(f"  - Falhas: {resumo['falhas']}")
+        return resumo
+
+def benchmark(quantidade=10000, arquivo_html=None):
+    """Compara o extrator BeautifulSoup com o streaming lxml numa listagem sintética"""
+    import contextlib
+    import io
+    import tempfile
+    import time
+    import tracemalloc
+
+    if arquivo_html is None:
+        arquivo_html = os.path.join(tempfile.mkdtemp(), f"cards_{quantidade}.html")
+        gerar_pagina_sintetica(arquivo_html, quantidade)
+    tamanho_mb = os.path.getsize(arquivo_html) / 1024 / 1024
+    print(f"📄 {arquivo_html} ({tamanho_mb:.1f} MB)")
+
+    resultados = {}
+    for nome, streaming in (("BeautifulSoup", False), ("lxml streaming", True)):
+        extrator = ExtratorPlantasConstruCode(arquivo_html)
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            extrator.extrair_plantas(streaming=streaming)
+        segundos = time.perf_counter() - inicio
+        pico_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        resultados[nome] = extrator.plantas
+        print(f"⏱️  {nome:<15} {len(extrator.plantas):>6} plantas  {segundos:7.2f} s  pico {pico_mb:7.1f} MB")
+
+    iguais = resultados["BeautifulSoup"] == resultados["lxml streaming"]
+    print(f"{'✅' if iguais else '❌'} Registros idênticos: {iguais}")
+    return iguais
+
 # Executar extração
 if __name__ == "__main__":
-    import sys
-    
-    if len(sys.argv) != 2:
-        print("Uso: python extrator_plantas_construcode.py arquivo.html")
-        sys.exit(1)
-    
-    extrator = ExtratorPlantasConstruCode(sys.argv[1])
-    extrator.extrair_plantas()
-    extrator.salvar_resultados()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extrai (e sincroniza) as plantas de um HTML do ConstruCode")
+    parser.add_argument("arquivo_html", nargs="?")
+    parser.add_argument("--sync", action="store_true", help="Baixa só plantas novas/revisadas (catálogo local)")
+    parser.add_argument("--destino", default="plantas_baixadas")
+    parser.add_argument("--catalogo", help="SQLite do catálogo (padrão: dados/catalogo_plantas.sqlite)")
+    parser.add_argument("--cookie", default=os.environ.get("CONSTRUCODE_COOKIE"), help="Cookie de sessão")
+    parser.add_argument("--verificar", action="store_true",
+                        help="GET condicional (ETag/Last-Modified) também para as inalteradas")
+    parser.add_argument("--bs4", action="store_true", help="Usa o parser BeautifulSoup original")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="Compara BeautifulSoup x lxml numa página sintética com N cards")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.arquivo_html)
+        sys.exit(0)
+    if not args.arquivo_html:
+        parser.error("informe o arquivo HTML")
+
+    extrator = ExtratorPlantasConstruCode(args.arquivo_html)
+    extrator.extrair_plantas(streaming=not args.bs4)
+    if args.sync:
+        extrator.sincronizar(args.destino, CatalogoPlantas(args.catalogo), args.cookie, args.verificar)
+    else:
+        extrator.salvar_resultados()
@@ -8,25 +8,26 @@ DIR_SAIDA = os.path.join(os.path.dirname(__file__), '../dados/saidas_split')
 # Defina o nome do arquivo de saída final
 ARQUIVO_MERGE = os.path.join(os.path.dirname(__file__), '../dados/memorial_unificado.txt')
 
-def merge_files():
+def merge_files(dir_saida=DIR_SAIDA, arquivo_merge=ARQUIVO_MERGE):
     arquivos = sorted(
-        [arq for arq in os.listdir(DIR_SAIDA) if arq.endswith('.txt')],
+        [arq for arq in os.listdir(dir_saida) if arq.endswith('.txt')],
         key=lambda x: x  # Ordenação alfanumérica padrão (funciona se seus splits começam por número)
     )
     if not arquivos:
         print('[ERRO] Nenhum arquivo de saída encontrado para juntar.')
-        return
+        return 0
 
-    with open(ARQUIVO_MERGE, 'w', encoding='utf-8') as fout:
+    with open(arquivo_merge, 'w', encoding='utf-8') as fout:
         for arq in arquivos:
-            caminho = os.path.join(DIR_SAIDA, arq)
+            caminho = os.path.join(dir_saida, arq)
             fout.write(f'===== {arq} =====\n\n')  # Cabeçalho para separação visual
             with open(caminho, 'r', encoding='utf-8') as fin:
                 fout.write(fin.read())
                 fout.write('\n\n')
 
-    print(f'[OK] Memorial unificado salvo em: {ARQUIVO_MERGE}')
+    print(f'[OK] Memorial unificado salvo em: {arquivo_merge}')
     print(f'Total de seções incluídas: {len(arquivos)}')
+    return len(arquivos)
 
 if __name__ == "__main__":
     merge_files()
\ No newline at end of file
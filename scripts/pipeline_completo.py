@@ -1,51 +1,132 @@
 #!/usr/bin/env python3
-"""Pipeline completo de análise de plantas"""
+"""
+Pipeline completo de análise de plantas
 
-import subprocess
-import json
+As etapas analisador → corrige_formato_json → calcula_area_total rodam neste
+processo (src/pipeline/dag.py): cv2/numpy/pytesseract são importados uma
+única vez e os resultados passam de uma etapa para a outra em memória. Com
+--checkpoint, cada etapa também grava o seu JSON (resultado_analisador.json,
+resultado_analisador_com_area.json, ...), a etapa "parquet" grava os
+ambientes em resultado_analisador.parquet (como o analisador avulso) e
+--retomar pula as etapas já gravadas para a mesma imagem.
+
+Uso:
+    python scripts/pipeline_completo.py plantas_teste/planta_construcode_pagina1.png
+    python scripts/pipeline_completo.py plantas_teste/*.png --checkpoint plantas_teste
+    python scripts/pipeline_completo.py planta.png --checkpoint plantas_teste --retomar
+"""
+
+import argparse
+import os
 import sys
+import time
 from pathlib import Path
 
-def executar_pipeline(arquivo_planta):
-    """Executa o pipeline completo de análise"""
-    
-    print(f"🚀 Iniciando análise de: {arquivo_planta}")
-    print("="*50)
-    
-    # 1. Executar analisador
-    print("\n📸 Etapa 1: Analisando planta...")
-    subprocess.run([sys.executable, "scripts/analisador_plantas.py", arquivo_planta])
-    
-    # 2. Corrigir formato
-    print("\n�� Etapa 2: Ajustando formato...")
-    subprocess.run([sys.executable, "scripts/corrige_formato_json.py"])
-    
-    # 3. Calcular áreas
-    print("\n📐 Etapa 3: Calculando áreas...")
-    subprocess.run([sys.executable, "scripts/calcula_area_total.py"])
-    
-    # 4. Exibir resumo
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.analisador_plantas_wsf import AnalisadorPlantasWSF, gravar_parquet  # noqa: E402
+from scripts.calcula_area_total import adicionar_area_total  # noqa: E402
+from scripts.corrige_formato_json import corrigir_formato  # noqa: E402
+from src.colunar.areas import calcular_areas, dataframe_de_json  # noqa: E402
+from src.pipeline.dag import Etapa, Pipeline  # noqa: E402
+
+IMAGEM_PADRAO = "plantas_teste/planta_construcode_pagina1.png"
+ARQUIVO_PARQUET = "resultado_analisador.parquet"
+
+TITULOS = {
+    "analise": "📸 Etapa 1: Analisando planta",
+    "formato": "🔧 Etapa 2: Ajustando formato",
+    "area": "📐 Etapa 3: Calculando áreas",
+    "parquet": "🧱 Etapa 4: Gravando ambientes em Parquet",
+}
+
+
+def etapa_parquet(analise, saida):
+    """Grava o Parquet dos ambientes em ``saida`` (sem diretório de saída, não grava nada)"""
+    if not saida:
+        return None
+    return gravar_parquet(analise, Path(saida) / ARQUIVO_PARQUET)
+
+
+def montar_pipeline(analisador=None) -> Pipeline:
+    """analise → formato → area, cada uma com o seu arquivo de checkpoint, e analise → parquet
+
+    A entrada ``saida`` é o diretório do Parquet (normalmente o de checkpoints).
+    """
+    analisador = analisador or AnalisadorPlantasWSF()
+    return Pipeline([
+        Etapa("analise", analisador.analisar, depende=("imagem",),
+              checkpoint="resultado_analisador_original.json"),
+        Etapa("formato", corrigir_formato, depende=("analise",), checkpoint="resultado_analisador.json"),
+        Etapa("area", adicionar_area_total, depende=("formato",),
+              checkpoint="resultado_analisador_com_area.json"),
+        Etapa("parquet", etapa_parquet, depende=("analise", "saida")),
+    ])
+
+
+def assinatura_imagem(caminho) -> str:
+    """Caminho, tamanho e data da imagem: checkpoints de outra versão não são retomados"""
+    info = os.stat(caminho)
+    return f"{Path(caminho).resolve()}:{info.st_size}:{info.st_mtime_ns}"
+
+
+def exibir_resumo(dados):
     print("\n📊 RESUMO FINAL:")
     print("-"*50)
-    
-    with open('plantas_teste/resultado_analisador_com_area.json', 'r') as f:
-        dados = json.load(f)
-        
+
     print(f"Projeto: {dados['projeto']['nome']}")
     print(f"Data: {dados['projeto']['data']}")
     print(f"Responsável: {dados['projeto']['responsavel']}")
     print(f"\nÁrea Total: {dados['geometria']['area_total']:.2f} m²")
     print("\nDetalhamento por ambiente:")
-    
-    for medida in dados['geometria']['medidas']:
-        area = medida['largura'] * medida['comprimento']
-        print(f"  • {medida['ambiente']:.<20} {area:>6.2f} m²")
-    
+
+    df = calcular_areas(dataframe_de_json(dados['geometria']['medidas']))
+    for ambiente, area, valido in zip(df['ambiente'].fillna("(sem nome)"), df['area'], df['valido']):
+        print(f"  • {ambiente:.<20} {area:>6.2f} m²{'' if valido else '  (fora do total)'}")
+
+
+def executar_pipeline(arquivo_planta, pipeline=None, dir_checkpoint=None, retomar=False):
+    """Executa o pipeline completo de análise e devolve o JSON final (com area_total)"""
+    pipeline = pipeline or montar_pipeline()
+
+    print(f"🚀 Iniciando análise de: {arquivo_planta}")
+    print("="*50)
+
+    def _concluida(nome, valor, segundos):
+        print(f"\n{TITULOS.get(nome, nome)} — {segundos:.2f} s")
+
+    resultado = pipeline.executar({"imagem": str(arquivo_planta), "saida": dir_checkpoint},
+                                  dir_checkpoint=dir_checkpoint,
+                                  retomar=retomar, assinatura=assinatura_imagem(arquivo_planta),
+                                  ao_concluir=_concluida)
+    for nome in resultado.retomadas:
+        print(f"\n♻️  {TITULOS.get(nome, nome)}: retomada de {Path(dir_checkpoint) / pipeline.etapas[nome].checkpoint}")
+
+    dados = resultado.valores["area"]
+    exibir_resumo(dados)
+
     print("\n✅ Análise concluída com sucesso!")
+    return dados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline completo de análise de plantas (em processo)")
+    parser.add_argument("imagens", nargs="*", default=[IMAGEM_PADRAO])
+    parser.add_argument("--checkpoint", help="Diretório onde gravar o JSON de cada etapa "
+                                             "(uma subpasta por imagem quando há mais de uma)")
+    parser.add_argument("--retomar", action="store_true", help="Reaproveita etapas já gravadas em --checkpoint")
+    args = parser.parse_args()
+
+    pipeline = montar_pipeline()
+    inicio = time.perf_counter()
+    for imagem in args.imagens:
+        dir_checkpoint = args.checkpoint
+        if dir_checkpoint and len(args.imagens) > 1:
+            dir_checkpoint = str(Path(dir_checkpoint) / Path(imagem).stem)
+        executar_pipeline(imagem, pipeline, dir_checkpoint, args.retomar)
+    if len(args.imagens) > 1:
+        print(f"\n⏱️  {len(args.imagens)} imagens em {time.perf_counter() - inicio:.1f} s")
+
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        executar_pipeline(sys.argv[1])
-    else:
-        # Usar arquivo padrão se não especificado
-        executar_pipeline("plantas_teste/planta_construcode_pagina1.png")
+    main()
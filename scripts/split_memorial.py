@@ -1,47 +1,49 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+"""
+Divide o memorial em seções "N. TÍTULO" (dados/saidas_split/)
 
+Cada seção é gravada assim que a próxima começa (streaming linha a linha,
+ver src/memorial/divisor.py) e ao final é gerado o índice sidecar
+``<memorial>.indice.json``, com o intervalo de bytes e o checksum de cada
+seção no memorial (lido por src/memorial/indice.py).
+
+Uso:
+    python scripts/split_memorial.py
+    python scripts/split_memorial.py dados/memorial_unificado.txt --saida dados/saidas_split
+"""
+
+import argparse
 import os
-import re
-from unidecode import unidecode
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memorial.divisor import dividir_memorial, gerar_tag  # noqa: E402,F401
+from src.memorial.indice import caminho_sidecar, salvar_indice  # noqa: E402
 
 # Caminho atualizado do arquivo de entrada (ajuste caso use 'dados' ou 'data')
 ARQUIVO_ENTRADA = os.path.join(os.path.dirname(__file__), '../dados/memorial_estrutural.txt')
+DIR_SAIDA = os.path.join(os.path.dirname(__file__), '../dados/saidas_split')
 
-def split_sections(text):
-    padrao = re.compile(r'\n?(\d{1,3}\.\s*[A-Z][^\n]+)\n', re.UNICODE)
-    blocos = padrao.split(text)
-    resultado = {}
-    if blocos[0].strip():
-        resultado['INTRO'] = blocos[0].strip()
-    for i in range(1, len(blocos), 2):
-        titulo = blocos[i].strip()
-        corpo = blocos[i + 1].strip() if (i + 1) < len(blocos) else ""
-        resultado[titulo] = corpo
-    return resultado
-
-def gerar_tag(titulo, idx):
-    # Limita para NO MÁXIMO 8 palavras e remove caracteres perigosos
-    palavras = unidecode(titulo.lower()).replace('.', '').replace('-', ' ').split()
-    tag_curta = "_".join(palavras[:8])
-    return f"{idx:02d}_{tag_curta}"
 
 def main():
-    with open(ARQUIVO_ENTRADA, 'r', encoding='utf-8') as f:
-        texto = f.read()
+    parser = argparse.ArgumentParser(description="Divide o memorial em seções N. TÍTULO")
+    parser.add_argument("entrada", nargs="?", default=ARQUIVO_ENTRADA, help="Memorial em texto (UTF-8)")
+    parser.add_argument("--saida", default=DIR_SAIDA, help="Diretório das seções")
+    parser.add_argument("--indice", help="Arquivo do índice (padrão: <entrada>.indice.json)")
+    args = parser.parse_args()
 
-    blocos = split_sections(texto)
+    secoes = []
+    for secao in dividir_memorial(args.entrada, args.saida):
+        secoes.append(secao)
+        print(f'[OK] Seção salva: {os.path.join(args.saida, secao.arquivo)}')
 
-    DIR_SAIDA = os.path.join(os.path.dirname(__file__), '../dados/saidas_split')
-    os.makedirs(DIR_SAIDA, exist_ok=True)
-    for idx, (tag, conteudo) in enumerate(blocos.items(), start=1):
-        tag_arquivo = gerar_tag(tag, idx)
-        arq_saida = os.path.join(DIR_SAIDA, f'{tag_arquivo}.txt')
-        with open(arq_saida, 'w', encoding='utf-8') as fout:
-            fout.write(conteudo)
-        print(f'[OK] Seção salva: {arq_saida}')
+    indice = salvar_indice(secoes, args.entrada, args.indice or caminho_sidecar(args.entrada))
+    print(f'\nTotal de seções extraídas: {len(secoes)} (veja em {args.saida})')
+    print(f'Índice de offsets: {indice}')
 
-    print(f'\nTotal de seções extraídas: {len(blocos)} (veja em dados/saidas_split/)')
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,312 @@
+"""
+Índice full-text (SQLite FTS5) sobre os textos de OCR e os memoriais
+
+Responde perguntas como "quais folhas citam FCK 30" ou "todo BANHEIRO com
+área" sem rodar o ``ParserInteligentePlantas`` de novo em cada arquivo.
+São indexados, linha a linha:
+
+    dados/pipeline_output/*.txt    (saídas de OCR)
+    dados/saidas_split/*.txt       (seções do memorial)
+    entradas de texto do cache de OCR (uma página por entrada)
+
+Cada linha guarda a página e o offset (em caracteres) no documento, então
+uma ocorrência aponta direto para o trecho. A atualização é incremental:
+arquivos com mesmo tamanho e data e entradas do cache já vistas são
+pulados, e os que sumiram saem do índice. O tokenizador ``unicode61`` com
+``remove_diacritics`` ignora acentos e caixa (ÁREA = AREA = área).
+
+Páginas nos arquivos de texto: um form feed (``\\f``, como no pdftotext) avança
+a página, e linhas "--- Página N ---" a definem.
+
+Uso:
+    from src.busca.indice_textual import IndiceTextual
+    indice = IndiceTextual()
+    indice.atualizar()
+    for o in indice.buscar("FCK 30"):
+        print(o.origem, o.pagina, o.offset, o.linha)
+
+CLI:
+    python -m src.busca.indice_textual atualizar
+    python -m src.busca.indice_textual buscar "FCK 30" --limite 20
+    python -m src.busca.indice_textual buscar "BANHEIRO M2" --por-documento
+"""
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.classificador_tipos import dobrar
+from src.ocr.cache import CacheOCR, obter_cache
+
+RAIZ = Path(__file__).resolve().parents[2]
+CAMINHO_PADRAO = RAIZ / "dados" / "indice_textual.sqlite"
+PASTAS_PADRAO = [
+    (RAIZ / "dados" / "pipeline_output", "*.txt"),
+    (RAIZ / "dados" / "saidas_split", "*.txt"),
+]
+PREFIXO_CACHE = "ocr:"
+
+_MARCA_PAGINA = re.compile(r'\s*-{2,}\s*P[ÁA]GINA\s+(\d+)\s*-{2,}\s*', re.IGNORECASE)
+_PAGINA_ORIGEM = re.compile(r'#pagina=(\d+)$')
+_OPERADORES = {"AND", "OR", "NOT"}
+
+
+@dataclass
+class Ocorrencia:
+    origem: str  # caminho do arquivo, ou "pdf#pagina=N" para páginas do cache de OCR
+    pagina: int
+    offset: int  # em caracteres, no documento inteiro
+    linha: str
+    relevancia: float
+
+
+def linhas_com_pagina(texto: str, pagina: int = 1) -> Iterator[Tuple[int, int, str]]:
+    """(página, offset da linha, linha) das linhas não vazias do texto"""
+    offset = 0
+    for linha in texto.split("\n"):
+        marca = _MARCA_PAGINA.fullmatch(linha)
+        if marca:
+            pagina = int(marca.group(1))
+        else:
+            inicio = offset
+            for i, parte in enumerate(linha.split("\f")):
+                if i:
+                    pagina += 1
+                if parte.strip():
+                    yield pagina, inicio, parte.rstrip("\r")
+                inicio += len(parte) + 1
+        offset += len(linha) + 1
+
+
+def consulta_fts(consulta: str) -> str:
+    """
+    Converte texto livre em consulta FTS5: cada palavra vira um termo entre
+    aspas (todas obrigatórias). Aspas, AND/OR/NOT e prefixos ``termo*`` do
+    usuário são mantidos; uma consulta com aspas é repassada como está e, se
+    a sintaxe FTS5 estiver errada, a busca levanta ValueError.
+    """
+    if '"' in consulta:
+        return consulta
+    termos = []
+    for palavra in consulta.split():
+        if palavra in _OPERADORES:
+            termos.append(palavra)
+        elif palavra.endswith("*") and len(palavra) > 1:
+            termos.append('"' + palavra[:-1] + '"*')
+        else:
+            termos.append('"' + palavra + '"')
+    return " ".join(termos)
+
+
+def _posicao(linha: str, consulta: str) -> int:
+    """Posição do primeiro termo da consulta na linha (ignorando acentos e caixa)"""
+    dobrada = dobrar(linha)
+    posicoes = [dobrada.find(dobrar(t)) for t in re.findall(r'\w+', consulta) if t not in _OPERADORES]
+    posicoes = [p for p in posicoes if p >= 0]
+    return min(posicoes) if posicoes else 0
+
+
+class IndiceTextual:
+    """Índice FTS5 incremental de arquivos de texto e do cache de OCR"""
+
+    def __init__(self, caminho=None):
+        self.caminho = Path(caminho or CAMINHO_PADRAO)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documentos (
+                id INTEGER PRIMARY KEY,
+                origem TEXT UNIQUE,
+                rotulo TEXT,
+                assinatura TEXT,
+                primeira_linha INTEGER,  -- rowids [primeira_linha, primeira_linha + linhas) em ``trechos``
+                linhas INTEGER,
+                indexado_em REAL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS trechos USING fts5(
+                texto,
+                documento UNINDEXED,
+                pagina UNINDEXED,
+                posicao UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+        """)
+        self._conn.commit()
+
+    def _assinatura(self, origem: str) -> Optional[str]:
+        linha = self._conn.execute("SELECT assinatura FROM documentos WHERE origem = ?", (origem,)).fetchone()
+        return linha[0] if linha else None
+
+    def _remover(self, origem: str):
+        linha = self._conn.execute(
+            "SELECT id, primeira_linha, linhas FROM documentos WHERE origem = ?", (origem,)).fetchone()
+        if linha is not None:
+            documento, primeira, total = linha
+            self._conn.execute("DELETE FROM trechos WHERE rowid >= ? AND rowid < ?", (primeira, primeira + total))
+            self._conn.execute("DELETE FROM documentos WHERE id = ?", (documento,))
+
+    def indexar_texto(self, origem: str, texto: str, assinatura: str = "", pagina: int = 1,
+                      rotulo: Optional[str] = None) -> int:
+        """(Re)indexa um documento; devolve o número de linhas indexadas"""
+        with self._lock:
+            self._remover(origem)
+            primeira = self._conn.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM trechos").fetchone()[0]
+            documento = self._conn.execute(
+                "INSERT INTO documentos (origem, rotulo, assinatura, primeira_linha, linhas, indexado_em) "
+                "VALUES (?, ?, ?, ?, 0, ?)", (origem, rotulo or origem, assinatura, primeira, time.time())).lastrowid
+            # rowids contíguos por documento: a remoção apaga um intervalo, sem varrer o índice
+            linhas = [(primeira + i, linha, documento, pag, posicao)
+                      for i, (pag, posicao, linha) in enumerate(linhas_com_pagina(texto, pagina))]
+            self._conn.executemany(
+                "INSERT INTO trechos (rowid, texto, documento, pagina, posicao) VALUES (?, ?, ?, ?, ?)", linhas)
+            self._conn.execute("UPDATE documentos SET linhas = ? WHERE id = ?", (len(linhas), documento))
+            self._conn.commit()
+        return len(linhas)
+
+    def indexar_arquivo(self, caminho) -> bool:
+        """Indexa o arquivo se ele mudou desde a última vez (tamanho/data)"""
+        caminho = Path(caminho)
+        estado = caminho.stat()
+        assinatura = f"{estado.st_size}:{estado.st_mtime_ns}"
+        origem = str(caminho.resolve())
+        if self._assinatura(origem) == assinatura:
+            return False
+        self.indexar_texto(origem, caminho.read_text(encoding="utf-8", errors="replace"), assinatura)
+        return True
+
+    def indexar_pastas(self, pastas: Iterable[Tuple[Path, str]]) -> Dict[str, int]:
+        """Indexa arquivos novos/alterados e remove do índice os que sumiram das pastas"""
+        resumo = {"indexados": 0, "inalterados": 0, "removidos": 0}
+        for pasta, padrao in pastas:
+            pasta = Path(pasta).resolve()
+            vistos = set()
+            for caminho in sorted(pasta.glob(padrao)) if pasta.is_dir() else []:
+                if not caminho.is_file():
+                    continue
+                vistos.add(str(caminho))
+                resumo["indexados" if self.indexar_arquivo(caminho) else "inalterados"] += 1
+            prefixo = str(pasta) + os.sep
+            with self._lock:
+                for (origem,) in self._conn.execute(
+                        "SELECT origem FROM documentos WHERE origem LIKE ?", (prefixo + "%",)).fetchall():
+                    if origem not in vistos and Path(origem).parent == pasta and Path(origem).match(padrao):
+                        self._remover(origem)
+                        resumo["removidos"] += 1
+                self._conn.commit()
+        return resumo
+
+    def indexar_cache(self, cache: CacheOCR) -> Dict[str, int]:
+        """Indexa as páginas novas do cache de OCR e remove as que foram despejadas"""
+        no_cache = {PREFIXO_CACHE + chave: chave for chave, _ in cache.chaves_texto()}
+        with self._lock:
+            indexadas = {o for (o,) in self._conn.execute(
+                "SELECT origem FROM documentos WHERE origem LIKE ?", (PREFIXO_CACHE + "%",))}
+        novas = [chave for origem, chave in no_cache.items() if origem not in indexadas]
+        for chave, origem, texto in cache.textos(novas):
+            marca = _PAGINA_ORIGEM.search(origem or "")
+            pagina = int(marca.group(1)) if marca else 1
+            self.indexar_texto(PREFIXO_CACHE + chave, texto, pagina=pagina, rotulo=origem or None)
+        with self._lock:
+            removidas = indexadas - set(no_cache)
+            for origem in removidas:
+                self._remover(origem)
+            self._conn.commit()
+        return {"indexados": len(novas), "inalterados": len(no_cache) - len(novas), "removidos": len(removidas)}
+
+    def atualizar(self, pastas: Optional[Iterable[Tuple[Path, str]]] = None,
+                  cache: Optional[CacheOCR] = None, incluir_cache: bool = True) -> Dict[str, int]:
+        resumo = self.indexar_pastas(PASTAS_PADRAO if pastas is None else pastas)
+        cache = cache or (obter_cache() if incluir_cache else None)
+        if cache is not None:
+            for chave, valor in self.indexar_cache(cache).items():
+                resumo[chave] += valor
+        return resumo
+
+    def _consultar(self, sql: str, consulta: str, *parametros) -> list:
+        """Executa um MATCH; sintaxe FTS5 inválida vira ValueError"""
+        fts = consulta_fts(consulta)
+        with self._lock:
+            try:
+                return self._conn.execute(sql, (fts,) + parametros).fetchall()
+            except sqlite3.OperationalError as e:
+                raise ValueError(f"Consulta inválida ({fts!r}): {e}") from e
+
+    def buscar(self, consulta: str, limite: int = 50) -> List[Ocorrencia]:
+        """Linhas que contêm todos os termos, das mais relevantes (BM25) para as menos"""
+        linhas = self._consultar(
+            "SELECT d.rotulo, l.pagina, l.posicao, l.texto, bm25(trechos) "
+            "FROM trechos l JOIN documentos d ON d.id = l.documento "
+            "WHERE trechos MATCH ? ORDER BY rank LIMIT ?", consulta, limite)
+        return [Ocorrencia(rotulo, pagina, posicao + _posicao(texto, consulta), texto, round(-relevancia, 3))
+                for rotulo, pagina, posicao, texto, relevancia in linhas]
+
+    def documentos(self, consulta: str) -> List[Tuple[str, int]]:
+        """(origem, ocorrências) dos documentos que citam a consulta, dos que mais citam para os que menos"""
+        linhas = self._consultar(
+            "SELECT d.rotulo, COUNT(*) AS n FROM trechos l JOIN documentos d ON d.id = l.documento "
+            "WHERE trechos MATCH ? GROUP BY d.id ORDER BY n DESC", consulta)
+        return [tuple(linha) for linha in linhas]
+
+    def estatisticas(self) -> Dict:
+        documentos, linhas = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(linhas), 0) FROM documentos").fetchone()
+        return {"arquivo": str(self.caminho), "documentos": documentos, "linhas": linhas}
+
+    def fechar(self):
+        self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice full-text dos textos de OCR e memoriais")
+    parser.add_argument("--db", help=f"Arquivo SQLite do índice (padrão: {CAMINHO_PADRAO})")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_atualizar = sub.add_parser("atualizar", help="Indexa arquivos novos/alterados e o cache de OCR")
+    p_atualizar.add_argument("--pasta", action="append", help="Pasta com .txt (padrão: pipeline_output e saidas_split)")
+    p_atualizar.add_argument("--sem-cache", action="store_true", help="Não indexa o cache de OCR")
+    p_buscar = sub.add_parser("buscar", help="Busca termos (sem acentos/caixa)")
+    p_buscar.add_argument("consulta")
+    p_buscar.add_argument("--limite", type=int, default=20)
+    p_buscar.add_argument("--por-documento", action="store_true", help="Só os documentos e o número de linhas")
+    sub.add_parser("estatisticas", help="Documentos e linhas indexados")
+    args = parser.parse_args()
+
+    indice = IndiceTextual(args.db)
+    inicio = time.perf_counter()
+    try:
+        _executar_comando(indice, args, inicio)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(2)
+    finally:
+        indice.fechar()
+
+
+def _executar_comando(indice: IndiceTextual, args: argparse.Namespace, inicio: float):
+    if args.comando == "atualizar":
+        pastas = [(Path(p), "*.txt") for p in args.pasta] if args.pasta else None
+        resumo = indice.atualizar(pastas, incluir_cache=not args.sem_cache)
+        print(f"🗂️  {resumo['indexados']} indexados, {resumo['inalterados']} inalterados, "
+              f"{resumo['removidos']} removidos ({(time.perf_counter() - inicio) * 1000:.0f} ms)")
+    elif args.comando == "buscar" and args.por_documento:
+        documentos = indice.documentos(args.consulta)
+        for origem, n in documentos:
+            print(f"{n:>6}  {origem}")
+        print(f"🔎 {len(documentos)} documentos em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    elif args.comando == "buscar":
+        ocorrencias = indice.buscar(args.consulta, args.limite)
+        for o in ocorrencias:
+            print(f"{o.origem}  p.{o.pagina}  @{o.offset}  {o.linha.strip()[:120]}")
+        print(f"🔎 {len(ocorrencias)} ocorrências em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    else:
+        for chave, valor in indice.estatisticas().items():
+            print(f"{chave:>10}: {valor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Classificador de tipo de planta por palavras-chave, em uma única passada
+
+Todas as palavras-chave (por padrão as de ``config_tipos_plantas.json``)
+são compiladas numa única expressão regular em forma de trie (prefixos
+comuns fatorados), o que funciona como um autômato: o texto é percorrido
+uma vez, recomeçando a busca logo após o início de cada ocorrência (então
+ocorrências sobrepostas também contam), e cada ocorrência é creditada a
+todos os tipos que usam aquela palavra. Acentos e maiúsculas/minúsculas são
+ignorados: o texto é convertido para latin-1 e dobrado por uma tabela de 256 bytes
+(``bytes.translate``), o que custa uma fração da própria busca.
+
+Palavras contidas em outras (ex.: "ÁGUA" dentro de "CAIXA D'ÁGUA") ou que se
+sobrepõem ("CAIXA D'ÁGUA" e "ÁGUA FRIA" em "CAIXA D'ÁGUA FRIA") também são
+contadas, como no ``palavra in texto`` antigo: em cada posição vale o trecho
+mais longo, creditado também às palavras-chave que são prefixo dele.
+
+Uso:
+    from src.classificador_tipos import ClassificadorTipos
+    classificador = ClassificadorTipos.de_config()
+    for p in classificador.classificar(texto):
+        print(p.tipo, p.distintas, p.ocorrencias)
+
+Benchmark:
+    python -m src.classificador_tipos --benchmark memorial.txt
+    python -m src.classificador_tipos --benchmark --mb 8
+"""
+import argparse
+import json
+import random
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+CONFIG_PADRAO = Path(__file__).resolve().parents[1] / "config_tipos_plantas.json"
+
+
+def normalizar(texto: str) -> str:
+    """Maiúsculas sem acentos (usado nas palavras-chave, não no texto inteiro)"""
+    decomposto = unicodedata.normalize("NFD", texto.upper())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def _tabela_dobra() -> bytes:
+    """Byte latin-1 -> byte da letra maiúscula sem acento (á -> A, ç -> C)"""
+    tabela = bytearray(range(256))
+    for codigo in range(256):
+        dobrado = normalizar(chr(codigo))
+        if len(dobrado) == 1 and ord(dobrado) < 256:
+            tabela[codigo] = ord(dobrado)
+    return bytes(tabela)
+
+
+_TABELA = _tabela_dobra()
+
+
+def dobrar(texto: str) -> bytes:
+    """Texto em maiúsculas sem acentos, como bytes latin-1 (fora do latin-1 vira '?')"""
+    return texto.encode("latin-1", "replace").translate(_TABELA)
+
+
+def _regex_trie(palavras: Iterable[str]) -> str:
+    """Alternância fatorada por prefixos; o trecho mais longo vence em cada posição"""
+    trie: Dict = {}
+    for palavra in palavras:
+        no = trie
+        for letra in palavra:
+            no = no.setdefault(letra, {})
+        no[""] = {}
+
+    def gerar(no: Dict) -> str:
+        termina = "" in no
+        ramos = [re.escape(letra) + gerar(filho)
+                 for letra, filho in sorted(no.items()) if letra != ""]
+        if not ramos:
+            return ""
+        corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+        if termina:
+            corpo = ("(?:" + corpo + ")" if len(ramos) == 1 else corpo) + "?"
+        return corpo
+
+    return gerar(trie)
+
+
+@dataclass
+class PontuacaoTipo:
+    tipo: str
+    distintas: int  # palavras-chave diferentes encontradas
+    ocorrencias: int  # total de ocorrências
+    cobertura: float  # distintas / palavras-chave do tipo
+    palavras: Dict[str, int]
+
+
+class ClassificadorTipos:
+    """Conta palavras-chave de todos os tipos numa única varredura do texto"""
+
+    def __init__(self, palavras_por_tipo: Dict[str, Iterable[str]]):
+        self.tipos = list(palavras_por_tipo)
+        self.palavras_por_tipo: Dict[str, List[str]] = {}
+        self._tipos_da_palavra: Dict[str, List[str]] = defaultdict(list)
+        for tipo, palavras in palavras_por_tipo.items():
+            normalizadas = list(dict.fromkeys(normalizar(p) for p in palavras if p.strip()))
+            self.palavras_por_tipo[tipo] = normalizadas
+            for palavra in normalizadas:
+                self._tipos_da_palavra[palavra].append(tipo)
+
+        # Em cada posição a trie casa o trecho mais longo; "ELETRIC" também é de "ELET".
+        # Palavras no meio do trecho ("AGUA" em "CAIXA D'AGUA") casam na própria posição.
+        todas = list(self._tipos_da_palavra)
+        self._prefixos = {p: [q for q in todas if p.startswith(q)] for p in todas}
+        self.regex = re.compile(_regex_trie(todas).encode("latin-1", "replace")) if todas else None
+        self._por_trecho = {p.encode("latin-1", "replace"): self._prefixos[p] for p in todas}
+
+    @classmethod
+    def de_config(cls, caminho=CONFIG_PADRAO,
+                  extras: Optional[Dict[str, Iterable[str]]] = None,
+                  tipos: Optional[Iterable[str]] = None) -> "ClassificadorTipos":
+        """Palavras-chave de config_tipos_plantas.json, mais ``extras`` por tipo
+
+        ``tipos`` limita os tipos do config (e dos extras) aos informados, para
+        que ``melhor()`` só devolva tipos que o chamador sabe tratar.
+        """
+        with open(caminho, encoding="utf-8") as f:
+            config = json.load(f)["tipos_plantas"]
+        palavras = {tipo: list(dados.get("palavras_chave", [])) for tipo, dados in config.items()}
+        for tipo, adicionais in (extras or {}).items():
+            palavras.setdefault(tipo, []).extend(adicionais)
+        if tipos is not None:
+            permitidos = list(tipos)
+            palavras = {tipo: palavras.get(tipo, []) for tipo in permitidos}
+        return cls(palavras)
+
+    def contar(self, texto: str) -> Dict[str, int]:
+        """Ocorrências por palavra-chave normalizada"""
+        contagem: Dict[str, int] = defaultdict(int)
+        if self.regex is None:
+            return contagem
+        # search() salta em C até a próxima ocorrência; recomeçar uma posição adiante
+        # (e não no fim do trecho, como findall) pega as sobreposições
+        dobrado, trechos, posicao = dobrar(texto), Counter(), 0
+        while True:
+            achado = self.regex.search(dobrado, posicao)
+            if achado is None:
+                break
+            trechos[achado.group()] += 1
+            posicao = achado.start() + 1
+        for trecho, n in trechos.items():
+            for palavra in self._por_trecho[trecho]:
+                contagem[palavra] += n
+        return contagem
+
+    def classificar(self, texto: str) -> List[PontuacaoTipo]:
+        """Tipos com pelo menos uma palavra encontrada, do mais para o menos provável"""
+        contagem = self.contar(texto)
+        por_tipo: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for palavra, n in contagem.items():
+            for tipo in self._tipos_da_palavra[palavra]:
+                por_tipo[tipo][palavra] = n
+        pontuacoes = [
+            PontuacaoTipo(tipo, len(palavras), sum(palavras.values()),
+                          round(len(palavras) / len(self.palavras_por_tipo[tipo]), 3), palavras)
+            for tipo, palavras in por_tipo.items()
+        ]
+        # Empate: vale a ordem de declaração dos tipos
+        pontuacoes.sort(key=lambda p: (-p.distintas, -p.ocorrencias, self.tipos.index(p.tipo)))
+        return pontuacoes
+
+    def melhor(self, texto: str, minimo: int = 1) -> Optional[str]:
+        """Tipo mais pontuado com ao menos ``minimo`` palavras distintas"""
+        pontuacoes = self.classificar(texto)
+        if pontuacoes and pontuacoes[0].distintas >= minimo:
+            return pontuacoes[0].tipo
+        return None
+
+
+def _texto_sintetico(mb: float, palavras: List[str]) -> str:
+    rnd = random.Random(0)
+    comuns = ("memorial descritivo dos serviços de execução conforme normas técnicas vigentes "
+              "o contratado deverá fornecer materiais de primeira qualidade e mão de obra").split()
+    partes, tamanho = [], 0
+    while tamanho < mb * 1024 * 1024:
+        palavra = rnd.choice(palavras) if rnd.random() < 0.01 else rnd.choice(comuns)
+        partes.append(palavra)
+        tamanho += len(palavra) + 1
+    return " ".join(partes)
+
+
+def _contagem_ingenua(texto: str, palavras_por_tipo: Dict[str, List[str]]) -> Dict[str, int]:
+    """Abordagem anterior: upper() e uma varredura por palavra-chave por tipo"""
+    texto_upper = texto.upper()
+    return {tipo: sum(texto_upper.count(p.upper()) for p in palavras) for tipo, palavras in palavras_por_tipo.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classifica o tipo de planta por palavras-chave")
+    parser.add_argument("arquivo", nargs="?", help="Texto (OCR ou memorial)")
+    parser.add_argument("--config", default=str(CONFIG_PADRAO))
+    parser.add_argument("--benchmark", action="store_true", help="Compara com uma varredura por palavra")
+    parser.add_argument("--mb", type=float, default=8.0, help="Tamanho do texto sintético do benchmark")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    classificador = ClassificadorTipos.de_config(args.config)
+    if args.arquivo:
+        texto = Path(args.arquivo).read_text(encoding="utf-8", errors="ignore")
+    elif args.benchmark:
+        texto = _texto_sintetico(args.mb, [p.lower() for ps in classificador.palavras_por_tipo.values() for p in ps])
+    else:
+        parser.error("informe o arquivo ou use --benchmark")
+
+    if not args.benchmark:
+        for p in classificador.classificar(texto):
+            print(f"🏷️  {p.tipo:<14} {p.distintas:>3} palavras  {p.ocorrencias:>7} ocorrências  cobertura {p.cobertura:.0%}")
+        return
+
+    with open(args.config, encoding="utf-8") as f:
+        originais = {t: d["palavras_chave"] for t, d in json.load(f)["tipos_plantas"].items()}
+    total_palavras = sum(len(v) for v in originais.values())
+    print(f"📄 Texto: {len(texto) / 1024 / 1024:.1f} MB, {total_palavras} palavras-chave em {len(originais)} tipos")
+    for nome, funcao in (("varredura por palavra", lambda: _contagem_ingenua(texto, originais)),
+                         ("passada única (trie)", lambda: classificador.classificar(texto))):
+        inicio = time.perf_counter()
+        for _ in range(args.repeticoes):
+            funcao()
+        print(f"⏱️  {nome:<22} {(time.perf_counter() - inicio) / args.repeticoes * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Ambientes e medidas em formato colunar (Arrow/Parquet)
+
+Os estágios do pipeline gravam JSON indentado (``resultado_analisador.json``,
+``resultado_analisador_com_area.json``) e o estágio seguinte recarrega o
+arquivo inteiro para percorrer dicionários aninhados. Aqui cada ambiente
+vira uma linha de uma tabela com esquema fixo:
+
+    projeto, planta_id, ambiente, largura, comprimento, area, pagina, bbox
+
+``bbox`` é a caixa (x, y, w, h) em pixels da região de OCR onde o nome do
+ambiente foi lido. Medidas que não são números viram nulos (em vez de
+derrubar o estágio), e ``area`` já sai calculada. Somas por planta ou por
+projeto sobre centenas de plantas rodam vetorizadas no Arrow, lendo só as
+colunas necessárias.
+
+Uso:
+    from src.colunar.ambientes import converter_json, ler_ambientes, somar_areas
+    converter_json(["plantas_teste/resultado_analisador_com_area.json"], "dados/ambientes.parquet")
+    tabela = ler_ambientes("dados/ambientes.parquet", colunas=["planta_id", "area"])
+    print(somar_areas(tabela, largura_minima=2, comprimento_minimo=2))
+
+CLI:
+    python -m src.colunar.ambientes converter plantas_teste/*.json --saida dados/ambientes.parquet
+    python -m src.colunar.ambientes resumo dados/ambientes.parquet --por projeto
+"""
+import argparse
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+BBOX = pa.struct([("x", pa.int32()), ("y", pa.int32()), ("w", pa.int32()), ("h", pa.int32())])
+
+ESQUEMA_AMBIENTES = pa.schema([
+    ("projeto", pa.string()),
+    ("planta_id", pa.string()),
+    ("ambiente", pa.string()),
+    ("largura", pa.float64()),       # m
+    ("comprimento", pa.float64()),   # m
+    ("area", pa.float64()),          # m², largura * comprimento
+    ("pagina", pa.int32()),
+    ("bbox", BBOX),
+])
+
+LINHAS_POR_GRUPO = 64 * 1024
+
+
+def _numero(valor) -> Optional[float]:
+    """float da medida (aceita "3,5"); None se não for um número finito"""
+    if isinstance(valor, str):
+        valor = valor.strip().replace(",", ".")
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return None
+    return numero if math.isfinite(numero) else None
+
+
+def _bbox(valor) -> Optional[Dict[str, int]]:
+    if isinstance(valor, dict):
+        valor = [valor.get(c) for c in ("x", "y", "w", "h")]
+    if not isinstance(valor, (list, tuple)) or len(valor) != 4 or any(v is None for v in valor):
+        return None
+    return dict(zip(("x", "y", "w", "h"), (int(v) for v in valor)))
+
+
+def registro_ambiente(medida: Dict, planta_id: str, projeto: Optional[str] = None) -> Dict:
+    """Linha da tabela a partir de um item de ``medidas`` do analisador"""
+    largura, comprimento = _numero(medida.get("largura")), _numero(medida.get("comprimento"))
+    pagina = medida.get("pagina")
+    return {
+        "projeto": projeto,
+        "planta_id": planta_id,
+        "ambiente": medida.get("ambiente"),
+        "largura": largura,
+        "comprimento": comprimento,
+        "area": largura * comprimento if largura is not None and comprimento is not None else None,
+        "pagina": int(pagina) if pagina is not None else None,
+        "bbox": _bbox(medida.get("bbox", medida.get("posicao"))),
+    }
+
+
+def registros_de_json(dados: Union[Dict, List], planta_id: str,
+                      projeto: Optional[str] = None) -> Iterator[Dict]:
+    """Ambientes de um resultado do pipeline, em qualquer um dos formatos em uso
+
+    Aceita a saída do analisador (``{"medidas": [...]}``), a de
+    corrige_formato_json/calcula_area_total (``{"geometria": {"medidas": [...]}}``)
+    e uma lista de medidas solta.
+    """
+    if isinstance(dados, dict):
+        nome = dados.get("projeto")
+        if projeto is None:
+            projeto = nome.get("nome") if isinstance(nome, dict) else nome
+        if dados.get("arquivo_origem"):
+            planta_id = Path(dados["arquivo_origem"]).stem
+        geometria = dados.get("geometria")
+        if isinstance(geometria, dict) and "medidas" in geometria:
+            medidas = geometria["medidas"]
+        else:
+            medidas = dados.get("medidas")
+    else:
+        medidas = dados
+    for medida in medidas or []:
+        if isinstance(medida, dict):
+            yield registro_ambiente(medida, planta_id, projeto)
+
+
+def tabela_ambientes(registros: Iterable[Dict]) -> pa.Table:
+    return pa.Table.from_pylist(list(registros), schema=ESQUEMA_AMBIENTES)
+
+
+class EscritorAmbientes:
+    """Grava ambientes num Parquet em grupos de linhas, sem montar a tabela inteira"""
+
+    def __init__(self, caminho, linhas_por_grupo: int = LINHAS_POR_GRUPO):
+        self.caminho = Path(caminho)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.linhas_por_grupo = linhas_por_grupo
+        self.linhas = 0
+        self._pendentes: List[Dict] = []
+        self._escritor = pq.ParquetWriter(str(self.caminho), ESQUEMA_AMBIENTES)
+
+    def escrever(self, registros: Iterable[Dict]):
+        for registro in registros:
+            self._pendentes.append(registro)
+            if len(self._pendentes) >= self.linhas_por_grupo:
+                self._descarregar()
+
+    def _descarregar(self):
+        if self._pendentes:
+            self._escritor.write_table(tabela_ambientes(self._pendentes))
+            self.linhas += len(self._pendentes)
+            self._pendentes = []
+
+    def fechar(self):
+        self._descarregar()
+        self._escritor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def converter_json(caminhos: Iterable, saida, projeto: Optional[str] = None) -> int:
+    """Converte resultados JSON do pipeline num único Parquet; retorna o número de ambientes"""
+    with EscritorAmbientes(saida) as escritor:
+        for caminho in caminhos:
+            caminho = Path(caminho)
+            with open(caminho, encoding="utf-8") as f:
+                dados = json.load(f)
+            escritor.escrever(registros_de_json(dados, caminho.stem, projeto))
+    return escritor.linhas
+
+
+def ler_ambientes(origem, colunas: Optional[Sequence[str]] = None, filtro=None) -> pa.Table:
+    """Lê um Parquet, uma pasta de Parquets (``*.parquet``) ou uma lista deles
+
+    ``colunas`` limita o que é lido do disco e ``filtro`` (expressão do
+    ``pyarrow.dataset``, ex.: ``pc.field("area") > 10``) é aplicado na leitura.
+    """
+    arquivos = []
+    for caminho in map(Path, origem if isinstance(origem, (list, tuple)) else [origem]):
+        arquivos.extend(sorted(caminho.glob("*.parquet")) if caminho.is_dir() else [caminho])
+    dataset = ds.dataset([str(c) for c in arquivos], format="parquet", schema=ESQUEMA_AMBIENTES)
+    return dataset.to_table(columns=list(colunas) if colunas else None, filter=filtro)
+
+
+def filtrar_validos(tabela: pa.Table, largura_minima: float = 0.0,
+                    comprimento_minimo: float = 0.0) -> pa.Table:
+    """Ambientes com as duas medidas e acima dos mínimos (os mesmos de calcula_area_total)"""
+    mascara = pc.and_(pc.greater_equal(tabela["largura"], largura_minima),
+                      pc.greater_equal(tabela["comprimento"], comprimento_minimo))
+    return tabela.filter(pc.fill_null(mascara, False))
+
+
+def somar_areas(tabela: pa.Table, por: Union[str, Sequence[str]] = "planta_id",
+                largura_minima: float = 0.0, comprimento_minimo: float = 0.0) -> pa.Table:
+    """Área total e número de ambientes por grupo (colunas area_total, ambientes)"""
+    por = [por] if isinstance(por, str) else list(por)
+    validos = filtrar_validos(tabela, largura_minima, comprimento_minimo)
+    somas = validos.group_by(por).aggregate([("area", "sum"), ("area", "count")])
+    somas = somas.rename_columns([
+        {"area_sum": "area_total", "area_count": "ambientes"}.get(nome, nome) for nome in somas.column_names])
+    return somas.sort_by([(c, "ascending") for c in por])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ambientes e medidas em Parquet")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_converter = sub.add_parser("converter", help="Converte resultados JSON do pipeline")
+    p_converter.add_argument("jsons", nargs="+")
+    p_converter.add_argument("--saida", required=True, help="Arquivo .parquet")
+    p_converter.add_argument("--projeto", help="Projeto, quando o JSON não informa")
+    p_resumo = sub.add_parser("resumo", help="Área total por planta ou projeto")
+    p_resumo.add_argument("parquets", nargs="+", help="Arquivos ou pastas")
+    p_resumo.add_argument("--por", default="planta_id", choices=["planta_id", "projeto", "ambiente"])
+    p_resumo.add_argument("--largura-minima", type=float, default=0.0)
+    p_resumo.add_argument("--comprimento-minimo", type=float, default=0.0)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    if args.comando == "converter":
+        linhas = converter_json(args.jsons, args.saida, args.projeto)
+        print(f"✅ {linhas} ambientes de {len(args.jsons)} arquivos em {args.saida}")
+    else:
+        tabela = ler_ambientes(args.parquets, colunas=[args.por, "largura", "comprimento", "area"])
+        for linha in somar_areas(tabela, args.por, args.largura_minima, args.comprimento_minimo).to_pylist():
+            print(f"  • {str(linha[args.por]):.<40} {linha['area_total']:>10.2f} m²  ({linha['ambientes']} ambientes)")
+        print(f"📐 {tabela.num_rows} ambientes lidos em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Agregação vetorizada de áreas (numpy/pandas)
+
+Substitui o laço com try/except por medida de ``scripts/calcula_area_total.py``
+e o recálculo de ``largura * comprimento`` de ``pipeline_completo.py``: as
+medidas de todas as plantas viram colunas, a área e o filtro de
+``LARGURA_MINIMA``/``COMPRIMENTO_MINIMO`` são calculados uma única vez, e os
+totais por ambiente, por planta e por projeto saem de group-bys sobre essas
+colunas.
+
+Diferença em relação ao laço antigo: medidas em texto com vírgula decimal
+("3,5") são aceitas, em vez de descartadas pelo ``float()``.
+
+Entradas aceitas: os JSON do pipeline (saída do analisador ou
+``{"geometria": {"medidas": [...]}}``), listas de medidas e os Parquet de
+``src/colunar/ambientes.py``.
+
+Uso:
+    from src.colunar.areas import carregar_ambientes, totais
+    df = carregar_ambientes(["plantas_teste/resultado_analisador.json", "dados/ambientes.parquet"])
+    print(totais(df)["projetos"])
+
+CLI:
+    python -m src.colunar.areas plantas_teste/*.json dados/ambientes/ --por planta
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .ambientes import ler_ambientes, registros_de_json
+
+# Critérios para filtrar dimensões válidas (valores menores podem ser ruído, como parede ou porta)
+LARGURA_MINIMA = 2  # em metros
+COMPRIMENTO_MINIMO = 2
+
+COLUNAS = ["projeto", "planta_id", "ambiente", "largura", "comprimento"]
+
+# Níveis de totais: nome -> chaves do group-by
+NIVEIS = {
+    "ambientes": ["ambiente"],
+    "plantas": ["projeto", "planta_id"],
+    "projetos": ["projeto"],
+}
+
+
+def _numeros(serie: pd.Series) -> np.ndarray:
+    """float64 da coluna; textos como "3,5" são aceitos e o resto vira NaN"""
+    if not pd.api.types.is_numeric_dtype(serie):
+        serie = serie.astype(str).str.replace(",", ".", regex=False)
+    return pd.to_numeric(serie, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def dataframe_de_json(dados: Union[Dict, List], planta_id: str = "",
+                      projeto: Optional[str] = None) -> pd.DataFrame:
+    """Medidas de um resultado do pipeline (qualquer formato em uso) como DataFrame"""
+    return pd.DataFrame(list(registros_de_json(dados, planta_id, projeto)), columns=COLUNAS)
+
+
+def carregar_ambientes(origens: Iterable, projeto: Optional[str] = None) -> pd.DataFrame:
+    """Junta JSON (arquivo ou dicionário já lido) e Parquet num único DataFrame"""
+    partes = []
+    for origem in origens:
+        if isinstance(origem, (dict, list)):
+            partes.append(dataframe_de_json(origem, projeto=projeto))
+            continue
+        origem = Path(origem)
+        if origem.is_dir() or origem.suffix == ".parquet":
+            partes.append(ler_ambientes(origem, colunas=COLUNAS).to_pandas())
+        else:
+            with open(origem, encoding="utf-8") as f:
+                partes.append(dataframe_de_json(json.load(f), origem.stem, projeto))
+    partes = [p for p in partes if len(p)]
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS)
+    return pd.concat(partes, ignore_index=True)
+
+
+def calcular_areas(df: pd.DataFrame, largura_minima: float = LARGURA_MINIMA,
+                   comprimento_minimo: float = COMPRIMENTO_MINIMO) -> pd.DataFrame:
+    """Acrescenta ``area`` (todas as medidas numéricas), ``valido`` e ``area_valida``
+
+    ``valido`` segue o critério de calcula_area_total: as duas medidas são
+    números e largura >= mínima e comprimento >= mínimo. Medidas que não são
+    números ficam com area NaN e valido False.
+    """
+    largura = _numeros(df["largura"])
+    comprimento = _numeros(df["comprimento"])
+    area = largura * comprimento
+    with np.errstate(invalid="ignore"):
+        valido = (largura >= largura_minima) & (comprimento >= comprimento_minimo)
+    return df.assign(largura=largura, comprimento=comprimento, area=area,
+                     valido=valido, area_valida=np.where(valido, area, 0.0))
+
+
+def area_total(medidas, largura_minima: float = LARGURA_MINIMA,
+               comprimento_minimo: float = COMPRIMENTO_MINIMO) -> float:
+    """Soma das áreas válidas de uma lista de medidas (o cálculo de calcula_area_total)"""
+    df = dataframe_de_json(list(medidas))
+    return float(calcular_areas(df, largura_minima, comprimento_minimo)["area_valida"].sum())
+
+
+def resumir(df: pd.DataFrame, por: Union[str, List[str]]) -> pd.DataFrame:
+    """Totais de um DataFrame já passado por ``calcular_areas``, agrupados por ``por``"""
+    por = [por] if isinstance(por, str) else list(por)
+    resumo = df.assign(descartado=~df["valido"]).groupby(por, dropna=False, sort=True).agg(
+        area_total=("area_valida", "sum"),
+        ambientes=("valido", "sum"),
+        descartados=("descartado", "sum"),
+        maior_area=("area_valida", "max"),
+    )
+    resumo["ambientes"] = resumo["ambientes"].astype(int)
+    resumo["descartados"] = resumo["descartados"].astype(int)
+    resumo["area_media"] = resumo["area_total"] / resumo["ambientes"].replace(0, np.nan)
+    return resumo.reset_index()
+
+
+def totais(df: pd.DataFrame, largura_minima: float = LARGURA_MINIMA,
+           comprimento_minimo: float = COMPRIMENTO_MINIMO) -> Dict[str, pd.DataFrame]:
+    """Totais por ambiente, por planta e por projeto, com as áreas calculadas uma vez"""
+    calculado = calcular_areas(df, largura_minima, comprimento_minimo)
+    return {nivel: resumir(calculado, por) for nivel, por in NIVEIS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Totais de área por ambiente, planta e projeto")
+    parser.add_argument("origens", nargs="+", help="JSON do pipeline, Parquet ou pastas de Parquet")
+    parser.add_argument("--por", choices=["ambiente", "planta", "projeto"], default="projeto")
+    parser.add_argument("--projeto", help="Projeto, quando o JSON não informa")
+    parser.add_argument("--largura-minima", type=float, default=LARGURA_MINIMA)
+    parser.add_argument("--comprimento-minimo", type=float, default=COMPRIMENTO_MINIMO)
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    df = carregar_ambientes(args.origens, args.projeto)
+    resumo = totais(df, args.largura_minima, args.comprimento_minimo)[args.por + "s"]
+    with pd.option_context("display.max_rows", None, "display.width", 160):
+        print(resumo.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+    print(f"\n📐 {len(df)} ambientes, {len(resumo)} grupos em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
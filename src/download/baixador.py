@@ -0,0 +1,371 @@
+"""
+Downloader concorrente de plantas
+
+Substitui o laço de ``requests.get`` um a um do ``baixar_plantas_batch``:
+- uma ``requests.Session`` com pool de conexões compartilhada pelas threads;
+- corpo gravado em disco em blocos (nada de ``response.content`` inteiro);
+- limite de downloads simultâneos e intervalo mínimo entre requisições
+  por host;
+- novas tentativas com backoff exponencial (``tentativas`` e
+  ``delay_segundos`` do ``config_extracao.json``);
+- retomada via HTTP Range a partir do arquivo ``.parcial``;
+- manifesto JSONL com uma linha por URL processada.
+
+Uso:
+    from src.download.baixador import baixar_lote, carregar_config
+    resultados = baixar_lote(urls, "dados/temp", config=carregar_config())
+
+CLI:
+    python -m src.download.baixador urls.txt --destino dados/temp --manifesto dados/temp/manifesto.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CONFIG_PADRAO = Path(__file__).resolve().parents[2] / "config_extracao.json"
+TAMANHO_BLOCO = 64 * 1024
+STATUS_REPETIR = {429, 500, 502, 503, 504}
+# erros da própria URL: repetir não adianta
+ERROS_DEFINITIVOS = (requests.exceptions.MissingSchema, requests.exceptions.InvalidSchema,
+                     requests.exceptions.InvalidURL)
+
+
+@dataclass
+class ConfigDownload:
+    tentativas: int = 3
+    delay_segundos: float = 2.0  # espera da 1ª nova tentativa; dobra a cada falha
+    timeout: float = 30.0
+    workers: int = 8
+    por_host: int = 2  # downloads simultâneos por host
+    intervalo_host: float = 0.5  # segundos mínimos entre requisições ao mesmo host
+
+
+@dataclass
+class ResultadoDownload:
+    url: str
+    status: str  # OK | INALTERADO (HTTP 304) | FALHA | ERRO
+    arquivo: str = ""
+    erro: str = ""
+    http_status: Optional[int] = None
+    bytes: int = 0
+    sha256: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    tentativas: int = 0
+    retomado: bool = False
+    duracao: float = 0.0
+    data: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+
+def carregar_config(caminho=CONFIG_PADRAO, **ajustes) -> ConfigDownload:
+    """Lê a seção ``download`` do config_extracao.json; ``ajustes`` sobrescrevem"""
+    valores = {}
+    caminho = Path(caminho)
+    if caminho.exists():
+        with open(caminho, encoding="utf-8") as f:
+            secao = json.load(f).get("download", {})
+        valores = {k: v for k, v in secao.items() if k in ConfigDownload.__dataclass_fields__}
+    valores.update({k: v for k, v in ajustes.items() if v is not None})
+    return ConfigDownload(**valores)
+
+
+def criar_sessao(config: ConfigDownload) -> requests.Session:
+    """Sessão com pool de conexões dimensionado para os workers"""
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=config.workers, pool_maxsize=config.workers)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+
+class LimitadorHost:
+    """Semáforo por host + intervalo mínimo entre inícios de requisição"""
+
+    def __init__(self, por_host: int, intervalo: float):
+        self.por_host = por_host
+        self.intervalo = intervalo
+        self._lock = threading.Lock()
+        self._semaforos: Dict[str, threading.Semaphore] = {}
+        self._proxima: Dict[str, float] = {}
+
+    def _semaforo(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.por_host)
+            return self._semaforos[host]
+
+    def _aguardar_vez(self, host: str):
+        with self._lock:
+            agora = time.monotonic()
+            inicio = max(agora, self._proxima.get(host, 0.0))
+            self._proxima[host] = inicio + self.intervalo
+        if inicio > agora:
+            time.sleep(inicio - agora)
+
+    def __call__(self, url: str):
+        return _VagaHost(self, urlparse(url).netloc)
+
+
+class _VagaHost:
+    def __init__(self, limitador: LimitadorHost, host: str):
+        self.limitador = limitador
+        self.semaforo = limitador._semaforo(host)
+        self.host = host
+
+    def __enter__(self):
+        self.semaforo.acquire()
+        self.limitador._aguardar_vez(self.host)
+
+    def __exit__(self, *exc):
+        self.semaforo.release()
+
+
+def _espera(tentativa: int, config: ConfigDownload, resposta: Optional[requests.Response]) -> float:
+    if resposta is not None:
+        retry_after = resposta.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return config.delay_segundos * 2 ** (tentativa - 1)
+
+
+def _inicio_content_range(valor: Optional[str]) -> Optional[int]:
+    """Primeiro byte de ``Content-Range: bytes X-Y/Z`` (None se ausente/ilegível)"""
+    encontrado = re.match(r"\s*bytes\s+(\d+)-", valor or "")
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def baixar_arquivo(url: str, caminho, sessao: requests.Session, config: ConfigDownload,
+                   limitador: Optional[LimitadorHost] = None,
+                   validar: Optional[Callable[[bytes], bool]] = None,
+                   cabecalhos: Optional[Dict[str, str]] = None) -> ResultadoDownload:
+    """
+    Baixa ``url`` para ``caminho`` em blocos, retomando de ``caminho.parcial``.
+
+    ``validar`` recebe os primeiros bytes do arquivo (ex.: checar ``%PDF``);
+    se recusar, o conteúdo fica em ``caminho.falha`` e o status é FALHA.
+    ``cabecalhos`` extras (ex.: If-None-Match) só vão na requisição inicial,
+    não nas retomadas; uma resposta 304 resulta em status INALTERADO.
+    Uma resposta 206 cujo ``Content-Range`` não começa onde o ``.parcial``
+    termina descarta o parcial e o download recomeça do zero. Qualquer erro
+    de rede ou de disco vira status ERRO (a função não levanta exceção).
+    """
+    caminho = Path(caminho)
+    parcial = caminho.with_name(caminho.name + ".parcial")
+    limitador = limitador or LimitadorHost(config.por_host, config.intervalo_host)
+    resultado = ResultadoDownload(url=url, status="ERRO")
+    inicio = time.perf_counter()
+    try:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        resultado.erro = str(e)
+        return resultado
+
+    for tentativa in range(1, config.tentativas + 1):
+        resultado.tentativas = tentativa
+        resposta = None
+        try:
+            ja_baixado = parcial.stat().st_size if parcial.exists() else 0
+            enviar = {"Range": f"bytes={ja_baixado}-"} if ja_baixado else dict(cabecalhos or {})
+            with limitador(url):
+                resposta = sessao.get(url, headers=enviar, stream=True,
+                                      timeout=config.timeout, allow_redirects=True)
+                with resposta:
+                    resultado.http_status = resposta.status_code
+                    resultado.etag = resposta.headers.get("ETag", resultado.etag)
+                    resultado.last_modified = resposta.headers.get("Last-Modified", resultado.last_modified)
+                    if resposta.status_code == 304:
+                        resultado.status = "INALTERADO"
+                        resultado.erro = ""
+                        break
+                    if resposta.status_code == 416 and ja_baixado:
+                        pass  # o .parcial já tem o arquivo inteiro
+                    elif resposta.status_code in STATUS_REPETIR:
+                        raise requests.HTTPError(f"HTTP {resposta.status_code}", response=resposta)
+                    elif resposta.status_code not in (200, 206):
+                        resultado.status = "FALHA"
+                        resultado.erro = f"HTTP {resposta.status_code}"
+                        break
+                    else:
+                        continuar = resposta.status_code == 206 and ja_baixado > 0
+                        if continuar:
+                            inicio_resposta = _inicio_content_range(resposta.headers.get("Content-Range"))
+                            if inicio_resposta == 0:
+                                continuar = False  # o servidor mandou o arquivo desde o início
+                            elif inicio_resposta != ja_baixado:
+                                parcial.unlink()
+                                raise requests.HTTPError(
+                                    f"Content-Range {resposta.headers.get('Content-Range')!r} não continua "
+                                    f"os {ja_baixado} bytes do .parcial; recomeçando do zero", response=resposta)
+                        resultado.retomado = resultado.retomado or continuar
+                        with open(parcial, "ab" if continuar else "wb") as f:
+                            for bloco in resposta.iter_content(TAMANHO_BLOCO):
+                                f.write(bloco)
+        except ERROS_DEFINITIVOS as e:
+            resultado.erro = str(e)
+            break
+        except (requests.RequestException, OSError) as e:
+            resultado.erro = str(e)
+            if tentativa < config.tentativas:
+                time.sleep(_espera(tentativa, config, resposta))
+            continue
+
+        resultado.erro = ""
+        try:
+            _finalizar(parcial, caminho, resultado, validar)
+        except OSError as e:
+            resultado.status = "ERRO"
+            resultado.erro = str(e)
+        break
+
+    resultado.duracao = round(time.perf_counter() - inicio, 3)
+    return resultado
+
+
+def _finalizar(parcial: Path, caminho: Path, resultado: ResultadoDownload,
+               validar: Optional[Callable[[bytes], bool]]):
+    sha = hashlib.sha256()
+    with open(parcial, "rb") as f:
+        cabeca = f.read(1024)
+        sha.update(cabeca)
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO), b""):
+            sha.update(bloco)
+    resultado.bytes = parcial.stat().st_size
+    resultado.sha256 = sha.hexdigest()
+    if validar is not None and not validar(cabeca):
+        falha = caminho.with_name(caminho.name + ".falha")
+        os.replace(parcial, falha)
+        resultado.status = "FALHA"
+        resultado.arquivo = str(falha)
+        resultado.erro = "conteúdo inválido"
+        return
+    os.replace(parcial, caminho)
+    resultado.status = "OK"
+    resultado.arquivo = str(caminho)
+
+
+def nome_padrao(url: str) -> str:
+    """Nome estável derivado da URL (necessário para retomar entre execuções)"""
+    nome = os.path.basename(urlparse(url).path)
+    sufixo = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return f"{nome or 'download'}_{sufixo}"
+
+
+def nome_planta(url: str) -> str:
+    """
+    Nome estável de uma planta da ConstruCode.
+
+    Leva idProjeto/idObra/tp quando a URL tem, mas o que garante um arquivo
+    (e um ``.parcial``) por planta é o sufixo com o hash da URL inteira:
+    links ``Planta/?m=...&area=...&tp=301`` de plantas diferentes só
+    diferem em ``m``.
+    """
+    parametros = parse_qs(urlparse(url).query)
+    if not any(k in parametros for k in ("idProjeto", "idObra", "tp")):
+        return nome_padrao(url) + ".pdf"
+
+    def valor(chave: str) -> str:
+        return re.sub(r"\W", "", parametros.get(chave, [""])[0]) or "desconhecido"
+
+    sufixo = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return f"planta_idProjeto{valor('idProjeto')}_idObra{valor('idObra')}_tp{valor('tp')}_{sufixo}.pdf"
+
+
+def baixar_lote(urls: Iterable[str], destino, config: Optional[ConfigDownload] = None,
+                manifesto=None, nome_arquivo: Callable[[str], str] = nome_padrao,
+                validar: Optional[Callable[[bytes], bool]] = None,
+                ao_concluir: Optional[Callable[[ResultadoDownload], None]] = None,
+                cabecalhos: Optional[Dict[str, Dict[str, str]]] = None,
+                sessao: Optional[requests.Session] = None) -> List[ResultadoDownload]:
+    """
+    Baixa as URLs em paralelo respeitando os limites por host.
+
+    Devolve um resultado por URL, na ordem de ``urls``. URLs que dão no
+    mesmo arquivo (repetidas) são baixadas uma vez só, para duas threads
+    não gravarem no mesmo ``.parcial``. Cada resultado é anexado ao ``manifesto`` (JSONL) assim que termina,
+    então uma execução interrompida deixa o registro do que já foi feito.
+    ``cabecalhos`` mapeia URL -> cabeçalhos extras (requisições condicionais);
+    ``sessao`` permite reaproveitar cookies de autenticação.
+    """
+    config = config or carregar_config()
+    destino = Path(destino)
+    cabecalhos = cabecalhos or {}
+    propria = sessao is None
+    sessao = sessao or criar_sessao(config)
+    limitador = LimitadorHost(config.por_host, config.intervalo_host)
+    urls = list(urls)
+    por_caminho: Dict[Path, ResultadoDownload] = {}
+    saida_manifesto = None
+    if manifesto is not None:
+        Path(manifesto).parent.mkdir(parents=True, exist_ok=True)
+        saida_manifesto = open(manifesto, "a", encoding="utf-8")
+
+    try:
+        with ThreadPoolExecutor(max_workers=config.workers) as executor:
+            caminhos = [destino / nome_arquivo(url) for url in urls]
+            futuros = {}
+            for url, caminho in zip(urls, caminhos):
+                if caminho not in por_caminho:
+                    por_caminho[caminho] = ResultadoDownload(url=url, status="ERRO")
+                    futuros[executor.submit(baixar_arquivo, url, caminho, sessao, config, limitador,
+                                            validar, cabecalhos.get(url))] = caminho
+            for futuro in as_completed(futuros):
+                caminho = futuros[futuro]
+                try:
+                    resultado = futuro.result()
+                except Exception as e:
+                    resultado = replace(por_caminho[caminho], erro=str(e))
+                por_caminho[caminho] = resultado
+                if saida_manifesto is not None:
+                    saida_manifesto.write(json.dumps(asdict(resultado), ensure_ascii=False) + "\n")
+                    saida_manifesto.flush()
+                if ao_concluir is not None:
+                    ao_concluir(resultado)
+    finally:
+        if propria:
+            sessao.close()
+        if saida_manifesto is not None:
+            saida_manifesto.close()
+    return [por_caminho[caminho] if por_caminho[caminho].url == url else replace(por_caminho[caminho], url=url)
+            for url, caminho in zip(urls, caminhos)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download concorrente com retomada e manifesto JSONL")
+    parser.add_argument("urls", help="Arquivo texto com uma URL por linha")
+    parser.add_argument("--destino", default="dados/temp")
+    parser.add_argument("--manifesto", help="JSONL de saída (padrão: <destino>/manifesto.jsonl)")
+    parser.add_argument("--config", default=str(CONFIG_PADRAO))
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--por-host", type=int)
+    args = parser.parse_args()
+
+    with open(args.urls, encoding="utf-8") as f:
+        urls = [linha.strip() for linha in f if linha.strip() and not linha.startswith("#")]
+    config = carregar_config(args.config, workers=args.workers, por_host=args.por_host)
+    manifesto = args.manifesto or str(Path(args.destino) / "manifesto.jsonl")
+
+    def mostrar(r: ResultadoDownload):
+        icone = "✔️" if r.status == "OK" else "❌"
+        print(f"{icone} {r.url} -> {r.arquivo or r.erro} ({r.bytes} bytes, {r.tentativas} tentativa(s))")
+
+    inicio = time.perf_counter()
+    resultados = baixar_lote(urls, args.destino, config, manifesto=manifesto, ao_concluir=mostrar)
+    ok = sum(r.status == "OK" for r in resultados)
+    print(f"\n📦 {ok}/{len(resultados)} arquivos em {time.perf_counter() - inicio:.1f}s — manifesto: {manifesto}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Extração em streaming dos cards de plantas de um HTML do ConstruCode
+
+O ``ExtratorPlantasConstruCode`` original carrega a página inteira no
+BeautifulSoup antes de procurar os cards. Aqui o HTML é lido em blocos
+por um ``lxml.etree.HTMLPullParser``; cada ``div.card`` é convertido em
+registro assim que fecha e em seguida descartado da árvore, então a
+memória fica limitada a um card por vez, mesmo com milhares de plantas.
+
+Uso:
+    from src.download.cards import iterar_cards
+    for posicao, card in iterar_cards("listagem.html"):
+        print(posicao, card["planta_id"], card["revisao"])
+
+Benchmark (página sintética):
+    python scripts/extrator_plantas_construcode.py --benchmark 10000
+"""
+import re
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import unquote
+
+from lxml import etree
+
+TAMANHO_BLOCO = 256 * 1024
+REGEX_ONCLICK = re.compile(r"window\.location='(/Track/Planta/\?m=([^&]+)&o=cc&area=(\d+)&tp=)'")
+REGEX_REVISAO = re.compile(r"Revis[ãa]o:\s*(\d+)")
+
+# Seletores compilados uma vez (equivalentes a .card__title e .card__text)
+_TITULO = etree.XPath(".//h2[contains(concat(' ', normalize-space(@class), ' '), ' card__title ')][1]")
+_DETALHES = etree.XPath(".//p[contains(concat(' ', normalize-space(@class), ' '), ' card__text ')][1]")
+
+
+def _e_card(elemento) -> bool:
+    return "card" in (elemento.get("class") or "").split()
+
+
+def _texto(nos, padrao: str) -> str:
+    return "".join(nos[0].itertext()).strip() if nos else padrao
+
+
+def registro_card(card) -> Optional[Dict]:
+    """Campos brutos de um ``div.card`` (None se o onclick não aponta para uma planta)"""
+    match = REGEX_ONCLICK.search(card.get("onclick") or "")
+    if not match:
+        return None
+    titulo = _texto(_TITULO(card), "Sem título")
+    detalhes = _texto(_DETALHES(card), "Sem detalhes")
+    revisao = REGEX_REVISAO.search(detalhes)
+    return {
+        "planta_id": unquote(match.group(2)),
+        "area_id": match.group(3),
+        "titulo": titulo,
+        "detalhes": detalhes,
+        "revisao": revisao.group(1) if revisao else "00",
+        "url_relativa": match.group(1),
+    }
+
+
+def iterar_cards(caminho, encoding: Optional[str] = "utf-8",
+                 tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[Tuple[int, Dict]]:
+    """
+    Gera ``(posição, registro)`` para cada card na ordem do documento.
+
+    ``posição`` conta todos os ``div.card`` (como o ``enumerate`` do
+    extrator original), inclusive os que não apontam para uma planta.
+    ``encoding=None`` deixa o libxml2 detectar pelo ``<meta charset>``.
+    """
+    parser = etree.HTMLPullParser(events=("end",), tag="div", encoding=encoding)
+    posicao = 0
+
+    def eventos():
+        nonlocal posicao
+        for _, elemento in parser.read_events():
+            if not _e_card(elemento):
+                continue
+            posicao += 1
+            registro = registro_card(elemento)
+            # Libera o card e os irmãos já processados
+            elemento.clear(keep_tail=True)
+            pai = elemento.getparent()
+            if pai is not None:
+                while elemento.getprevious() is not None:
+                    del pai[0]
+            if registro is not None:
+                yield posicao, registro
+
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            parser.feed(bloco)
+            yield from eventos()
+    parser.close()
+    yield from eventos()
+
+
+def gerar_pagina_sintetica(caminho, quantidade: int = 10000):
+    """Listagem sintética no formato do ConstruCode, para benchmark"""
+    disciplinas = ["ARQUITETÔNICO - PLANTA BAIXA", "ESTRUTURAL - FORMAS", "INSTALAÇÕES ELÉTRICAS",
+                   "HIDRÁULICA - ÁGUA FRIA", "DETALHAMENTO DE ESQUADRIAS"]
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write("<html><head><meta charset='utf-8'><title>ConstruCode</title></head><body>"
+                "<div class='container'><div class='cards'>\n")
+        for i in range(quantidade):
+            f.write(
+                f"<div class='card' onclick=\"window.location='/Track/Planta/?m=ID{i:06d}%3d"
+                f"&o=cc&area=37589&tp=';\"><div class='card__content'>"
+                f"<h2 class='card__title'>{disciplinas[i % len(disciplinas)]} - FOLHA {i:04d}</h2>"
+                f"<p class='card__text'>Pavimento {i % 12} | Revisão: {i % 7:02d} | "
+                f"Atualizado em 2025-06-{1 + i % 28:02d}</p></div></div>\n")
+        f.write("</div></div></body></html>\n")
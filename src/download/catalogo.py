@@ -0,0 +1,172 @@
+"""
+Catálogo local de plantas do ConstruCode e sincronização incremental
+
+Guarda, por ``planta_id``, a última revisão baixada, o ETag/Last-Modified
+devolvidos pelo servidor e o SHA-256 do arquivo. A sincronização compara
+uma listagem nova de cards (``ExtratorPlantasConstruCode.extrair_plantas``)
+com o catálogo e baixa só as plantas novas ou revisadas; as inalteradas não
+geram requisição (ou, com ``verificar=True``, só um GET condicional que o
+servidor responde com 304).
+
+Uso:
+    from src.download.catalogo import CatalogoPlantas, sincronizar
+    resumo = sincronizar(extrator.plantas, "plantas_baixadas", CatalogoPlantas())
+"""
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+from .baixador import ConfigDownload, ResultadoDownload, baixar_lote, carregar_config
+
+CAMINHO_PADRAO = Path(__file__).resolve().parents[2] / "dados" / "catalogo_plantas.sqlite"
+
+
+@dataclass
+class Diferenca:
+    novas: List[Dict] = field(default_factory=list)
+    revisadas: List[Dict] = field(default_factory=list)
+    inalteradas: List[Dict] = field(default_factory=list)
+
+    @property
+    def baixar(self) -> List[Dict]:
+        return self.novas + self.revisadas
+
+
+class CatalogoPlantas:
+    """planta_id -> revisão, ETag/Last-Modified, hash e arquivo local (SQLite)"""
+
+    def __init__(self, caminho=None):
+        self.caminho = Path(caminho or CAMINHO_PADRAO)
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS plantas (
+                planta_id TEXT PRIMARY KEY,
+                area_id TEXT,
+                titulo TEXT,
+                tipo TEXT,
+                revisao TEXT,
+                url TEXT,
+                arquivo TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                sha256 TEXT,
+                bytes INTEGER,
+                baixado_em REAL,
+                visto_em REAL
+            );
+        """)
+        self._conn.commit()
+
+    def obter(self, planta_id: str) -> Optional[Dict]:
+        cursor = self._conn.execute("SELECT * FROM plantas WHERE planta_id = ?", (planta_id,))
+        linha = cursor.fetchone()
+        if linha is None:
+            return None
+        return dict(zip([c[0] for c in cursor.description], linha))
+
+    def diferenca(self, plantas: List[Dict]) -> Diferenca:
+        """Classifica uma listagem de cards em novas, revisadas e inalteradas"""
+        diff = Diferenca()
+        for planta in plantas:
+            registro = self.obter(planta["planta_id"])
+            if registro is None:
+                diff.novas.append(planta)
+            elif registro["revisao"] != planta["revisao"] or not Path(registro["arquivo"] or "").exists():
+                diff.revisadas.append(planta)
+            else:
+                diff.inalteradas.append(planta)
+        return diff
+
+    def registrar(self, planta: Dict, resultado: ResultadoDownload):
+        """Grava o download bem-sucedido (OK ou 304) de uma planta"""
+        agora = time.time()
+        anterior = self.obter(planta["planta_id"]) or {}
+        if resultado.status == "INALTERADO":
+            arquivo, sha256, tamanho = anterior.get("arquivo"), anterior.get("sha256"), anterior.get("bytes")
+        else:
+            arquivo, sha256, tamanho = resultado.arquivo, resultado.sha256, resultado.bytes
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plantas (planta_id, area_id, titulo, tipo, revisao, url, arquivo, "
+                "etag, last_modified, sha256, bytes, baixado_em, visto_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (planta["planta_id"], planta.get("area_id"), planta.get("titulo"), planta.get("tipo"),
+                 planta["revisao"], planta["url_completa"], arquivo,
+                 resultado.etag or anterior.get("etag"), resultado.last_modified or anterior.get("last_modified"),
+                 sha256, tamanho, anterior.get("baixado_em") if resultado.status == "INALTERADO" else agora,
+                 agora))
+            self._conn.commit()
+
+    def marcar_vistas(self, plantas: List[Dict]):
+        with self._lock:
+            self._conn.executemany("UPDATE plantas SET visto_em = ? WHERE planta_id = ?",
+                                   [(time.time(), p["planta_id"]) for p in plantas])
+            self._conn.commit()
+
+    def cabecalhos_condicionais(self, planta_id: str) -> Dict[str, str]:
+        registro = self.obter(planta_id) or {}
+        cabecalhos = {}
+        if registro.get("etag"):
+            cabecalhos["If-None-Match"] = registro["etag"]
+        if registro.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = registro["last_modified"]
+        return cabecalhos
+
+    def total(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM plantas").fetchone()[0]
+
+    def fechar(self):
+        self._conn.close()
+
+
+def sincronizar(plantas: List[Dict], destino, catalogo: CatalogoPlantas,
+                config: Optional[ConfigDownload] = None, verificar: bool = False,
+                sessao: Optional[requests.Session] = None, manifesto=None) -> Dict:
+    """
+    Baixa apenas as plantas novas ou revisadas em ``destino/<tipo>/<nome_arquivo>``.
+
+    Args:
+        plantas: Cards extraídos (planta_id, revisao, tipo, url_completa, nome_arquivo)
+        verificar: Também envia GET condicional (ETag/Last-Modified) para as
+            inalteradas, detectando arquivos trocados sem mudança de revisão
+        sessao: Sessão já autenticada (cookie do ConstruCode)
+
+    Returns:
+        Resumo com as contagens e os resultados de cada download.
+    """
+    config = config or carregar_config()
+    destino = Path(destino)
+    diff = catalogo.diferenca(plantas)
+    alvo = diff.baixar + (diff.inalteradas if verificar else [])
+    por_url = {p["url_completa"]: p for p in alvo}
+    cabecalhos = {p["url_completa"]: catalogo.cabecalhos_condicionais(p["planta_id"])
+                  for p in diff.inalteradas if verificar}
+
+    def nome_arquivo(url: str) -> str:
+        planta = por_url[url]
+        return str(Path(planta["tipo"]) / planta["nome_arquivo"])
+
+    def registrar(resultado: ResultadoDownload):
+        if resultado.status in ("OK", "INALTERADO"):
+            catalogo.registrar(por_url[resultado.url], resultado)
+
+    resultados = baixar_lote(list(por_url), destino, config, manifesto=manifesto, nome_arquivo=nome_arquivo,
+                             validar=lambda cabeca: b"%PDF" in cabeca, ao_concluir=registrar,
+                             cabecalhos=cabecalhos, sessao=sessao)
+    catalogo.marcar_vistas(diff.inalteradas)
+    return {
+        "novas": len(diff.novas),
+        "revisadas": len(diff.revisadas),
+        "inalteradas": len(diff.inalteradas),
+        "baixadas": sum(r.status == "OK" for r in resultados),
+        "falhas": sum(r.status in ("FALHA", "ERRO") for r in resultados),
+        "bytes": sum(r.bytes for r in resultados),
+        "resultados": resultados,
+    }
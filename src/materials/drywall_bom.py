@@ -0,0 +1,289 @@
+"""
+Lista de materiais (BOM) de drywall para o projeto inteiro
+
+``gerar_relatorio_completo`` soma um ambiente só, e ``_formatar_lista_compras``
+arredonda para caixas, rolos e sacos já nesse ambiente: somando as listas de
+vários ambientes, cada um arredonda para cima por conta própria e a compra
+sai maior do que precisa. Aqui os ambientes chegam em blocos (CSV, JSON do
+pipeline ou DataFrames), cada bloco passa por ``CalculadorDrywallLote`` e só
+as quantidades exatas por material (SKU) são acumuladas; a embalagem é
+aplicada uma única vez, no total. A memória depende do tamanho do bloco, não
+do número de ambientes.
+
+Peças que são cortadas no ambiente (chapas e montantes) continuam contadas
+por ambiente, como no cálculo escalar; o arredondamento único vale para o
+que é vendido em embalagem ou barra (parafusos, fita, massa, lã, guias e
+perfis do forro). A coluna "por ambiente" mostra quanto se compraria
+arredondando ambiente a ambiente.
+
+Uso:
+    from src.materials.drywall_bom import AgregadorMateriais, ler_entradas
+    agregador = AgregadorMateriais()
+    for bloco in ler_entradas(["dados/ambientes.csv", "plantas_teste/resultado_analisador.json"]):
+        agregador.adicionar_dataframe(bloco)
+    print("\\n".join(agregador.lista_compras()))
+    agregador.salvar_xlsx("dados/lista_materiais.xlsx")
+
+CLI:
+    python -m src.materials.drywall_bom dados/ambientes.csv plantas_teste/ --saida dados/lista_materiais.xlsx
+"""
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+from src.colunar.ambientes import registros_de_json
+
+from .drywall import TipoChapa
+from .drywall_lote import AmbientesLote, CalculadorDrywallLote
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # dependência opcional
+    Workbook = None
+
+TAMANHO_BLOCO = 10_000
+ALTURA_PADRAO = 2.70  # pé-direito quando a entrada não traz altura (JSON do analisador)
+
+
+@dataclass(frozen=True)
+class Material:
+    """Item de compra: unidade de cálculo e tamanho da embalagem"""
+    sku: str
+    descricao: str
+    unidade: str
+    embalagem: float = 1
+    nome_embalagem: str = "un"
+
+
+MATERIAIS: Dict[str, Material] = {m.sku: m for m in [
+    Material("CHAPA-ST", "Chapa de Drywall Standard 1.20x2.40m", "un"),
+    Material("CHAPA-RU", "Chapa de Drywall Resistente à Umidade 1.20x2.40m", "un"),
+    Material("CHAPA-RF", "Chapa de Drywall Resistente ao Fogo 1.20x2.40m", "un"),
+    Material("M70", "Montante M70", "pç", 1, "peças"),
+    Material("G70", "Guia G70", "m", 3, "barras de 3m"),
+    Material("F530", "Perfil F530 (principais e travessas)", "m", 3, "barras de 3m"),
+    Material("CANTONEIRA", "Cantoneira perimetral", "m", 3, "barras de 3m"),
+    Material("TIRANTE", "Tirante com suporte nivelador", "un"),
+    Material("BUCHA", "Bucha para tirante", "un"),
+    Material("PARAFUSO", "Parafusos para drywall", "un", 1000, "caixas (1000 un cada)"),
+    Material("FITA", "Fita para juntas", "m", 50, "rolos de 50m"),
+    Material("MASSA", "Massa para drywall", "kg", 20, "sacos de 20kg"),
+    Material("MASSA-RAPIDA", "Massa de secagem rápida", "kg", 20, "sacos de 20kg"),
+    Material("LA-MINERAL", "Lã mineral", "m²", 12.5, "rolos de 12.5m²"),
+]}
+
+# SKU -> colunas de QuantitativosLote.colunas() somadas nele
+COLUNAS_POR_SKU = {
+    "M70": ["montantes"],
+    "G70": ["guias_metros"],
+    "F530": ["principais_metros", "travessas_metros"],
+    "CANTONEIRA": ["cantoneira_metros"],
+    "TIRANTE": ["tirantes"],
+    "BUCHA": ["tirantes"],
+    "PARAFUSO": ["parafusos_chapa_parede", "parafusos_estrutura", "parafusos_forro"],
+    "FITA": ["fita_parede_metros", "fita_forro_metros"],
+    "MASSA": ["massa_parede_kg", "massa_forro_kg"],
+    "MASSA-RAPIDA": ["massa_rapida_kg"],
+    "LA-MINERAL": ["la_mineral_m2"],
+}
+COLUNAS_PAREDE = {"montantes", "guias_metros", "parafusos_chapa_parede", "parafusos_estrutura",
+                  "fita_parede_metros", "massa_parede_kg", "massa_rapida_kg", "la_mineral_m2"}
+
+
+def _embalagens(quantidade, embalagem: float):
+    """ceil(quantidade / embalagem), tolerando o ruído de ponto flutuante das somas"""
+    return np.ceil(np.round(np.asarray(quantidade, dtype=np.float64) / embalagem, 6)).astype(np.int64)
+
+
+@dataclass
+class ItemCompra:
+    material: Material
+    quantidade: float             # soma exata, sem arredondar
+    embalagens: int               # arredondamento único sobre o total
+    embalagens_por_ambiente: int  # se cada ambiente arredondasse por conta própria
+
+    @property
+    def comprado(self) -> float:
+        return self.embalagens * self.material.embalagem
+
+    @property
+    def sobra(self) -> float:
+        return self.comprado - self.quantidade
+
+    def texto(self) -> str:
+        return f"{self.material.descricao}: {self.embalagens} {self.material.nome_embalagem}"
+
+
+class AgregadorMateriais:
+    """Acumula as quantidades exatas por SKU, bloco a bloco"""
+
+    def __init__(self, altura_chapa: float = 2.40, estrutura_metalica: bool = True,
+                 paredes: bool = True, forros: bool = True, la_mineral: bool = False):
+        self.altura_chapa = altura_chapa
+        self.estrutura_metalica = estrutura_metalica
+        self.paredes = paredes
+        self.forros = forros
+        self.la_mineral = la_mineral
+        self.quantidades: Dict[str, float] = {sku: 0.0 for sku in MATERIAIS}
+        self.por_ambiente: Dict[str, int] = {sku: 0 for sku in MATERIAIS}
+        self.ambientes = 0
+        self.ignorados = 0  # linhas sem comprimento/largura/altura numéricos ou com tipo de chapa desconhecido
+        self.area_paredes = 0.0
+        self.area_forro = 0.0
+
+    def _somar(self, sku: str, valores: np.ndarray):
+        if not len(valores):
+            return
+        self.quantidades[sku] += float(valores.sum())
+        self.por_ambiente[sku] += int(_embalagens(valores, MATERIAIS[sku].embalagem).sum())
+
+    def adicionar_lote(self, lote: AmbientesLote, tipos_chapa=TipoChapa.STANDARD):
+        """Soma um bloco de ambientes; ``tipos_chapa``: um TipoChapa ou um código (ST/RU/RF) por ambiente"""
+        if isinstance(tipos_chapa, TipoChapa):
+            tipos_chapa = np.full(len(lote), tipos_chapa.value)
+        tipos_chapa = np.char.upper(np.char.strip(np.asarray(tipos_chapa, dtype=str)))
+        desconhecidos = set(np.unique(tipos_chapa)) - {tipo.value for tipo in TipoChapa}
+        if desconhecidos:
+            raise ValueError(f"Tipo de chapa desconhecido: {', '.join(sorted(desconhecidos))}")
+        colunas = CalculadorDrywallLote(lote).calcular(self.altura_chapa, self.estrutura_metalica).colunas()
+        zeros = np.zeros(len(lote))
+
+        chapas = zeros
+        if self.paredes:
+            chapas = chapas + colunas["chapas_parede"]
+            self.area_paredes += float(colunas["area_liquida"].sum())
+        if self.forros:
+            chapas = chapas + colunas["chapas_forro"]
+            self.area_forro += float(colunas["area_forro"].sum())
+        for tipo in TipoChapa:
+            self._somar(f"CHAPA-{tipo.value}", chapas[tipos_chapa == tipo.value])
+
+        for sku, nomes in COLUNAS_POR_SKU.items():
+            if sku == "LA-MINERAL" and not self.la_mineral:
+                continue
+            nomes = [n for n in nomes if (self.paredes if n in COLUNAS_PAREDE else self.forros)]
+            if nomes:
+                self._somar(sku, sum((colunas[n] for n in nomes), zeros))
+        self.ambientes += len(lote)
+
+    def adicionar_dataframe(self, df: pd.DataFrame, altura: float = ALTURA_PADRAO,
+                            parede_dupla: bool = False, tipo_chapa: TipoChapa = TipoChapa.STANDARD):
+        """Bloco com comprimento, largura e, se houver, altura, area_aberturas, parede_dupla e tipo_chapa"""
+        dados = pd.DataFrame({
+            "comprimento": pd.to_numeric(df["comprimento"], errors="coerce"),
+            "largura": pd.to_numeric(df["largura"], errors="coerce"),
+            "altura": pd.to_numeric(df["altura"], errors="coerce") if "altura" in df else altura,
+            "area_aberturas": pd.to_numeric(df["area_aberturas"], errors="coerce").fillna(0)
+            if "area_aberturas" in df else 0.0,
+            "parede_dupla": df["parede_dupla"].fillna(parede_dupla).astype(bool)
+            if "parede_dupla" in df else parede_dupla,
+            "tipo_chapa": df["tipo_chapa"].fillna(tipo_chapa.value).astype(str).str.strip().str.upper()
+            .replace("", tipo_chapa.value) if "tipo_chapa" in df else tipo_chapa.value,
+        }, index=df.index)
+        validos = dados[["comprimento", "largura", "altura"]].notna().all(axis=1) \
+            & dados["tipo_chapa"].isin([tipo.value for tipo in TipoChapa])
+        self.ignorados += int((~validos).sum())
+        dados = dados[validos]
+        if len(dados):
+            self.adicionar_lote(AmbientesLote.de_dataframe(dados), dados["tipo_chapa"].to_numpy())
+
+    def itens(self) -> List[ItemCompra]:
+        """Materiais com quantidade, na ordem de MATERIAIS"""
+        return [ItemCompra(material, self.quantidades[sku],
+                           int(_embalagens(self.quantidades[sku], material.embalagem)),
+                           self.por_ambiente[sku])
+                for sku, material in MATERIAIS.items() if self.quantidades[sku] > 0]
+
+    def lista_compras(self) -> List[str]:
+        return [item.texto() for item in self.itens()]
+
+    def resumo(self) -> Dict[str, Union[int, float]]:
+        return {"ambientes": self.ambientes, "ignorados": self.ignorados,
+                "area_paredes_m2": round(self.area_paredes, 2), "area_forro_m2": round(self.area_forro, 2)}
+
+    def salvar_xlsx(self, caminho):
+        if Workbook is None:
+            raise ImportError("openpyxl não está instalado (pip install openpyxl)")
+        livro = Workbook(write_only=True)
+        planilha = livro.create_sheet("Lista de compras")
+        planilha.append(["SKU", "Material", "Unidade", "Quantidade exata", "Embalagem", "Embalagens",
+                         "Comprado", "Sobra", "Embalagens por ambiente"])
+        for item in self.itens():
+            m = item.material
+            planilha.append([m.sku, m.descricao, m.unidade, round(item.quantidade, 2), m.nome_embalagem,
+                             item.embalagens, round(item.comprado, 2), round(item.sobra, 2),
+                             item.embalagens_por_ambiente])
+        resumo = livro.create_sheet("Resumo")
+        for chave, valor in self.resumo().items():
+            resumo.append([chave, valor])
+        Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        livro.save(caminho)
+
+
+def _blocos_json(caminhos: Iterable[Path], tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+    registros = []
+    for caminho in caminhos:
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+        registros.extend(registros_de_json(dados, caminho.stem))
+        while len(registros) >= tamanho_bloco:
+            yield pd.DataFrame(registros[:tamanho_bloco])
+            registros = registros[tamanho_bloco:]
+    if registros:
+        yield pd.DataFrame(registros)
+
+
+def ler_entradas(entradas: Iterable[Union[str, Path]], tamanho_bloco: int = TAMANHO_BLOCO) -> Iterator[pd.DataFrame]:
+    """Blocos de ambientes de CSVs (lidos em pedaços) e JSONs do pipeline; pastas viram *.csv e *.json"""
+    arquivos: List[Path] = []
+    for entrada in entradas:
+        entrada = Path(entrada)
+        arquivos.extend(sorted(entrada.glob("*.csv")) + sorted(entrada.glob("*.json")) if entrada.is_dir()
+                        else [entrada])
+    jsons = [a for a in arquivos if a.suffix == ".json"]
+    for arquivo in arquivos:
+        if arquivo.suffix == ".csv":
+            yield from pd.read_csv(arquivo, chunksize=tamanho_bloco)
+    yield from _blocos_json(jsons, tamanho_bloco)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lista de materiais de drywall do projeto inteiro")
+    parser.add_argument("entradas", nargs="+", help="CSVs de ambientes, JSONs do pipeline ou pastas")
+    parser.add_argument("--saida", help="Planilha .xlsx com a lista de compras")
+    parser.add_argument("--altura", type=float, default=ALTURA_PADRAO, help="Pé-direito quando a entrada não traz altura")
+    parser.add_argument("--altura-chapa", type=float, default=2.40)
+    parser.add_argument("--parede", choices=["simples", "dupla"], default="simples")
+    parser.add_argument("--tipo-chapa", choices=[t.value for t in TipoChapa], default=TipoChapa.STANDARD.value)
+    parser.add_argument("--sem-paredes", action="store_true")
+    parser.add_argument("--sem-forros", action="store_true")
+    parser.add_argument("--la-mineral", action="store_true", help="Inclui lã mineral nas paredes")
+    parser.add_argument("--tamanho-bloco", type=int, default=TAMANHO_BLOCO)
+    args = parser.parse_args()
+
+    agregador = AgregadorMateriais(args.altura_chapa, paredes=not args.sem_paredes,
+                                   forros=not args.sem_forros, la_mineral=args.la_mineral)
+    inicio = time.perf_counter()
+    for bloco in ler_entradas(args.entradas, args.tamanho_bloco):
+        agregador.adicionar_dataframe(bloco, args.altura, args.parede == "dupla", TipoChapa(args.tipo_chapa))
+
+    resumo = agregador.resumo()
+    print(f"📐 {resumo['ambientes']} ambientes em {time.perf_counter() - inicio:.2f} s"
+          + (f" ({resumo['ignorados']} ignorados)" if resumo["ignorados"] else ""))
+    print("\n🛒 LISTA DE COMPRAS:")
+    for item in agregador.itens():
+        economia = item.embalagens_por_ambiente - item.embalagens
+        print(f"  • {item.texto()}" + (f"  (-{economia} vs. por ambiente)" if economia else ""))
+    if args.saida:
+        agregador.salvar_xlsx(args.saida)
+        print(f"\n💾 Planilha salva em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Quantitativos de drywall em lote (numpy)
+
+``CalculadorDrywall`` calcula um ambiente por vez e devolve dicionários
+aninhados; para um prédio com milhares de ambientes isso significa milhares
+de calculadores e dicionários somados à mão. Aqui os ambientes entram como
+colunas (comprimento, largura, altura, área das aberturas e tipo de parede)
+e as contas de ``calcular_parede_simples``/``calcular_parede_dupla`` e
+``calcular_forro`` — inclusive os ``math.ceil`` das perdas — são feitas de
+uma vez sobre os arrays.
+
+As expressões são as mesmas do cálculo escalar, na mesma ordem, então os
+valores são idênticos bit a bit: a tabela guarda os valores sem arredondar e
+``QuantitativosLote.parede(i)``/``forro(i)`` remontam o dicionário de
+``CalculadorDrywall`` para o ambiente ``i`` (é assim que os testes comparam
+os dois caminhos).
+
+Uso:
+    from src.materials.drywall_lote import AmbientesLote, CalculadorDrywallLote
+    lote = AmbientesLote.de_calculadores(calculadores)
+    quantitativos = CalculadorDrywallLote(lote).calcular()
+    quantitativos.dataframe(), quantitativos.totais()
+
+CLI:
+    python -m src.materials.drywall_lote ambientes.csv --saida quantitativos.csv
+"""
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .drywall import CalculadorDrywall, EspessuraChapa, TipoChapa
+
+COLUNAS_ENTRADA = ["comprimento", "largura", "altura", "area_aberturas", "parede_dupla"]
+
+# Colunas de contagem (peças, barras, rolos); as demais são metros, m² ou kg
+COLUNAS_INTEIRAS = {
+    "chapas_parede", "montantes", "guias_barras_3m", "parafusos_chapa_parede", "parafusos_estrutura",
+    "la_mineral_rolos", "chapas_forro", "principais_barras_3m", "travessas_barras_3m",
+    "cantoneira_barras_3m", "tirantes", "parafusos_forro",
+}
+
+
+@dataclass
+class AmbientesLote:
+    """Ambientes em colunas (um elemento por ambiente)"""
+    comprimento: np.ndarray
+    largura: np.ndarray
+    altura: np.ndarray
+    area_aberturas: np.ndarray  # soma das áreas de portas e janelas do ambiente
+    parede_dupla: np.ndarray    # bool: calcular_parede_dupla em vez de calcular_parede_simples
+
+    def __post_init__(self):
+        self.comprimento = np.asarray(self.comprimento, dtype=np.float64)
+        self.largura = np.asarray(self.largura, dtype=np.float64)
+        self.altura = np.asarray(self.altura, dtype=np.float64)
+        self.area_aberturas = np.asarray(self.area_aberturas, dtype=np.float64)
+        self.parede_dupla = np.asarray(self.parede_dupla, dtype=bool)
+        n = len(self.comprimento)
+        for nome in COLUNAS_ENTRADA[1:]:
+            if getattr(self, nome).shape != (n,):
+                raise ValueError(f"Coluna '{nome}' com tamanho diferente de comprimento ({n})")
+
+    def __len__(self) -> int:
+        return len(self.comprimento)
+
+    @property
+    def perimetro(self) -> np.ndarray:
+        return 2 * (self.comprimento + self.largura)
+
+    @property
+    def area_piso(self) -> np.ndarray:
+        return self.comprimento * self.largura
+
+    @classmethod
+    def criar(cls, comprimento, largura, altura, area_aberturas=None, parede_dupla=None) -> "AmbientesLote":
+        """Colunas opcionais com padrão: sem aberturas, parede simples"""
+        n = len(comprimento)
+        return cls(comprimento, largura, altura,
+                   np.zeros(n) if area_aberturas is None else area_aberturas,
+                   np.zeros(n, dtype=bool) if parede_dupla is None else parede_dupla)
+
+    @classmethod
+    def de_aberturas(cls, comprimento, largura, altura, indice_ambiente, larguras, alturas,
+                     parede_dupla=None) -> "AmbientesLote":
+        """Aberturas em colunas próprias, com o índice do ambiente de cada uma
+
+        ``np.bincount`` soma na ordem das aberturas, como o ``sum`` de
+        ``calcular_parede_simples``.
+        """
+        area = np.asarray(larguras, dtype=np.float64) * np.asarray(alturas, dtype=np.float64)
+        soma = np.bincount(np.asarray(indice_ambiente, dtype=np.intp), weights=area, minlength=len(comprimento))
+        return cls.criar(comprimento, largura, altura, soma, parede_dupla)
+
+    @classmethod
+    def de_calculadores(cls, calculadores: Iterable[CalculadorDrywall],
+                        tipos_parede: Optional[Iterable[str]] = None) -> "AmbientesLote":
+        """Converte calculadores escalares (``tipos_parede``: "simples"/"dupla" por ambiente)"""
+        calculadores = list(calculadores)
+        tipos = list(tipos_parede) if tipos_parede is not None else ["simples"] * len(calculadores)
+        return cls(
+            [c.ambiente.comprimento for c in calculadores],
+            [c.ambiente.largura for c in calculadores],
+            [c.ambiente.altura for c in calculadores],
+            [sum(ab.area for ab in c.aberturas) for c in calculadores],
+            [tipo != "simples" for tipo in tipos],
+        )
+
+    @classmethod
+    def de_dataframe(cls, df: pd.DataFrame) -> "AmbientesLote":
+        """DataFrame com as colunas de COLUNAS_ENTRADA (area_aberturas e parede_dupla opcionais)"""
+        return cls.criar(
+            df["comprimento"].to_numpy(), df["largura"].to_numpy(), df["altura"].to_numpy(),
+            df["area_aberturas"].fillna(0).to_numpy() if "area_aberturas" in df else None,
+            df["parede_dupla"].fillna(False).to_numpy(dtype=bool) if "parede_dupla" in df else None,
+        )
+
+
+def _teto(valores: np.ndarray) -> np.ndarray:
+    """math.ceil elemento a elemento, como inteiro"""
+    return np.ceil(valores).astype(np.int64)
+
+
+class CalculadorDrywallLote:
+    """Versão vetorizada de CalculadorDrywall (mesmas constantes)"""
+
+    def __init__(self, ambientes: AmbientesLote):
+        self.ambientes = ambientes
+
+    def calcular_paredes(self, altura_chapa: float = 2.40) -> Dict[str, np.ndarray]:
+        """Contas de calcular_parede_simples, sem arredondar
+
+        ``calcular_parede_dupla`` usa sempre a chapa de 2.40 m, então
+        ``altura_chapa`` só vale para as paredes simples.
+        """
+        c = CalculadorDrywall
+        amb = self.ambientes
+        perimetro = amb.perimetro
+        area_paredes = perimetro * amb.altura
+        area_liquida = area_paredes - amb.area_aberturas
+
+        area_chapa = np.where(amb.parede_dupla, c.CHAPA_LARGURA * 2.40, c.CHAPA_LARGURA * altura_chapa)
+        num_chapas = _teto(area_liquida / area_chapa)
+        total_chapas = _teto(num_chapas * (1 + c.PERDA_CHAPA)) * 2
+
+        num_montantes = _teto(perimetro / c.ESPACAMENTO_MONTANTE) + 4
+        montantes_com_perda = _teto(num_montantes * (1 + c.PERDA_PERFIL))
+        guias = perimetro * 2 * (1 + c.PERDA_PERFIL)
+        kg_massa = area_liquida * 1.0
+
+        return {
+            "perimetro": perimetro,
+            "area_paredes": area_paredes,
+            "area_aberturas": amb.area_aberturas,
+            "area_liquida": area_liquida,
+            "area_chapa": area_chapa,
+            "chapas_parede": total_chapas,
+            "area_chapas_parede": total_chapas * area_chapa,
+            "montantes": montantes_com_perda,
+            "montantes_metros": montantes_com_perda * amb.altura,
+            "guias_metros": guias,
+            "guias_barras_3m": _teto(guias / 3),
+            "parafusos_chapa_parede": total_chapas * 35,
+            "parafusos_estrutura": num_montantes * 8,
+            "fita_parede_metros": area_liquida * 2.5,
+            "massa_parede_kg": kg_massa,
+            "massa_rapida_kg": kg_massa * 0.3,
+            "la_mineral_m2": area_liquida,
+            "la_mineral_rolos": _teto(area_liquida / 12.5),
+        }
+
+    def calcular_forros(self, estrutura_metalica: bool = True) -> Dict[str, np.ndarray]:
+        """Contas de calcular_forro, sem arredondar"""
+        c = CalculadorDrywall
+        amb = self.ambientes
+        area_forro = amb.area_piso
+        area_chapa = c.CHAPA_LARGURA * c.CHAPA_ALTURA
+        chapas = _teto(_teto(area_forro / area_chapa) * (1 + c.PERDA_CHAPA))
+
+        colunas = {
+            "area_forro": area_forro,
+            "chapas_forro": chapas,
+            "area_chapas_forro": chapas * area_chapa,
+            "parafusos_forro": chapas * 30,
+            "fita_forro_metros": area_forro * 2.0,
+            "massa_forro_kg": area_forro * 0.8,
+        }
+        zeros = np.zeros(len(amb), dtype=np.int64)
+        if estrutura_metalica:
+            perfis = {
+                "principais": _teto(amb.largura / c.ESPACAMENTO_SUPORTE_FORRO) * amb.comprimento,
+                "travessas": _teto(amb.comprimento / c.ESPACAMENTO_SUPORTE_FORRO) * amb.largura,
+                "cantoneira": amb.perimetro,
+            }
+            for nome, metros in perfis.items():
+                colunas[f"{nome}_metros"] = metros * 1.05
+                colunas[f"{nome}_barras_3m"] = _teto(metros * 1.05 / 3)
+            colunas["tirantes"] = _teto(area_forro / 1.44)
+        else:
+            for nome in ("principais", "travessas", "cantoneira"):
+                colunas[f"{nome}_metros"] = np.zeros(len(amb))
+                colunas[f"{nome}_barras_3m"] = zeros
+            colunas["tirantes"] = zeros
+        return colunas
+
+    def calcular(self, altura_chapa: float = 2.40, estrutura_metalica: bool = True) -> "QuantitativosLote":
+        return QuantitativosLote(self.ambientes, self.calcular_paredes(altura_chapa),
+                                 self.calcular_forros(estrutura_metalica), estrutura_metalica)
+
+
+class QuantitativosLote:
+    """Resultado do lote: tabela compacta e o dicionário escalar de cada ambiente"""
+
+    def __init__(self, ambientes: AmbientesLote, paredes: Dict[str, np.ndarray],
+                 forros: Dict[str, np.ndarray], estrutura_metalica: bool = True):
+        self.ambientes = ambientes
+        self.paredes = paredes
+        self.forros = forros
+        self.estrutura_metalica = estrutura_metalica
+
+    def __len__(self) -> int:
+        return len(self.ambientes)
+
+    def colunas(self) -> Dict[str, np.ndarray]:
+        """Quantitativos por ambiente, já com os acréscimos da parede dupla"""
+        p = self.paredes
+        dupla = self.ambientes.parede_dupla
+        fator = np.where(dupla, 2, 1)
+        acabamento = np.where(dupla, 1.3, 1.0)
+        colunas = {"parede_dupla": dupla}
+        colunas.update({nome: p[nome] for nome in ("perimetro", "area_paredes", "area_aberturas", "area_liquida")})
+        colunas.update({
+            "chapas_parede": p["chapas_parede"] * fator,
+            "area_chapas_parede": p["area_chapas_parede"] * fator,
+            "montantes": p["montantes"],
+            "montantes_metros": p["montantes_metros"],
+            "guias_metros": p["guias_metros"],
+            "guias_barras_3m": p["guias_barras_3m"],
+            # total_chapas é par, então x 1.5 continua inteiro
+            "parafusos_chapa_parede": np.where(dupla, p["parafusos_chapa_parede"] * 3 // 2, p["parafusos_chapa_parede"]),
+            "parafusos_estrutura": p["parafusos_estrutura"],
+            "fita_parede_metros": p["fita_parede_metros"] * acabamento,
+            "massa_parede_kg": p["massa_parede_kg"] * acabamento,
+            "massa_rapida_kg": p["massa_rapida_kg"],
+            "la_mineral_m2": p["la_mineral_m2"],
+            "la_mineral_rolos": p["la_mineral_rolos"],
+        })
+        colunas.update(self.forros)
+        return colunas
+
+    def dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame(self.colunas())
+
+    def totais(self) -> Dict[str, float]:
+        """Soma de cada quantitativo sobre todos os ambientes"""
+        return {nome: (int(valores.sum()) if nome in COLUNAS_INTEIRAS else float(valores.sum()))
+                for nome, valores in self.colunas().items() if nome != "parede_dupla"}
+
+    def parede(self, i: int, tipo_chapa: TipoChapa = TipoChapa.STANDARD,
+               espessura: EspessuraChapa = EspessuraChapa.E12_5) -> Dict:
+        """Dicionário de calcular_parede_simples (ou _dupla) para o ambiente ``i``"""
+        p = {nome: valores[i].item() for nome, valores in self.paredes.items()}
+        resultado = {
+            "resumo": {
+                "area_total_paredes": round(p["area_paredes"], 2),
+                "area_aberturas": round(p["area_aberturas"], 2),
+                "area_liquida": round(p["area_liquida"], 2),
+                "perimetro": round(p["perimetro"], 2)
+            },
+            "chapas": {
+                "tipo": tipo_chapa.value,
+                "espessura_mm": espessura.value,
+                "quantidade": p["chapas_parede"],
+                "area_total_m2": round(p["area_chapas_parede"], 2)
+            },
+            "estrutura_metalica": {
+                "montantes": {
+                    "tipo": "M70",
+                    "quantidade_pecas": p["montantes"],
+                    "metros_lineares": round(p["montantes_metros"], 2)
+                },
+                "guias": {
+                    "tipo": "G70",
+                    "metros_lineares": round(p["guias_metros"], 2),
+                    "quantidade_barras_3m": p["guias_barras_3m"]
+                }
+            },
+            "fixacao": {
+                "parafusos_chapa_estrutura": p["parafusos_chapa_parede"],
+                "parafusos_estrutura": p["parafusos_estrutura"],
+                "parafusos_total": p["parafusos_chapa_parede"] + p["parafusos_estrutura"]
+            },
+            "acabamento": {
+                "fita_metros": round(p["fita_parede_metros"], 2),
+                "massa_corrida_kg": round(p["massa_parede_kg"], 2),
+                "massa_rapida_kg": round(p["massa_rapida_kg"], 2)
+            },
+            "isolamento": {
+                "la_mineral_m2": round(p["la_mineral_m2"], 2),
+                "la_mineral_rolos": p["la_mineral_rolos"]
+            }
+        }
+        if self.ambientes.parede_dupla[i]:
+            # Mesmas contas de calcular_parede_dupla, sobre os valores já arredondados
+            resultado["chapas"]["quantidade"] *= 2
+            resultado["chapas"]["area_total_m2"] *= 2
+            resultado["fixacao"]["parafusos_chapa_estrutura"] *= 1.5
+            resultado["acabamento"]["fita_metros"] *= 1.3
+            resultado["acabamento"]["massa_corrida_kg"] *= 1.3
+            resultado["tipo_parede"] = "DUPLA - Maior isolamento acústico"
+        return resultado
+
+    def forro(self, i: int, tipo_chapa: TipoChapa = TipoChapa.STANDARD) -> Dict:
+        """Dicionário de calcular_forro para o ambiente ``i``"""
+        f = {nome: valores[i].item() for nome, valores in self.forros.items()}
+        if self.estrutura_metalica:
+            estrutura = {
+                nome: {
+                    "metros_lineares": round(f[f"{chave}_metros"], 2),
+                    "quantidade_barras_3m": f[f"{chave}_barras_3m"]
+                }
+                for nome, chave in (("perfis_principais_F530", "principais"), ("travessas_F530", "travessas"),
+                                    ("cantoneira_perimetral", "cantoneira"))
+            }
+            estrutura["tirantes"] = f["tirantes"]
+            estrutura["suportes_niveladores"] = f["tirantes"]
+        else:
+            estrutura = {"tipo": "Estrutura de madeira - calcular separadamente"}
+        return {
+            "resumo": {
+                "area_forro": round(f["area_forro"], 2),
+                "perimetro": round(self.paredes["perimetro"][i].item(), 2)
+            },
+            "chapas": {
+                "tipo": tipo_chapa.value,
+                "quantidade": f["chapas_forro"],
+                "area_total_m2": round(f["area_chapas_forro"], 2)
+            },
+            "estrutura_metalica": estrutura,
+            "fixacao": {
+                "parafusos_chapa_estrutura": f["parafusos_forro"],
+                "buchas_tirantes": f["tirantes"]
+            },
+            "acabamento": {
+                "fita_metros": round(f["fita_forro_metros"], 2),
+                "massa_corrida_kg": round(f["massa_forro_kg"], 2)
+            }
+        }
+
+
+def _ler_tabela(caminho: Path) -> pd.DataFrame:
+    if caminho.suffix == ".parquet":
+        return pd.read_parquet(caminho)
+    return pd.read_csv(caminho)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantitativos de drywall para muitos ambientes de uma vez")
+    parser.add_argument("entrada", help="CSV ou Parquet com " + ", ".join(COLUNAS_ENTRADA))
+    parser.add_argument("--saida", help="CSV ou Parquet com os quantitativos por ambiente")
+    parser.add_argument("--altura-chapa", type=float, default=2.40)
+    parser.add_argument("--sem-estrutura-forro", action="store_true", help="Forro em estrutura de madeira")
+    args = parser.parse_args()
+
+    lote = AmbientesLote.de_dataframe(_ler_tabela(Path(args.entrada)))
+    inicio = time.perf_counter()
+    quantitativos = CalculadorDrywallLote(lote).calcular(args.altura_chapa, not args.sem_estrutura_forro)
+    df = quantitativos.dataframe()
+    print(f"📐 {len(lote)} ambientes em {time.perf_counter() - inicio:.3f} s")
+    for nome, valor in quantitativos.totais().items():
+        print(f"  {nome:.<28} {valor:>14,.2f}" if isinstance(valor, float) else f"  {nome:.<28} {valor:>14,}")
+
+    if args.saida:
+        saida = Path(args.saida)
+        if saida.suffix == ".parquet":
+            df.to_parquet(saida, index=False)
+        else:
+            df.to_csv(saida, index=False)
+        print(f"💾 Quantitativos salvos em: {saida}")
+
+
+if __name__ == "__main__":
+    main()
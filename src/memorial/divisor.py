@@ -0,0 +1,163 @@
+"""
+Divisão em streaming de memoriais descritivos nas seções "N. TÍTULO"
+
+O ``split_memorial.py`` original lia o memorial inteiro, aplicava um
+``re.split`` e montava um dicionário com todas as seções antes de gravar a
+primeira. Aqui o arquivo é lido linha a linha (em bytes): cada linha de
+título fecha a seção anterior, que já foi sendo gravada em disco à medida
+que as linhas chegavam. A memória fica limitada a uma linha, mesmo com o
+``memorial_unificado.txt`` de várias centenas de MB.
+
+Para cada seção é devolvido o intervalo de bytes do corpo no arquivo de
+origem (sem os espaços das pontas, como o ``strip()`` antigo), então
+``mmap[inicio:fim]`` devolve exatamente o texto gravado na seção, sem
+dividir o memorial de novo (ver src/memorial/indice.py).
+
+Uso:
+    from src.memorial.divisor import dividir_memorial
+    for secao in dividir_memorial("dados/memorial_estrutural.txt", "dados/saidas_split"):
+        print(secao.titulo, secao.inicio, secao.fim)
+"""
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+try:
+    from unidecode import unidecode
+except ImportError:  # dependência opcional
+    unidecode = None
+
+REGEX_TITULO = re.compile(r'\s*(\d{1,3}\.\s*[A-Z].+)')
+
+
+def _ascii(texto: str) -> str:
+    if unidecode is not None:
+        return unidecode(texto)
+    decomposto = unicodedata.normalize("NFD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def gerar_tag(titulo: str, idx: int) -> str:
+    """Nome do arquivo da seção: índice + no máximo 8 palavras, sem caracteres perigosos"""
+    palavras = _ascii(titulo.lower()).replace('.', '').replace('-', ' ').split()
+    tag_curta = "_".join(palavras[:8])
+    return f"{idx:02d}_{tag_curta}"
+
+
+def chave_titulo(titulo: str) -> str:
+    """Tag normalizada do título, sem numeração nem acentos ("2. FUNDAÇÕES" -> "fundacoes")"""
+    sem_numero = re.sub(r'^\d{1,3}\.\s*', '', titulo)
+    return re.sub(r'[^a-z0-9]+', '_', _ascii(sem_numero.lower())).strip('_')
+
+
+def titulo_da_linha(linha: str) -> Optional[str]:
+    """Título "N. TÍTULO" se a linha for um cabeçalho de seção"""
+    match = REGEX_TITULO.fullmatch(linha.rstrip('\r\n'))
+    return match.group(1).strip() if match else None
+
+
+@dataclass
+class Secao:
+    ordem: int
+    titulo: str
+    tag: str  # nome do arquivo da seção, sem extensão
+    arquivo: str
+    cabecalho: int  # offset da linha de título no arquivo de origem (-1 na INTRO)
+    inicio: int  # intervalo [inicio, fim) do corpo, em bytes, no arquivo de origem
+    fim: int
+    sha256: str = ""  # do corpo
+    chave: str = ""  # chave_titulo(titulo), para busca
+
+    @property
+    def bytes(self) -> int:
+        return self.fim - self.inicio
+
+
+class _Escritor:
+    """Grava o corpo de uma seção com ``strip()`` incremental, sem guardá-lo em memória"""
+
+    def __init__(self, caminho: Path, gravar: bool = True):
+        self.caminho = caminho
+        self.gravar = gravar
+        self.hash = hashlib.sha256()
+        self.arquivo = None
+        self.pendente = ""  # espaços que só são gravados se vier mais conteúdo
+        self.inicio: Optional[int] = None
+        self.fim: Optional[int] = None
+
+    def linha(self, linha: str, offset: int, tamanho: int):
+        if not linha.strip():
+            if self.inicio is not None:
+                self.pendente += linha
+            return
+        if self.inicio is None:
+            texto = linha.lstrip()
+            self.inicio = offset + len(linha[:len(linha) - len(texto)].encode('utf-8'))
+            if self.gravar:
+                self.arquivo = open(self.caminho, 'w', encoding='utf-8', newline='')
+        else:
+            texto = self.pendente + linha
+        corpo = texto.rstrip()
+        self.pendente = texto[len(corpo):]
+        self.hash.update(corpo.encode('utf-8'))
+        if self.arquivo is not None:
+            self.arquivo.write(corpo)
+        self.fim = offset + tamanho - len(self.pendente.encode('utf-8'))
+
+    def fechar(self, criar_vazio: bool, offset: int) -> bool:
+        """Fecha o arquivo; seções sem corpo só geram arquivo (vazio) se ``criar_vazio``"""
+        if self.inicio is not None:
+            if self.arquivo is not None:
+                self.arquivo.close()
+            return True
+        if criar_vazio:
+            if self.gravar:
+                self.caminho.write_text("", encoding='utf-8')
+            self.inicio = self.fim = offset
+            return True
+        return False
+
+
+def dividir_memorial(entrada, dir_saida=None, nomear: Callable[[str, int], str] = gerar_tag) -> Iterator[Secao]:
+    """
+    Grava cada seção de ``entrada`` em ``dir_saida/<tag>.txt`` e a devolve assim que fecha.
+
+    O texto antes do primeiro título vira a seção INTRO (só se não for vazio).
+    Títulos repetidos geram seções separadas, numeradas em sequência.
+    Sem ``dir_saida`` nada é gravado: só as seções são devolvidas (indexação).
+    """
+    gravar = dir_saida is not None
+    dir_saida = Path(dir_saida if gravar else ".")
+    if gravar:
+        dir_saida.mkdir(parents=True, exist_ok=True)
+    ordem = 1
+    titulo, cabecalho = 'INTRO', -1
+    escritor = _Escritor(dir_saida / f"{nomear(titulo, ordem)}.txt", gravar)
+    offset = 0
+
+    def fechar() -> Optional[Secao]:
+        if not escritor.fechar(criar_vazio=cabecalho >= 0, offset=offset):
+            return None
+        return Secao(ordem, titulo, escritor.caminho.stem, escritor.caminho.name, cabecalho,
+                     escritor.inicio, escritor.fim, escritor.hash.hexdigest(), chave_titulo(titulo))
+
+    with open(entrada, 'rb') as f:
+        for bruto in f:
+            linha = bruto.decode('utf-8')
+            novo_titulo = titulo_da_linha(linha)
+            if novo_titulo is None:
+                escritor.linha(linha, offset, len(bruto))
+            else:
+                secao = fechar()
+                if secao is not None:
+                    yield secao
+                    ordem += 1
+                titulo, cabecalho = novo_titulo, offset
+                escritor = _Escritor(dir_saida / f"{nomear(titulo, ordem)}.txt", gravar)
+            offset += len(bruto)
+    secao = fechar()
+    if secao is not None:
+        yield secao
@@ -0,0 +1,192 @@
+"""
+Índice de seções (sidecar) e acesso direto por mmap aos memoriais
+
+Ao lado de cada memorial (``memorial_unificado.txt``) fica o índice
+``memorial_unificado.txt.indice.json``. Ele guarda, por seção, o título, a
+tag normalizada, o intervalo de bytes do corpo e o SHA-256, além do
+SHA-256 do arquivo inteiro. O ``MemorialIndexado`` mapeia o memorial com
+``mmap`` e devolve as seções como ``memoryview`` (sem cópia) ou ``str``,
+sem reler nem dividir o texto.
+
+O índice só é refeito quando o conteúdo muda. Se tamanho e data de
+modificação conferem com o sidecar, ele é usado direto. Se só a data mudou
+(arquivo copiado ou salvo de novo sem alterações), o checksum é
+recalculado e, se bater, o sidecar é apenas atualizado.
+
+Uso:
+    from src.memorial.indice import MemorialIndexado
+    with MemorialIndexado("dados/memorial_unificado.txt") as memorial:
+        for secao in memorial:
+            print(secao.ordem, secao.titulo, secao.bytes)
+        texto = memorial.texto("fundacoes")
+
+CLI:
+    python -m src.memorial.indice dados/memorial_unificado.txt
+    python -m src.memorial.indice dados/memorial_unificado.txt --secao fundacoes
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .divisor import Secao, chave_titulo, dividir_memorial
+
+VERSAO_INDICE = 1
+SUFIXO_SIDECAR = ".indice.json"
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def caminho_sidecar(origem) -> Path:
+    origem = Path(origem)
+    return origem.with_name(origem.name + SUFIXO_SIDECAR)
+
+
+def sha256_arquivo(caminho) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def salvar_indice(secoes: List[Secao], origem, caminho=None, sha256: Optional[str] = None) -> Path:
+    """Grava o sidecar de ``origem`` (escrita atômica); ``sha256`` evita reler o arquivo"""
+    origem = Path(origem)
+    caminho = Path(caminho or caminho_sidecar(origem))
+    estado = origem.stat()
+    indice = {
+        "versao": VERSAO_INDICE,
+        "origem": origem.name,
+        "tamanho": estado.st_size,
+        "modificado_em": estado.st_mtime,
+        "sha256": sha256 or sha256_arquivo(origem),
+        "secoes": [asdict(s) for s in secoes],
+    }
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+    return caminho
+
+
+def carregar_indice(caminho) -> Optional[Dict]:
+    """Conteúdo do sidecar (seções já como ``Secao``); None se ausente, ilegível ou de outra versão"""
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if indice.get("versao") != VERSAO_INDICE:
+        return None
+    indice["secoes"] = [Secao(**s) for s in indice["secoes"]]
+    return indice
+
+
+def indexar(origem, sidecar=None) -> List[Secao]:
+    """Varre o memorial (sem gravar as seções) e grava o sidecar"""
+    secoes = list(dividir_memorial(origem))
+    salvar_indice(secoes, origem, sidecar)
+    return secoes
+
+
+def indice_atualizado(origem, sidecar=None) -> Tuple[List[Secao], bool]:
+    """Seções do sidecar, refazendo o índice só se o checksum mudou; (seções, reconstruído)"""
+    sidecar = Path(sidecar or caminho_sidecar(origem))
+    indice = carregar_indice(sidecar)
+    estado = Path(origem).stat()
+    if indice is not None and indice["tamanho"] == estado.st_size:
+        if indice["modificado_em"] == estado.st_mtime:
+            return indice["secoes"], False
+        sha256 = sha256_arquivo(origem)
+        if sha256 == indice["sha256"]:
+            salvar_indice(indice["secoes"], origem, sidecar, sha256)
+            return indice["secoes"], False
+    return indexar(origem, sidecar), True
+
+
+class MemorialIndexado:
+    """Memorial mapeado em memória, com acesso às seções pelo índice sidecar"""
+
+    def __init__(self, caminho, sidecar=None):
+        self.caminho = Path(caminho)
+        self.secoes, self.reconstruido = indice_atualizado(self.caminho, sidecar)
+        self._arquivo = open(self.caminho, "rb")
+        tamanho = os.fstat(self._arquivo.fileno()).st_size
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ) if tamanho else None
+        self._busca: Dict[str, Secao] = {}
+        for secao in reversed(self.secoes):  # títulos repetidos: vale a primeira ocorrência
+            for chave in (secao.titulo, secao.tag, secao.chave):
+                self._busca[chave] = secao
+
+    def __len__(self) -> int:
+        return len(self.secoes)
+
+    def __iter__(self) -> Iterator[Secao]:
+        return iter(self.secoes)
+
+    def secao(self, chave: Union[int, str, Secao]) -> Secao:
+        """Seção pela ordem (1 = primeira), título, tag do arquivo ou tag normalizada"""
+        if isinstance(chave, Secao):
+            return chave
+        if isinstance(chave, int):
+            return self.secoes[chave - 1]
+        secao = self._busca.get(chave) or self._busca.get(chave_titulo(chave))
+        if secao is None:
+            raise KeyError(chave)
+        return secao
+
+    def memoria(self, chave: Union[int, str, Secao]) -> memoryview:
+        """Bytes do corpo sem cópia; libere a view (``release()``) antes de ``fechar()``"""
+        secao = self.secao(chave)
+        if self._mapa is None:
+            return memoryview(b"")
+        return memoryview(self._mapa)[secao.inicio:secao.fim]
+
+    def texto(self, chave: Union[int, str, Secao]) -> str:
+        with self.memoria(chave) as view:
+            return str(view, "utf-8")
+
+    def verificar(self, chave: Union[int, str, Secao]) -> bool:
+        """Confere o SHA-256 da seção com o do índice"""
+        secao = self.secao(chave)
+        with self.memoria(secao) as view:
+            return hashlib.sha256(view).hexdigest() == secao.sha256
+
+    def fechar(self):
+        if self._mapa is not None:
+            self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self) -> "MemorialIndexado":
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Índice de seções e leitura direta de memoriais")
+    parser.add_argument("memorial", help="Memorial em texto (ex.: dados/memorial_unificado.txt)")
+    parser.add_argument("--secao", help="Imprime a seção (ordem, título ou tag)")
+    parser.add_argument("--reindexar", action="store_true", help="Refaz o índice mesmo sem mudanças")
+    args = parser.parse_args()
+
+    if args.reindexar:
+        indexar(args.memorial)
+    with MemorialIndexado(args.memorial) as memorial:
+        if args.secao:
+            chave = int(args.secao) if args.secao.isdigit() else args.secao
+            print(memorial.texto(chave))
+            return
+        estado = "reconstruído" if memorial.reconstruido else "em dia"
+        print(f"📑 {len(memorial)} seções, índice {estado}: {caminho_sidecar(args.memorial)}")
+        for secao in memorial:
+            print(f"  {secao.ordem:>4}  {secao.inicio:>12}  {secao.bytes:>10} B  {secao.titulo}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Registros de ambientes e aberturas para estimativas em grande escala
+
+``DimensoesAmbiente`` e ``Abertura`` são dataclasses comuns: cada objeto
+carrega um ``__dict__`` e ``perimetro``/``area_piso``/``area`` são
+recalculados a cada acesso; ``CalculadorDrywall.aberturas`` é uma lista
+somada a cada chamada. Aqui:
+
+- ``RegistroAbertura`` e ``RegistroAmbiente`` são imutáveis e com
+  ``__slots__``. Os valores derivados (área, perímetro, área das aberturas)
+  são calculados uma vez, na criação, com as mesmas expressões de
+  drywall.py. Os registros servem onde se espera ``DimensoesAmbiente`` e
+  ``Abertura`` (``CalculadorDrywall``, ``ServicoCalculo``).
+- ``TabelaAmbientes`` guarda os ambientes em colunas numpy (cerca de 33
+  bytes por ambiente). É um ``AmbientesLote``, então ``CalculadorDrywallLote``,
+  ``AgregadorMateriais`` e ``OtimizadorCorte`` a consomem direto.
+
+Uso:
+    from src.modules.drywall.models.drywall_model import RegistroAbertura, RegistroAmbiente, TabelaAmbientes
+    quarto = RegistroAmbiente(3.2, 2.8, 2.7, (RegistroAbertura(0.8, 2.1),))
+    tabela = TabelaAmbientes.de_registros([quarto] * 1000)
+    CalculadorDrywallLote(tabela).calcular().totais()
+
+Benchmark de memória:
+    python -m src.modules.drywall.models.drywall_model --ambientes 1000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from src.materials.drywall import Abertura, CalculadorDrywall, DimensoesAmbiente
+from src.materials.drywall_lote import AmbientesLote
+
+
+@dataclass(frozen=True, slots=True)
+class RegistroAbertura:
+    """Porta ou janela (mesmos campos de Abertura), com a área já calculada"""
+    largura: float
+    altura: float
+    tipo: str = "porta"
+    area: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "area", self.largura * self.altura)
+
+
+@dataclass(frozen=True, slots=True)
+class RegistroAmbiente:
+    """Ambiente (mesmos campos de DimensoesAmbiente) com aberturas e valores derivados"""
+    comprimento: float
+    largura: float
+    altura: float
+    aberturas: Tuple[RegistroAbertura, ...] = ()
+    parede_dupla: bool = False
+    area_piso: float = field(init=False, repr=False, compare=False)
+    perimetro: float = field(init=False, repr=False, compare=False)
+    area_aberturas: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.aberturas, tuple):
+            object.__setattr__(self, "aberturas", tuple(self.aberturas))
+        object.__setattr__(self, "area_piso", self.comprimento * self.largura)
+        object.__setattr__(self, "perimetro", 2 * (self.comprimento + self.largura))
+        # mesma ordem de soma de calcular_parede_simples
+        object.__setattr__(self, "area_aberturas", sum(ab.area for ab in self.aberturas))
+
+    @classmethod
+    def de_calculador(cls, calculador: CalculadorDrywall, parede_dupla: bool = False) -> "RegistroAmbiente":
+        amb = calculador.ambiente
+        return cls(amb.comprimento, amb.largura, amb.altura,
+                   tuple(RegistroAbertura(ab.largura, ab.altura, ab.tipo) for ab in calculador.aberturas),
+                   parede_dupla)
+
+    def calculador(self) -> CalculadorDrywall:
+        """CalculadorDrywall deste ambiente (o registro faz o papel de DimensoesAmbiente)"""
+        calculador = CalculadorDrywall(self)
+        calculador.aberturas = list(self.aberturas)
+        return calculador
+
+
+class TabelaAmbientes(AmbientesLote):
+    """Ambientes em colunas numpy; perímetro e área de piso calculados uma vez por tabela"""
+
+    @cached_property
+    def perimetro(self) -> np.ndarray:
+        return 2 * (self.comprimento + self.largura)
+
+    @cached_property
+    def area_piso(self) -> np.ndarray:
+        return self.comprimento * self.largura
+
+    @classmethod
+    def de_registros(cls, registros: Iterable[RegistroAmbiente], n: Optional[int] = None) -> "TabelaAmbientes":
+        """Preenche as colunas registro a registro; com ``n``, sem lista intermediária"""
+        if n is None:
+            registros = list(registros)
+            n = len(registros)
+        colunas = np.empty((4, n))
+        dupla = np.empty(n, dtype=bool)
+        i = -1
+        for i, registro in enumerate(registros):
+            if i >= n:
+                raise ValueError(f"Mais de {n} registros")
+            colunas[:, i] = (registro.comprimento, registro.largura, registro.altura, registro.area_aberturas)
+            dupla[i] = registro.parede_dupla
+        if i + 1 != n:
+            raise ValueError(f"Esperados {n} registros, recebidos {i + 1}")
+        return cls(colunas[0], colunas[1], colunas[2], colunas[3], dupla)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória das colunas (sem contar as derivadas já calculadas)"""
+        return sum(getattr(self, nome).nbytes for nome in ("comprimento", "largura", "altura",
+                                                            "area_aberturas", "parede_dupla"))
+
+    def registro(self, i: int) -> RegistroAmbiente:
+        """Ambiente ``i`` como registro (as aberturas viram uma só, com a área somada)"""
+        area = float(self.area_aberturas[i])
+        aberturas = (RegistroAbertura(area, 1.0, "aberturas"),) if area else ()
+        return RegistroAmbiente(float(self.comprimento[i]), float(self.largura[i]), float(self.altura[i]),
+                                aberturas, bool(self.parede_dupla[i]))
+
+
+def _medir(construir) -> Tuple[float, float]:
+    """(MB que continuam alocados, segundos) para construir o objeto
+
+    O tempo é medido numa construção separada, sem o tracemalloc ligado.
+    """
+    inicio = time.perf_counter()
+    objeto = construir()
+    segundos = time.perf_counter() - inicio
+    del objeto
+    gc.collect()
+    tracemalloc.start()
+    objeto = construir()
+    atual, _pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objeto
+    return atual / 1024 / 1024, segundos
+
+
+def _calculador(comprimento: float, largura: float, altura: float, abertura: Abertura) -> CalculadorDrywall:
+    calculador = CalculadorDrywall(DimensoesAmbiente(comprimento, largura, altura))
+    calculador.adicionar_abertura(abertura)
+    return calculador
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória de N ambientes: calculadores, registros e tabela")
+    parser.add_argument("--ambientes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    n = args.ambientes
+    r = np.random.default_rng(0)
+    comprimentos = r.uniform(1.5, 8, n).round(2).tolist()
+    larguras = r.uniform(1.2, 6, n).round(2).tolist()
+    porta, portas = Abertura(0.8, 2.1), (RegistroAbertura(0.8, 2.1),)
+
+    casos = {
+        "CalculadorDrywall + Abertura": lambda: [_calculador(c, l, 2.7, porta) for c, l in zip(comprimentos, larguras)],
+        "RegistroAmbiente": lambda: [RegistroAmbiente(c, l, 2.7, portas) for c, l in zip(comprimentos, larguras)],
+        "TabelaAmbientes": lambda: TabelaAmbientes.criar(np.array(comprimentos), np.array(larguras),
+                                                         np.full(n, 2.7), np.full(n, portas[0].area)),
+    }
+    print(f"📦 {n:,} ambientes (1 porta cada)")
+    for nome, construir in casos.items():
+        mb, segundos = _medir(construir)
+        print(f"  {nome:.<30} {mb:>9.1f} MB  {mb * 1024 * 1024 / n:>6.0f} B/ambiente  {segundos:>6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
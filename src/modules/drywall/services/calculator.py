@@ -0,0 +1,165 @@
+"""
+Serviço de cálculo de drywall com memoização
+
+Prédios residenciais repetem a mesma tipologia de apartamento dezenas de
+vezes, e cada ambiente repetido passava por ``CalculadorDrywall`` (e
+``QuantityCalculator``) de novo. Aqui as entradas viram uma chave canônica —
+medidas arredondadas ao milímetro, aberturas ordenadas, tipo de parede,
+tipo e espessura de chapa — e o resultado fica num LRU limitado
+(cachetools): cada ambiente distinto é calculado uma vez.
+
+O cálculo é feito a partir da chave (medidas já arredondadas e aberturas na
+ordem canônica), então o resultado não depende de qual ambiente equivalente
+chegou primeiro. O tipo da abertura (porta/janela) não entra na chave: só a
+área dela conta no cálculo. Cada consulta recebe uma cópia do resultado, que
+pode ser alterada à vontade; quem só lê (laços de milhares de ambientes)
+pode passar ``copiar=False`` e receber o dicionário do próprio cache.
+
+Uso:
+    from src.modules.drywall.services.calculator import obter_servico
+    servico = obter_servico()
+    parede = servico.parede(DimensoesAmbiente(4.0, 3.0, 2.7), [Abertura(0.8, 2.1)])
+    forro = servico.forro(DimensoesAmbiente(4.0, 3.0, 2.7))
+    servico.estatisticas()  # acertos, falhas, taxa_acerto, entradas...
+"""
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+from src.core.quantity_calculator import QuantityCalculator
+from src.materials.drywall import Abertura, CalculadorDrywall, DimensoesAmbiente, EspessuraChapa, TipoChapa
+
+TAMANHO_PADRAO = 4096  # resultados distintos guardados
+
+ChaveAberturas = Tuple[Tuple[int, int], ...]
+
+
+def _mm(valor: float) -> int:
+    return int(round(valor * 1000))
+
+
+def chave_aberturas(aberturas: Iterable[Abertura]) -> ChaveAberturas:
+    """Aberturas em mm, ordenadas: a mesma parede com portas em outra ordem dá a mesma chave"""
+    return tuple(sorted((_mm(ab.largura), _mm(ab.altura)) for ab in aberturas))
+
+
+def chave_ambiente(ambiente: DimensoesAmbiente) -> Tuple[int, int, int]:
+    return _mm(ambiente.comprimento), _mm(ambiente.largura), _mm(ambiente.altura)
+
+
+def _copiar(valor):
+    """Cópia dos dicionários/listas do resultado (mais barata que copy.deepcopy)"""
+    if isinstance(valor, dict):
+        return {chave: _copiar(v) for chave, v in valor.items()}
+    if isinstance(valor, list):
+        return [_copiar(v) for v in valor]
+    return valor
+
+
+def _calculador(dimensoes: Tuple[int, int, int], aberturas: ChaveAberturas = ()) -> CalculadorDrywall:
+    """CalculadorDrywall com as medidas canônicas da chave"""
+    comprimento, largura, altura = (v / 1000 for v in dimensoes)
+    calculador = CalculadorDrywall(DimensoesAmbiente(comprimento, largura, altura))
+    for largura_ab, altura_ab in aberturas:
+        calculador.adicionar_abertura(Abertura(largura_ab / 1000, altura_ab / 1000))
+    return calculador
+
+
+class ServicoCalculo:
+    """Fachada de CalculadorDrywall/QuantityCalculator com cache LRU por chave canônica"""
+
+    def __init__(self, tamanho: int = TAMANHO_PADRAO):
+        self._cache: LRUCache = LRUCache(maxsize=tamanho)
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def _obter(self, chave: Hashable, calcular, copiar: bool = True):
+        with self._lock:
+            valor = self._cache.get(chave)
+            if valor is None:
+                self.falhas += 1
+            else:
+                self.acertos += 1
+        if valor is None:
+            valor = calcular()
+            with self._lock:
+                self._cache[chave] = valor
+        return _copiar(valor) if copiar else valor
+
+    def parede(self, ambiente: DimensoesAmbiente, aberturas: Iterable[Abertura] = (),
+               tipo_parede: str = "simples", tipo_chapa: TipoChapa = TipoChapa.STANDARD,
+               espessura: EspessuraChapa = EspessuraChapa.E12_5, altura_chapa: float = 2.40,
+               copiar: bool = True) -> Dict:
+        """calcular_parede_simples ou calcular_parede_dupla (``tipo_parede``)"""
+        if tipo_parede not in ("simples", "dupla"):
+            raise ValueError(f"Tipo de parede desconhecido: {tipo_parede}")
+        dimensoes, chave_ab = chave_ambiente(ambiente), chave_aberturas(aberturas)
+        # calcular_parede_dupla sempre usa a chapa de 2.40 m
+        altura_mm = _mm(altura_chapa) if tipo_parede == "simples" else _mm(CalculadorDrywall.CHAPA_ALTURA)
+        chave = ("parede", dimensoes, chave_ab, tipo_parede, tipo_chapa.value, espessura.value, altura_mm)
+
+        def calcular():
+            calculador = _calculador(dimensoes, chave_ab)
+            if tipo_parede == "dupla":
+                return calculador.calcular_parede_dupla(tipo_chapa, espessura)
+            return calculador.calcular_parede_simples(tipo_chapa, espessura, altura_mm / 1000)
+        return self._obter(chave, calcular, copiar)
+
+    def forro(self, ambiente: DimensoesAmbiente, tipo_chapa: TipoChapa = TipoChapa.STANDARD,
+              estrutura_metalica: bool = True, copiar: bool = True) -> Dict:
+        dimensoes = chave_ambiente(ambiente)
+        chave = ("forro", dimensoes, tipo_chapa.value, bool(estrutura_metalica))
+        return self._obter(chave, lambda: _calculador(dimensoes).calcular_forro(tipo_chapa, estrutura_metalica),
+                           copiar)
+
+    def relatorio(self, ambiente: DimensoesAmbiente, aberturas: Iterable[Abertura] = (),
+                  incluir_parede: bool = True, incluir_forro: bool = True, tipo_parede: str = "simples",
+                  copiar: bool = True) -> Dict:
+        """gerar_relatorio_completo (dados do ambiente, quantitativos e lista de compras)"""
+        dimensoes, chave_ab = chave_ambiente(ambiente), chave_aberturas(aberturas)
+        chave = ("relatorio", dimensoes, chave_ab, bool(incluir_parede), bool(incluir_forro), tipo_parede)
+        return self._obter(chave, lambda: _calculador(dimensoes, chave_ab).gerar_relatorio_completo(
+            incluir_parede, incluir_forro, tipo_parede), copiar)
+
+    def do_calculador(self, calculador: CalculadorDrywall, tipo_parede: str = "simples",
+                      copiar: bool = True) -> Dict:
+        """Relatório de um CalculadorDrywall já montado, pelo cache"""
+        return self.relatorio(calculador.ambiente, calculador.aberturas, tipo_parede=tipo_parede, copiar=copiar)
+
+    def area_parede(self, comprimento: float, altura: float,
+                    aberturas: Optional[List[Dict[str, float]]] = None) -> float:
+        """QuantityCalculator.wall_area com aberturas ({'width', 'height'}) ordenadas"""
+        chave_ab = tuple(sorted((_mm(op.get("width", 0)), _mm(op.get("height", 0))) for op in aberturas or []))
+        chave = ("area_parede", _mm(comprimento), _mm(altura), chave_ab)
+        return self._obter(chave, lambda: QuantityCalculator.wall_area(
+            _mm(comprimento) / 1000, _mm(altura) / 1000,
+            [{"width": w / 1000, "height": h / 1000} for w, h in chave_ab]))
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "entradas": len(self._cache),
+                "tamanho_maximo": int(self._cache.maxsize),
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / consultas, 3) if consultas else 0.0,
+            }
+
+    def limpar(self):
+        with self._lock:
+            self._cache.clear()
+            self.acertos = self.falhas = 0
+
+
+_SERVICO: Optional[ServicoCalculo] = None
+
+
+def obter_servico() -> ServicoCalculo:
+    """Serviço compartilhado do processo"""
+    global _SERVICO
+    if _SERVICO is None:
+        _SERVICO = ServicoCalculo()
+    return _SERVICO
@@ -0,0 +1,351 @@
+"""
+Plano de corte de perfis (barras de 3 m) e chapas (1.20 x 2.40 m)
+
+``CalculadorDrywall`` estima chapas como ``ceil(area / area_chapa)`` mais 10%
+e perfis como ``ceil(metros / 3)`` mais 5%. Aqui as peças de cada ambiente
+(montantes, guias, F530, cantoneiras e os recortes de chapa de cada face de
+parede e de forro) são juntadas para o projeto inteiro e encaixadas em
+ordem decrescente de tamanho, sempre no menor pedaço que ainda serve — inclusive
+nas sobras de outros ambientes. A perda informada é a do plano, não um
+percentual fixo.
+
+- Perfis (1D): montantes M70, guias G70, F530 e cantoneira em barras de 3 m.
+  Trechos maiores que a barra são emendados (barras inteiras + resto).
+- Chapas (2D): cortes guilhotinados, com giro das peças opcional. Cada face
+  de parede ou de forro é dividida em faixas de 1.20 m e trechos de 2.40 m;
+  aberturas não são descontadas, porque o recorte da porta/janela sai de
+  uma chapa inteira e normalmente vira refugo.
+
+Peças iguais são tratadas em grupo (quantidade por medida em mm), então o
+custo depende do número de medidas diferentes e não do número de peças: um
+prédio inteiro sai em segundos.
+
+Uso:
+    from src.modules.drywall.services.optimizer import OtimizadorCorte
+    otimizador = OtimizadorCorte()
+    otimizador.adicionar_lote(lote)  # AmbientesLote de src/materials/drywall_lote.py
+    relatorio = otimizador.otimizar()
+    print(relatorio.texto())
+"""
+import bisect
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.materials.drywall import CalculadorDrywall, DimensoesAmbiente
+from src.materials.drywall_lote import AmbientesLote, CalculadorDrywallLote
+
+BARRA_MM = 3000
+CHAPA_MM = (1200, 2400)  # largura x altura
+SOBRA_MINIMA_PERFIL_MM = 300   # sobras menores são refugo
+SOBRA_MINIMA_CHAPA_MM = 200    # menor lado de uma sobra de chapa aproveitável
+
+PERFIS = ("M70", "G70", "F530", "CANTONEIRA")
+
+Peca2D = Tuple[int, int]
+
+
+def _mm(valores) -> np.ndarray:
+    return np.rint(np.asarray(valores, dtype=np.float64) * 1000).astype(np.int64)
+
+
+def _contar(medidas: np.ndarray, quantidades: np.ndarray, destino: Counter):
+    """Soma ``quantidades`` por medida (escalar em mm ou par largura x altura)"""
+    medidas, quantidades = np.asarray(medidas), np.asarray(quantidades, dtype=np.int64)
+    validas = quantidades > 0
+    if medidas.ndim == 1:
+        validas &= medidas > 0
+    else:
+        validas &= (medidas > 0).all(axis=1)
+    if not validas.any():
+        return
+    chaves, inverso = np.unique(medidas[validas], axis=0, return_inverse=True)
+    somas = np.bincount(inverso.ravel(), weights=quantidades[validas])
+    for chave, soma in zip(chaves.tolist(), somas.tolist()):
+        destino[tuple(chave) if isinstance(chave, list) else chave] += int(soma)
+
+
+def _trechos(comprimentos_mm: np.ndarray, quantidades: np.ndarray, destino: Counter, barra: int = BARRA_MM):
+    """Trechos lineares: os maiores que a barra viram barras inteiras emendadas com o resto"""
+    inteiras, resto = np.divmod(comprimentos_mm, barra)
+    _contar(np.full(len(inteiras), barra), inteiras * quantidades, destino)
+    _contar(resto, quantidades, destino)
+
+
+def _faces(larguras_mm: np.ndarray, alturas_mm: np.ndarray, quantidades: np.ndarray, destino: Counter,
+           chapa: Peca2D = CHAPA_MM):
+    """Recortes de chapa de superfícies largura x altura: faixas da largura da chapa, trechos da altura"""
+    bw, bh = chapa
+    n_l, r_l = np.divmod(larguras_mm, bw)
+    n_a, r_a = np.divmod(alturas_mm, bh)
+    for largura, altura, n in ((bw, bh, n_l * n_a), (r_l, bh, n_a), (bw, r_a, n_l), (r_l, r_a, 1)):
+        largura = np.broadcast_to(largura, larguras_mm.shape)
+        altura = np.broadcast_to(altura, larguras_mm.shape)
+        _contar(np.stack([largura, altura], axis=1), n * quantidades, destino)
+
+
+@dataclass
+class ResultadoPerfil:
+    """Plano de corte de um perfil"""
+    perfil: str
+    barras: int
+    metros_pecas: float
+    sobras_mm: Dict[int, int]  # sobra aproveitável (mm) -> número de barras
+    estimativa_barras: int = 0  # cálculo com perda fixa (CalculadorDrywall)
+    comprimento_barra_mm: int = BARRA_MM
+
+    @property
+    def metros_comprados(self) -> float:
+        return self.barras * self.comprimento_barra_mm / 1000
+
+    @property
+    def perda_m(self) -> float:
+        return self.metros_comprados - self.metros_pecas
+
+    @property
+    def perda_percentual(self) -> float:
+        return 100 * self.perda_m / self.metros_comprados if self.barras else 0.0
+
+    @property
+    def metros_sobras(self) -> float:
+        return sum(mm * n for mm, n in self.sobras_mm.items()) / 1000
+
+
+@dataclass
+class ResultadoChapas:
+    """Plano de corte das chapas"""
+    chapas: int
+    area_pecas: float
+    sobras_mm: Dict[Peca2D, int]  # sobra aproveitável (largura, altura em mm) -> quantidade
+    estimativa_chapas: int = 0
+    chapa_mm: Peca2D = CHAPA_MM
+
+    @property
+    def area_comprada(self) -> float:
+        return self.chapas * self.chapa_mm[0] * self.chapa_mm[1] / 1e6
+
+    @property
+    def perda_m2(self) -> float:
+        return self.area_comprada - self.area_pecas
+
+    @property
+    def perda_percentual(self) -> float:
+        return 100 * self.perda_m2 / self.area_comprada if self.chapas else 0.0
+
+    @property
+    def area_sobras(self) -> float:
+        return sum(w * h * n for (w, h), n in self.sobras_mm.items()) / 1e6
+
+
+def cortar_barras(pecas: Dict[int, int], barra: int = BARRA_MM, corte: int = 0,
+                  sobra_minima: int = SOBRA_MINIMA_PERFIL_MM) -> Tuple[int, Dict[int, int]]:
+    """Encaixe decrescente das peças (mm -> quantidade) em barras
+
+    Cada grupo de peças vai para a menor sobra que ainda serve; barras novas
+    só são abertas quando nenhuma sobra serve. ``corte`` é a espessura do
+    disco, descontada entre peças. Devolve (barras, sobras aproveitáveis).
+    """
+    sobras: Dict[int, int] = {}  # capacidade restante (mm, já com um corte a mais) -> barras
+    chaves: List[int] = []
+    capacidade = barra + corte
+    barras = 0
+
+    def _guardar(resto: int, n: int):
+        if resto <= corte or n <= 0:
+            return
+        if resto not in sobras:
+            bisect.insort(chaves, resto)
+            sobras[resto] = 0
+        sobras[resto] += n
+
+    for medida in sorted(pecas, reverse=True):
+        k = pecas[medida]
+        passo = medida + corte
+        if passo > capacidade:
+            raise ValueError(f"Peça de {medida} mm maior que a barra de {barra} mm")
+        while k:
+            i = bisect.bisect_left(chaves, passo)
+            if i == len(chaves):
+                por_barra = capacidade // passo
+                cheias = k // por_barra
+                barras += cheias
+                _guardar(capacidade - por_barra * passo, cheias)
+                k -= cheias * por_barra
+                if k:
+                    barras += 1
+                    _guardar(capacidade - k * passo, 1)
+                    k = 0
+                continue
+            livre = chaves[i]
+            n = sobras[livre]
+            por_sobra = livre // passo
+            usadas = min(n, k // por_sobra)
+            if usadas == 0:
+                usadas, colocadas = 1, k
+            else:
+                colocadas = usadas * por_sobra
+            sobras[livre] -= usadas
+            if not sobras[livre]:
+                del sobras[livre]
+                chaves.pop(i)
+            if usadas == 1 and colocadas < por_sobra:
+                _guardar(livre - colocadas * passo, 1)
+            else:
+                _guardar(livre - por_sobra * passo, usadas)
+            k -= colocadas
+
+    return barras, {resto - corte: n for resto, n in sobras.items() if resto - corte >= sobra_minima}
+
+
+def _dividir(livre: Peca2D, peca: Peca2D) -> List[Peca2D]:
+    """Corte guilhotinado de ``peca`` no canto de ``livre``: fica a divisão com a maior sobra"""
+    (w, h), (pw, ph) = livre, peca
+    horizontal = [(w - pw, ph), (w, h - ph)]  # corta primeiro na altura da peça
+    vertical = [(w - pw, h), (pw, h - ph)]    # corta primeiro na largura da peça
+    maior = max(max(a * b for a, b in horizontal), max(a * b for a, b in vertical))
+    partes = horizontal if max(a * b for a, b in horizontal) == maior else vertical
+    return [(a, b) for a, b in partes if a > 0 and b > 0]
+
+
+def cortar_chapas(pecas: Dict[Peca2D, int], chapa: Peca2D = CHAPA_MM, girar: bool = True,
+                  sobra_minima: int = SOBRA_MINIMA_CHAPA_MM) -> Tuple[int, Dict[Peca2D, int]]:
+    """Encaixe guilhotinado decrescente (por área) das peças (largura, altura em mm) em chapas
+
+    Cada grupo de peças vai para a menor sobra onde cabe (girada, se
+    ``girar``); chapas novas recebem as peças em grade. Devolve (chapas,
+    sobras aproveitáveis).
+    """
+    bw, bh = chapa
+    livres: Counter = Counter()
+    chapas = 0
+
+    def _orientacoes(peca: Peca2D) -> List[Peca2D]:
+        pw, ph = peca
+        return [peca, (ph, pw)] if girar and pw != ph else [peca]
+
+    for peca in sorted(pecas, key=lambda p: (p[0] * p[1], max(p)), reverse=True):
+        if not any(pw <= bw and ph <= bh for pw, ph in _orientacoes(peca)):
+            raise ValueError(f"Peça {peca[0]}x{peca[1]} mm maior que a chapa {bw}x{bh} mm")
+        k = pecas[peca]
+        while k:
+            melhor = None
+            for livre in livres:
+                for pw, ph in _orientacoes(peca):
+                    if pw <= livre[0] and ph <= livre[1] and (melhor is None or livre[0] * livre[1] < melhor[0][0] * melhor[0][1]):
+                        melhor = (livre, (pw, ph))
+            if melhor is not None:
+                livre, orientada = melhor
+                usadas = min(livres[livre], k)
+                livres[livre] -= usadas
+                if not livres[livre]:
+                    del livres[livre]
+                for parte in _dividir(livre, orientada):
+                    livres[parte] += usadas
+                k -= usadas
+                continue
+
+            # Chapa nova: peças em grade, na orientação que cabe mais
+            pw, ph = max((o for o in _orientacoes(peca) if o[0] <= bw and o[1] <= bh),
+                         key=lambda o: (bw // o[0]) * (bh // o[1]))
+            colunas, linhas = bw // pw, bh // ph
+            por_chapa = colunas * linhas
+            cheias = k // por_chapa
+            if cheias:
+                chapas += cheias
+                for parte in ((bw, bh - linhas * ph), (bw - colunas * pw, linhas * ph)):
+                    if parte[0] > 0 and parte[1] > 0:
+                        livres[parte] += cheias
+                k -= cheias * por_chapa
+            if k:
+                chapas += 1
+                linhas_usadas, resto = divmod(k, colunas)
+                partes = [(bw, bh - (linhas_usadas + (1 if resto else 0)) * ph),
+                          (bw - colunas * pw, linhas_usadas * ph)]
+                if resto:
+                    partes.append((bw - resto * pw, ph))
+                for parte in partes:
+                    if parte[0] > 0 and parte[1] > 0:
+                        livres[parte] += 1
+                k = 0
+
+    return chapas, {p: n for p, n in livres.items() if min(p) >= sobra_minima}
+
+
+@dataclass
+class RelatorioCorte:
+    perfis: Dict[str, ResultadoPerfil] = field(default_factory=dict)
+    chapas: ResultadoChapas = None
+
+    def texto(self) -> str:
+        linhas = ["✂️  PLANO DE CORTE:"]
+        for r in self.perfis.values():
+            linhas.append(f"  • {r.perfil}: {r.barras} barras de {r.comprimento_barra_mm / 1000:g}m "
+                          f"(estimativa {r.estimativa_barras}), perda {r.perda_m:.2f} m "
+                          f"({r.perda_percentual:.1f}%), sobras aproveitáveis {r.metros_sobras:.2f} m")
+        if self.chapas is not None:
+            c = self.chapas
+            linhas.append(f"  • Chapas: {c.chapas} (estimativa {c.estimativa_chapas}), perda {c.perda_m2:.2f} m² "
+                          f"({c.perda_percentual:.1f}%), sobras aproveitáveis {c.area_sobras:.2f} m²")
+        return "\n".join(linhas)
+
+
+class OtimizadorCorte:
+    """Junta as peças de todos os ambientes e monta o plano de corte do projeto"""
+
+    def __init__(self, girar_chapas: bool = True, corte_mm: int = 0,
+                 sobra_minima_perfil: int = SOBRA_MINIMA_PERFIL_MM,
+                 sobra_minima_chapa: int = SOBRA_MINIMA_CHAPA_MM):
+        self.girar_chapas = girar_chapas
+        self.corte_mm = corte_mm
+        self.sobra_minima_perfil = sobra_minima_perfil
+        self.sobra_minima_chapa = sobra_minima_chapa
+        self.perfis: Dict[str, Counter] = {perfil: Counter() for perfil in PERFIS}
+        self.chapas: Counter = Counter()
+        self.estimativas: Counter = Counter()
+
+    def adicionar_lote(self, lote: AmbientesLote, paredes: bool = True, forros: bool = True):
+        """Peças de um bloco de ambientes (a mesma geometria de CalculadorDrywall)"""
+        c, l, h = _mm(lote.comprimento), _mm(lote.largura), _mm(lote.altura)
+        colunas = CalculadorDrywallLote(lote).calcular().colunas()
+        if paredes:
+            montantes = np.ceil(lote.perimetro / CalculadorDrywall.ESPACAMENTO_MONTANTE).astype(np.int64) + 4
+            _trechos(h, montantes, self.perfis["M70"])
+            for lado in (c, l):
+                _trechos(lado, np.full(len(lote), 4), self.perfis["G70"])  # 2 paredes x (superior + inferior)
+                _faces(lado, h, np.where(lote.parede_dupla, 8, 4), self.chapas)  # 2 paredes x 2 faces (x 2 camadas)
+            self.estimativas["M70"] += int(colunas["montantes"].sum())
+            self.estimativas["G70"] += int(colunas["guias_barras_3m"].sum())
+            self.estimativas["chapas"] += int(colunas["chapas_parede"].sum())
+        if forros:
+            principais = np.ceil(lote.largura / CalculadorDrywall.ESPACAMENTO_SUPORTE_FORRO).astype(np.int64)
+            travessas = np.ceil(lote.comprimento / CalculadorDrywall.ESPACAMENTO_SUPORTE_FORRO).astype(np.int64)
+            _trechos(c, principais, self.perfis["F530"])
+            _trechos(l, travessas, self.perfis["F530"])
+            for lado in (c, l):
+                _trechos(lado, np.full(len(lote), 2), self.perfis["CANTONEIRA"])
+            _faces(l, c, np.ones(len(lote), dtype=np.int64), self.chapas)
+            self.estimativas["F530"] += int((colunas["principais_barras_3m"] + colunas["travessas_barras_3m"]).sum())
+            self.estimativas["CANTONEIRA"] += int(colunas["cantoneira_barras_3m"].sum())
+            self.estimativas["chapas"] += int(colunas["chapas_forro"].sum())
+
+    def adicionar_ambiente(self, ambiente: DimensoesAmbiente, parede_dupla: bool = False,
+                           paredes: bool = True, forros: bool = True):
+        self.adicionar_lote(AmbientesLote.criar([ambiente.comprimento], [ambiente.largura], [ambiente.altura],
+                                                parede_dupla=[parede_dupla]), paredes, forros)
+
+    def otimizar(self) -> RelatorioCorte:
+        relatorio = RelatorioCorte()
+        for perfil, pecas in self.perfis.items():
+            if not pecas:
+                continue
+            barras, sobras = cortar_barras(pecas, corte=self.corte_mm, sobra_minima=self.sobra_minima_perfil)
+            relatorio.perfis[perfil] = ResultadoPerfil(perfil, barras, sum(mm * n for mm, n in pecas.items()) / 1000,
+                                                       sobras, self.estimativas[perfil])
+        if self.chapas:
+            chapas, sobras = cortar_chapas(self.chapas, girar=self.girar_chapas, sobra_minima=self.sobra_minima_chapa)
+            area = sum(w * h * n for (w, h), n in self.chapas.items()) / 1e6
+            relatorio.chapas = ResultadoChapas(chapas, area, sobras, self.estimativas["chapas"])
+        return relatorio
+
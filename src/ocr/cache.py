@@ -0,0 +1,277 @@
+"""
+Cache de resultados de OCR endereçado por conteúdo
+
+Os resultados ficam num SQLite, sob uma chave formada pelo hash do conteúdo
+de entrada (arquivo ou imagem já pré-processada), pela receita de
+pré-processamento, pela configuração do Tesseract, pelo idioma e pela
+versão do Tesseract. Quando o tamanho total passa do limite, as entradas
+menos usadas recentemente (LRU) são descartadas.
+
+CLI:
+    python -m src.ocr.cache estatisticas
+    python -m src.ocr.cache listar --limite 20
+    python -m src.ocr.cache limpar --tudo
+    python -m src.ocr.cache limpar --max-mb 100
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+ENV_CACHE = "WSF_OCR_CACHE"  # "0" desativa o cache
+ENV_CACHE_PATH = "WSF_OCR_CACHE_PATH"
+ENV_CACHE_MB = "WSF_OCR_CACHE_MB"
+CAMINHO_PADRAO = Path(__file__).resolve().parents[2] / "dados" / "cache_ocr" / "ocr.sqlite"
+LIMITE_PADRAO_MB = 512
+
+
+@lru_cache(maxsize=None)
+def versao_tesseract(backend: str = "pytesseract") -> str:
+    """Versão do Tesseract em uso (faz parte da chave do cache)"""
+    try:
+        if backend == "tesserocr":
+            import tesserocr
+            return tesserocr.tesseract_version().split()[1]
+        import pytesseract
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return "desconhecida"
+
+
+def hash_arquivo(caminho, bloco: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(bloco), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+def hash_imagem(imagem) -> str:
+    """Hash do conteúdo de uma imagem (numpy, PIL, caminho ou bytes)"""
+    if isinstance(imagem, (str, Path)):
+        return hash_arquivo(imagem)
+    h = hashlib.sha256()
+    if isinstance(imagem, (bytes, bytearray, memoryview)):
+        h.update(imagem)
+        return h.hexdigest()
+    if not isinstance(imagem, np.ndarray):  # PIL.Image
+        h.update(f"{imagem.mode}{imagem.size}".encode())
+        h.update(imagem.tobytes())
+        return h.hexdigest()
+    h.update(f"{imagem.dtype}{imagem.shape}".encode())
+    h.update(np.ascontiguousarray(imagem).data)
+    return h.hexdigest()
+
+
+def montar_chave(hash_conteudo: str, receita: str = "", config: str = "",
+                 lang: str = "por", tipo: str = "texto", versao: Optional[str] = None) -> str:
+    versao = versao or versao_tesseract()
+    bruto = "|".join([hash_conteudo, receita, config, lang, tipo, versao])
+    return hashlib.sha256(bruto.encode()).hexdigest()
+
+
+class CacheOCR:
+    """Cache LRU limitado por tamanho, persistido em SQLite"""
+
+    def __init__(self, caminho=None, limite_mb: Optional[float] = None):
+        self.caminho = Path(caminho or os.environ.get(ENV_CACHE_PATH) or CAMINHO_PADRAO)
+        if limite_mb is None:
+            limite_mb = float(os.environ.get(ENV_CACHE_MB, LIMITE_PADRAO_MB))
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.acertos = 0
+        self.falhas = 0
+        self._lock = threading.Lock()
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS resultados (
+                chave TEXT PRIMARY KEY,
+                tipo TEXT,
+                valor TEXT,
+                origem TEXT,
+                tamanho INTEGER,
+                criado REAL,
+                ultimo_acesso REAL,
+                acessos INTEGER DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_ultimo_acesso ON resultados(ultimo_acesso);
+            CREATE TABLE IF NOT EXISTS contadores (nome TEXT PRIMARY KEY, valor INTEGER);
+        """)
+        self._conn.commit()
+        # Total mantido a cada escrita, para guardar() não somar a tabela inteira
+        self._total_bytes = self._somar_tamanhos()
+
+    def _somar_tamanhos(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM resultados").fetchone()[0]
+
+    def _contar(self, nome: str):
+        self._conn.execute(
+            "INSERT INTO contadores (nome, valor) VALUES (?, 1) "
+            "ON CONFLICT(nome) DO UPDATE SET valor = valor + 1", (nome,))
+
+    def obter(self, chave: str):
+        """Retorna o resultado armazenado ou None (contabilizando acerto/falha)"""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT tipo, valor FROM resultados WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                self.falhas += 1
+                self._contar("falhas")
+                self._conn.commit()
+                return None
+            self.acertos += 1
+            self._contar("acertos")
+            self._conn.execute(
+                "UPDATE resultados SET ultimo_acesso = ?, acessos = acessos + 1 WHERE chave = ?",
+                (time.time(), chave))
+            self._conn.commit()
+        tipo, valor = linha
+        return json.loads(valor) if tipo == "dados" else valor
+
+    def guardar(self, chave: str, valor, tipo: str = "texto", origem: str = ""):
+        serializado = json.dumps(valor, ensure_ascii=False) if tipo == "dados" else valor
+        tamanho = len(serializado.encode("utf-8"))
+        agora = time.time()
+        with self._lock:
+            anterior = self._conn.execute(
+                "SELECT tamanho FROM resultados WHERE chave = ?", (chave,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resultados "
+                "(chave, tipo, valor, origem, tamanho, criado, ultimo_acesso, acessos) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0)",
+                (chave, tipo, serializado, origem, tamanho, agora, agora))
+            self._total_bytes += tamanho - (anterior[0] if anterior else 0)
+            self._despejar(self.limite_bytes)
+            self._conn.commit()
+
+    def _despejar(self, limite_bytes: int) -> int:
+        """Remove as entradas menos usadas até o total caber no limite
+
+        Lê o índice de ``ultimo_acesso`` só até juntar o suficiente, em vez de
+        carregar a tabela inteira a cada inserção.
+        """
+        if self._total_bytes <= limite_bytes:
+            return 0
+        excesso, remover = self._total_bytes - limite_bytes, []
+        for chave, tamanho in self._conn.execute(
+                "SELECT chave, tamanho FROM resultados ORDER BY ultimo_acesso"):
+            if excesso <= 0:
+                break
+            remover.append((chave,))
+            excesso -= tamanho
+            self._total_bytes -= tamanho
+        self._conn.executemany("DELETE FROM resultados WHERE chave = ?", remover)
+        return len(remover)
+
+    def reduzir(self, limite_mb: float) -> int:
+        with self._lock:
+            self._total_bytes = self._somar_tamanhos()  # inclui o que outros processos gravaram
+            removidas = self._despejar(int(limite_mb * 1024 * 1024))
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return removidas
+
+    def limpar(self) -> int:
+        with self._lock:
+            removidas = self._conn.execute("DELETE FROM resultados").rowcount
+            self._conn.execute("DELETE FROM contadores")
+            self._conn.commit()
+            self._total_bytes = 0
+            self._conn.execute("VACUUM")
+        return removidas
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            entradas, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM resultados").fetchone()
+            contadores = dict(self._conn.execute("SELECT nome, valor FROM contadores").fetchall())
+        acertos, falhas = contadores.get("acertos", 0), contadores.get("falhas", 0)
+        consultas = acertos + falhas
+        return {
+            "arquivo": str(self.caminho),
+            "entradas": entradas,
+            "tamanho_mb": round(total / 1024 / 1024, 3),
+            "limite_mb": round(self.limite_bytes / 1024 / 1024, 1),
+            "acertos": acertos,
+            "falhas": falhas,
+            "taxa_acerto": round(acertos / consultas, 3) if consultas else 0.0,
+        }
+
+    def listar(self, limite: int = 20) -> List[Dict]:
+        with self._lock:
+            linhas = self._conn.execute(
+                "SELECT chave, tipo, origem, tamanho, ultimo_acesso, acessos FROM resultados "
+                "ORDER BY ultimo_acesso DESC LIMIT ?", (limite,)).fetchall()
+        campos = ["chave", "tipo", "origem", "tamanho", "ultimo_acesso", "acessos"]
+        return [dict(zip(campos, linha)) for linha in linhas]
+
+    def chaves_texto(self) -> List[Tuple[str, str]]:
+        """(chave, origem) das entradas de texto"""
+        with self._lock:
+            return self._conn.execute("SELECT chave, origem FROM resultados WHERE tipo = 'texto'").fetchall()
+
+    def textos(self, chaves: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+        """(chave, origem, texto) das entradas pedidas, uma por vez e sem contar como acesso"""
+        for chave in chaves:
+            with self._lock:
+                linha = self._conn.execute(
+                    "SELECT chave, origem, valor FROM resultados WHERE chave = ? AND tipo = 'texto'",
+                    (chave,)).fetchone()
+            if linha is not None:
+                yield linha
+
+    def fechar(self):
+        self._conn.close()
+
+
+_CACHE: Optional[CacheOCR] = None
+
+
+def obter_cache() -> Optional[CacheOCR]:
+    """Cache compartilhado do processo; None se desativado com WSF_OCR_CACHE=0"""
+    global _CACHE
+    if os.environ.get(ENV_CACHE) == "0":
+        return None
+    if _CACHE is None:
+        _CACHE = CacheOCR()
+    return _CACHE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspeciona ou limpa o cache de OCR")
+    parser.add_argument("--db", help=f"Arquivo SQLite do cache (padrão: ${ENV_CACHE_PATH} ou {CAMINHO_PADRAO})")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    sub.add_parser("estatisticas", help="Entradas, tamanho e taxa de acerto")
+    p_listar = sub.add_parser("listar", help="Entradas usadas mais recentemente")
+    p_listar.add_argument("--limite", type=int, default=20)
+    p_limpar = sub.add_parser("limpar", help="Remove entradas")
+    grupo = p_limpar.add_mutually_exclusive_group(required=True)
+    grupo.add_argument("--tudo", action="store_true", help="Apaga todo o cache")
+    grupo.add_argument("--max-mb", type=float, help="Reduz o cache até este tamanho (LRU)")
+    args = parser.parse_args()
+
+    cache = CacheOCR(args.db)
+    if args.comando == "estatisticas":
+        for chave, valor in cache.estatisticas().items():
+            print(f"{chave:>14}: {valor}")
+    elif args.comando == "listar":
+        for e in cache.listar(args.limite):
+            quando = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(e["ultimo_acesso"]))
+            print(f"{e['chave'][:12]}  {e['tipo']:<6} {e['tamanho']:>8} B  {e['acessos']:>4}x  {quando}  {e['origem']}")
+    elif args.tudo:
+        print(f"🧹 {cache.limpar()} entradas removidas")
+    else:
+        print(f"🧹 {cache.reduzir(args.max_mb)} entradas removidas")
+    cache.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Montagem de pranchas a partir de tiles Leaflet salvos (z/x/y)
+
+Substitui as capturas via Selenium (janela 1920x1080 + ``time.sleep``):
+os tiles já baixados em ``dados/tiles_salvos_html`` são colados na maior
+resolução disponível, sem navegador. A prancha vai para um ``.npy``
+mapeado em memória, que ``src.ocr.tiles`` lê diretamente, ou para uma
+imagem comum (.png/.tif).
+
+Nomes reconhecidos para os tiles (zoom de 0 a 30):
+    .../{z}/{x}/{y}.png           (estrutura padrão de servidores de tiles)
+    tile_007_{z}_{x}_{y}.png      (nome gerado pelo baixar_imgs_html.py)
+
+Outros nomes terminados em inteiros (ex.: ``img_2025_06_10.png``) não são
+tiles.
+
+Uso:
+    python -m src.ocr.leaflet dados/tiles_salvos_html --saida prancha.npy --ocr
+"""
+import argparse
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .tiles import ocr_tiles, texto_de_palavras
+
+EXTENSOES = {".png", ".jpg", ".jpeg", ".webp"}
+ZOOM_MAXIMO = 30
+_NOME_TILE = re.compile(r"tile_\d+_(\d{1,2})_(\d+)_(\d+)")  # tile_{i:03d}_{z}_{x}_{y}
+
+
+@dataclass(frozen=True)
+class TileLeaflet:
+    z: int
+    x: int
+    y: int
+    caminho: Path
+
+
+def coordenadas_tile(caminho) -> Optional[TileLeaflet]:
+    """Extrai (z, x, y) do caminho do tile; None se o nome não tiver coordenadas"""
+    caminho = Path(caminho)
+    if caminho.suffix.lower() not in EXTENSOES:
+        return None
+    partes = [caminho.parent.parent.name, caminho.parent.name, caminho.stem]
+    if all(p.isdigit() for p in partes):
+        z, x, y = map(int, partes)
+    else:
+        nome = _NOME_TILE.fullmatch(caminho.stem)
+        if nome is None:
+            return None
+        z, x, y = map(int, nome.groups())
+    if z > ZOOM_MAXIMO:
+        return None
+    return TileLeaflet(z, x, y, caminho)
+
+
+def listar_tiles(pasta) -> Dict[int, List[TileLeaflet]]:
+    """Tiles encontrados em ``pasta`` (recursivo), agrupados por zoom"""
+    por_zoom: Dict[int, List[TileLeaflet]] = defaultdict(list)
+    for caminho in sorted(Path(pasta).rglob("*")):
+        tile = coordenadas_tile(caminho)
+        if tile is not None:
+            por_zoom[tile.z].append(tile)
+    return dict(por_zoom)
+
+
+def montar_prancha(pasta, saida=None, zoom: Optional[int] = None, tms: bool = False,
+                   cinza: bool = True, fundo: int = 255) -> np.ndarray:
+    """
+    Cola os tiles de um nível de zoom (o maior, por padrão) numa prancha.
+
+    Args:
+        pasta: Diretório com os tiles
+        saida: ``.npy`` (mapa em memória, gravado tile a tile) ou imagem
+            (.png/.tif); sem saída, a prancha fica só em memória
+        zoom: Nível a montar; padrão é o de maior resolução
+        tms: Eixo y invertido (camadas Leaflet com ``tms: true``)
+        cinza: Monta em tons de cinza (suficiente para OCR e metade da memória)
+        fundo: Valor dos tiles ausentes (branco)
+
+    Returns:
+        A prancha (np.memmap quando ``saida`` é ``.npy``).
+    """
+    por_zoom = listar_tiles(pasta)
+    if not por_zoom:
+        raise FileNotFoundError(f"Nenhum tile z/x/y encontrado em {pasta}")
+    zoom = max(por_zoom) if zoom is None else zoom
+    if zoom not in por_zoom:
+        raise ValueError(f"Zoom {zoom} indisponível; níveis encontrados: {sorted(por_zoom)}")
+    tiles = por_zoom[zoom]
+
+    with Image.open(tiles[0].caminho) as im:
+        lado_x, lado_y = im.size
+    x_min = min(t.x for t in tiles)
+    y_min = min(t.y for t in tiles)
+    y_max = max(t.y for t in tiles)
+    colunas = max(t.x for t in tiles) - x_min + 1
+    linhas = y_max - y_min + 1
+    forma = (linhas * lado_y, colunas * lado_x) + (() if cinza else (3,))
+
+    npy = saida is not None and Path(saida).suffix == ".npy"
+    if npy:
+        Path(saida).parent.mkdir(parents=True, exist_ok=True)
+        prancha = np.lib.format.open_memmap(saida, mode="w+", dtype=np.uint8, shape=forma)
+        prancha[:] = fundo
+    else:
+        prancha = np.full(forma, fundo, dtype=np.uint8)
+
+    leitura = cv2.IMREAD_GRAYSCALE if cinza else cv2.IMREAD_COLOR
+    for tile in tiles:
+        imagem = cv2.imread(str(tile.caminho), leitura)
+        if imagem is None:
+            print(f"⚠️ Tile ilegível ignorado: {tile.caminho}")
+            continue
+        linha = (y_max - tile.y) if tms else (tile.y - y_min)
+        x0, y0 = (tile.x - x_min) * lado_x, linha * lado_y
+        h, w = imagem.shape[:2]
+        prancha[y0:y0 + min(h, lado_y), x0:x0 + min(w, lado_x)] = imagem[:lado_y, :lado_x]
+
+    if npy:
+        prancha.flush()
+    elif saida is not None:
+        Path(saida).parent.mkdir(parents=True, exist_ok=True)
+        cv2.imwrite(str(saida), prancha)
+    return prancha
+
+
+def ocr_prancha(pasta, saida=None, zoom: Optional[int] = None, tms: bool = False,
+                lang: str = "por", config: str = "--psm 11") -> str:
+    """Monta a prancha e aplica o OCR em tiles (src.ocr.tiles), sem navegador"""
+    prancha = montar_prancha(pasta, saida=saida, zoom=zoom, tms=tms, cinza=True)
+    return texto_de_palavras(ocr_tiles(prancha, lang=lang, config=config))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monta pranchas a partir de tiles Leaflet z/x/y")
+    parser.add_argument("pasta", help="Diretório com os tiles (ex.: dados/tiles_salvos_html)")
+    parser.add_argument("--saida", default="prancha.npy", help=".npy (mapeado em memória), .png ou .tif")
+    parser.add_argument("--zoom", type=int, help="Nível de zoom (padrão: o maior)")
+    parser.add_argument("--tms", action="store_true", help="Eixo y invertido (tms: true)")
+    parser.add_argument("--cor", action="store_true", help="Mantém as cores (padrão: cinza)")
+    parser.add_argument("--ocr", action="store_true", help="Executa o OCR na prancha montada")
+    args = parser.parse_args()
+
+    por_zoom = listar_tiles(args.pasta)
+    for z, tiles in sorted(por_zoom.items()):
+        print(f"🔎 Zoom {z}: {len(tiles)} tiles")
+    prancha = montar_prancha(args.pasta, saida=args.saida, zoom=args.zoom, tms=args.tms, cinza=not args.cor)
+    print(f"✅ Prancha {prancha.shape[1]}x{prancha.shape[0]} salva em {args.saida}")
+
+    if args.ocr:
+        if args.cor:
+            prancha = cv2.cvtColor(prancha, cv2.COLOR_BGR2GRAY)
+        texto = texto_de_palavras(ocr_tiles(prancha))
+        print("\n📝 Texto extraído:")
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
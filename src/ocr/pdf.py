@@ -0,0 +1,84 @@
+"""
+OCR de PDF página a página em fluxo contínuo
+
+Cada página é rasterizada isoladamente (``first_page``/``last_page``) e
+enviada ao pool de OCR; enquanto os workers leem as páginas já enviadas,
+o processo principal rasteriza a próxima. No máximo ``em_voo`` páginas
+ficam em memória ao mesmo tempo, independentemente do tamanho do PDF.
+
+Com o cache de OCR ativo, páginas já lidas (mesmo PDF, página, DPI e
+config) são devolvidas sem rasterizar nem chamar o Tesseract. A página é
+guardada só sob essa chave: a imagem rasterizada não entra no cache.
+"""
+from collections import deque
+from typing import Iterator, Optional, Tuple
+
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from .cache import hash_arquivo, montar_chave, versao_tesseract
+from .servico import ServicoOCR, obter_servico
+
+
+def contar_paginas(caminho_pdf: str) -> int:
+    return int(pdfinfo_from_path(caminho_pdf)["Pages"])
+
+
+def rasterizar_pagina(caminho_pdf: str, pagina: int, dpi: int = 200):
+    """Rasteriza uma única página (numeração a partir de 1)"""
+    return convert_from_path(caminho_pdf, dpi=dpi, first_page=pagina, last_page=pagina)[0]
+
+
+def ocr_pdf_paginas(caminho_pdf: str, lang: str = "por", config: str = "",
+                    dpi: int = 200, servico: Optional[ServicoOCR] = None,
+                    em_voo: Optional[int] = None) -> Iterator[Tuple[int, int, str]]:
+    """
+    Gera (pagina, total, texto) na ordem das páginas, à medida que ficam prontas.
+
+    Args:
+        em_voo: máximo de páginas rasterizadas aguardando OCR; por padrão,
+                o tamanho do pool + 1 (uma página sendo pré-rasterizada).
+    """
+    servico = servico or obter_servico()
+    limite = em_voo or (servico.workers + 1)
+    total = contar_paginas(caminho_pdf)
+
+    cache = servico.cache
+    hash_pdf = hash_arquivo(caminho_pdf) if cache is not None else None
+
+    pendentes = deque()
+    for pagina in range(1, total + 1):
+        chave = None
+        if cache is not None:
+            chave = montar_chave(hash_pdf, receita=f"pdf:dpi={dpi}:pagina={pagina}", config=config,
+                                 lang=lang, versao=versao_tesseract(servico.backend))
+            texto = cache.obter(chave)
+            if texto is not None:
+                pendentes.append((pagina, texto))
+                continue
+
+        imagem = rasterizar_pagina(caminho_pdf, pagina, dpi)
+        futuro = servico.submeter(imagem, lang, config, cache=False)
+        del imagem
+        if chave is not None:
+            futuro.add_done_callback(_guardar_pagina(cache, chave, f"{caminho_pdf}#pagina={pagina}"))
+        pendentes.append((pagina, futuro))
+
+        while len(pendentes) >= limite:
+            yield _proximo(pendentes, total)
+
+    while pendentes:
+        yield _proximo(pendentes, total)
+
+
+def _guardar_pagina(cache, chave: str, origem: str):
+    def _guardar(futuro):
+        if futuro.exception() is None:
+            cache.guardar(chave, futuro.result(), origem=origem)
+    return _guardar
+
+
+def _proximo(pendentes: deque, total: int) -> Tuple[int, int, str]:
+    numero, resultado = pendentes.popleft()
+    if not isinstance(resultado, str):
+        resultado = resultado.result()
+    return numero, total, resultado
@@ -0,0 +1,213 @@
+"""
+Pipeline de pré-processamento de imagens para OCR
+
+Uma receita é uma sequência declarativa de etapas (nome + parâmetros)
+aplicada em memória sobre arrays numpy, sem gravar PNGs intermediários.
+Cada etapa tem o tempo medido, o que permite comparar receitas em
+pranchas grandes (A0/A1).
+
+Uso:
+    from src.ocr.preprocessamento import RECEITAS
+    imagem, tempos = RECEITAS["planta_principal"].aplicar_arquivo("planta.png")
+
+Benchmark:
+    python -m src.ocr.preprocessamento planta.png --receitas analisador construcode
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+ETAPAS: Dict[str, Callable] = {}
+
+
+def etapa(nome: str):
+    """Registra uma função de etapa: f(imagem, **params) -> imagem"""
+    def registrar(funcao):
+        ETAPAS[nome] = funcao
+        return funcao
+    return registrar
+
+
+@etapa("cinza")
+def _cinza(img: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+
+
+@etapa("redimensionar")
+def _redimensionar(img: np.ndarray, largura_max: int = 3000) -> np.ndarray:
+    """Reduz a imagem se for mais larga que ``largura_max`` (nunca amplia)"""
+    altura, largura = img.shape[:2]
+    if largura <= largura_max:
+        return img
+    escala = largura_max / largura
+    return cv2.resize(img, (largura_max, int(altura * escala)), interpolation=cv2.INTER_AREA)
+
+
+@etapa("equalizar")
+def _equalizar(img: np.ndarray) -> np.ndarray:
+    return cv2.equalizeHist(img)
+
+
+@etapa("mediana")
+def _mediana(img: np.ndarray, k: int = 3) -> np.ndarray:
+    return cv2.medianBlur(img, k)
+
+
+@etapa("denoise")
+def _denoise(img: np.ndarray, h: float = 30, template: int = 7, busca: int = 21,
+             lado_max: int = 1600) -> np.ndarray:
+    """
+    fastNlMeansDenoising com redução automática de escala.
+
+    O custo cresce com a área da imagem; acima de ``lado_max`` pixels no
+    maior lado o filtro roda numa cópia reduzida e o resultado volta à
+    resolução original. ``lado_max=0`` desativa a redução.
+    """
+    altura, largura = img.shape[:2]
+    lado = max(altura, largura)
+    if not lado_max or lado <= lado_max:
+        return cv2.fastNlMeansDenoising(img, None, h, template, busca)
+    escala = lado_max / lado
+    reduzida = cv2.resize(img, (int(largura * escala), int(altura * escala)), interpolation=cv2.INTER_AREA)
+    filtrada = cv2.fastNlMeansDenoising(reduzida, None, h, template, busca)
+    return cv2.resize(filtrada, (largura, altura), interpolation=cv2.INTER_LINEAR)
+
+
+@etapa("threshold")
+def _threshold(img: np.ndarray, limiar: int = 150) -> np.ndarray:
+    return cv2.threshold(img, limiar, 255, cv2.THRESH_BINARY)[1]
+
+
+@etapa("otsu")
+def _otsu(img: np.ndarray) -> np.ndarray:
+    return cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+
+
+@etapa("adaptativo")
+def _adaptativo(img: np.ndarray, metodo: str = "gaussiano", bloco: int = 11, c: float = 2) -> np.ndarray:
+    tipo = cv2.ADAPTIVE_THRESH_GAUSSIAN_C if metodo == "gaussiano" else cv2.ADAPTIVE_THRESH_MEAN_C
+    return cv2.adaptiveThreshold(img, 255, tipo, cv2.THRESH_BINARY, bloco, c)
+
+
+@etapa("morfologia")
+def _morfologia(img: np.ndarray, operacao: str = "fechar", tamanho: int = 3) -> np.ndarray:
+    """Abertura/fechamento com kernel retangular; kernel 1x1 é identidade e é ignorado"""
+    if tamanho <= 1:
+        return img
+    operacoes = {"fechar": cv2.MORPH_CLOSE, "abrir": cv2.MORPH_OPEN,
+                 "dilatar": cv2.MORPH_DILATE, "erodir": cv2.MORPH_ERODE}
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (tamanho, tamanho))
+    return cv2.morphologyEx(img, operacoes[operacao], kernel)
+
+
+@dataclass
+class Etapa:
+    nome: str
+    params: Dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.nome not in ETAPAS:
+            raise ValueError(f"Etapa de pré-processamento desconhecida: {self.nome}")
+
+
+@dataclass
+class Receita:
+    """Sequência de etapas de pré-processamento"""
+    nome: str
+    etapas: List[Etapa]
+
+    @classmethod
+    def de_lista(cls, nome: str, etapas: List) -> "Receita":
+        """Cria a receita a partir de ["cinza", ("mediana", {"k": 3}), ...]"""
+        convertidas = []
+        for item in etapas:
+            if isinstance(item, str):
+                convertidas.append(Etapa(item))
+            else:
+                convertidas.append(Etapa(item[0], dict(item[1])))
+        return cls(nome, convertidas)
+
+    def descricao(self) -> str:
+        """Representação canônica (usada, por exemplo, na chave do cache de OCR)"""
+        partes = []
+        for e in self.etapas:
+            params = ",".join(f"{k}={v}" for k, v in sorted(e.params.items()))
+            partes.append(f"{e.nome}({params})")
+        return "|".join(partes)
+
+    def aplicar(self, imagem: np.ndarray) -> Tuple[np.ndarray, List[Tuple[str, float]]]:
+        """Aplica as etapas em memória e devolve (imagem, [(etapa, segundos), ...])"""
+        tempos = []
+        for e in self.etapas:
+            inicio = time.perf_counter()
+            imagem = ETAPAS[e.nome](imagem, **e.params)
+            tempos.append((e.nome, time.perf_counter() - inicio))
+        return imagem, tempos
+
+    def aplicar_arquivo(self, caminho: str) -> Tuple[np.ndarray, List[Tuple[str, float]]]:
+        """Lê o arquivo (já em cinza, se a receita começa por 'cinza') e aplica a receita"""
+        inicio = time.perf_counter()
+        em_cinza = bool(self.etapas) and self.etapas[0].nome == "cinza"
+        imagem = cv2.imread(str(caminho), cv2.IMREAD_GRAYSCALE if em_cinza else cv2.IMREAD_COLOR)
+        if imagem is None:
+            raise FileNotFoundError(f"Não foi possível abrir a imagem: {caminho}")
+        leitura = ("leitura", time.perf_counter() - inicio)
+        imagem, tempos = self.aplicar(imagem)
+        return imagem, [leitura] + tempos
+
+
+RECEITAS: Dict[str, Receita] = {
+    # AnalisadorPlantasWSF
+    "analisador": Receita.de_lista("analisador", [
+        "cinza",
+        ("adaptativo", {"metodo": "gaussiano", "bloco": 11, "c": 2}),
+    ]),
+    # processar_imagem_planta.py
+    "planta_principal": Receita.de_lista("planta_principal", [
+        "cinza",
+        ("threshold", {"limiar": 150}),
+        ("mediana", {"k": 3}),
+    ]),
+    # melhorar_imagem_ocr.py
+    "construcode": Receita.de_lista("construcode", [
+        "cinza",
+        "equalizar",
+        ("denoise", {"h": 30, "template": 7, "busca": 21, "lado_max": 1600}),
+        ("adaptativo", {"metodo": "media", "bloco": 11, "c": 7}),
+    ]),
+    # melhorar_imagem_ocr_v2.py
+    "otimizada": Receita.de_lista("otimizada", [
+        "cinza",
+        ("redimensionar", {"largura_max": 3000}),
+        ("mediana", {"k": 3}),
+        "otsu",
+    ]),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara receitas de pré-processamento")
+    parser.add_argument("imagem", help="Imagem de entrada (ex.: prancha A0/A1)")
+    parser.add_argument("--receitas", nargs="+", default=list(RECEITAS), choices=list(RECEITAS))
+    parser.add_argument("--repeticoes", type=int, default=1)
+    args = parser.parse_args()
+
+    for nome in args.receitas:
+        receita = RECEITAS[nome]
+        acumulado: Dict[str, float] = {}
+        for _ in range(args.repeticoes):
+            _, tempos = receita.aplicar_arquivo(args.imagem)
+            for etapa_nome, segundos in tempos:
+                acumulado[etapa_nome] = acumulado.get(etapa_nome, 0.0) + segundos
+        total = sum(acumulado.values()) / args.repeticoes
+        print(f"\n📐 Receita '{nome}': {total * 1000:.1f} ms")
+        for etapa_nome, segundos in acumulado.items():
+            print(f"   {etapa_nome:<14} {segundos / args.repeticoes * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
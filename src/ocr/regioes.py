@@ -0,0 +1,125 @@
+"""
+OCR em lote de regiões de texto
+
+Em vez de chamar o Tesseract uma vez por contorno, as regiões são
+empacotadas num mosaico (ou lidas direto da imagem inteira) e passam por
+uma única chamada a ``image_to_data``. As palavras reconhecidas são então
+devolvidas às caixas de origem pelo centro do retângulo de cada palavra.
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .servico import obter_servico
+
+Caixa = Tuple[int, int, int, int]  # (x, y, w, h)
+
+WHITELIST = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,x "
+CONFIG_REGIOES = f"--psm 11 -c tessedit_char_whitelist={WHITELIST}"
+
+MARGEM_MOSAICO = 16  # pixels de fundo branco entre regiões no mosaico
+
+
+def filtrar_caixas(contornos, largura: int, altura: int) -> List[Caixa]:
+    """Converte contornos em caixas, descartando as muito pequenas ou muito grandes"""
+    import cv2
+
+    caixas = []
+    for contorno in contornos:
+        x, y, w, h = cv2.boundingRect(contorno)
+        if w > 30 and h > 10 and w < largura * 0.5 and h < altura * 0.5:
+            caixas.append((x, y, w, h))
+    return caixas
+
+
+def montar_mosaico(imagem: np.ndarray, caixas: List[Caixa],
+                   margem: int = MARGEM_MOSAICO) -> Tuple[np.ndarray, List[Caixa]]:
+    """
+    Empacota as regiões em prateleiras (shelf packing) numa única imagem.
+
+    Returns:
+        (mosaico, posicoes): posicoes[i] é a caixa da região i dentro do mosaico.
+    """
+    if not caixas:
+        return np.full((1, 1), 255, dtype=imagem.dtype), []
+
+    largura_max = max(imagem.shape[1], max(w for _, _, w, _ in caixas) + 2 * margem)
+
+    # Primeira passada: calcula posições sem copiar pixels
+    posicoes: List[Caixa] = []
+    cursor_x, cursor_y, altura_prateleira = margem, margem, 0
+    for _, _, w, h in caixas:
+        if cursor_x + w + margem > largura_max:
+            cursor_x = margem
+            cursor_y += altura_prateleira + margem
+            altura_prateleira = 0
+        posicoes.append((cursor_x, cursor_y, w, h))
+        cursor_x += w + margem
+        altura_prateleira = max(altura_prateleira, h)
+    altura_total = cursor_y + altura_prateleira + margem
+
+    # Segunda passada: copia cada ROI para o fundo branco
+    mosaico = np.full((altura_total, largura_max) + imagem.shape[2:], 255, dtype=imagem.dtype)
+    for (x, y, w, h), (mx, my, _, _) in zip(caixas, posicoes):
+        mosaico[my:my + h, mx:mx + w] = imagem[y:y + h, x:x + w]
+    return mosaico, posicoes
+
+
+def atribuir_palavras(dados: Dict[str, list], caixas: List[Caixa]) -> List[str]:
+    """
+    Distribui as palavras de um resultado ``image_to_data`` (Output.DICT)
+    entre as caixas, usando o centro de cada palavra.
+
+    Palavras da mesma linha do Tesseract são unidas por espaço e linhas
+    diferentes por quebra de linha, preservando a ordem de leitura.
+    """
+    linhas_por_caixa: List[Dict[tuple, List[str]]] = [dict() for _ in caixas]
+    if not caixas:
+        return []
+
+    # Índice simples por faixa vertical para não testar todas as caixas
+    ordem_y = sorted(range(len(caixas)), key=lambda i: caixas[i][1])
+
+    for k, palavra in enumerate(dados.get("text", [])):
+        palavra = (palavra or "").strip()
+        if not palavra:
+            continue
+        cx = dados["left"][k] + dados["width"][k] / 2
+        cy = dados["top"][k] + dados["height"][k] / 2
+        for i in ordem_y:
+            x, y, w, h = caixas[i]
+            if y > cy:
+                break
+            if x <= cx < x + w and y <= cy < y + h:
+                chave = (dados["block_num"][k], dados["par_num"][k], dados["line_num"][k])
+                linhas_por_caixa[i].setdefault(chave, []).append(palavra)
+                break
+
+    return ["\n".join(" ".join(p) for p in linhas.values()) for linhas in linhas_por_caixa]
+
+
+def ocr_regioes(imagem: np.ndarray, caixas: List[Caixa], lang: str = "por",
+                config: str = CONFIG_REGIOES, modo: str = "mosaico") -> List[str]:
+    """
+    Executa OCR de todas as caixas com uma única chamada ao Tesseract.
+
+    Args:
+        imagem: imagem pré-processada (tons de cinza ou binária).
+        caixas: regiões (x, y, w, h) na imagem.
+        modo: "mosaico" empacota as ROIs isoladas; "imagem" lê a imagem
+              inteira e apenas filtra as palavras pelas caixas.
+    Returns:
+        Lista de textos, um por caixa, na mesma ordem de ``caixas``.
+    """
+    if not caixas:
+        return []
+
+    if modo == "mosaico":
+        alvo, caixas_alvo = montar_mosaico(imagem, caixas)
+    elif modo == "imagem":
+        alvo, caixas_alvo = imagem, caixas
+    else:
+        raise ValueError(f"Modo de OCR desconhecido: {modo}")
+
+    dados = obter_servico().dados(alvo, lang=lang, config=config)
+    return atribuir_palavras(dados, caixas_alvo)
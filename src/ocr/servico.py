@@ -0,0 +1,295 @@
+"""
+Serviço de OCR compartilhado
+
+Mantém um pool de processos de longa duração, um por núcleo por padrão.
+Cada worker inicializa a API do Tesseract (via ``tesserocr``) uma única
+vez por configuração e a reaproveita em todas as chamadas, evitando o
+custo de iniciar um processo e recarregar o ``por.traineddata`` a cada
+imagem. Sem ``tesserocr`` instalado, os workers usam ``pytesseract``
+(um subprocesso por chamada), mas as chamadas continuam paralelas.
+
+Os resultados passam pelo cache de OCR (``src/ocr/cache.py``): uma imagem
+com o mesmo conteúdo, config e idioma não é lida de novo.
+
+Uso:
+    from src.ocr.servico import obter_servico
+    texto = obter_servico().texto(imagem, lang='por', config='--oem 3 --psm 11')
+
+Benchmark:
+    python -m src.ocr.servico --benchmark plantas_teste/*.png --workers 4
+"""
+import argparse
+import os
+import shlex
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+try:
+    import tesserocr
+except ImportError:  # dependência opcional
+    tesserocr = None
+
+import pytesseract
+
+from .cache import CacheOCR, hash_imagem, montar_chave, obter_cache, versao_tesseract
+
+ENV_WORKERS = "WSF_OCR_WORKERS"
+ENV_BACKEND = "WSF_OCR_BACKEND"
+
+# APIs já inicializadas neste processo: chave de configuração -> PyTessBaseAPI
+_APIS: Dict[tuple, object] = {}
+
+
+def _interpretar_config(lang: str, config: str) -> Tuple[str, Optional[int], Optional[int], Tuple[Tuple[str, str], ...]]:
+    """Converte uma string de config estilo CLI em (lang, oem, psm, variaveis)"""
+    oem = psm = None
+    variaveis = []
+    tokens = shlex.split(config or "")
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        valor = tokens[i + 1] if i + 1 < len(tokens) else None
+        if token == "--oem" and valor is not None:
+            oem, i = int(valor), i + 2
+        elif token == "--psm" and valor is not None:
+            psm, i = int(valor), i + 2
+        elif token == "-l" and valor is not None:
+            lang, i = valor, i + 2
+        elif token == "-c" and valor is not None and "=" in valor:
+            chave, _, conteudo = valor.partition("=")
+            variaveis.append((chave, conteudo))
+            i += 2
+        else:
+            i += 1
+    return lang, oem, psm, tuple(variaveis)
+
+
+def _como_pil(imagem) -> Image.Image:
+    if isinstance(imagem, Image.Image):
+        return imagem
+    if isinstance(imagem, (str, Path)):
+        return Image.open(imagem)
+    return Image.fromarray(np.asarray(imagem))
+
+
+def _api_tesserocr(lang: str, config: str):
+    """Retorna (criando na primeira vez) a API do Tesseract deste worker"""
+    chave = _interpretar_config(lang, config)
+    api = _APIS.get(chave)
+    if api is None:
+        lang_, oem, psm, variaveis = chave
+        kwargs = {"lang": lang_}
+        # tesserocr.OEM/PSM são só constantes inteiras (não instanciáveis)
+        if oem is not None:
+            kwargs["oem"] = oem
+        if psm is not None:
+            kwargs["psm"] = psm
+        api = tesserocr.PyTessBaseAPI(**kwargs)
+        for nome, valor in variaveis:
+            api.SetVariable(nome, valor)
+        _APIS[chave] = api
+    return api
+
+
+def _tsv_para_dict(tsv: str) -> Dict[str, list]:
+    """Converte a saída TSV do Tesseract no formato de pytesseract.Output.DICT"""
+    linhas = [l.split("\t") for l in tsv.splitlines() if l]
+    campos = ["level", "page_num", "block_num", "par_num", "line_num", "word_num",
+              "left", "top", "width", "height", "conf", "text"]
+    dados = {c: [] for c in campos}
+    for valores in linhas:
+        if len(valores) < 11 or valores[0] == "level":
+            continue
+        valores = valores + [""] * (12 - len(valores))
+        for c, v in zip(campos, valores):
+            if c == "text":
+                dados[c].append(v)
+            elif c == "conf":
+                dados[c].append(float(v))
+            else:
+                dados[c].append(int(v))
+    return dados
+
+
+def _executar(tarefa: str, imagem, lang: str, config: str, backend: str):
+    """Executa uma tarefa de OCR no processo atual (worker ou chamador)"""
+    pil = _como_pil(imagem)
+    if backend == "tesserocr":
+        api = _api_tesserocr(lang, config)
+        api.SetImage(pil)
+        if tarefa == "texto":
+            return api.GetUTF8Text()
+        return _tsv_para_dict(api.GetTSVText(0))
+
+    if tarefa == "texto":
+        return pytesseract.image_to_string(pil, lang=lang, config=config)
+    return pytesseract.image_to_data(pil, lang=lang, config=config,
+                                     output_type=pytesseract.Output.DICT)
+
+
+def backend_padrao() -> str:
+    escolhido = os.environ.get(ENV_BACKEND, "auto")
+    if escolhido == "auto":
+        return "tesserocr" if tesserocr is not None else "pytesseract"
+    if escolhido == "tesserocr" and tesserocr is None:
+        raise ImportError("Backend 'tesserocr' solicitado, mas o pacote não está instalado")
+    return escolhido
+
+
+class ServicoOCR:
+    """Pool de workers de OCR com a API do Tesseract mantida carregada"""
+
+    def __init__(self, workers: Optional[int] = None, backend: Optional[str] = None,
+                 cache: Union[CacheOCR, bool, None] = True):
+        if workers is None:
+            workers = int(os.environ.get(ENV_WORKERS, os.cpu_count() or 1))
+        self.workers = max(0, workers)
+        self.backend = backend or backend_padrao()
+        self.cache = obter_cache() if cache is True else (cache or None)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def submeter(self, imagem, lang: str = "por", config: str = "",
+                 tarefa: str = "texto", origem: str = "", cache: bool = True) -> Future:
+        """
+        Agenda uma tarefa ('texto' ou 'dados') e retorna o Future.
+
+        ``cache=False`` é para quem já guarda o resultado sob a própria chave
+        (página de PDF, arquivo + receita): assim cada resultado fica no
+        cache uma vez só.
+        """
+        chave = None
+        if self.cache is not None and cache:
+            chave = montar_chave(hash_imagem(imagem), config=config, lang=lang, tipo=tarefa,
+                                 versao=versao_tesseract(self.backend))
+            em_cache = self.cache.obter(chave)
+            if em_cache is not None:
+                futuro = Future()
+                futuro.set_result(em_cache)
+                return futuro
+            if not origem and isinstance(imagem, (str, Path)):
+                origem = str(imagem)
+
+        pool = self._executor()
+        if pool is None:
+            futuro = Future()
+            try:
+                futuro.set_result(_executar(tarefa, imagem, lang, config, self.backend))
+            except Exception as e:
+                futuro.set_exception(e)
+        else:
+            futuro = pool.submit(_executar, tarefa, imagem, lang, config, self.backend)
+
+        if chave is not None:
+            def _guardar(f: Future):
+                if f.exception() is None:
+                    self.cache.guardar(chave, f.result(), tipo=tarefa, origem=origem)
+            futuro.add_done_callback(_guardar)
+        return futuro
+
+    def texto(self, imagem, lang: str = "por", config: str = "", origem: str = "",
+              cache: bool = True) -> str:
+        """Equivalente a pytesseract.image_to_string"""
+        return self.submeter(imagem, lang, config, "texto", origem, cache).result()
+
+    def dados(self, imagem, lang: str = "por", config: str = "", origem: str = "",
+              cache: bool = True) -> Dict[str, list]:
+        """Equivalente a pytesseract.image_to_data(output_type=Output.DICT)"""
+        return self.submeter(imagem, lang, config, "dados", origem, cache).result()
+
+    def mapear(self, imagens: Iterable, lang: str = "por", config: str = "") -> Iterator[str]:
+        """OCR de várias imagens em paralelo, devolvendo os textos em ordem"""
+        pendentes = [self.submeter(img, lang, config) for img in imagens]
+        for futuro in pendentes:
+            yield futuro.result()
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+_SERVICO: Optional[ServicoOCR] = None
+
+
+def obter_servico() -> ServicoOCR:
+    """Serviço compartilhado do processo, criado sob demanda"""
+    global _SERVICO
+    if _SERVICO is None:
+        _SERVICO = ServicoOCR()
+    return _SERVICO
+
+
+def configurar(workers: Optional[int] = None, backend: Optional[str] = None) -> ServicoOCR:
+    """Recria o serviço compartilhado com outra concorrência/backend"""
+    global _SERVICO
+    if _SERVICO is not None:
+        _SERVICO.fechar()
+    _SERVICO = ServicoOCR(workers=workers, backend=backend)
+    return _SERVICO
+
+
+def benchmark(imagens: List[str], workers: int, repeticoes: int = 1,
+              lang: str = "por", config: str = "") -> Dict[str, float]:
+    """Compara pytesseract sequencial com o pool de workers (imagens/s)"""
+    lote = [str(p) for p in imagens] * repeticoes
+
+    inicio = time.perf_counter()
+    for caminho in lote:
+        pytesseract.image_to_string(Image.open(caminho), lang=lang, config=config)
+    tempo_sequencial = time.perf_counter() - inicio
+
+    with ServicoOCR(workers=workers, cache=False) as servico:
+        # Aquece os workers para medir apenas o regime permanente
+        list(servico.mapear(lote[:workers or 1], lang, config))
+        inicio = time.perf_counter()
+        list(servico.mapear(lote, lang, config))
+        tempo_pool = time.perf_counter() - inicio
+        backend = servico.backend
+
+    return {
+        "imagens": len(lote),
+        "backend": backend,
+        "workers": workers,
+        "sequencial_img_s": len(lote) / tempo_sequencial,
+        "pool_img_s": len(lote) / tempo_pool,
+        "aceleracao": tempo_sequencial / tempo_pool,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço de OCR compartilhado")
+    parser.add_argument("--benchmark", nargs="+", metavar="IMAGEM", required=True,
+                        help="Imagens usadas para medir a vazão")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--lang", default="por")
+    parser.add_argument("--config", default="--oem 3 --psm 11")
+    args = parser.parse_args()
+
+    r = benchmark(args.benchmark, args.workers, args.repeticoes, args.lang, args.config)
+    print(f"📊 {r['imagens']} imagens | backend={r['backend']} | workers={r['workers']}")
+    print(f"   Sequencial (pytesseract): {r['sequencial_img_s']:.2f} img/s")
+    print(f"   Pool de workers:          {r['pool_img_s']:.2f} img/s")
+    print(f"   Aceleração:               {r['aceleracao']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Processamento em tiles de pranchas muito grandes
+
+Uma prancha A0 a 300 DPI tem ~14000x10000 pixels; carregar em BGR e fazer
+cópias (cinza, threshold, overlay) custa vários GB. Aqui a imagem é
+decodificada uma única vez para um raster em tons de cinza num arquivo
+``.npy`` mapeado em memória (reaproveitado nas execuções seguintes) e todo
+o resto (pré-processamento, OCR, detecção de paredes) trabalha em tiles
+sobrepostos lidos do mapa. Só os tiles em processamento ocupam memória.
+
+Junção nas emendas:
+- cada tile tem um "núcleo" (as células da grade, sem sobreposição);
+  uma detecção pertence ao tile cujo núcleo contém o seu centro, então
+  nada é contado duas vezes;
+- segmentos de parede horizontais/verticais que atravessam emendas são
+  unidos depois de todos os tiles processados.
+"""
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from .cache import hash_arquivo
+from .preprocessamento import Receita
+from .servico import ServicoOCR, obter_servico
+
+# Pranchas de projeto são legitimamente enormes; o limite de pixels do PIL
+# (proteção contra "decompression bomb") só é desligado durante a leitura do
+# cabeçalho em tamanho_imagem, e não no processo inteiro
+_LOCK_LIMITE_PIL = threading.Lock()
+
+TAMANHO_TILE = 2048
+SOBREPOSICAO = 256  # maior que metade da maior palavra/rótulo esperado
+LIMIAR_PIXELS = 30_000_000  # acima disso, os scripts usam o caminho em tiles
+DIR_CACHE_RASTER = Path(__file__).resolve().parents[2] / "dados" / "cache_raster"
+
+
+@dataclass(frozen=True)
+class Tile:
+    """Região lida (x0..x1, y0..y1) e núcleo dono das detecções (nx0..nx1, ny0..ny1)"""
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    nx0: int
+    ny0: int
+    nx1: int
+    ny1: int
+
+    def contem(self, x: float, y: float) -> bool:
+        return self.nx0 <= x < self.nx1 and self.ny0 <= y < self.ny1
+
+
+@contextmanager
+def _sem_limite_pixels():
+    with _LOCK_LIMITE_PIL:
+        anterior = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = None
+        try:
+            yield
+        finally:
+            Image.MAX_IMAGE_PIXELS = anterior
+
+
+def tamanho_imagem(caminho) -> Tuple[int, int]:
+    """(largura, altura) lendo apenas o cabeçalho do arquivo"""
+    with _sem_limite_pixels(), Image.open(caminho) as im:
+        return im.size
+
+
+def e_grande(caminho, limiar: int = LIMIAR_PIXELS) -> bool:
+    largura, altura = tamanho_imagem(caminho)
+    return largura * altura > limiar
+
+
+def abrir_raster(caminho, dir_cache=DIR_CACHE_RASTER) -> np.ndarray:
+    """
+    Raster em tons de cinza mapeado em memória (np.memmap, somente leitura).
+
+    Arquivos ``.npy`` são mapeados diretamente; os demais formatos são
+    decodificados uma vez em cinza e gravados em ``dir_cache`` com o hash
+    do arquivo no nome.
+    """
+    caminho = Path(caminho)
+    if caminho.suffix == ".npy":
+        return np.load(caminho, mmap_mode="r")
+
+    destino = Path(dir_cache) / f"{hash_arquivo(caminho)[:24]}.npy"
+    if not destino.exists():
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        imagem = cv2.imread(str(caminho), cv2.IMREAD_GRAYSCALE)
+        if imagem is None:
+            raise FileNotFoundError(f"Não foi possível abrir a imagem: {caminho}")
+        temporario = destino.with_name(destino.stem + ".parcial.npy")
+        mapa = np.lib.format.open_memmap(temporario, mode="w+", dtype=np.uint8, shape=imagem.shape)
+        mapa[:] = imagem
+        mapa.flush()
+        del mapa, imagem
+        os.replace(temporario, destino)
+    return np.load(destino, mmap_mode="r")
+
+
+def gerar_tiles(altura: int, largura: int, tamanho: int = TAMANHO_TILE,
+                sobreposicao: int = SOBREPOSICAO) -> Iterator[Tile]:
+    """Grade de tiles cujos núcleos particionam a imagem exatamente"""
+    for ny0 in range(0, altura, tamanho):
+        ny1 = min(ny0 + tamanho, altura)
+        for nx0 in range(0, largura, tamanho):
+            nx1 = min(nx0 + tamanho, largura)
+            yield Tile(max(0, nx0 - sobreposicao), max(0, ny0 - sobreposicao),
+                       min(largura, nx1 + sobreposicao), min(altura, ny1 + sobreposicao),
+                       nx0, ny0, nx1, ny1)
+
+
+def ler_tile(raster: np.ndarray, tile: Tile) -> np.ndarray:
+    """Copia apenas a região do tile do mapa para a memória"""
+    return np.array(raster[tile.y0:tile.y1, tile.x0:tile.x1])
+
+
+def processar_tiles(raster: np.ndarray, funcao: Callable[[np.ndarray, Tile], list],
+                    tamanho: int = TAMANHO_TILE, sobreposicao: int = SOBREPOSICAO) -> list:
+    """Aplica ``funcao(bloco, tile)`` a cada tile e concatena os resultados"""
+    resultados = []
+    for tile in gerar_tiles(raster.shape[0], raster.shape[1], tamanho, sobreposicao):
+        resultados.extend(funcao(ler_tile(raster, tile), tile))
+    return resultados
+
+
+def _palavras_do_tile(tile: Tile, dados: Dict[str, list]) -> List[Dict]:
+    palavras = []
+    for k, texto in enumerate(dados.get("text", [])):
+        texto = (texto or "").strip()
+        if not texto:
+            continue
+        x, y = dados["left"][k] + tile.x0, dados["top"][k] + tile.y0
+        w, h = dados["width"][k], dados["height"][k]
+        if tile.contem(x + w / 2, y + h / 2):
+            palavras.append({"texto": texto, "caixa": (x, y, w, h), "conf": dados["conf"][k]})
+    return palavras
+
+
+def ocr_tiles(raster: np.ndarray, receita: Optional[Receita] = None, lang: str = "por",
+              config: str = "--psm 11", tamanho: int = TAMANHO_TILE,
+              sobreposicao: int = SOBREPOSICAO, servico: Optional[ServicoOCR] = None,
+              cache: bool = True) -> List[Dict]:
+    """
+    OCR em tiles com no máximo ``workers + 1`` tiles em memória.
+
+    ``cache=False`` não guarda os tiles no cache de OCR (para quem guarda o
+    texto da prancha inteira).
+
+    Returns:
+        Palavras em coordenadas globais: {"texto", "caixa": (x, y, w, h), "conf"}.
+    """
+    servico = servico or obter_servico()
+    limite = servico.workers + 1
+    palavras: List[Dict] = []
+    pendentes = deque()
+    for tile in gerar_tiles(raster.shape[0], raster.shape[1], tamanho, sobreposicao):
+        bloco = ler_tile(raster, tile)
+        if receita is not None:
+            bloco, _ = receita.aplicar(bloco)
+        pendentes.append((tile, servico.submeter(bloco, lang, config, "dados", cache=cache)))
+        del bloco
+        while len(pendentes) >= limite:
+            tile_pronto, futuro = pendentes.popleft()
+            palavras.extend(_palavras_do_tile(tile_pronto, futuro.result()))
+    while pendentes:
+        tile_pronto, futuro = pendentes.popleft()
+        palavras.extend(_palavras_do_tile(tile_pronto, futuro.result()))
+    return palavras
+
+
+def agrupar_linhas(palavras: List[Dict], fator_espaco: float = 2.0) -> List[Dict]:
+    """
+    Reagrupa palavras em regiões de texto por linha (ordem de leitura).
+
+    Palavras com centros na mesma faixa vertical formam uma linha; um
+    espaço horizontal maior que ``fator_espaco`` x altura inicia outra região.
+
+    Returns:
+        [{"texto": str, "posicao": (x, y, w, h)}, ...] — formato de regioes_texto.
+    """
+    if not palavras:
+        return []
+    ordenadas = sorted(palavras, key=lambda p: p["caixa"][1] + p["caixa"][3] / 2)
+    linhas: List[List[Dict]] = []
+    for p in ordenadas:
+        _, y, _, h = p["caixa"]
+        cy = y + h / 2
+        if linhas:
+            _, ly, _, lh = linhas[-1][-1]["caixa"]
+            if abs(cy - (ly + lh / 2)) < max(h, lh) / 2:
+                linhas[-1].append(p)
+                continue
+        linhas.append([p])
+
+    regioes = []
+    for linha in linhas:
+        linha.sort(key=lambda p: p["caixa"][0])
+        grupo = [linha[0]]
+        for p in linha[1:]:
+            ax, _, aw, ah = grupo[-1]["caixa"]
+            if p["caixa"][0] - (ax + aw) > fator_espaco * ah:
+                regioes.append(_regiao(grupo))
+                grupo = []
+            grupo.append(p)
+        regioes.append(_regiao(grupo))
+    return regioes
+
+
+def _regiao(grupo: List[Dict]) -> Dict:
+    x0 = min(p["caixa"][0] for p in grupo)
+    y0 = min(p["caixa"][1] for p in grupo)
+    x1 = max(p["caixa"][0] + p["caixa"][2] for p in grupo)
+    y1 = max(p["caixa"][1] + p["caixa"][3] for p in grupo)
+    return {"texto": " ".join(p["texto"] for p in grupo), "posicao": (x0, y0, x1 - x0, y1 - y0)}
+
+
+def texto_de_palavras(palavras: List[Dict]) -> str:
+    """Texto corrido (uma região por linha), como o image_to_string"""
+    return "\n".join(r["texto"] for r in agrupar_linhas(palavras))
+
+
+def unir_segmentos(linhas: np.ndarray, tolerancia: int = 3, folga: int = 10) -> np.ndarray:
+    """
+    Une segmentos horizontais/verticais colineares que se tocam ou se
+    sobrepõem (por exemplo, a mesma parede vista por dois tiles).
+    Segmentos inclinados são devolvidos sem alteração.
+    """
+    if len(linhas) == 0:
+        return np.empty((0, 4), dtype=np.int32)
+    linhas = np.asarray(linhas, dtype=np.int32).reshape(-1, 4)
+    dx = np.abs(linhas[:, 2] - linhas[:, 0])
+    dy = np.abs(linhas[:, 3] - linhas[:, 1])
+    horizontais = (dy <= tolerancia) & (dx > dy)
+    verticais = (dx <= tolerancia) & (dy >= dx)
+    outras = linhas[~(horizontais | verticais)]
+
+    def _unir(segs: np.ndarray, eixo_fixo: int) -> List[List[int]]:
+        # eixo_fixo=1 -> horizontais (y constante); 0 -> verticais (x constante)
+        eixo_var = 1 - eixo_fixo
+        fixo = (segs[:, eixo_fixo] + segs[:, eixo_fixo + 2]) / 2
+        ini = np.minimum(segs[:, eixo_var], segs[:, eixo_var + 2])
+        fim = np.maximum(segs[:, eixo_var], segs[:, eixo_var + 2])
+        unidos = []
+        for i in np.lexsort((ini, np.round(fixo / (tolerancia + 1)))):
+            if unidos:
+                f, a, b = unidos[-1]
+                if abs(fixo[i] - f) <= tolerancia and ini[i] <= b + folga:
+                    unidos[-1] = [f, a, max(b, fim[i])]
+                    continue
+            unidos.append([fixo[i], ini[i], fim[i]])
+        if eixo_fixo == 1:
+            return [[int(a), int(round(f)), int(b), int(round(f))] for f, a, b in unidos]
+        return [[int(round(f)), int(a), int(round(f)), int(b)] for f, a, b in unidos]
+
+    resultado = _unir(linhas[horizontais], 1) + _unir(linhas[verticais], 0) + outras.tolist()
+    return np.array(resultado, dtype=np.int32).reshape(-1, 4)
+
+
+def detectar_paredes_tiles(raster: np.ndarray, tamanho: int = TAMANHO_TILE,
+                           sobreposicao: int = SOBREPOSICAO, canny: Tuple[int, int] = (50, 150),
+                           limiar_hough: int = 100, comprimento_min: int = 100,
+                           espaco_max: int = 10) -> np.ndarray:
+    """HoughLinesP por tile, com os segmentos das emendas unidos (N x 4: x1, y1, x2, y2)"""
+    def _linhas(bloco: np.ndarray, tile: Tile) -> list:
+        bordas = cv2.Canny(bloco, canny[0], canny[1], apertureSize=3)
+        linhas = cv2.HoughLinesP(bordas, 1, np.pi / 180, limiar_hough,
+                                 minLineLength=comprimento_min, maxLineGap=espaco_max)
+        if linhas is None:
+            return []
+        resultado = []
+        for x1, y1, x2, y2 in linhas.reshape(-1, 4).tolist():
+            x1, x2, y1, y2 = x1 + tile.x0, x2 + tile.x0, y1 + tile.y0, y2 + tile.y0
+            alinhado = abs(x2 - x1) <= 3 or abs(y2 - y1) <= 3
+            # Segmentos alinhados são unidos depois; os demais ficam com o tile dono
+            if alinhado or tile.contem((x1 + x2) / 2, (y1 + y2) / 2):
+                resultado.append((x1, y1, x2, y2))
+        return resultado
+
+    return unir_segmentos(np.array(processar_tiles(raster, _linhas, tamanho, sobreposicao)))
@@ -4,86 +4,204 @@ import json
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, asdict
 
+PADROES_AMBIENTE = {
+    'QUARTO': [r'QUARTO\s*(\d+)?', r'DORMIT[ÓO]RIO\s*(\d+)?', r'SU[ÍI]TE'],
+    'SALA': [r'SALA\s*(DE\s*)?(ESTAR|JANTAR|TV)?', r'LIVING'],
+    'COZINHA': [r'COZINHA', r'COPA'],
+    'BANHEIRO': [r'BANHEIRO', r'WC', r'LAVABO', r'BWC'],
+    'VARANDA': [r'VARANDA', r'SACADA', r'TERRAÇO'],
+    'ÁREA_SERVIÇO': [r'[ÁA]REA\s*(DE\s*)?SERVI[ÇC]O', r'LAVANDERIA'],
+    'GARAGEM': [r'GARAGEM', r'VAGA', r'ESTACIONAMENTO']
+}
+# Compilados uma vez; a ordem (tipo, padrão) define a ordem dos ambientes no relatório
+_PADROES_AMBIENTE = [(tipo, re.compile(padrao)) for tipo, padroes in PADROES_AMBIENTE.items() for padrao in padroes]
+# Medidas numéricas: número seguido de um sufixo por classe (tipo, classe, sufixo)
+_NUMERO = r'(\d+[,.]?\d*)'
+_SUFIXOS = [
+    ('AREA', '0', r'\s*M[²2]'),
+    ('AREA', '1', r'\s*METROS?\s*QUADRADOS?'),
+    ('DIMENSAO', '', r'\s*[Xx]\s*' + _NUMERO),
+    ('MEDIDA', 'M', r'\s*M(?:ETROS?)?'),
+    ('MEDIDA', 'CM', r'\s*CM'),
+    ('MEDIDA', 'MM', r'\s*MM')
+]
+_PADROES_NUMERICOS = [re.compile(_NUMERO + sufixo) for _, _, sufixo in _SUFIXOS]
+_PADROES_AREA = _PADROES_NUMERICOS[:2]
+_PADRAO_DIMENSAO = _PADROES_NUMERICOS[2]
+# Cada sequência de dígitos, com o número que começa nela e os sufixos que casam logo depois
+_PADRAO_SEQUENCIA = re.compile(r'(?=(?P<numero>\d+[,.]?\d*)' + ''.join(
+    f'(?=(?P<s{i}>{sufixo}))?' for i, (_, _, sufixo) in enumerate(_SUFIXOS)) + r')\d+')
+_GRUPOS_SUFIXO = [_PADRAO_SEQUENCIA.groupindex[f's{i}'] for i in range(len(_SUFIXOS))]
+_PADRAO_NIVEL = re.compile(r'T[ÉE]RREO|SUBSOLO\s*\d*|MEZANINO|COBERTURA|\d+\s*[º°O]?\s*PAVIMENTO|PAVIMENTO\s*\d+')
+
 @dataclass
 class Ambiente:
     nome: str
     area: Optional[float] = None
     dimensoes: Optional[Tuple[float, float]] = None
 
+@dataclass(frozen=True)
+class Token:
+    """Trecho tipado do texto OCR, com offsets [inicio, fim)"""
+    tipo: str  # AMBIENTE | AREA | DIMENSAO | MEDIDA | NIVEL
+    inicio: int
+    fim: int
+    texto: str
+    classe: str = ""  # tipo de ambiente, índice do padrão de área ou unidade da medida
+    valor: object = None  # número, (largura, comprimento) ou índice do padrão de ambiente
+
+def _numero(texto: str) -> float:
+    return float(texto.replace(',', '.'))
+
+def _valor_numero(match) -> float:
+    return _numero(match.group(1))
+
+def _valor_dimensao(match) -> Tuple[float, float]:
+    l = _numero(match.group(1))
+    c = _numero(match.group(2))
+    if l > 100 or c > 100:
+        l = l / 100
+        c = c / 100
+    return (l, c)
+
+def _tokens_ambiente(texto: str) -> List[Token]:
+    tokens = []
+    for indice, (tipo, padrao) in enumerate(_PADROES_AMBIENTE):
+        tokens += [Token('AMBIENTE', m.start(), m.end(), m.group(0), tipo, indice) for m in padrao.finditer(texto)]
+    return tokens
+
+def _tokens_numericos(texto: str) -> List[Token]:
+    """
+    AREA, DIMENSAO e MEDIDA numa única passada pelas sequências de dígitos.
+
+    Os sufixos nunca começam com dígito, vírgula ou ponto, então o número
+    de qualquer padrão é o mais longo possível: todo início dentro de uma
+    sequência de dígitos leva ao mesmo fim e basta testar os sufixos uma vez
+    por sequência. Cada classe só aceita um token a partir do fim do
+    anterior, o que reproduz exatamente o ``finditer`` isolado de cada padrão.
+    """
+    tokens = []
+    livre = [0] * len(_SUFIXOS)
+    for m in _PADRAO_SEQUENCIA.finditer(texto):
+        if m.lastindex == 1:  # só o número, nenhum sufixo
+            continue
+        for i, grupo in enumerate(_GRUPOS_SUFIXO):
+            fim = m.end(grupo)
+            if fim < 0 or m.end() <= livre[i]:
+                continue
+            inicio = max(m.start(), livre[i])
+            tipo, classe, _ = _SUFIXOS[i]
+            if tipo == 'DIMENSAO':
+                valor = _valor_dimensao(_PADRAO_DIMENSAO.match(texto, inicio))
+            else:
+                valor = _numero(texto[inicio:m.end('numero')])
+            tokens.append(Token(tipo, inicio, fim, texto[inicio:fim], classe, valor))
+            livre[i] = fim
+    return tokens
+
+def _tokens_nivel(texto: str) -> List[Token]:
+    return [Token('NIVEL', m.start(), m.end(), m.group(0)) for m in _PADRAO_NIVEL.finditer(texto)]
+
+def tokenizar(texto: str) -> List[Token]:
+    """
+    Tokens do texto (já em maiúsculas) ordenados por posição.
+
+    Os tokens se sobrepõem de propósito, como nos padrões originais: em
+    "3,00 X 4,00 M2" a dimensão e a área compartilham o "4,00", e "BWC"
+    conta como BWC e como WC.
+    """
+    tokens = _tokens_ambiente(texto) + _tokens_numericos(texto) + _tokens_nivel(texto)
+    tokens.sort(key=lambda t: (t.inicio, t.fim))
+    return tokens
+
+_GERADORES = {'AMBIENTE': _tokens_ambiente, 'AREA': _tokens_numericos, 'DIMENSAO': _tokens_numericos,
+              'MEDIDA': _tokens_numericos, 'NIVEL': _tokens_nivel}
+
+class _PrimeiroNaJanela:
+    """
+    Primeiro token de um padrão dentro de janelas [a, b) visitadas em ordem
+    crescente de ``a``: um ponteiro avança sobre os tokens, sem nova varredura.
+
+    Equivale a ``padrao.search(texto, a, b)``. Só quando um token atravessa
+    a borda da janela (e o trecho recortado pode casar diferente) a busca é
+    refeita, limitada à janela.
+    """
+    def __init__(self, texto: str, padrao, tokens: List[Token], valor):
+        self.texto = texto
+        self.padrao = padrao
+        self.tokens = tokens
+        self.valor = valor
+        self.i = 0
+
+    def buscar(self, a: int, b: int):
+        while self.i < len(self.tokens) and self.tokens[self.i].fim <= a:
+            self.i += 1
+        if self.i == len(self.tokens):
+            return None
+        token = self.tokens[self.i]
+        if token.inicio >= b:
+            return None
+        if token.inicio >= a and token.fim <= b:
+            return token.valor
+        match = self.padrao.search(self.texto, a, b)
+        return self.valor(match) if match else None
+
 class ParserPlantaArquitetonica:
     """Parser especializado para plantas arquitetônicas"""
     def __init__(self, texto_ocr: str):
         self.texto = texto_ocr.upper()
         self.ambientes = []
         self.medidas = []
+        self._tokens = {}
 
-    def extrair_ambientes(self) -> List[Ambiente]:
-        padroes_ambiente = {
-            'QUARTO': [r'QUARTO\s*(\d+)?', r'DORMIT[ÓO]RIO\s*(\d+)?', r'SU[ÍI]TE'],
-            'SALA': [r'SALA\s*(DE\s*)?(ESTAR|JANTAR|TV)?', r'LIVING'],
-            'COZINHA': [r'COZINHA', r'COPA'],
-            'BANHEIRO': [r'BANHEIRO', r'WC', r'LAVABO', r'BWC'],
-            'VARANDA': [r'VARANDA', r'SACADA', r'TERRAÇO'],
-            'ÁREA_SERVIÇO': [r'[ÁA]REA\s*(DE\s*)?SERVI[ÇC]O', r'LAVANDERIA'],
-            'GARAGEM': [r'GARAGEM', r'VAGA', r'ESTACIONAMENTO']
-        }
-        for tipo, padroes in padroes_ambiente.items():
-            for padrao in padroes:
-                matches = re.finditer(padrao, self.texto)
-                for match in matches:
-                    area = self._buscar_area_proxima(match.start())
-                    dimensoes = self._buscar_dimensoes_proximas(match.start())
-                    ambiente = Ambiente(
-                        nome=match.group(0),
-                        area=area,
-                        dimensoes=dimensoes
-                    )
-                    self.ambientes.append(ambiente)
-        return self.ambientes
+    @property
+    def tokens(self) -> List[Token]:
+        """Todos os tokens do texto, ordenados por posição (os mesmos de tokenizar, gerados uma vez)"""
+        if 'tokenizar' not in self._tokens:
+            todos = self._gerados(_tokens_ambiente) + self._gerados(_tokens_numericos) + self._gerados(_tokens_nivel)
+            todos.sort(key=lambda t: (t.inicio, t.fim))
+            self._tokens['tokenizar'] = todos
+        return self._tokens['tokenizar']
+
+    def _gerados(self, gerar) -> List[Token]:
+        if gerar.__name__ not in self._tokens:
+            self._tokens[gerar.__name__] = gerar(self.texto)
+        return self._tokens[gerar.__name__]
 
-    def _buscar_area_proxima(self, posicao: int, janela: int = 100) -> Optional[float]:
-        inicio = max(0, posicao - janela)
-        fim = min(len(self.texto), posicao + janela)
-        trecho = self.texto[inicio:fim]
-        padroes_area = [
-            r'(\d+[,.]?\d*)\s*M[²2]',
-            r'(\d+[,.]?\d*)\s*METROS?\s*QUADRADOS?'
-        ]
-        for padrao in padroes_area:
-            match = re.search(padrao, trecho)
-            if match:
-                valor = match.group(1).replace(',', '.')
-                return float(valor)
-        return None
-
-    def _buscar_dimensoes_proximas(self, posicao: int, janela: int = 100) -> Optional[Tuple[float, float]]:
-        inicio = max(0, posicao - janela)
-        fim = min(len(self.texto), posicao + janela)
-        trecho = self.texto[inicio:fim]
-        padrao_dimensao = r'(\d+[,.]?\d*)\s*[Xx]\s*(\d+[,.]?\d*)'
-        match = re.search(padrao_dimensao, trecho)
-        if match:
-            l = float(match.group(1).replace(',', '.'))
-            c = float(match.group(2).replace(',', '.'))
-            if l > 100 or c > 100:
-                l = l / 100
-                c = c / 100
-            return (l, c)
-        return None
+    def _tokens_do_tipo(self, tipo: str, classe: Optional[str] = None) -> List[Token]:
+        return [t for t in self._gerados(_GERADORES[tipo]) if t.tipo == tipo and (classe is None or t.classe == classe)]
+
+    def extrair_ambientes(self, janela: int = 100) -> List[Ambiente]:
+        ambientes = sorted(self._tokens_do_tipo('AMBIENTE'), key=lambda t: t.inicio)
+        areas = [_PrimeiroNaJanela(self.texto, padrao, self._tokens_do_tipo('AREA', str(i)), _valor_numero)
+                 for i, padrao in enumerate(_PADROES_AREA)]
+        dimensoes = _PrimeiroNaJanela(self.texto, _PADRAO_DIMENSAO, self._tokens_do_tipo('DIMENSAO'),
+                                      _valor_dimensao)
+
+        # Junção linear: ambientes e medidas já estão ordenados por posição
+        medidas = {}
+        for token in ambientes:
+            a = max(0, token.inicio - janela)
+            b = min(len(self.texto), token.inicio + janela)
+            area = None
+            for busca in areas:
+                area = busca.buscar(a, b)
+                if area is not None:
+                    break
+            medidas[token] = (area, dimensoes.buscar(a, b))
+
+        # Mesma ordem do relatório original: por tipo, por padrão, por posição
+        for token in sorted(ambientes, key=lambda t: (t.valor, t.inicio)):
+            area, dims = medidas[token]
+            self.ambientes.append(Ambiente(nome=token.texto, area=area, dimensoes=dims))
+        return self.ambientes
 
     def extrair_medidas_gerais(self) -> List[float]:
-        padroes = [
-            r'(\d+[,.]?\d*)\s*M(?:ETROS?)?',
-            r'(\d+[,.]?\d*)\s*CM',
-            r'(\d+[,.]?\d*)\s*MM'
-        ]
-        medidas = []
-        for padrao in padroes:
-            matches = re.findall(padrao, self.texto)
-            for match in matches:
-                valor = float(match.replace(',', '.'))
-                medidas.append(valor)
-        return sorted(set(medidas))
+        return sorted(set(t.valor for t in self._tokens_do_tipo('MEDIDA')))
+
+    def extrair_niveis(self) -> List[str]:
+        """Pavimentos/níveis citados no texto (TÉRREO, 2º PAVIMENTO, COBERTURA...)"""
+        return [re.sub(r'\s+', ' ', t.texto) for t in self._tokens_do_tipo('NIVEL')]
 
     def gerar_relatorio(self) -> Dict:
         ambientes = self.extrair_ambientes()
@@ -0,0 +1,123 @@
+"""
+Executor de pipeline em processo (DAG de etapas)
+
+Cada etapa é uma função Python que recebe, na ordem de ``depende``, os
+valores das etapas (ou entradas) de que depende, e devolve o seu valor. As
+etapas rodam no mesmo interpretador, em ordem topológica, passando objetos
+em memória em vez de arquivos JSON entre subprocessos.
+
+Checkpoints são opcionais: com ``dir_checkpoint``, o valor de cada etapa que
+declara ``checkpoint`` é gravado em JSON nesse diretório, junto com um
+manifesto (``pipeline.json``) que guarda a assinatura das entradas. Com
+``retomar=True`` e a mesma assinatura, etapas já gravadas são lidas do disco
+em vez de executadas; se uma etapa roda de novo, todas as que dependem dela
+também rodam.
+
+Uso:
+    from src.pipeline.dag import Etapa, Pipeline
+    pipeline = Pipeline([
+        Etapa("analise", analisar, depende=("imagem",), checkpoint="resultado_analisador.json"),
+        Etapa("area", calcular, depende=("analise",)),
+    ])
+    resultado = pipeline.executar({"imagem": "planta.png"}, dir_checkpoint="plantas_teste")
+    resultado.valores["area"], resultado.tempos
+"""
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+MANIFESTO = "pipeline.json"
+
+
+@dataclass
+class Etapa:
+    """Uma função do pipeline e os nomes dos valores que ela recebe"""
+    nome: str
+    funcao: Callable[..., Any]
+    depende: Tuple[str, ...] = ()
+    checkpoint: Optional[str] = None  # arquivo JSON no diretório de checkpoints
+
+
+@dataclass
+class ResultadoPipeline:
+    valores: Dict[str, Any] = field(default_factory=dict)
+    tempos: Dict[str, float] = field(default_factory=dict)  # segundos por etapa executada
+    retomadas: List[str] = field(default_factory=list)      # etapas lidas do checkpoint
+
+
+class Pipeline:
+    def __init__(self, etapas: Iterable[Etapa]):
+        self.etapas: Dict[str, Etapa] = {}
+        for etapa in etapas:
+            if etapa.nome in self.etapas:
+                raise ValueError(f"Etapa duplicada: {etapa.nome}")
+            self.etapas[etapa.nome] = etapa
+
+    def ordem(self) -> List[str]:
+        """Etapas em ordem topológica (ValueError se houver ciclo)"""
+        grafo = TopologicalSorter({nome: [d for d in e.depende if d in self.etapas]
+                                   for nome, e in self.etapas.items()})
+        try:
+            return list(grafo.static_order())
+        except CycleError as e:
+            raise ValueError(f"Ciclo entre etapas: {' -> '.join(e.args[1])}") from e
+
+    def executar(self, entradas: Optional[Dict[str, Any]] = None, dir_checkpoint=None,
+                 retomar: bool = False, assinatura: str = "",
+                 ao_concluir: Optional[Callable[[str, Any, float], None]] = None) -> ResultadoPipeline:
+        """Executa todas as etapas; ``ao_concluir(nome, valor, segundos)`` após cada uma"""
+        resultado = ResultadoPipeline(valores=dict(entradas or {}))
+        ordem = self.ordem()
+        for nome in ordem:
+            faltando = [d for d in self.etapas[nome].depende if d not in self.etapas and d not in resultado.valores]
+            if faltando:
+                raise KeyError(f"Etapa '{nome}' depende de valores ausentes: {', '.join(faltando)}")
+
+        pasta = Path(dir_checkpoint) if dir_checkpoint else None
+        gravadas = self._manifesto(pasta, assinatura) if pasta and retomar else {}
+        recalculadas = set()
+        for nome in ordem:
+            etapa = self.etapas[nome]
+            arquivo = pasta / etapa.checkpoint if pasta and etapa.checkpoint else None
+            if (arquivo is not None and gravadas.get(nome) == etapa.checkpoint and arquivo.exists()
+                    and not recalculadas.intersection(etapa.depende)):
+                with open(arquivo, encoding="utf-8") as f:
+                    resultado.valores[nome] = json.load(f)
+                resultado.retomadas.append(nome)
+                continue
+
+            inicio = time.perf_counter()
+            valor = etapa.funcao(*(resultado.valores[d] for d in etapa.depende))
+            resultado.tempos[nome] = time.perf_counter() - inicio
+            resultado.valores[nome] = valor
+            recalculadas.add(nome)
+            if arquivo is not None:
+                _gravar_json(arquivo, valor)
+                gravadas[nome] = etapa.checkpoint
+                _gravar_json(pasta / MANIFESTO, {"assinatura": assinatura, "etapas": gravadas})
+            if ao_concluir is not None:
+                ao_concluir(nome, valor, resultado.tempos[nome])
+        return resultado
+
+    @staticmethod
+    def _manifesto(pasta: Path, assinatura: str) -> Dict[str, str]:
+        """Checkpoints gravados para a mesma assinatura de entradas"""
+        try:
+            with open(pasta / MANIFESTO, encoding="utf-8") as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return dict(manifesto.get("etapas", {})) if manifesto.get("assinatura") == assinatura else {}
+
+
+def _gravar_json(caminho: Path, valor):
+    """Grava de forma atômica (arquivo temporário + rename)"""
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(valor, f, indent=2, ensure_ascii=False)
+    os.replace(temporario, caminho)
@@ -0,0 +1,384 @@
+"""
+Ingestão contínua: fila de jobs em SQLite e daemon que observa uma pasta
+
+Substitui o laço dos scripts batch_pipeline.sh/processar_lote.sh (um
+``run_pipeline.sh`` por arquivo, sucesso decidido por grep no log). Cada
+arquivo novo na pasta observada (via ``watchdog``) vira um job numa fila
+persistida em SQLite, com estado ``queued`` → ``running`` → ``done`` ou
+``failed``. Um número fixo de workers (threads deste processo) retira jobs
+da fila e chama o processador registrado para a extensão do arquivo.
+
+Toda mudança de estado é um evento estruturado (``Evento``), gravado na
+tabela ``eventos`` e entregue aos assinantes (ex.: uma linha JSON por
+evento no log). Ao reiniciar, jobs que estavam ``running`` voltam para a
+fila e os arquivos que chegaram com o daemon parado são enfileirados; um
+arquivo com a mesma assinatura (tamanho e data) não é processado de novo.
+Um arquivo alterado enquanto o seu job roda é marcado como pendente e volta
+para a fila assim que o job termina.
+
+Uso:
+    from src.pipeline.ingestao import DaemonIngestao, FilaJobs
+    daemon = DaemonIngestao("dados/entrada", {".txt": processar_texto}, FilaJobs(), workers=2)
+    daemon.iniciar()
+    ...
+    daemon.parar()
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+CAMINHO_PADRAO = Path(__file__).resolve().parents[2] / "dados" / "ingestao.sqlite"
+
+# Estados de um job
+ENFILEIRADO = "queued"
+EXECUTANDO = "running"
+CONCLUIDO = "done"
+FALHOU = "failed"
+
+
+@dataclass
+class Job:
+    id: int
+    caminho: str
+    assinatura: str
+    estado: str
+    tentativas: int = 0
+
+
+@dataclass
+class Evento:
+    """Transição de estado de um job"""
+    momento: float
+    job: int
+    arquivo: str
+    estado: str
+    dados: Optional[Dict] = None
+
+    def json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+
+def assinatura_arquivo(caminho) -> str:
+    info = os.stat(caminho)
+    return f"{info.st_size}:{info.st_mtime_ns}"
+
+
+class FilaJobs:
+    """Fila de jobs persistida em SQLite, um job por caminho"""
+
+    def __init__(self, caminho=None):
+        self.caminho = Path(caminho or CAMINHO_PADRAO)
+        self._lock = threading.Lock()
+        self._assinantes: List[Callable[[Evento], None]] = []
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.caminho), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                caminho TEXT UNIQUE,
+                assinatura TEXT,
+                estado TEXT,
+                tentativas INTEGER DEFAULT 0,
+                erro TEXT,
+                resultado TEXT,
+                pendente TEXT,
+                criado REAL,
+                atualizado REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_estado ON jobs(estado, id);
+            CREATE TABLE IF NOT EXISTS eventos (
+                id INTEGER PRIMARY KEY,
+                momento REAL,
+                job INTEGER,
+                arquivo TEXT,
+                estado TEXT,
+                dados TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_eventos_job ON eventos(job);
+        """)
+        colunas = {linha[1] for linha in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "pendente" not in colunas:  # fila criada antes da coluna existir
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN pendente TEXT")
+        self._conn.commit()
+
+    def assinar(self, funcao: Callable[[Evento], None]):
+        """Recebe cada evento depois de gravado"""
+        self._assinantes.append(funcao)
+
+    def _registrar(self, job: int, arquivo: str, estado: str, dados: Optional[Dict] = None) -> Evento:
+        evento = Evento(time.time(), job, arquivo, estado, dados)
+        self._conn.execute(
+            "INSERT INTO eventos (momento, job, arquivo, estado, dados) VALUES (?, ?, ?, ?, ?)",
+            (evento.momento, job, arquivo, estado, json.dumps(dados, ensure_ascii=False) if dados else None))
+        return evento
+
+    def _emitir(self, eventos: List[Evento]):
+        for evento in eventos:
+            for funcao in self._assinantes:
+                funcao(evento)
+
+    def enfileirar(self, caminho, assinatura: Optional[str] = None) -> Optional[int]:
+        """Enfileira o arquivo; None se já está na fila ou já foi processado com a mesma assinatura
+
+        Se o job está running, a nova assinatura fica pendente e o job volta
+        para a fila quando terminar (também retorna None).
+        """
+        caminho = str(Path(caminho).resolve())
+        assinatura = assinatura or assinatura_arquivo(caminho)
+        eventos = []
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT id, assinatura, estado FROM jobs WHERE caminho = ?", (caminho,)).fetchone()
+            agora = time.time()
+            if linha is None:
+                job = self._conn.execute(
+                    "INSERT INTO jobs (caminho, assinatura, estado, criado, atualizado) VALUES (?, ?, ?, ?, ?)",
+                    (caminho, assinatura, ENFILEIRADO, agora, agora)).lastrowid
+            else:
+                job, anterior, estado = linha
+                if estado == ENFILEIRADO:
+                    # Arquivo ainda sendo copiado: só a assinatura muda
+                    self._conn.execute("UPDATE jobs SET assinatura = ? WHERE id = ?", (assinatura, job))
+                    self._conn.commit()
+                    return None
+                if estado == EXECUTANDO:
+                    if anterior != assinatura:
+                        self._conn.execute("UPDATE jobs SET pendente = ? WHERE id = ?", (assinatura, job))
+                        self._conn.commit()
+                    return None
+                if anterior == assinatura:
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET assinatura = ?, estado = ?, erro = NULL, atualizado = ? WHERE id = ?",
+                    (assinatura, ENFILEIRADO, agora, job))
+            eventos.append(self._registrar(job, caminho, ENFILEIRADO, {"assinatura": assinatura}))
+            self._conn.commit()
+        self._emitir(eventos)
+        return job
+
+    def reservar(self) -> Optional[Job]:
+        """Próximo job da fila, já marcado como running"""
+        with self._lock:
+            linha = self._conn.execute(
+                "SELECT id, caminho, assinatura, tentativas FROM jobs WHERE estado = ? ORDER BY id LIMIT 1",
+                (ENFILEIRADO,)).fetchone()
+            if linha is None:
+                return None
+            job = Job(linha[0], linha[1], linha[2], EXECUTANDO, linha[3] + 1)
+            self._conn.execute(
+                "UPDATE jobs SET estado = ?, tentativas = ?, atualizado = ? WHERE id = ?",
+                (EXECUTANDO, job.tentativas, time.time(), job.id))
+            evento = self._registrar(job.id, job.caminho, EXECUTANDO, {"tentativa": job.tentativas})
+            self._conn.commit()
+        self._emitir([evento])
+        return job
+
+    def _finalizar(self, job: Job, estado: str, dados: Dict, erro: Optional[str] = None,
+                   resultado: Optional[Dict] = None):
+        with self._lock:
+            pendente = self._conn.execute("SELECT pendente FROM jobs WHERE id = ?", (job.id,)).fetchone()[0]
+            agora = time.time()
+            self._conn.execute(
+                "UPDATE jobs SET estado = ?, assinatura = ?, erro = ?, resultado = ?, pendente = NULL, "
+                "atualizado = ? WHERE id = ?",
+                (estado, job.assinatura, erro,
+                 json.dumps(resultado, ensure_ascii=False) if resultado is not None else None,
+                 agora, job.id))
+            eventos = [self._registrar(job.id, job.caminho, estado, dados)]
+            # arquivo alterado depois da versão que o job leu: processa de novo
+            if pendente is not None and pendente != job.assinatura:
+                self._conn.execute("UPDATE jobs SET estado = ?, assinatura = ?, atualizado = ? WHERE id = ?",
+                                   (ENFILEIRADO, pendente, agora, job.id))
+                eventos.append(self._registrar(job.id, job.caminho, ENFILEIRADO,
+                                               {"assinatura": pendente, "alterado_em_execucao": True}))
+            self._conn.commit()
+        job.estado = estado
+        self._emitir(eventos)
+
+    def concluir(self, job: Job, resultado: Optional[Dict] = None, segundos: float = 0.0):
+        self._finalizar(job, CONCLUIDO, {"segundos": round(segundos, 3), "resultado": resultado},
+                        resultado=resultado)
+
+    def falhar(self, job: Job, erro: str, segundos: float = 0.0):
+        self._finalizar(job, FALHOU, {"segundos": round(segundos, 3), "erro": erro}, erro=erro)
+
+    def retomar(self) -> int:
+        """Devolve à fila os jobs que estavam running (daemon interrompido)"""
+        with self._lock:
+            interrompidos = self._conn.execute(
+                "SELECT id, caminho FROM jobs WHERE estado = ?", (EXECUTANDO,)).fetchall()
+            self._conn.execute("UPDATE jobs SET estado = ?, assinatura = COALESCE(pendente, assinatura), "
+                               "pendente = NULL, atualizado = ? WHERE estado = ?",
+                               (ENFILEIRADO, time.time(), EXECUTANDO))
+            eventos = [self._registrar(job, caminho, ENFILEIRADO, {"retomado": True})
+                       for job, caminho in interrompidos]
+            self._conn.commit()
+        self._emitir(eventos)
+        return len(eventos)
+
+    def refazer_falhas(self) -> int:
+        """Devolve à fila os jobs que falharam"""
+        with self._lock:
+            falhas = self._conn.execute("SELECT id, caminho FROM jobs WHERE estado = ?", (FALHOU,)).fetchall()
+            self._conn.execute("UPDATE jobs SET estado = ?, erro = NULL, atualizado = ? WHERE estado = ?",
+                               (ENFILEIRADO, time.time(), FALHOU))
+            eventos = [self._registrar(job, caminho, ENFILEIRADO, {"refeito": True}) for job, caminho in falhas]
+            self._conn.commit()
+        self._emitir(eventos)
+        return len(eventos)
+
+    def contagem(self) -> Dict[str, int]:
+        with self._lock:
+            linhas = self._conn.execute("SELECT estado, COUNT(*) FROM jobs GROUP BY estado").fetchall()
+        return {estado: 0 for estado in (ENFILEIRADO, EXECUTANDO, CONCLUIDO, FALHOU)} | dict(linhas)
+
+    def jobs(self, estado: Optional[str] = None) -> List[Dict]:
+        campos = ["id", "caminho", "assinatura", "estado", "tentativas", "erro", "atualizado"]
+        sql = f"SELECT {', '.join(campos)} FROM jobs"
+        with self._lock:
+            if estado:
+                linhas = self._conn.execute(sql + " WHERE estado = ? ORDER BY id", (estado,)).fetchall()
+            else:
+                linhas = self._conn.execute(sql + " ORDER BY id").fetchall()
+        return [dict(zip(campos, linha)) for linha in linhas]
+
+    def eventos(self, job: Optional[int] = None) -> List[Evento]:
+        sql = "SELECT momento, job, arquivo, estado, dados FROM eventos"
+        with self._lock:
+            if job is None:
+                linhas = self._conn.execute(sql + " ORDER BY id").fetchall()
+            else:
+                linhas = self._conn.execute(sql + " WHERE job = ? ORDER BY id", (job,)).fetchall()
+        return [Evento(m, j, a, e, json.loads(d) if d else None) for m, j, a, e, d in linhas]
+
+    def fechar(self):
+        self._conn.close()
+
+
+class _Observador(FileSystemEventHandler):
+    def __init__(self, daemon: "DaemonIngestao"):
+        self.daemon = daemon
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.daemon.novo_arquivo(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.daemon.novo_arquivo(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.daemon.novo_arquivo(event.dest_path)
+
+
+class DaemonIngestao:
+    """Observa ``pasta`` e processa os arquivos novos com ``workers`` threads
+
+    ``processadores`` mapeia extensão (".pdf", ".png", ...) para uma função
+    ``processar(caminho: Path) -> dict``; o dicionário devolvido vai para o
+    evento ``done``. Uma exceção marca o job como ``failed``.
+    """
+
+    def __init__(self, pasta, processadores: Dict[str, Callable[[Path], Dict]],
+                 fila: Optional[FilaJobs] = None, workers: int = 2, estabilidade: float = 1.0):
+        self.pasta = Path(pasta)
+        self.processadores = {ext.lower(): funcao for ext, funcao in processadores.items()}
+        self.fila = fila or FilaJobs()
+        self.workers = max(1, workers)
+        self.estabilidade = estabilidade  # segundos sem modificação antes de processar
+        self._sinal = threading.Event()
+        self._parando = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._observer: Optional[Observer] = None
+
+    def aceita(self, caminho) -> bool:
+        caminho = Path(caminho)
+        return caminho.suffix.lower() in self.processadores and not caminho.name.startswith(".")
+
+    def novo_arquivo(self, caminho) -> Optional[int]:
+        if not self.aceita(caminho):
+            return None
+        try:
+            job = self.fila.enfileirar(caminho)
+        except FileNotFoundError:  # removido antes de ser visto
+            return None
+        self._sinal.set()
+        return job
+
+    def varrer(self) -> int:
+        """Enfileira os arquivos que já estão na pasta (chegaram com o daemon parado)"""
+        return sum(self.novo_arquivo(c) is not None for c in sorted(self.pasta.iterdir()) if c.is_file())
+
+    def iniciar(self):
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.fila.retomar()
+        self.varrer()
+        self._observer = Observer()
+        self._observer.schedule(_Observador(self), str(self.pasta), recursive=False)
+        self._observer.start()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._trabalhar, name=f"ingestao-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def parar(self, timeout: Optional[float] = None):
+        """Para de observar e espera os jobs em execução terminarem"""
+        self._parando.set()
+        self._sinal.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def aguardar_ocioso(self, timeout: float = 30.0) -> bool:
+        """True quando não há jobs queued nem running (útil em testes e em modo --uma-vez)"""
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            contagem = self.fila.contagem()
+            if contagem[ENFILEIRADO] == 0 and contagem[EXECUTANDO] == 0:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def _aguardar_estavel(self, job: Job) -> bool:
+        """Espera o arquivo parar de crescer e atualiza a assinatura do job
+
+        False se o daemon começou a parar antes disso: o job fica running e
+        volta para a fila no próximo início.
+        """
+        while True:
+            idade = time.time() - os.stat(job.caminho).st_mtime
+            if idade >= self.estabilidade:
+                job.assinatura = assinatura_arquivo(job.caminho)
+                return True
+            if self._parando.wait(self.estabilidade - idade):
+                return False
+
+    def _trabalhar(self):
+        while not self._parando.is_set():
+            job = self.fila.reservar()
+            if job is None:
+                self._sinal.wait(1.0)
+                self._sinal.clear()
+                continue
+            inicio = time.perf_counter()
+            try:
+                if not self._aguardar_estavel(job):
+                    return
+                processar = self.processadores[Path(job.caminho).suffix.lower()]
+                resultado = processar(Path(job.caminho))
+            except Exception as e:
+                self.fila.falhar(job, f"{type(e).__name__}: {e}", time.perf_counter() - inicio)
+            else:
+                self.fila.concluir(job, resultado, time.perf_counter() - inicio)
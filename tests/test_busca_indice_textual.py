@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from src.busca.indice_textual import IndiceTextual, linhas_com_pagina
+from src.ocr.cache import CacheOCR
+
+
+def test_paginas_por_form_feed_e_marcador():
+    texto = "capa\fPLANTA BAIXA\n\fcorte\n--- Página 7 ---\nFCK 30 MPa\n"
+
+    assert list(linhas_com_pagina(texto)) == [
+        (1, 0, "capa"), (2, 5, "PLANTA BAIXA"), (3, 19, "corte"), (7, 42, "FCK 30 MPa")]
+
+
+def test_busca_sem_acentos_com_pagina_e_offset(tmp_path):
+    pasta = tmp_path / "pipeline_output"
+    pasta.mkdir()
+    (pasta / "estrutural_ocr.txt").write_text(
+        "PLANTA DE FORMAS\nconcreto fck 25 MPa\n\fNOTAS\nLajes: concreto com FCK 30 MPa\n", encoding="utf-8")
+    (pasta / "arquitetura_ocr.txt").write_text(
+        "SALA 12,50 m²\nBANHEIRO social - área 3,20 m²\nÁREA DE SERVIÇO\n", encoding="utf-8")
+    indice = IndiceTextual(tmp_path / "indice.sqlite")
+
+    assert indice.atualizar([(pasta, "*.txt")], incluir_cache=False)["indexados"] == 2
+
+    [ocorrencia] = indice.buscar("fck 30")
+    texto = (pasta / "estrutural_ocr.txt").read_text(encoding="utf-8")
+    assert (ocorrencia.origem, ocorrencia.pagina) == (str(pasta / "estrutural_ocr.txt"), 2)
+    assert texto[ocorrencia.offset:ocorrencia.offset + 6] == "FCK 30"
+    assert [o.linha for o in indice.buscar("banheiro AREA")] == ["BANHEIRO social - área 3,20 m²"]
+    assert len(indice.buscar("area")) == 2
+    assert indice.documentos("concreto") == [(str(pasta / "estrutural_ocr.txt"), 2)]
+    assert len(indice.buscar('"fck 30"')) == 1
+    with pytest.raises(ValueError, match="Consulta inválida"):
+        indice.buscar('fck "30')
+    with pytest.raises(ValueError, match="Consulta inválida"):
+        indice.documentos('"concreto" AND')
+
+
+def test_atualizacao_incremental(tmp_path):
+    pasta = tmp_path / "saidas_split"
+    pasta.mkdir()
+    (pasta / "01_objetivo.txt").write_text("Estacas escavadas", encoding="utf-8")
+    (pasta / "02_alvenaria.txt").write_text("Blocos cerâmicos", encoding="utf-8")
+    indice = IndiceTextual(tmp_path / "indice.sqlite")
+    indice.atualizar([(pasta, "*.txt")], incluir_cache=False)
+
+    assert indice.atualizar([(pasta, "*.txt")], incluir_cache=False) == {
+        "indexados": 0, "inalterados": 2, "removidos": 0}
+
+    (pasta / "01_objetivo.txt").write_text("Estacas hélice contínua", encoding="utf-8")
+    os.utime(pasta / "01_objetivo.txt", ns=(1, 1))
+    (pasta / "02_alvenaria.txt").unlink()
+    assert indice.atualizar([(pasta, "*.txt")], incluir_cache=False) == {
+        "indexados": 1, "inalterados": 0, "removidos": 1}
+    assert indice.buscar("escavadas") == [] and indice.buscar("ceramicos") == []
+    assert [o.linha for o in indice.buscar("helice")] == ["Estacas hélice contínua"]
+
+
+def test_indexa_paginas_do_cache_de_ocr(tmp_path):
+    cache = CacheOCR(tmp_path / "ocr.sqlite")
+    cache.guardar("k1", "QUADRO DE ÁREAS\nBANHEIRO 3,20 m²", origem="projeto.pdf#pagina=4")
+    cache.guardar("k2", {"text": ["BANHEIRO"]}, tipo="dados")
+    indice = IndiceTextual(tmp_path / "indice.sqlite")
+
+    assert indice.atualizar([], cache=cache)["indexados"] == 1
+    [ocorrencia] = indice.buscar("banheiro")
+    assert (ocorrencia.origem, ocorrencia.pagina, ocorrencia.offset) == ("projeto.pdf#pagina=4", 4, 16)
+
+    cache.limpar()
+    assert indice.atualizar([], cache=cache)["removidos"] == 1
+    assert indice.buscar("banheiro") == []
@@ -0,0 +1,54 @@
+from parser_inteligente_plantas import ParserInteligentePlantas, TipoPlanta
+from src.classificador_tipos import ClassificadorTipos
+
+
+def test_conta_em_uma_passada_ignorando_acentos_e_caixa():
+    classificador = ClassificadorTipos({
+        "hidraulica": ["ÁGUA", "CAIXA D'ÁGUA", "esgoto"],
+        "eletrica": ["elétric", "ELET"],
+    })
+
+    contagem = classificador.contar("Caixa d'agua e água fria; ESGOTO. Instalação Eletrica / ELÉTRICA")
+
+    assert contagem == {"AGUA": 2, "CAIXA D'AGUA": 1, "ESGOTO": 1, "ELETRIC": 2, "ELET": 2}
+
+
+def test_tipos_pontuados_e_nao_o_primeiro_com_dois_acertos():
+    classificador = ClassificadorTipos({
+        "arquitetonica": ["sala", "quarto", "cozinha"],
+        "estrutural": ["pilar", "viga", "laje", "fck"],
+    })
+    texto = "SALA QUARTO  P1 PILAR 20x40 VIGA V2 LAJE L1 fck 25 MPa"
+
+    pontuacoes = classificador.classificar(texto)
+
+    assert [p.tipo for p in pontuacoes] == ["estrutural", "arquitetonica"]
+    assert (pontuacoes[0].distintas, pontuacoes[0].cobertura) == (4, 1.0)
+    assert classificador.melhor("SALA", minimo=2) is None
+
+
+def test_parser_usa_palavras_do_config():
+    parser = ParserInteligentePlantas()
+    texto = "Sala 12,5 m² / Quarto — tomada TUG, interruptor, disjuntor 20A, circuito 3, eletroduto"
+
+    assert parser.identificar_tipo_planta(texto) == TipoPlanta.ELETRICA
+    assert parser.identificar_tipo_planta("texto qualquer") == TipoPlanta.ARQUITETONICA
+    assert parser.pontuar_tipos(texto)[0]["tipo"] == "eletrica"
+
+
+def test_parser_so_classifica_tipos_com_proposito():
+    parser = ParserInteligentePlantas()
+
+    for texto in ("LAYOUT MOBILIARIO MESA CADEIRA SOFA", "DETALHE CORTE AA ESCALA 1:50 VISTA COTAS PERFIL"):
+        resultado = parser.processar_planta(texto)
+
+        assert resultado.tipo in parser.propositos
+        assert {p["tipo"] for p in parser.pontuar_tipos(texto)} <= {t.value for t in parser.propositos}
+
+
+def test_conta_palavras_sobrepostas():
+    classificador = ClassificadorTipos({"hidraulica": ["caixa d'água", "água fria", "água"]})
+
+    contagem = classificador.contar("CAIXA D'ÁGUA FRIA")
+
+    assert contagem == {"CAIXA D'AGUA": 1, "AGUA FRIA": 1, "AGUA": 1}
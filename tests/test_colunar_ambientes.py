@@ -0,0 +1,60 @@
+import json
+
+import pyarrow.compute as pc
+
+from src.colunar.ambientes import (ESQUEMA_AMBIENTES, EscritorAmbientes, converter_json, ler_ambientes,
+                                   registros_de_json, somar_areas)
+
+ANALISADOR = {
+    "projeto": "Análise Automática de Planta Baixa",
+    "arquivo_origem": "plantas_teste/planta_construcode_pagina1.png",
+    "medidas": [
+        {"ambiente": "Sala", "largura": 4.5, "comprimento": 3.8, "bbox": [10, 20, 120, 30]},
+        {"ambiente": "Banheiro", "largura": 2.0, "comprimento": 1.5},
+        {"ambiente": "Quarto", "largura": "3,5", "comprimento": "x", "pagina": 2},
+    ],
+}
+CORRIGIDO = {
+    "projeto": {"nome": "Residencial A", "data": "2025-06-01", "responsavel": "Marcos Sea"},
+    "geometria": {"medidas": [{"ambiente": "Cozinha", "largura": 3.2, "comprimento": 2.5}], "area_total": 8.0},
+}
+
+
+def test_le_os_formatos_json_do_pipeline():
+    sala, banheiro, quarto = registros_de_json(ANALISADOR, "ignorado")
+    [cozinha] = registros_de_json(CORRIGIDO, "resultado_analisador")
+
+    assert (sala["planta_id"], sala["projeto"], sala["bbox"]) == (
+        "planta_construcode_pagina1", "Análise Automática de Planta Baixa", {"x": 10, "y": 20, "w": 120, "h": 30})
+    assert abs(sala["area"] - 17.1) < 1e-9 and banheiro["bbox"] is None
+    assert (quarto["largura"], quarto["comprimento"], quarto["area"], quarto["pagina"]) == (3.5, None, None, 2)
+    assert (cozinha["projeto"], cozinha["planta_id"], cozinha["area"]) == ("Residencial A", "resultado_analisador", 8.0)
+    assert len(list(registros_de_json(dict(ANALISADOR, geometria=None), "p"))) == 3
+    assert list(registros_de_json({"geometria": None, "medidas": None}, "p")) == []
+
+
+def test_parquet_ida_e_volta_e_somas_vetorizadas(tmp_path):
+    for nome, dados in (("a.json", ANALISADOR), ("b.json", CORRIGIDO)):
+        (tmp_path / nome).write_text(json.dumps(dados, ensure_ascii=False), encoding="utf-8")
+
+    assert converter_json([tmp_path / "a.json", tmp_path / "b.json"], tmp_path / "ambientes.parquet") == 4
+    tabela = ler_ambientes(tmp_path / "ambientes.parquet")
+    assert tabela.schema == ESQUEMA_AMBIENTES and tabela.num_rows == 4
+
+    # Mesmo critério de calcula_area_total: só medidas >= 2 m nas duas direções
+    somas = somar_areas(tabela, largura_minima=2, comprimento_minimo=2).to_pylist()
+    assert [(s["planta_id"], round(s["area_total"], 2), s["ambientes"]) for s in somas] == [
+        ("b", 8.0, 1), ("planta_construcode_pagina1", 17.1, 1)]
+
+    grandes = ler_ambientes(tmp_path, colunas=["ambiente"], filtro=pc.field("area") > 5)
+    assert sorted(grandes["ambiente"].to_pylist()) == ["Cozinha", "Sala"]
+
+
+def test_escritor_em_grupos_de_linhas(tmp_path):
+    registros = [{"planta_id": f"p{i % 3}", "ambiente": "Sala", "largura": 3.0, "comprimento": 4.0, "area": 12.0}
+                 for i in range(10)]
+    with EscritorAmbientes(tmp_path / "x.parquet", linhas_por_grupo=4) as escritor:
+        escritor.escrever(registros)
+
+    somas = somar_areas(ler_ambientes(tmp_path / "x.parquet")).to_pylist()
+    assert [(s["planta_id"], s["area_total"]) for s in somas] == [("p0", 48.0), ("p1", 36.0), ("p2", 36.0)]
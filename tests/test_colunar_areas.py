@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+
+from src.colunar.ambientes import converter_json
+from src.colunar.areas import area_total, carregar_ambientes, dataframe_de_json, totais
+
+MEDIDAS = [
+    {"ambiente": "Sala", "largura": 4.5, "comprimento": 3.8},
+    {"ambiente": "Banheiro", "largura": 2.0, "comprimento": 1.5},
+    {"ambiente": "Quarto", "largura": "3,5", "comprimento": 3},
+    {"ambiente": "Varanda", "largura": "x", "comprimento": 2},
+    {"ambiente": "Hall"},
+]
+
+
+def _laco_original(medidas, largura_minima=2, comprimento_minimo=2):
+    total = 0.0
+    for medida in medidas:
+        try:
+            largura, comprimento = float(medida["largura"]), float(medida["comprimento"])
+        except Exception:
+            continue
+        if largura >= largura_minima and comprimento >= comprimento_minimo:
+            total += largura * comprimento
+    return total
+
+
+def test_area_total_igual_ao_laco_original():
+    assert area_total(MEDIDAS) == _laco_original(MEDIDAS) + 3.5 * 3  # "3,5" agora também é aceito
+    rng = np.random.default_rng(7)
+    medidas = [{"ambiente": "A", "largura": float(l), "comprimento": float(c)}
+               for l, c in rng.uniform(0, 8, size=(5000, 2)).round(2)]
+    assert abs(area_total(medidas) - _laco_original(medidas)) < 1e-6
+    assert area_total([]) == 0.0
+
+
+def test_dataframe_de_json_com_geometria_nula():
+    df = dataframe_de_json({"projeto": {"nome": "A"}, "arquivo_origem": "x/p1.png", "geometria": None,
+                            "medidas": MEDIDAS})
+    assert list(df.columns) == ["projeto", "planta_id", "ambiente", "largura", "comprimento"]
+    assert (len(df), df["projeto"].iloc[0], df["planta_id"].iloc[0]) == (5, "A", "p1")
+    assert df["largura"].iloc[2] == 3.5
+
+
+def test_totais_por_ambiente_planta_e_projeto(tmp_path):
+    corrigido = {"projeto": {"nome": "Residencial A"}, "geometria": {"medidas": MEDIDAS}}
+    (tmp_path / "p1.json").write_text(json.dumps(corrigido), encoding="utf-8")
+    analisador = {"projeto": "Residencial B", "arquivo_origem": "plantas/p2.png",
+                  "medidas": [{"ambiente": "Sala", "largura": 5, "comprimento": 4}]}
+    (tmp_path / "p2.json").write_text(json.dumps(analisador), encoding="utf-8")
+    converter_json([tmp_path / "p2.json"], tmp_path / "parquet" / "p2.parquet")
+
+    df = carregar_ambientes([tmp_path / "p1.json", tmp_path / "parquet", analisador])
+    resumo = totais(df)
+
+    plantas = resumo["plantas"].set_index("planta_id")
+    assert list(plantas.index) == ["p1", "p2"]
+    assert round(plantas.loc["p1", "area_total"], 2) == 27.6
+    assert (plantas.loc["p1", "ambientes"], plantas.loc["p1", "descartados"]) == (2, 3)
+    projetos = resumo["projetos"].set_index("projeto")["area_total"].round(2).to_dict()
+    assert projetos == {"Residencial A": 27.6, "Residencial B": 40.0}
+    ambientes = resumo["ambientes"].set_index("ambiente")
+    assert round(ambientes.loc["Sala", "area_total"], 2) == 57.1 and ambientes.loc["Sala", "ambientes"] == 3
+    assert np.isnan(ambientes.loc["Banheiro", "area_media"])
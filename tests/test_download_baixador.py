@@ -0,0 +1,160 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.download.baixador import (TAMANHO_BLOCO, ConfigDownload, LimitadorHost, baixar_arquivo, baixar_lote,
+                                   criar_sessao, nome_planta)
+
+CONTEUDO = b"%PDF-1.4\n" + bytes(range(256)) * 400
+
+
+class ServidorPlantas(BaseHTTPRequestHandler):
+    """Stand-in local: Range, falhas transitórias, corte no meio do corpo e simultaneidade"""
+    falhas = {}
+    ativos = 0
+    pico = 0
+    lock = threading.Lock()
+    ranges = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.ativos += 1
+            cls.pico = max(cls.pico, cls.ativos)
+        try:
+            self._responder()
+        finally:
+            with cls.lock:
+                cls.ativos -= 1
+
+    def _responder(self):
+        cls = type(self)
+        caminho = self.path
+        restantes = cls.falhas.get(caminho, 0)
+        if restantes:
+            cls.falhas[caminho] = restantes - 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if caminho.startswith("/html"):
+            corpo = b"<html>login</html>"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+            return
+
+        inicio = 0
+        intervalo = self.headers.get("Range")
+        cls.ranges.append(intervalo)
+        if intervalo:
+            inicio = int(intervalo.split("=")[1].rstrip("-"))
+            if caminho.startswith("/desalinhado"):
+                inicio = 100  # ignora o Range pedido
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {inicio}-{len(CONTEUDO) - 1}/{len(CONTEUDO)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(CONTEUDO) - inicio))
+        self.end_headers()
+        if caminho.startswith("/cortado") and not intervalo:
+            self.wfile.write(CONTEUDO[:80000])  # conexão cai no meio do corpo
+            return
+        self.wfile.write(CONTEUDO[inicio:])
+
+
+@pytest.fixture
+def servidor():
+    ServidorPlantas.falhas, ServidorPlantas.ranges = {}, []
+    ServidorPlantas.ativos = ServidorPlantas.pico = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), ServidorPlantas)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+CONFIG = ConfigDownload(tentativas=3, delay_segundos=0.01, timeout=5, workers=6, por_host=2, intervalo_host=0)
+
+
+def test_repete_com_backoff_e_grava_manifesto(servidor, tmp_path):
+    ServidorPlantas.falhas = {"/planta/1": 2}
+    urls = [f"{servidor}/planta/{i}" for i in range(1, 7)] + [f"{servidor}/html"]
+
+    resultados = baixar_lote(urls, tmp_path, CONFIG, manifesto=tmp_path / "manifesto.jsonl",
+                             validar=lambda cabeca: cabeca.startswith(b"%PDF"))
+
+    por_url = {r.url: r for r in resultados}
+    assert por_url[urls[0]].status == "OK" and por_url[urls[0]].tentativas == 3
+    assert all(por_url[u].bytes == len(CONTEUDO) for u in urls[:6])
+    assert por_url[urls[-1]].status == "FALHA"
+    assert ServidorPlantas.pico <= CONFIG.por_host
+    linhas = [json.loads(l) for l in (tmp_path / "manifesto.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert sorted(l["url"] for l in linhas) == sorted(urls)
+
+
+def test_desiste_depois_das_tentativas(servidor, tmp_path):
+    ServidorPlantas.falhas = {"/planta/x": 10}
+
+    resultado = baixar_arquivo(f"{servidor}/planta/x", tmp_path / "x.pdf", criar_sessao(CONFIG), CONFIG)
+
+    assert resultado.status == "ERRO" and resultado.tentativas == CONFIG.tentativas
+    assert not (tmp_path / "x.pdf").exists()
+
+
+def test_retoma_com_range_depois_de_corte(servidor, tmp_path):
+    destino = tmp_path / "cortado.pdf"
+
+    resultado = baixar_arquivo(f"{servidor}/cortado", destino, criar_sessao(CONFIG), CONFIG,
+                               LimitadorHost(1, 0))
+
+    assert resultado.status == "OK" and resultado.retomado
+    assert ServidorPlantas.ranges == [None, f"bytes={TAMANHO_BLOCO}-"]  # blocos completos já gravados
+    assert destino.read_bytes() == CONTEUDO
+
+
+def test_content_range_desalinhado_recomeca_do_zero(servidor, tmp_path):
+    destino = tmp_path / "desalinhado.pdf"
+    (tmp_path / "desalinhado.pdf.parcial").write_bytes(b"x" * 500)
+
+    resultado = baixar_arquivo(f"{servidor}/desalinhado", destino, criar_sessao(CONFIG), CONFIG)
+
+    assert resultado.status == "OK" and resultado.tentativas == 2
+    assert ServidorPlantas.ranges == ["bytes=500-", None]
+    assert destino.read_bytes() == CONTEUDO
+
+
+def test_url_invalida_vira_erro_sem_derrubar_o_lote(servidor, tmp_path):
+    resultado = baixar_arquivo("notaurl", tmp_path / "x.pdf", criar_sessao(CONFIG), CONFIG)
+    assert resultado.status == "ERRO" and resultado.tentativas == 1 and resultado.erro
+
+    urls = ["notaurl", f"{servidor}/planta/1", "http://"]
+    resultados = baixar_lote(urls, tmp_path, CONFIG)
+    assert [r.url for r in resultados] == urls
+    assert [r.status for r in resultados] == ["ERRO", "OK", "ERRO"]
+
+
+def test_lote_na_ordem_com_urls_repetidas(servidor, tmp_path):
+    urls = [f"{servidor}/planta/2", f"{servidor}/planta/1", f"{servidor}/planta/2"]
+
+    resultados = baixar_lote(urls, tmp_path, CONFIG, manifesto=tmp_path / "manifesto.jsonl")
+
+    assert [r.url for r in resultados] == urls and all(r.status == "OK" for r in resultados)
+    assert ServidorPlantas.ranges.count(None) == 2  # a repetida é baixada uma vez
+    assert len((tmp_path / "manifesto.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_nome_planta_distingue_links_so_com_tp():
+    base = "https://www.construcode.com.br/Track/Planta/?m={}&o=cc&area=37589&tp=301"
+    nomes = {nome_planta(base.format(m)) for m in ("xgoVn%2f7JbbU%3d", "AbCdE%2f12345%3d")}
+    assert len(nomes) == 2
+    assert all(n.startswith("planta_idProjetodesconhecido_idObradesconhecido_tp301_") for n in nomes)
+    url = "https://www.construcode.com.br/Track/PlantasMob?idProjeto=37589&idObra=2221&tp=016"
+    assert nome_planta(url) == nome_planta(url) and nome_planta(url).startswith("planta_idProjeto37589_idObra2221_tp016_")
+    assert nome_planta("https://exemplo.com/arquivo.pdf").endswith(".pdf")
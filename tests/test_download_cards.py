@@ -0,0 +1,38 @@
+from bs4 import BeautifulSoup
+
+from src.download.cards import gerar_pagina_sintetica, iterar_cards
+
+HTML = """<html><body><div class="lista">
+<div class="card destaque" onclick="window.location='/Track/Planta/?m=xgoVn%2f7JbbU%3d&o=cc&area=37589&tp=';">
+  <h2 class="card__title"> ARQUITETÔNICO - <b>PLANTA BAIXA</b> </h2>
+  <p class="card__text">Revisão: 03</p>
+</div>
+<div class="card" onclick="abrirMenu()"><h2 class="card__title">Menu</h2></div>
+<div class="card" onclick="window.location='/Track/Planta/?m=abc&o=cc&area=1&tp=';"></div>
+</div></body></html>"""
+
+
+def test_cards_em_streaming(tmp_path):
+    caminho = tmp_path / "lista.html"
+    caminho.write_text(HTML, encoding="utf-8")
+
+    cards = list(iterar_cards(caminho, tamanho_bloco=64))
+
+    assert [posicao for posicao, _ in cards] == [1, 3]
+    primeiro = cards[0][1]
+    assert primeiro["planta_id"] == "xgoVn/7JbbU="
+    assert primeiro["titulo"] == "ARQUITETÔNICO - PLANTA BAIXA"
+    assert primeiro["revisao"] == "03"
+    assert cards[1][1]["titulo"] == "Sem título" and cards[1][1]["revisao"] == "00"
+
+
+def test_mesmos_registros_que_beautifulsoup(tmp_path):
+    caminho = tmp_path / "sintetica.html"
+    gerar_pagina_sintetica(caminho, 300)
+    soup = BeautifulSoup(caminho.read_text(encoding="utf-8"), "html.parser")
+    esperados = [(c.find("h2", class_="card__title").text.strip(), c.find("p", class_="card__text").text.strip())
+                 for c in soup.find_all("div", class_="card")]
+
+    obtidos = [(r["titulo"], r["detalhes"]) for _, r in iterar_cards(caminho, tamanho_bloco=4096)]
+
+    assert obtidos == esperados
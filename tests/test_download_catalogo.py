@@ -0,0 +1,81 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.download.baixador import ConfigDownload
+from src.download.catalogo import CatalogoPlantas, sincronizar
+
+ARQUIVOS = {"/p/a": b"%PDF-a1", "/p/b": b"%PDF-b1", "/p/c": b"%PDF-c1"}
+
+
+class Servidor(BaseHTTPRequestHandler):
+    pedidos = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        corpo = ARQUIVOS[self.path]
+        etag = f'"{hash(corpo)}"'
+        type(self).pedidos.append(self.path)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+@pytest.fixture
+def servidor():
+    Servidor.pedidos = []
+    ARQUIVOS.update({"/p/a": b"%PDF-a1", "/p/b": b"%PDF-b1", "/p/c": b"%PDF-c1"})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Servidor)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+CONFIG = ConfigDownload(tentativas=1, delay_segundos=0, timeout=5, workers=3, intervalo_host=0)
+
+
+def _cards(base, revisoes):
+    return [{"planta_id": pid, "area_id": "37589", "titulo": pid, "tipo": "ARQUITETÔNICA",
+             "revisao": rev, "url_completa": f"{base}/p/{pid}", "nome_arquivo": f"{pid}_REV{rev}.pdf"}
+            for pid, rev in revisoes.items()]
+
+
+def test_sincroniza_so_novas_e_revisadas(servidor, tmp_path):
+    catalogo = CatalogoPlantas(tmp_path / "catalogo.sqlite")
+
+    primeiro = sincronizar(_cards(servidor, {"a": "00", "b": "00"}), tmp_path / "plantas", catalogo, CONFIG)
+    assert (primeiro["novas"], primeiro["baixadas"]) == (2, 2)
+
+    Servidor.pedidos = []
+    ARQUIVOS["/p/b"] = b"%PDF-b2"
+    segundo = sincronizar(_cards(servidor, {"a": "00", "b": "01", "c": "00"}), tmp_path / "plantas",
+                          catalogo, CONFIG)
+
+    assert (segundo["novas"], segundo["revisadas"], segundo["inalteradas"]) == (1, 1, 1)
+    assert sorted(Servidor.pedidos) == ["/p/b", "/p/c"]
+    assert catalogo.obter("b")["revisao"] == "01"
+    assert (tmp_path / "plantas" / "ARQUITETÔNICA" / "b_REV01.pdf").read_bytes() == b"%PDF-b2"
+    assert catalogo.obter("a")["etag"]
+
+
+def test_verificar_usa_get_condicional(servidor, tmp_path):
+    catalogo = CatalogoPlantas(tmp_path / "catalogo.sqlite")
+    cards = _cards(servidor, {"a": "00"})
+    sincronizar(cards, tmp_path, catalogo, CONFIG)
+    sha = catalogo.obter("a")["sha256"]
+
+    resumo = sincronizar(cards, tmp_path, catalogo, CONFIG, verificar=True)
+
+    assert resumo["resultados"][0].status == "INALTERADO"
+    assert resumo["baixadas"] == 0 and resumo["bytes"] == 0
+    assert catalogo.obter("a")["sha256"] == sha
@@ -0,0 +1,105 @@
+import json
+import math
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.materials.drywall import Abertura, CalculadorDrywall, DimensoesAmbiente
+from src.materials.drywall_bom import AgregadorMateriais, ler_entradas
+from src.materials.drywall_lote import AmbientesLote
+
+AMBIENTES = pd.DataFrame({
+    "comprimento": [4.0, 3.2, 5.5, 2.0, "x"],
+    "largura": [3.0, 2.8, 4.1, 1.5, 2.0],
+    "altura": [2.7, 2.7, 2.8, 2.6, 2.7],
+    "area_aberturas": [1.68, 0.0, 3.36, 1.44, 0.0],
+    "tipo_chapa": ["ST", "RU", "ST", "RU", "ST"],
+})
+
+
+def _calculadores():
+    for linha in AMBIENTES.iloc[:4].itertuples():
+        calculador = CalculadorDrywall(DimensoesAmbiente(linha.comprimento, linha.largura, linha.altura))
+        calculador.adicionar_abertura(Abertura(linha.area_aberturas, 1.0))
+        yield linha.tipo_chapa, calculador
+
+
+def test_totais_iguais_a_soma_escalar_e_arredondamento_unico():
+    agregador = AgregadorMateriais()
+    agregador.adicionar_dataframe(AMBIENTES)
+    assert agregador.ambientes == 4 and agregador.ignorados == 1
+
+    fita = montantes = chapas_ru = parafusos = 0
+    for tipo, calculador in _calculadores():
+        parede, forro = calculador.calcular_parede_simples(), calculador.calcular_forro()
+        fita += parede["acabamento"]["fita_metros"] + forro["acabamento"]["fita_metros"]
+        montantes += parede["estrutura_metalica"]["montantes"]["quantidade_pecas"]
+        parafusos += parede["fixacao"]["parafusos_total"] + forro["fixacao"]["parafusos_chapa_estrutura"]
+        if tipo == "RU":
+            chapas_ru += parede["chapas"]["quantidade"] + forro["chapas"]["quantidade"]
+
+    itens = {item.material.sku: item for item in agregador.itens()}
+    assert itens["M70"].quantidade == montantes
+    assert itens["CHAPA-RU"].quantidade == chapas_ru
+    assert itens["PARAFUSO"].quantidade == parafusos
+    assert itens["FITA"].quantidade == pytest.approx(fita, abs=0.05)
+    # um arredondamento sobre o total, em vez de um por ambiente
+    assert itens["FITA"].embalagens == math.ceil(itens["FITA"].quantidade / 50) == 9
+    assert itens["FITA"].embalagens_por_ambiente == 10
+    assert itens["PARAFUSO"].embalagens == math.ceil(parafusos / 1000) < itens["PARAFUSO"].embalagens_por_ambiente
+    assert "LA-MINERAL" not in itens
+
+
+def test_blocos_nao_mudam_o_resultado(tmp_path):
+    grande = pd.concat([AMBIENTES.iloc[:4]] * 250, ignore_index=True)
+    grande.to_csv(tmp_path / "ambientes.csv", index=False)
+
+    de_uma_vez = AgregadorMateriais()
+    de_uma_vez.adicionar_dataframe(grande)
+    em_blocos = AgregadorMateriais()
+    blocos = list(ler_entradas([tmp_path], tamanho_bloco=64))
+    for bloco in blocos:
+        em_blocos.adicionar_dataframe(bloco)
+
+    assert len(blocos) == 16
+    assert em_blocos.por_ambiente == de_uma_vez.por_ambiente
+    for sku, quantidade in de_uma_vez.quantidades.items():
+        assert em_blocos.quantidades[sku] == pytest.approx(quantidade)
+    assert [i.embalagens for i in em_blocos.itens()] == [i.embalagens for i in de_uma_vez.itens()]
+
+
+def test_json_do_pipeline_e_xlsx(tmp_path):
+    dados = {"projeto": {"nome": "Torre"}, "geometria": {"medidas": [
+        {"ambiente": "Sala", "largura": "3,5", "comprimento": 4},
+        {"ambiente": "Quarto", "largura": 3, "comprimento": 3},
+        {"ambiente": "Hall"},
+    ]}}
+    (tmp_path / "planta.json").write_text(json.dumps(dados), encoding="utf-8")
+
+    agregador = AgregadorMateriais(la_mineral=True)
+    for bloco in ler_entradas([tmp_path / "planta.json"]):
+        agregador.adicionar_dataframe(bloco, altura=2.7)
+    assert agregador.resumo()["ambientes"] == 2 and agregador.ignorados == 1
+    assert agregador.resumo()["area_forro_m2"] == 23.0
+
+    saida = tmp_path / "lista.xlsx"
+    agregador.salvar_xlsx(saida)
+    linhas = list(load_workbook(saida)["Lista de compras"].iter_rows(values_only=True))
+    assert linhas[0][0] == "SKU"
+    skus = [linha[0] for linha in linhas[1:]]
+    assert skus == [item.material.sku for item in agregador.itens()]
+    assert "LA-MINERAL" in skus and "CHAPA-ST" in skus
+    assert any(texto.startswith("Fita para juntas: ") for texto in agregador.lista_compras())
+
+
+def test_tipo_de_chapa_normalizado_ou_ignorado():
+    agregador = AgregadorMateriais()
+    agregador.adicionar_dataframe(AMBIENTES.iloc[:4].assign(tipo_chapa=[" st", "ru", "ST", "xx"]))
+    assert agregador.ambientes == 3 and agregador.ignorados == 1
+
+    esperado = AgregadorMateriais()
+    esperado.adicionar_dataframe(AMBIENTES.iloc[:3])
+    assert agregador.quantidades == esperado.quantidades
+    with pytest.raises(ValueError):
+        agregador.adicionar_lote(AmbientesLote.criar([4.0, 3.0], [3.0, 2.0], [2.7, 2.7]), ["ru", "XX"])
@@ -0,0 +1,76 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.materials.drywall import Abertura, CalculadorDrywall, DimensoesAmbiente, TipoChapa
+from src.materials.drywall_lote import AmbientesLote, CalculadorDrywallLote
+
+
+def _ambientes_aleatorios(n, semente=7):
+    aleatorio = random.Random(semente)
+    calculadores, tipos = [], []
+    for _ in range(n):
+        calculador = CalculadorDrywall(DimensoesAmbiente(
+            round(aleatorio.uniform(0.8, 15), aleatorio.choice([1, 2, 3])),
+            round(aleatorio.uniform(0.8, 12), aleatorio.choice([1, 2, 3])),
+            aleatorio.choice([2.5, 2.6, 2.7, 2.8, 3.0, round(aleatorio.uniform(2.2, 4), 2)]),
+        ))
+        for _ in range(aleatorio.randint(0, 4)):
+            calculador.adicionar_abertura(Abertura(aleatorio.choice([0.6, 0.7, 0.8, 0.9, 1.2, 1.5]),
+                                                   aleatorio.choice([0.6, 1.2, 1.5, 2.1])))
+        calculadores.append(calculador)
+        tipos.append(aleatorio.choice(["simples", "simples", "dupla"]))
+    return calculadores, tipos
+
+
+def test_equivale_ao_calculo_escalar():
+    calculadores, tipos = _ambientes_aleatorios(2000)
+    quantitativos = CalculadorDrywallLote(AmbientesLote.de_calculadores(calculadores, tipos)).calcular()
+
+    for i, (calculador, tipo) in enumerate(zip(calculadores, tipos)):
+        parede = (calculador.calcular_parede_dupla(TipoChapa.RESISTENTE_UMIDADE) if tipo == "dupla"
+                  else calculador.calcular_parede_simples(TipoChapa.RESISTENTE_UMIDADE))
+        assert quantitativos.parede(i, TipoChapa.RESISTENTE_UMIDADE) == parede
+        assert quantitativos.forro(i) == calculador.calcular_forro()
+
+
+@pytest.mark.parametrize("altura_chapa", [2.60, 3.00])
+def test_altura_chapa_e_forro_sem_estrutura(altura_chapa):
+    calculadores, _ = _ambientes_aleatorios(300, semente=11)
+    quantitativos = CalculadorDrywallLote(AmbientesLote.de_calculadores(calculadores)).calcular(
+        altura_chapa=altura_chapa, estrutura_metalica=False)
+
+    for i, calculador in enumerate(calculadores):
+        assert quantitativos.parede(i) == calculador.calcular_parede_simples(altura_chapa=altura_chapa)
+        assert quantitativos.forro(i) == calculador.calcular_forro(estrutura_metalica=False)
+
+
+def test_tabela_compacta_e_totais():
+    calculadores, tipos = _ambientes_aleatorios(50, semente=3)
+    quantitativos = CalculadorDrywallLote(AmbientesLote.de_calculadores(calculadores, tipos)).calcular()
+    df = quantitativos.dataframe()
+
+    assert len(df) == 50
+    chapas = [c.calcular_parede_dupla() if t == "dupla" else c.calcular_parede_simples()
+              for c, t in zip(calculadores, tipos)]
+    assert df["chapas_parede"].tolist() == [p["chapas"]["quantidade"] for p in chapas]
+    assert df["parafusos_chapa_parede"].tolist() == [p["fixacao"]["parafusos_chapa_estrutura"] for p in chapas]
+    assert quantitativos.totais()["chapas_forro"] == sum(c.calcular_forro()["chapas"]["quantidade"]
+                                                         for c in calculadores)
+
+
+def test_aberturas_em_colunas():
+    lote = AmbientesLote.de_aberturas([4.0, 3.0, 5.0], [3.0, 3.0, 2.0], [2.7, 2.7, 2.7],
+                                      indice_ambiente=[0, 0], larguras=[0.8, 1.2], alturas=[2.1, 1.2])
+    esperado = CalculadorDrywall(DimensoesAmbiente(4.0, 3.0, 2.7))
+    esperado.adicionar_abertura(Abertura(0.8, 2.1))
+    esperado.adicionar_abertura(Abertura(1.2, 1.2))
+
+    assert lote.area_aberturas[1] == 0
+    assert CalculadorDrywallLote(lote).calcular().parede(0) == esperado.calcular_parede_simples()
+
+
+def test_colunas_com_tamanhos_diferentes():
+    with pytest.raises(ValueError):
+        AmbientesLote(np.ones(3), np.ones(3), np.ones(2), np.zeros(3), np.zeros(3, dtype=bool))
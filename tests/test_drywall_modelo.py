@@ -0,0 +1,64 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src.materials.drywall import Abertura, CalculadorDrywall, DimensoesAmbiente
+from src.materials.drywall_lote import AmbientesLote, CalculadorDrywallLote
+from src.modules.drywall.models.drywall_model import RegistroAbertura, RegistroAmbiente, TabelaAmbientes
+from src.modules.drywall.services.calculator import ServicoCalculo
+
+QUARTO = RegistroAmbiente(3.2, 2.8, 2.7, [RegistroAbertura(0.8, 2.1), RegistroAbertura(1.2, 1.2, "janela")])
+
+
+def _calculador_comum(registro):
+    calculador = CalculadorDrywall(DimensoesAmbiente(registro.comprimento, registro.largura, registro.altura))
+    for ab in registro.aberturas:
+        calculador.adicionar_abertura(Abertura(ab.largura, ab.altura, ab.tipo))
+    return calculador
+
+
+def test_registros_imutaveis_com_slots_e_derivados():
+    assert QUARTO.perimetro == DimensoesAmbiente(3.2, 2.8, 2.7).perimetro
+    assert QUARTO.area_piso == DimensoesAmbiente(3.2, 2.8, 2.7).area_piso
+    assert QUARTO.area_aberturas == 0.8 * 2.1 + 1.2 * 1.2
+    assert isinstance(QUARTO.aberturas, tuple)
+    assert not hasattr(QUARTO, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        QUARTO.comprimento = 4.0
+    assert QUARTO == RegistroAmbiente(3.2, 2.8, 2.7, (RegistroAbertura(0.8, 2.1), RegistroAbertura(1.2, 1.2, "janela")))
+    assert hash(QUARTO) == hash(RegistroAmbiente(3.2, 2.8, 2.7, QUARTO.aberturas))
+
+
+def test_registro_serve_onde_se_espera_dimensoes_ambiente():
+    calculador = QUARTO.calculador()
+    esperado = _calculador_comum(QUARTO)
+    assert calculador.gerar_relatorio_completo() == esperado.gerar_relatorio_completo()
+    assert RegistroAmbiente.de_calculador(esperado) == QUARTO
+    assert ServicoCalculo().parede(QUARTO, QUARTO.aberturas) == esperado.calcular_parede_simples()
+
+
+def test_tabela_consumida_pelo_calculador_em_lote():
+    r = np.random.default_rng(5)
+    registros = [RegistroAmbiente(float(c), float(l), 2.7, QUARTO.aberturas[:k], bool(d))
+                 for c, l, k, d in zip(r.uniform(1.5, 8, 300).round(2), r.uniform(1.2, 6, 300).round(2),
+                                       r.integers(0, 3, 300), r.random(300) < 0.3)]
+    tabela = TabelaAmbientes.de_registros(iter(registros), n=len(registros))
+    lote = AmbientesLote.de_calculadores([_calculador_comum(reg) for reg in registros],
+                                         ["dupla" if reg.parede_dupla else "simples" for reg in registros])
+
+    assert isinstance(tabela, AmbientesLote) and len(tabela) == 300
+    assert tabela.nbytes == 300 * (4 * 8 + 1)
+    assert tabela.perimetro is tabela.perimetro
+    resultado, esperado = CalculadorDrywallLote(tabela).calcular(), CalculadorDrywallLote(lote).calcular()
+    for nome, coluna in esperado.colunas().items():
+        assert np.array_equal(resultado.colunas()[nome], coluna), nome
+    assert tabela.registro(7).area_aberturas == registros[7].area_aberturas
+    assert tabela.registro(7).perimetro == registros[7].perimetro
+
+
+def test_tabela_com_numero_errado_de_registros():
+    with pytest.raises(ValueError):
+        TabelaAmbientes.de_registros(iter([QUARTO] * 3), n=2)
+    with pytest.raises(ValueError):
+        TabelaAmbientes.de_registros(iter([QUARTO] * 3), n=4)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.materials.drywall import DimensoesAmbiente
+from src.materials.drywall_lote import AmbientesLote
+from src.modules.drywall.services.optimizer import OtimizadorCorte, cortar_barras, cortar_chapas
+
+
+def test_barras_reaproveitam_sobras():
+    # 2.0 + 1.0 fecham uma barra; as sobras de 0.3 das peças de 2.7 recebem as de 0.3
+    assert cortar_barras({2000: 3, 1000: 3}) == (3, {})
+    assert cortar_barras({2700: 5, 300: 5}) == (5, {})
+    assert cortar_barras({1400: 3}) == (2, {1600: 1})
+
+
+def test_barras_com_espessura_de_corte():
+    assert cortar_barras({1000: 3}, corte=5)[0] == 2
+    assert cortar_barras({1500: 2}, corte=0)[0] == 1
+    with pytest.raises(ValueError):
+        cortar_barras({3100: 1})
+
+
+def test_chapas_guilhotina():
+    # a terceira faixa de 600 fica sozinha e o quadrado de 1200 não cabe na sobra dela
+    assert cortar_chapas({(1200, 2400): 2, (600, 2400): 3, (1200, 1200): 1}) == \
+        (5, {(600, 2400): 1, (1200, 1200): 1})
+    # giradas, as faixas de 2400 x 300 cabem na chapa e a sobra de 600 recebe as de 1200 x 300
+    assert cortar_chapas({(2400, 300): 2, (1200, 300): 4}) == (1, {})
+    with pytest.raises(ValueError):
+        cortar_chapas({(2400, 300): 1}, girar=False)
+
+
+@pytest.mark.parametrize("semente", [0, 1, 2])
+def test_conservacao_de_material(semente):
+    r = np.random.default_rng(semente)
+    n = 200
+    lote = AmbientesLote.criar(r.uniform(1.5, 8, n).round(2), r.uniform(1.2, 6, n).round(2),
+                               r.choice([2.5, 2.7, 2.8, 3.2], n), parede_dupla=r.random(n) < 0.3)
+    otimizador = OtimizadorCorte(sobra_minima_perfil=0, sobra_minima_chapa=0)
+    otimizador.adicionar_lote(lote)
+    relatorio = otimizador.otimizar()
+
+    for perfil, resultado in relatorio.perfis.items():
+        assert resultado.barras * 3000 == sum(mm * q for mm, q in otimizador.perfis[perfil].items()) \
+            + sum(mm * q for mm, q in resultado.sobras_mm.items())
+        assert resultado.barras <= resultado.estimativa_barras
+    c = relatorio.chapas
+    assert c.chapas * 1200 * 2400 == sum(w * h * q for (w, h), q in otimizador.chapas.items()) \
+        + sum(w * h * q for (w, h), q in c.sobras_mm.items())
+    assert c.area_comprada >= c.area_pecas and c.chapas < c.estimativa_chapas
+
+
+def test_pecas_de_um_ambiente():
+    otimizador = OtimizadorCorte()
+    otimizador.adicionar_ambiente(DimensoesAmbiente(4.0, 3.0, 2.7))
+
+    assert otimizador.perfis["M70"] == {2700: 28}         # ceil(14 / 0.6) + 4
+    assert otimizador.perfis["G70"] == {3000: 8, 1000: 4}  # 4 m = barra + 1 m; 3 m = barra
+    assert otimizador.chapas[(1200, 2400)] == 4 * (3 + 2) + 2  # 2 paredes x 2 faces de cada lado + forro
+    relatorio = otimizador.otimizar()
+    assert relatorio.perfis["G70"].barras == 10
+    assert "Chapas:" in relatorio.texto()
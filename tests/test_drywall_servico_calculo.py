@@ -0,0 +1,68 @@
+from src.core.quantity_calculator import QuantityCalculator
+from src.materials.drywall import Abertura, CalculadorDrywall, DimensoesAmbiente, TipoChapa
+from src.modules.drywall.services.calculator import ServicoCalculo, chave_aberturas
+
+
+def _escalar(ambiente, aberturas):
+    calculador = CalculadorDrywall(ambiente)
+    for abertura in aberturas:
+        calculador.adicionar_abertura(abertura)
+    return calculador
+
+
+def test_tipologia_repetida_calcula_uma_vez():
+    servico = ServicoCalculo()
+    aberturas = [Abertura(0.8, 2.1), Abertura(1.2, 1.2, "janela")]
+    for _ in range(30):  # 30 andares com o mesmo quarto
+        parede = servico.parede(DimensoesAmbiente(3.2, 2.8, 2.7), aberturas)
+        forro = servico.forro(DimensoesAmbiente(3.2, 2.8, 2.7))
+
+    calculador = _escalar(DimensoesAmbiente(3.2, 2.8, 2.7), aberturas)
+    assert parede == calculador.calcular_parede_simples()
+    assert forro == calculador.calcular_forro()
+    assert servico.estatisticas() == {"entradas": 2, "tamanho_maximo": 4096, "acertos": 58,
+                                      "falhas": 2, "taxa_acerto": 0.967}
+
+
+def test_chave_canonica():
+    servico = ServicoCalculo()
+    servico.parede(DimensoesAmbiente(3.2, 2.8, 2.7), [Abertura(0.8, 2.1), Abertura(1.2, 1.2, "janela")])
+    # menos de meio milímetro de diferença e aberturas em outra ordem: mesmo ambiente
+    servico.parede(DimensoesAmbiente(3.2002, 2.7999, 2.7), [Abertura(1.2, 1.2, "janela"), Abertura(0.8, 2.1)])
+    assert servico.estatisticas()["acertos"] == 1
+
+    servico.parede(DimensoesAmbiente(3.2, 2.8, 2.7), [Abertura(0.8, 2.1), Abertura(1.2, 1.2, "janela")],
+                   tipo_parede="dupla")
+    servico.parede(DimensoesAmbiente(3.2, 2.8, 2.7), [Abertura(0.8, 2.1), Abertura(1.2, 1.2, "janela")],
+                   tipo_chapa=TipoChapa.RESISTENTE_UMIDADE)
+    assert servico.estatisticas()["entradas"] == 3
+    assert chave_aberturas([Abertura(1.2, 1.2), Abertura(0.8, 2.1)]) == ((800, 2100), (1200, 1200))
+    # porta e janela do mesmo tamanho dão o mesmo resultado
+    servico.parede(DimensoesAmbiente(3.2, 2.8, 2.7), [Abertura(0.8, 2.1, "janela"), Abertura(1.2, 1.2)])
+    assert servico.estatisticas()["acertos"] == 2
+
+
+def test_resultado_copiado_ou_compartilhado():
+    servico = ServicoCalculo()
+    ambiente = DimensoesAmbiente(4.0, 3.0, 2.7)
+    parede = servico.parede(ambiente, tipo_parede="dupla")
+    parede["chapas"]["quantidade"] *= 2  # alterar a resposta não mexe no cache
+    assert servico.parede(ambiente, tipo_parede="dupla") == CalculadorDrywall(ambiente).calcular_parede_dupla()
+    assert servico.forro(ambiente, copiar=False) is servico.forro(ambiente, copiar=False)
+    assert servico.forro(ambiente) is not servico.forro(ambiente)
+
+
+def test_lru_limitado_e_relatorio():
+    servico = ServicoCalculo(tamanho=2)
+    for comprimento in (3.0, 4.0, 5.0, 3.0):
+        servico.forro(DimensoesAmbiente(comprimento, 3.0, 2.7))
+    assert servico.estatisticas()["entradas"] == 2
+    assert servico.estatisticas()["acertos"] == 0  # 3.0 já tinha sido despejado
+
+    calculador = _escalar(DimensoesAmbiente(4.0, 3.0, 2.7), [Abertura(0.8, 2.1)])
+    assert servico.do_calculador(calculador, "dupla") == calculador.gerar_relatorio_completo(tipo_parede="dupla")
+    aberturas = [{"width": 0.8, "height": 2.1}, {"width": 1.2, "height": 1.2}]
+    assert servico.area_parede(4.0, 2.7, aberturas) == QuantityCalculator.wall_area(4.0, 2.7, aberturas)
+    assert servico.area_parede(4.0, 2.7, aberturas[::-1]) == QuantityCalculator.wall_area(4.0, 2.7, aberturas)
+    servico.limpar()
+    assert servico.estatisticas()["entradas"] == 0
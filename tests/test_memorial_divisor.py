@@ -0,0 +1,71 @@
+import mmap
+import re
+
+from src.memorial.divisor import dividir_memorial
+
+
+def split_antigo(texto):
+    """split_sections anterior (re.split sobre o texto inteiro), usado como referência"""
+    blocos = re.compile(r'\n?(\d{1,3}\.\s*[A-Z][^\n]+)\n', re.UNICODE).split(texto)
+    resultado = {}
+    if blocos[0].strip():
+        resultado['INTRO'] = blocos[0].strip()
+    for i in range(1, len(blocos), 2):
+        resultado[blocos[i].strip()] = blocos[i + 1].strip() if (i + 1) < len(blocos) else ""
+    return resultado
+
+
+MEMORIAL = (
+    "MEMORIAL DESCRITIVO  \n"
+    "Obra: Residência Unifamiliar\n\n"
+    "1. OBJETIVO\n"
+    "\n"
+    "   Este memorial descreve os serviços.\t \n"
+    "\n"
+    "2. FUNDAÇÕES E ESTRUTURA\n"
+    "Estacas de 30 cm, concreto fck 25 MPa.\n"
+    "  \n"
+    "Vigas baldrame 20x40.\n\n\n"
+    "3. ALVENARIA\n"
+    "4. REVESTIMENTOS - PAREDES INTERNAS E EXTERNAS DE ÁREAS MOLHADAS\n"
+    "Cerâmica 30x60 até o teto.\n"
+)
+
+
+def test_mesmas_secoes_que_o_split_antigo(tmp_path):
+    origem = tmp_path / "memorial.txt"
+    origem.write_text(MEMORIAL, encoding="utf-8")
+
+    secoes = list(dividir_memorial(origem, tmp_path / "saida"))
+
+    esperado = split_antigo(MEMORIAL)
+    assert [s.titulo for s in secoes] == list(esperado)
+    assert [(tmp_path / "saida" / s.arquivo).read_text(encoding="utf-8") for s in secoes] == list(esperado.values())
+    assert [s.arquivo for s in secoes] == [
+        "01_intro.txt", "02_1_objetivo.txt", "03_2_fundacoes_e_estrutura.txt", "04_3_alvenaria.txt",
+        "05_4_revestimentos_paredes_internas_e_externas_de_areas.txt"]
+
+
+def test_indice_aponta_o_corpo_no_arquivo_de_origem(tmp_path):
+    origem = tmp_path / "memorial.txt"
+    origem.write_bytes(MEMORIAL.replace("\n", "\r\n").encode("utf-8"))
+    saida = tmp_path / "saida"
+
+    secoes = list(dividir_memorial(origem, saida))
+
+    with open(origem, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        for secao in secoes:
+            assert mapa[secao.inicio:secao.fim] == (saida / secao.arquivo).read_bytes()
+            if secao.cabecalho >= 0:
+                assert mapa[secao.cabecalho:].startswith(secao.titulo.encode("utf-8"))
+    assert secoes[3].titulo == "3. ALVENARIA" and secoes[3].bytes == 0
+
+
+def test_sem_intro_e_titulos_repetidos(tmp_path):
+    origem = tmp_path / "memorial.txt"
+    origem.write_text("\n\n1. GERAL\na\n1. GERAL\nb", encoding="utf-8")
+
+    secoes = list(dividir_memorial(origem, tmp_path))
+
+    assert [(s.ordem, s.titulo, (tmp_path / s.arquivo).read_text(encoding="utf-8")) for s in secoes] == [
+        (1, "1. GERAL", "a"), (2, "1. GERAL", "b")]
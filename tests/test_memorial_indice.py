@@ -0,0 +1,53 @@
+import mmap
+import os
+
+from src.memorial import indice as modulo
+from src.memorial.indice import MemorialIndexado, caminho_sidecar, carregar_indice
+
+MEMORIAL = (
+    "MEMORIAL DESCRITIVO\n\n"
+    "1. OBJETIVO\nEste memorial descreve os serviços.\n\n"
+    "2. FUNDAÇÕES E ESTRUTURA\nEstacas de 30 cm, concreto fck 25 MPa.\nVigas baldrame 20x40.\n"
+    "3. ALVENARIA\nBlocos cerâmicos 14x19x29.\n"
+)
+
+
+def test_secoes_por_mmap_sem_copia(tmp_path):
+    origem = tmp_path / "memorial_unificado.txt"
+    origem.write_text(MEMORIAL, encoding="utf-8")
+
+    with MemorialIndexado(origem) as memorial:
+        assert memorial.reconstruido
+        assert [s.chave for s in memorial] == ["intro", "objetivo", "fundacoes_e_estrutura", "alvenaria"]
+        assert memorial.texto("Fundações e Estrutura") == "Estacas de 30 cm, concreto fck 25 MPa.\nVigas baldrame 20x40."
+        assert memorial.texto(4) == memorial.texto("3. ALVENARIA") == "Blocos cerâmicos 14x19x29."
+        view = memorial.memoria("objetivo")
+        assert isinstance(view.obj, mmap.mmap) and bytes(view) == "Este memorial descreve os serviços.".encode("utf-8")
+        view.release()
+        assert all(memorial.verificar(s) for s in memorial)
+
+    sidecar = carregar_indice(caminho_sidecar(origem))
+    assert sidecar["tamanho"] == origem.stat().st_size
+    assert [s.titulo for s in sidecar["secoes"]][1:] == ["1. OBJETIVO", "2. FUNDAÇÕES E ESTRUTURA", "3. ALVENARIA"]
+
+
+def test_reindexa_so_quando_o_checksum_muda(tmp_path, monkeypatch):
+    origem = tmp_path / "memorial.txt"
+    origem.write_text(MEMORIAL, encoding="utf-8")
+    MemorialIndexado(origem).fechar()
+    varreduras = []
+    original = modulo.dividir_memorial
+    monkeypatch.setattr(modulo, "dividir_memorial", lambda *a: varreduras.append(a) or original(*a))
+
+    # Mesmo conteúdo com outra data: só o checksum é conferido
+    os.utime(origem, (1, 1))
+    with MemorialIndexado(origem) as memorial:
+        assert not memorial.reconstruido
+    assert carregar_indice(caminho_sidecar(origem))["modificado_em"] == 1
+    assert varreduras == []
+
+    origem.write_text(MEMORIAL.replace("14x19x29", "9x19x39"), encoding="utf-8")
+    with MemorialIndexado(origem) as memorial:
+        assert memorial.reconstruido
+        assert memorial.texto("alvenaria") == "Blocos cerâmicos 9x19x39."
+    assert len(varreduras) == 1
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.ocr import servico as servico_mod
+from src.ocr import cache as cache_mod
+from src.ocr.cache import CacheOCR, hash_imagem, montar_chave
+
+
+def test_cache_conta_acertos_e_falhas(tmp_path):
+    cache = CacheOCR(tmp_path / "ocr.sqlite")
+    chave = montar_chave("abc", "cinza", "--psm 11", versao="5.3.0")
+
+    assert cache.obter(chave) is None
+    cache.guardar(chave, "SALA 3,5x4,0")
+    cache.guardar("outra", {"text": ["SALA"]}, tipo="dados")
+
+    assert cache.obter(chave) == "SALA 3,5x4,0"
+    assert cache.obter("outra") == {"text": ["SALA"]}
+    stats = cache.estatisticas()
+    assert (stats["entradas"], stats["acertos"], stats["falhas"]) == (2, 2, 1)
+
+
+def test_cache_despeja_menos_usadas_recentemente(tmp_path):
+    cache = CacheOCR(tmp_path / "ocr.sqlite", limite_mb=2500 / 1024 / 1024)
+    cache.guardar("a", "x" * 1000)
+    cache.guardar("b", "y" * 1000)
+    cache.obter("a")  # "a" passa a ser a mais recente
+    cache.guardar("c", "z" * 1000)
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") is not None
+    assert cache.obter("c") is not None
+
+
+def test_caminho_e_limite_do_ambiente(tmp_path, monkeypatch):
+    monkeypatch.setenv("WSF_OCR_CACHE", "1")
+    monkeypatch.setenv("WSF_OCR_CACHE_PATH", str(tmp_path / "outro.sqlite"))
+    monkeypatch.setattr(cache_mod, "_CACHE", None)
+    cache = cache_mod.obter_cache()
+    assert cache.caminho == tmp_path / "outro.sqlite"
+
+    sem_espaco = CacheOCR(tmp_path / "zero.sqlite", limite_mb=0)
+    sem_espaco.guardar("a", "x")
+    assert sem_espaco.limite_bytes == 0 and sem_espaco.estatisticas()["entradas"] == 0
+
+
+def test_chave_depende_de_receita_config_e_versao():
+    base = montar_chave("h", "r1", "--psm 11", versao="5.3.0")
+    assert base != montar_chave("h", "r2", "--psm 11", versao="5.3.0")
+    assert base != montar_chave("h", "r1", "--psm 6", versao="5.3.0")
+    assert base != montar_chave("h", "r1", "--psm 11", versao="4.1.1")
+
+
+def test_servico_nao_repete_ocr_em_cache(tmp_path, monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(servico_mod, "_executar",
+                        lambda tarefa, imagem, lang, config, backend: chamadas.append(1) or "SALA")
+    monkeypatch.setattr(servico_mod, "versao_tesseract", lambda backend: "5.3.0")
+    cache = CacheOCR(tmp_path / "ocr.sqlite")
+    servico = servico_mod.ServicoOCR(workers=0, backend="pytesseract", cache=cache)
+    imagem = np.zeros((20, 30), dtype=np.uint8)
+
+    assert servico.texto(imagem) == "SALA"
+    assert servico.texto(imagem.copy()) == "SALA"
+    assert len(chamadas) == 1
+    assert hash_imagem(imagem) != hash_imagem(imagem.reshape(30, 20))
+
+
+def test_total_acompanha_substituicoes_e_reducao(tmp_path):
+    cache = CacheOCR(tmp_path / "ocr.sqlite", limite_mb=2500 / 1024 / 1024)
+    cache.guardar("a", "x" * 1000)
+    cache.guardar("a", "x" * 1500)  # substitui, não soma
+    cache.guardar("b", "y" * 1000)
+
+    assert cache.estatisticas()["entradas"] == 2
+    assert cache._total_bytes == 2500
+    assert cache.reduzir(1200 / 1024 / 1024) == 1
+    assert cache._total_bytes == 1000 and cache.obter("b") is not None
@@ -0,0 +1,50 @@
+import cv2
+import numpy as np
+
+from src.ocr.leaflet import coordenadas_tile, listar_tiles, montar_prancha
+
+
+def _salvar_tiles(pasta, imagem, z, lado, nome):
+    for ty in range(imagem.shape[0] // lado):
+        for tx in range(imagem.shape[1] // lado):
+            caminho = pasta / nome(z, 10 + tx, 20 + ty)
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(caminho), imagem[ty * lado:(ty + 1) * lado, tx * lado:(tx + 1) * lado])
+
+
+def test_coordenadas_dos_nomes_de_tile():
+    for nome in ("tiles/15/3/7.png", "tile_004_15_3_7.png"):
+        tile = coordenadas_tile(nome)
+        assert (tile.z, tile.x, tile.y) == (15, 3, 7)
+    assert coordenadas_tile("planta_20250610_081412_p01.png") is None
+    assert coordenadas_tile("img_2025_06_10.png") is None
+    assert coordenadas_tile("planta-15-3-7.png") is None
+    assert coordenadas_tile("2025/06/10.png") is None
+    assert coordenadas_tile("15/3/7.pdf") is None
+
+
+def test_monta_maior_zoom_em_resolucao_total(tmp_path):
+    original = np.random.default_rng(1).integers(0, 256, (3 * 64, 4 * 64), dtype=np.uint8)
+    _salvar_tiles(tmp_path, original, 5, 64, lambda z, x, y: f"{z}/{x}/{y}.png")
+    _salvar_tiles(tmp_path, original[::2, ::2], 4, 32, lambda z, x, y: f"tile_001_{z}_{x}_{y}.png")
+
+    assert sorted(listar_tiles(tmp_path)) == [4, 5]
+    prancha = montar_prancha(tmp_path, saida=tmp_path / "prancha.npy")
+
+    assert isinstance(prancha, np.memmap)
+    assert np.array_equal(prancha, original)
+    assert np.array_equal(np.load(tmp_path / "prancha.npy"), original)
+
+
+def test_tiles_ausentes_ficam_brancos_e_tms_inverte_y(tmp_path):
+    original = np.zeros((128, 64), dtype=np.uint8)
+    original[64:] = 100
+    _salvar_tiles(tmp_path, original, 3, 64, lambda z, x, y: f"{z}/{x}/{y}.png")
+    (tmp_path / "3" / "11").mkdir()
+    cv2.imwrite(str(tmp_path / "3" / "11" / "20.png"), np.full((64, 64), 50, np.uint8))
+
+    prancha = montar_prancha(tmp_path, tms=True)
+
+    assert prancha.shape == (128, 128)
+    assert (prancha[:64, :64] == 100).all() and (prancha[64:, :64] == 0).all()
+    assert (prancha[:64, 64:] == 255).all() and (prancha[64:, 64:] == 50).all()
@@ -0,0 +1,55 @@
+from concurrent.futures import Future
+
+from src.ocr import pdf
+from src.ocr import servico as servico_mod
+from src.ocr.cache import CacheOCR
+
+
+class ServicoFalso:
+    """Segura os Futures até o consumidor pedir, para medir páginas em voo"""
+    workers = 2
+    cache = None
+
+    def __init__(self):
+        self.em_voo = 0
+        self.pico = 0
+
+    def submeter(self, imagem, lang, config, cache=True):
+        self.em_voo += 1
+        self.pico = max(self.pico, self.em_voo)
+        futuro = Future()
+        futuro.set_result(f"texto {imagem}")
+        original = futuro.result
+
+        def result(timeout=None):
+            self.em_voo -= 1
+            return original(timeout)
+
+        futuro.result = result
+        return futuro
+
+
+def test_ocr_pdf_paginas_em_ordem_e_memoria_limitada(monkeypatch):
+    monkeypatch.setattr(pdf, "contar_paginas", lambda caminho: 40)
+    monkeypatch.setattr(pdf, "rasterizar_pagina", lambda caminho, pagina, dpi: pagina)
+    servico = ServicoFalso()
+
+    resultado = list(pdf.ocr_pdf_paginas("plantas.pdf", servico=servico))
+
+    assert [p for p, _, _ in resultado] == list(range(1, 41))
+    assert resultado[0] == (1, 40, "texto 1")
+    assert servico.pico <= servico.workers + 1
+
+
+def test_pagina_fica_no_cache_uma_vez_so(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf, "contar_paginas", lambda caminho: 2)
+    monkeypatch.setattr(pdf, "rasterizar_pagina", lambda caminho, pagina, dpi: str(pagina).encode())
+    monkeypatch.setattr(pdf, "hash_arquivo", lambda caminho: "pdf")
+    monkeypatch.setattr(servico_mod, "_executar", lambda tarefa, imagem, lang, config, backend: "SALA")
+    cache = CacheOCR(tmp_path / "ocr.sqlite")
+    servico = servico_mod.ServicoOCR(workers=0, backend="pytesseract", cache=cache)
+
+    assert [t for _, _, t in pdf.ocr_pdf_paginas("plantas.pdf", servico=servico)] == ["SALA", "SALA"]
+    stats = cache.estatisticas()
+    assert (stats["entradas"], stats["falhas"]) == (2, 2)
+    assert sorted(e["origem"] for e in cache.listar()) == ["plantas.pdf#pagina=1", "plantas.pdf#pagina=2"]
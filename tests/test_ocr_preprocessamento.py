@@ -0,0 +1,23 @@
+import numpy as np
+
+from src.ocr.preprocessamento import RECEITAS, Receita
+
+
+def test_receita_aplica_em_memoria_e_mede_etapas():
+    imagem = np.random.default_rng(0).integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    receita = Receita.de_lista("teste", [
+        "cinza",
+        ("morfologia", {"tamanho": 1}),
+        ("denoise", {"h": 10, "lado_max": 200}),
+        "otsu",
+    ])
+
+    resultado, tempos = receita.aplicar(imagem)
+
+    assert resultado.shape == (300, 400)
+    assert set(np.unique(resultado)) <= {0, 255}
+    assert [nome for nome, _ in tempos] == ["cinza", "morfologia", "denoise", "otsu"]
+
+
+def test_descricao_canonica_da_receita():
+    assert RECEITAS["planta_principal"].descricao() == "cinza()|threshold(limiar=150)|mediana(k=3)"
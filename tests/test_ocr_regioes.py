@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.ocr.regioes import atribuir_palavras, montar_mosaico
+
+
+def _dados(palavras):
+    """Monta um resultado no formato do pytesseract.Output.DICT"""
+    campos = ["text", "left", "top", "width", "height", "block_num", "par_num", "line_num"]
+    dados = {c: [] for c in campos}
+    for texto, (x, y, w, h), linha in palavras:
+        for c, v in zip(campos, [texto, x, y, w, h, 1, 1, linha]):
+            dados[c].append(v)
+    return dados
+
+
+def test_montar_mosaico_copia_rois_sem_sobreposicao():
+    imagem = np.full((200, 300), 255, dtype=np.uint8)
+    imagem[10:30, 10:60] = 0
+    imagem[100:140, 200:290] = 0
+    caixas = [(10, 10, 50, 20), (200, 100, 90, 40)]
+
+    mosaico, posicoes = montar_mosaico(imagem, caixas)
+
+    assert len(posicoes) == 2
+    for (x, y, w, h), (mx, my, mw, mh) in zip(caixas, posicoes):
+        assert (w, h) == (mw, mh)
+        assert np.array_equal(mosaico[my:my + mh, mx:mx + mw], imagem[y:y + h, x:x + w])
+    (ax, ay, aw, ah), (bx, by, bw, bh) = posicoes
+    assert ax + aw <= bx or ay + ah <= by
+
+
+def test_atribuir_palavras_por_centro_e_linha():
+    caixas = [(0, 0, 100, 50), (200, 0, 100, 50)]
+    dados = _dados([
+        ("SALA", (5, 5, 40, 15), 1),
+        ("3,5x4,0", (5, 25, 60, 15), 2),
+        ("", (0, 0, 0, 0), 0),
+        ("QUARTO", (210, 5, 60, 15), 1),
+        ("ruido", (150, 5, 20, 15), 1),
+    ])
+
+    assert atribuir_palavras(dados, caixas) == ["SALA\n3,5x4,0", "QUARTO"]
@@ -0,0 +1,40 @@
+import types
+
+from src.ocr import servico
+from src.ocr.servico import _interpretar_config, _tsv_para_dict
+
+
+def test_interpretar_config_estilo_cli():
+    lang, oem, psm, variaveis = _interpretar_config(
+        "eng", "--oem 3 --psm 11 -l por -c tessedit_char_whitelist=0123x")
+    assert (lang, oem, psm) == ("por", 3, 11)
+    assert variaveis == (("tessedit_char_whitelist", "0123x"),)
+
+
+def test_tsv_para_dict_no_formato_pytesseract():
+    tsv = (
+        "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+        "1\t1\t0\t0\t0\t0\t0\t0\t100\t50\t-1\t\n"
+        "5\t1\t1\t1\t1\t1\t5\t5\t40\t15\t91.5\tSALA\n"
+    )
+    dados = _tsv_para_dict(tsv)
+    assert dados["text"] == ["", "SALA"]
+    assert dados["left"] == [0, 5]
+    assert dados["conf"] == [-1.0, 91.5]
+
+
+def test_api_tesserocr_recebe_oem_e_psm_inteiros(monkeypatch):
+    criadas = []
+
+    class API:
+        def __init__(self, **kwargs):
+            criadas.append(kwargs)
+
+        def SetVariable(self, nome, valor):
+            pass
+
+    monkeypatch.setattr(servico, "tesserocr", types.SimpleNamespace(PyTessBaseAPI=API))
+    monkeypatch.setattr(servico, "_APIS", {})
+    api = servico._api_tesserocr("por", "--oem 1 --psm 11")
+    assert servico._api_tesserocr("por", "--oem 1 --psm 11") is api
+    assert criadas == [{"lang": "por", "oem": 1, "psm": 11}]
@@ -0,0 +1,81 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.ocr.tiles import abrir_raster, agrupar_linhas, gerar_tiles, ocr_tiles, tamanho_imagem, unir_segmentos
+
+
+def test_nucleos_dos_tiles_particionam_a_imagem():
+    cobertura = np.zeros((1000, 1500), dtype=np.int32)
+    for tile in gerar_tiles(1000, 1500, tamanho=400, sobreposicao=50):
+        cobertura[tile.ny0:tile.ny1, tile.nx0:tile.nx1] += 1
+        assert tile.x0 <= tile.nx0 and tile.nx1 <= tile.x1
+
+    assert (cobertura == 1).all()
+
+
+def test_unir_segmentos_atravessando_emendas():
+    linhas = np.array([
+        [0, 100, 450, 101],     # mesma parede vista por dois tiles
+        [380, 100, 900, 100],
+        [200, 0, 201, 300],
+        [200, 305, 200, 600],   # lacuna menor que a folga
+        [10, 10, 300, 300],     # inclinada: intocada
+    ])
+
+    unidos = unir_segmentos(linhas).tolist()
+
+    assert [0, 100, 900, 100] in unidos or [0, 101, 900, 101] in unidos
+    assert [200, 0, 200, 600] in unidos
+    assert [10, 10, 300, 300] in unidos
+    assert len(unidos) == 3
+
+
+def test_agrupar_linhas_em_regioes():
+    palavras = [
+        {"texto": "3,50", "caixa": (160, 102, 40, 20)},
+        {"texto": "SALA", "caixa": (100, 100, 50, 20)},
+        {"texto": "COZINHA", "caixa": (600, 101, 80, 20)},
+        {"texto": "BWC", "caixa": (100, 200, 40, 20)},
+    ]
+
+    regioes = agrupar_linhas(palavras)
+
+    assert [r["texto"] for r in regioes] == ["SALA 3,50", "COZINHA", "BWC"]
+    assert regioes[0]["posicao"] == (100, 100, 100, 22)
+
+
+class ServicoFalso:
+    workers = 1
+
+    def submeter(self, bloco, lang, config, tarefa, cache=True):
+        # Uma "palavra" no pixel preto do bloco, em coordenadas locais
+        ys, xs = np.nonzero(bloco == 0)
+        futuro = Future()
+        futuro.set_result({"text": ["X"] * len(xs), "left": xs.tolist(), "top": ys.tolist(),
+                           "width": [1] * len(xs), "height": [1] * len(xs), "conf": [90] * len(xs)})
+        return futuro
+
+
+def test_ocr_tiles_sem_duplicatas_nas_sobreposicoes(tmp_path):
+    imagem = np.full((500, 700), 255, dtype=np.uint8)
+    imagem[[10, 250, 260, 499], [10, 250, 300, 699]] = 0
+    np.save(tmp_path / "prancha.npy", imagem)
+
+    raster = abrir_raster(tmp_path / "prancha.npy")
+    palavras = ocr_tiles(raster, tamanho=256, sobreposicao=64, servico=ServicoFalso())
+
+    assert sorted(p["caixa"][:2] for p in palavras) == [(10, 10), (250, 250), (300, 260), (699, 499)]
+
+
+def test_limite_de_pixels_do_pil_desligado_so_no_cabecalho(tmp_path, monkeypatch):
+    caminho = tmp_path / "prancha.png"
+    Image.new("L", (64, 48)).save(caminho)
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+
+    assert tamanho_imagem(caminho) == (64, 48)
+    assert Image.MAX_IMAGE_PIXELS == 100
+    with pytest.raises(Image.DecompressionBombError):
+        Image.open(caminho)
@@ -0,0 +1,64 @@
+import json
+
+import pyarrow.parquet as pq
+
+from parser_inteligente_plantas import ParserInteligentePlantas, expandir_entradas, planta_para_dict
+
+TEXTOS = {
+    "arquitetura.txt": "PLANTA BAIXA\nSALA 12,50 m²\nQUARTO 3,00 x 3,50\nCOZINHA 8,40 m²\nBANHEIRO",
+    "estrutural.txt": "FORMAS\nPILAR P1 20x40\nVIGA V2\nLAJE maciça\nconcreto FCK 30",
+    "eletrica.txt": "TOMADA TUG\nINTERRUPTOR simples\nQUADRO de distribuição\nCIRCUITO 4",
+}
+
+
+def _pasta(tmp_path):
+    pasta = tmp_path / "ocr"
+    (pasta / "sub").mkdir(parents=True)
+    for nome, texto in TEXTOS.items():
+        (pasta / nome).write_text(texto, encoding="utf-8")
+    (pasta / "sub" / "hidraulica.txt").write_text("REGISTRO\nESGOTO\nCAIXA d'água", encoding="utf-8")
+    (pasta / "notas.md").write_text("SALA", encoding="utf-8")
+    return pasta
+
+
+def test_expande_diretorio_glob_e_arquivo(tmp_path):
+    pasta = _pasta(tmp_path)
+
+    assert [c.name for c in expandir_entradas(pasta)] == ["arquitetura.txt", "eletrica.txt", "estrutural.txt"]
+    assert [c.name for c in expandir_entradas([str(pasta / "**" / "*.txt"), pasta / "eletrica.txt"])] == [
+        "arquitetura.txt", "eletrica.txt", "estrutural.txt", "hidraulica.txt"]
+
+
+def test_lote_em_processos_igual_ao_processamento_unitario(tmp_path):
+    pasta = _pasta(tmp_path)
+    (pasta / "corrompido.txt").write_bytes(b"\xff\xfe")
+    parser = ParserInteligentePlantas()
+    vistos = []
+
+    resumo = parser.processar_lote(pasta, tmp_path / "saida.jsonl", workers=2, tamanho_bloco=1,
+                                   ao_concluir=vistos.append)
+
+    registros = {r["arquivo"]: r for r in map(json.loads, open(tmp_path / "saida.jsonl", encoding="utf-8"))}
+    assert len(vistos) == len(registros) == resumo.processados == resumo.arquivos == 4
+    assert resumo.erros == 1 and registros[str(pasta / "corrompido.txt")]["erro"].startswith("UnicodeDecodeError")
+    assert resumo.por_tipo == {"arquitetonica": 1, "estrutural": 1, "eletrica": 1}
+    for nome, texto in TEXTOS.items():
+        registro = registros[str(pasta / nome)]
+        assert registro["bytes"] == len(texto.encode("utf-8"))
+        esperado = json.loads(json.dumps(planta_para_dict(parser, parser.processar_planta(texto))))
+        esperado["informacoes_relevantes"].get("ambientes", []).sort()
+        registro["informacoes_relevantes"].get("ambientes", []).sort()
+        assert {k: registro[k] for k in esperado} == esperado
+
+
+def test_saida_parquet_no_processo_atual(tmp_path):
+    pasta = _pasta(tmp_path)
+
+    resumo = ParserInteligentePlantas().processar_lote(
+        str(pasta / "*.txt"), tmp_path / "saida.parquet", workers=0, modo_detalhado=True)
+
+    tabela = pq.read_table(tmp_path / "saida.parquet").to_pylist()
+    assert resumo.erros == 0 and resumo.arquivos_por_s > 0
+    assert [linha["tipo"] for linha in tabela] == ["arquitetonica", "eletrica", "estrutural"]
+    assert json.loads(tabela[2]["informacoes_relevantes"]) == {"resistencia_concreto": "FCK 30 MPa"}
+    assert json.loads(tabela[0]["detalhes_completos"])["texto_original"] == TEXTOS["arquitetura.txt"]
@@ -0,0 +1,118 @@
+import random
+import re
+
+from src.parser_planta_arquitetonica import (_PADROES_NUMERICOS, _SUFIXOS, ParserPlantaArquitetonica,
+                                             _tokens_numericos, tokenizar)
+
+PADROES_ANTIGOS = {
+    'QUARTO': [r'QUARTO\s*(\d+)?', r'DORMIT[ÓO]RIO\s*(\d+)?', r'SU[ÍI]TE'],
+    'SALA': [r'SALA\s*(DE\s*)?(ESTAR|JANTAR|TV)?', r'LIVING'],
+    'COZINHA': [r'COZINHA', r'COPA'],
+    'BANHEIRO': [r'BANHEIRO', r'WC', r'LAVABO', r'BWC'],
+    'VARANDA': [r'VARANDA', r'SACADA', r'TERRAÇO'],
+    'ÁREA_SERVIÇO': [r'[ÁA]REA\s*(DE\s*)?SERVI[ÇC]O', r'LAVANDERIA'],
+    'GARAGEM': [r'GARAGEM', r'VAGA', r'ESTACIONAMENTO']
+}
+
+
+def relatorio_antigo(texto_ocr):
+    """Algoritmo anterior (um re.search por janela de cada ambiente), usado como referência"""
+    texto = texto_ocr.upper()
+
+    def janela(posicao):
+        return texto[max(0, posicao - 100):min(len(texto), posicao + 100)]
+
+    def area(posicao):
+        for padrao in (r'(\d+[,.]?\d*)\s*M[²2]', r'(\d+[,.]?\d*)\s*METROS?\s*QUADRADOS?'):
+            match = re.search(padrao, janela(posicao))
+            if match:
+                return float(match.group(1).replace(',', '.'))
+        return None
+
+    def dimensoes(posicao):
+        match = re.search(r'(\d+[,.]?\d*)\s*[Xx]\s*(\d+[,.]?\d*)', janela(posicao))
+        if not match:
+            return None
+        l, c = (float(g.replace(',', '.')) for g in match.groups())
+        return (l / 100, c / 100) if l > 100 or c > 100 else (l, c)
+
+    ambientes = [{'nome': m.group(0), 'area': area(m.start()), 'dimensoes': dimensoes(m.start())}
+                 for padroes in PADROES_ANTIGOS.values() for padrao in padroes for m in re.finditer(padrao, texto)]
+    medidas = sorted(set(float(v.replace(',', '.')) for padrao in
+                         (r'(\d+[,.]?\d*)\s*M(?:ETROS?)?', r'(\d+[,.]?\d*)\s*CM', r'(\d+[,.]?\d*)\s*MM')
+                         for v in re.findall(padrao, texto)))
+    total_area = sum(a['area'] for a in ambientes if a['area'])
+    return {
+        'resumo': {
+            'total_ambientes': len(ambientes),
+            'area_total_identificada': round(total_area, 2) if total_area > 0 else None,
+            'num_quartos': len([a for a in ambientes if 'QUARTO' in a['nome']]),
+            'num_banheiros': len([a for a in ambientes if any(b in a['nome'] for b in ['BANHEIRO', 'WC', 'LAVABO'])])
+        },
+        'ambientes': ambientes,
+        'medidas_encontradas': medidas[:20],
+        'estatisticas': {
+            'total_medidas': len(medidas),
+            'menor_medida': min(medidas) if medidas else None,
+            'maior_medida': max(medidas) if medidas else None
+        }
+    }
+
+
+def texto_aleatorio(rnd, tamanho):
+    pecas = ["QUARTO 1", "quarto", "DORMITÓRIO 2", "Suíte", "SALA DE ESTAR", "sala tv", "LIVING", "COZINHA",
+             "COPA", "BWC", "wc", "LAVABO", "BANHEIRO", "VARANDA", "TERRAÇO", "ÁREA DE SERVIÇO", "area servico",
+             "GARAGEM", "VAGA", "12,50 m²", "9.3M2", "15 METROS QUADRADOS", "3,00 x 4,00", "300X450", "2.5 m",
+             "80 CM", "15MM", "12", "x", "m²", "TÉRREO", "2º PAVIMENTO", " ", "\n", "-", "ESC 1:50", "A=",
+             "1234567", ",", "."]
+    partes = []
+    while sum(map(len, partes)) < tamanho:
+        partes.append(rnd.choice(pecas))
+        partes.append(rnd.choice([" ", "", "  ", "\n", " - "]))
+    return "".join(partes)
+
+
+def test_relatorio_identico_ao_algoritmo_anterior():
+    rnd = random.Random(12)
+    for _ in range(300):
+        texto = texto_aleatorio(rnd, rnd.randint(0, 900))
+        assert ParserPlantaArquitetonica(texto).gerar_relatorio() == relatorio_antigo(texto), texto
+
+
+def test_medidas_cortadas_pela_borda_da_janela():
+    # A janela do QUARTO começa/termina no meio das medidas: o trecho recortado casa diferente
+    for deslocamento in range(90, 110):
+        antes = "123,45 M2 3,00 X 4,00" + "-" * deslocamento
+        depois = "-" * (deslocamento - 8) + "1234,5 X 6789 METROS QUADRADOS"
+        texto = antes + "QUARTO 2" + depois
+        assert ParserPlantaArquitetonica(texto).gerar_relatorio() == relatorio_antigo(texto)
+
+
+def test_tokens_com_offsets():
+    texto = "TÉRREO\nSALA DE ESTAR 4,20 X 5,00 = 21,00 M²\nBWC 3 CM"
+
+    tokens = tokenizar(texto)
+
+    resumo = [(t.tipo, t.texto, t.classe, t.valor) for t in tokens]
+    assert ('NIVEL', 'TÉRREO', '', None) in resumo
+    assert ('AMBIENTE', 'SALA DE ESTAR', 'SALA', 3) in resumo
+    assert ('DIMENSAO', '4,20 X 5,00', '', (4.2, 5.0)) in resumo
+    assert ('AREA', '21,00 M²', '0', 21.0) in resumo
+    assert ('MEDIDA', '3 CM', 'CM', 3.0) in resumo
+    # BWC também é um WC (padrões sobrepostos são preservados)
+    assert [t.classe for t in tokens if t.texto in ("BWC", "WC")] == ["BANHEIRO", "BANHEIRO"]
+    assert all(texto[t.inicio:t.fim] == t.texto for t in tokens)
+    assert [t.inicio for t in tokens] == sorted(t.inicio for t in tokens)
+    parser = ParserPlantaArquitetonica(texto)
+    assert parser.tokens == tokenizar(texto.upper()) and parser.tokens is parser.tokens
+
+
+def test_passada_unica_equivale_ao_finditer_de_cada_padrao():
+    rnd = random.Random(3)
+    for _ in range(2000):
+        texto = "".join(rnd.choice("0123456789,. \nXXM²2CMMETROSQUADRADOS") for _ in range(rnd.randint(0, 60)))
+        tokens = _tokens_numericos(texto)
+        for (tipo, classe, _), padrao in zip(_SUFIXOS, _PADROES_NUMERICOS):
+            esperado = [(m.start(), m.end()) for m in padrao.finditer(texto)]
+            obtido = [(t.inicio, t.fim) for t in tokens if (t.tipo, t.classe) == (tipo, classe)]
+            assert obtido == esperado, (texto, tipo, classe)
@@ -0,0 +1,80 @@
+import json
+
+import pyarrow.parquet as pq
+import pytest
+
+from scripts.pipeline_completo import executar_pipeline, montar_pipeline
+from src.pipeline.dag import Etapa, Pipeline
+
+
+def _pipeline(chamadas):
+    def etapa(nome, funcao):
+        def rodar(*args):
+            chamadas.append(nome)
+            return funcao(*args)
+        return rodar
+    return Pipeline([
+        Etapa("soma", etapa("soma", lambda a, b: a + b), depende=("a", "b"), checkpoint="soma.json"),
+        Etapa("dobro", etapa("dobro", lambda s: {"valor": 2 * s}), depende=("soma",), checkpoint="dobro.json"),
+        Etapa("texto", etapa("texto", lambda d, a: f"{d['valor']}/{a}"), depende=("dobro", "a")),
+    ])
+
+
+def test_ordem_topologica_e_valores_em_memoria():
+    chamadas = []
+    resultado = _pipeline(chamadas).executar({"a": 2, "b": 3})
+
+    assert chamadas == ["soma", "dobro", "texto"]
+    assert resultado.valores["texto"] == "10/2" and set(resultado.tempos) == set(chamadas)
+    with pytest.raises(KeyError):
+        _pipeline([]).executar({"a": 1})
+    with pytest.raises(ValueError):
+        Pipeline([Etapa("x", len, depende=("y",)), Etapa("y", len, depende=("x",))]).ordem()
+
+
+def test_checkpoints_retomados_so_com_a_mesma_assinatura(tmp_path):
+    chamadas = []
+    _pipeline(chamadas).executar({"a": 2, "b": 3}, dir_checkpoint=tmp_path, assinatura="v1")
+    assert json.loads((tmp_path / "dobro.json").read_text()) == {"valor": 10}
+
+    chamadas.clear()
+    resultado = _pipeline(chamadas).executar({"a": 2, "b": 3}, tmp_path, retomar=True, assinatura="v1")
+    assert chamadas == ["texto"] and resultado.retomadas == ["soma", "dobro"]
+
+    # Etapa refeita invalida as que dependem dela
+    (tmp_path / "soma.json").unlink()
+    chamadas.clear()
+    _pipeline(chamadas).executar({"a": 2, "b": 3}, tmp_path, retomar=True, assinatura="v1")
+    assert chamadas == ["soma", "dobro", "texto"]
+
+    chamadas.clear()
+    _pipeline(chamadas).executar({"a": 2, "b": 3}, tmp_path, retomar=True, assinatura="v2")
+    assert chamadas == ["soma", "dobro", "texto"]
+
+
+class _Analisador:
+    def __init__(self):
+        self.imagens = []
+
+    def analisar(self, caminho_imagem):
+        self.imagens.append(caminho_imagem)
+        return {"projeto": "Teste", "arquivo_origem": caminho_imagem, "medidas": [
+            {"ambiente": "Sala", "largura": 4.5, "comprimento": 3.8},
+            {"ambiente": "Banheiro", "largura": 2.0, "comprimento": 1.5}]}
+
+
+def test_pipeline_completo_em_processo(tmp_path):
+    imagem = tmp_path / "planta.png"
+    imagem.write_bytes(b"png")
+    analisador = _Analisador()
+    pipeline = montar_pipeline(analisador)
+
+    dados = executar_pipeline(imagem, pipeline, dir_checkpoint=tmp_path / "ck")
+    assert dados["projeto"]["nome"] == "Teste" and round(dados["geometria"]["area_total"], 2) == 17.1
+    com_area = json.loads((tmp_path / "ck" / "resultado_analisador_com_area.json").read_text(encoding="utf-8"))
+    assert com_area == dados
+    ambientes = pq.read_table(tmp_path / "ck" / "resultado_analisador.parquet").to_pylist()
+    assert [(a["planta_id"], a["ambiente"]) for a in ambientes] == [("planta", "Sala"), ("planta", "Banheiro")]
+
+    executar_pipeline(imagem, pipeline, dir_checkpoint=tmp_path / "ck", retomar=True)
+    assert analisador.imagens == [str(imagem)]
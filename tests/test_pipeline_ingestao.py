@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+
+from src.pipeline.ingestao import DaemonIngestao, FilaJobs
+
+
+def test_fila_persistente_retoma_jobs_interrompidos(tmp_path):
+    arquivo = tmp_path / "planta.png"
+    arquivo.write_bytes(b"png")
+    fila = FilaJobs(tmp_path / "jobs.sqlite")
+
+    job = fila.enfileirar(arquivo)
+    assert fila.enfileirar(arquivo) is None
+    assert fila.reservar().id == job and fila.reservar() is None
+    fila.fechar()
+
+    # Reinício com o job ainda running: volta para a fila
+    fila = FilaJobs(tmp_path / "jobs.sqlite")
+    eventos = []
+    fila.assinar(eventos.append)
+    assert fila.retomar() == 1
+    reservado = fila.reservar()
+    assert reservado.tentativas == 2
+    fila.concluir(reservado, {"ambientes": 3}, segundos=0.5)
+    assert fila.enfileirar(arquivo) is None  # mesma assinatura: não processa de novo
+
+    assert [(e.estado, e.dados) for e in eventos] == [
+        ("queued", {"retomado": True}), ("running", {"tentativa": 2}),
+        ("done", {"segundos": 0.5, "resultado": {"ambientes": 3}})]
+    assert [e.estado for e in fila.eventos(job)] == ["queued", "running", "queued", "running", "done"]
+    assert fila.contagem() == {"queued": 0, "running": 0, "done": 1, "failed": 0}
+
+
+def test_arquivo_alterado_durante_a_execucao_volta_para_a_fila(tmp_path):
+    arquivo = tmp_path / "planta.png"
+    arquivo.write_bytes(b"png")
+    fila = FilaJobs(tmp_path / "jobs.sqlite")
+    job = fila.enfileirar(arquivo, assinatura="v1")
+    reservado = fila.reservar()
+
+    assert fila.enfileirar(arquivo, assinatura="v1") is None  # evento repetido da mesma versão
+    assert fila.enfileirar(arquivo, assinatura="v2") is None  # alterado enquanto roda
+    fila.concluir(reservado, {"ambientes": 1})
+
+    assert [e.estado for e in fila.eventos(job)] == ["queued", "running", "done", "queued"]
+    assert fila.jobs()[0]["estado"] == "queued" and fila.jobs()[0]["assinatura"] == "v2"
+    novo = fila.reservar()
+    assert novo.assinatura == "v2"
+    fila.concluir(novo)
+    assert fila.contagem()["queued"] == 0 and fila.enfileirar(arquivo, assinatura="v2") is None
+
+
+def test_daemon_observa_a_pasta_com_workers_limitados(tmp_path):
+    entrada = tmp_path / "entrada"
+    entrada.mkdir()
+    (entrada / "antigo.txt").write_text("já estava na pasta", encoding="utf-8")
+    simultaneos, maximo, lock = [0], [0], threading.Lock()
+
+    def processar(caminho):
+        with lock:
+            simultaneos[0] += 1
+            maximo[0] = max(maximo[0], simultaneos[0])
+        try:
+            texto = caminho.read_text(encoding="utf-8")
+            if "erro" in texto:
+                raise ValueError("memorial inválido")
+            return {"caracteres": len(texto)}
+        finally:
+            with lock:
+                simultaneos[0] -= 1
+
+    fila = FilaJobs(tmp_path / "jobs.sqlite")
+    daemon = DaemonIngestao(entrada, {".txt": processar}, fila, workers=2, estabilidade=0.05)
+    daemon.iniciar()
+    try:
+        for i in range(6):
+            (entrada / f"memorial_{i}.txt").write_text(f"seção {i}", encoding="utf-8")
+        (entrada / "ruim.txt").write_text("erro", encoding="utf-8")
+        (entrada / "planta.dwg").write_bytes(b"ignorado")
+        limite = time.monotonic() + 20
+        while len(fila.jobs()) < 8 and time.monotonic() < limite:  # eventos do watchdog
+            time.sleep(0.05)
+        assert daemon.aguardar_ocioso(timeout=20)
+    finally:
+        daemon.parar()
+
+    assert fila.contagem() == {"queued": 0, "running": 0, "done": 7, "failed": 1}
+    assert 1 <= maximo[0] <= 2
+    [falha] = fila.jobs("failed")
+    assert falha["erro"] == "ValueError: memorial inválido" and falha["caminho"].endswith("ruim.txt")
+
+    # Reinício: só o arquivo alterado com o daemon parado é processado de novo
+    (entrada / "memorial_0.txt").write_text("seção 0, revisada", encoding="utf-8")
+    os.utime(entrada / "memorial_0.txt", (1, 1))
+    processados = []
+    daemon = DaemonIngestao(entrada, {".txt": lambda c: processados.append(c.name) or {}}, fila,
+                            workers=1, estabilidade=0.05)
+    daemon.iniciar()
+    try:
+        assert daemon.aguardar_ocioso(timeout=20)
+    finally:
+        daemon.parar()
+    assert processados == ["memorial_0.txt"]